@@ -0,0 +1,109 @@
+# Accesos a vectores con y sin la comprobación de rango que bounds.py demuestra innecesaria.
+#
+#   python benchmarks/bench_bounds.py [--n N] [--rounds R] [--repeat K]
+#
+# El programa recorre vectores de N elementos con bucles de contador (hacia delante, hacia
+# atrás y anidados) R veces. Se compila dos veces el mismo árbol: tal cual y después de
+# analyze_bounds, que marca los accesos seguros; se mide con closures, la máquina virtual y el
+# programa traducido a Python, y se comprueba que las variables finales coinciden.
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from token_stream import TokenBuffer
+from executor import compile_program
+from bytecode import compile_bytecode
+from vm import VirtualMachine
+from transpiler import transpile
+from bounds import analyze_bounds
+
+
+def gen_program(n, rounds):
+    side = max(1, int(n ** 0.5))
+    return f"""
+int[{n}] v
+float[{n}] x
+int[{side * side}] m
+int i, j, r, total
+float s
+while r < {rounds}: {{
+    i = 0
+    while i < {n}: {{
+        v[i] = v[i] + i
+        x[i] = x[i] * 0.5 + 1.0
+        i = i + 1
+    }}
+    i = {n} - 1
+    while i >= 0: {{
+        total = total + v[i]
+        s = s + x[i]
+        i = i - 1
+    }}
+    i = 0
+    while i < {side}: {{
+        j = 0
+        while j < {side}: {{
+            m[i * {side} + j] = m[i * {side} + j] + j
+            j = j + 1
+        }}
+        i = i + 1
+    }}
+    r = r + 1
+}}
+"""
+
+
+def load(source, lexer, parser):
+    lexer.lineno = 1
+    lexer.input(source)
+    tree = parser.parse_tokens(TokenBuffer(source).fill(lexer))
+    SemanticAnalyzer().analyze(tree)
+    return tree
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+ENGINES = (('closures', compile_program), ('vm', lambda tree: VirtualMachine(compile_bytecode(tree))),
+           ('python', transpile))
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--n', type=int, default=10_000, help="elementos de cada vector")
+    argp.add_argument('--rounds', type=int, default=20, help="vueltas del bucle exterior")
+    argp.add_argument('--repeat', type=int, default=3)
+    args = argp.parse_args()
+
+    tree = load(gen_program(args.n, args.rounds), Lexer().lexer, Parser(production=True))
+    checked = [(name, make(tree)) for name, make in ENGINES]
+    safe, accesses = analyze_bounds(tree)
+    unchecked = [(name, make(tree)) for name, make in ENGINES]
+
+    print(f"vectores de {args.n} elementos, {args.rounds} vueltas; {safe} de {accesses} accesos sin comprobar")
+    failed = False
+    for (name, with_checks), (_, without_checks) in zip(checked, unchecked):
+        before = best_of(with_checks.run, args.repeat)
+        after = best_of(without_checks.run, args.repeat)
+        same = with_checks.format_variables() == without_checks.format_variables()
+        failed = failed or not same
+        print(f"{name:9} con comprobación {before:8.4f} s  sin {after:8.4f} s  x{before / after:5.2f}"
+              f"{'' if same else '  RESULTADOS DISTINTOS'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Servidor de compilación (src/daemon.py) frente a arrancar main.py para cada fichero.
+#
+#   python benchmarks/bench_daemon.py [--repeat K] [--jobs N]
+#
+# Arranca un servidor en un socket temporal y compila los ejemplos de tests/:
+#   - en frío: un proceso `main.py --production --include fichero` por fichero (importaciones y
+#     construcción del lexer y del parser cada vez);
+#   - en caliente: una petición por fichero al servidor ya arrancado.
+# Comprueba que las respuestas del servidor coinciden con ParserRunner en este proceso (estado,
+# tokens, árbol y diagnósticos) y que, con todos los procesos ocupados y sin cola, el servidor
+# responde "ocupado" en lugar de aceptar más trabajo.
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+TESTS = os.path.join(SRC, '..', 'tests')
+sys.path.insert(0, SRC)
+
+from bench_tokens import gen_source
+from daemon import Client, ast_json, tokens_json
+from diagnostics import json_fields
+from main import ParserRunner
+
+
+def wait_for(path, proc):
+    while not os.path.exists(path):
+        if proc.poll() is not None:
+            raise RuntimeError("El servidor no ha arrancado")
+        time.sleep(0.05)
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--repeat', type=int, default=3)
+    argp.add_argument('--jobs', type=int, default=2)
+    args = argp.parse_args()
+
+    files = sorted(glob.glob(os.path.join(TESTS, '*.vip')))
+    runner = ParserRunner(production=True, output_format='json')
+    ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'viper.sock')
+        server = subprocess.Popen([sys.executable, os.path.join(SRC, 'daemon.py'), '--socket', path, 'serve',
+                                   '-j', str(args.jobs), '--max-pending', '0'])
+        try:
+            wait_for(path, server)
+
+            # Copia de los ejemplos para que main.py escriba sus .token fuera de tests/
+            inputs = os.path.join(tmp, 'tests')
+            os.mkdir(inputs)
+            for name in files:
+                shutil.copy(name, inputs)
+            start = time.perf_counter()
+            for name in files:
+                subprocess.run([sys.executable, os.path.join(SRC, 'main.py'), '--production', '--format', 'json',
+                                '--include', os.path.basename(name), inputs], capture_output=True, check=True)
+            cold = time.perf_counter() - start
+
+            with Client(path) as client:
+                warm = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    responses = [client.compile(name) for name in files]
+                    warm = min(warm, time.perf_counter() - start)
+
+            for name, response in zip(files, responses):
+                with open(name, encoding='utf-8') as f:
+                    result = runner.compile_source(f.read(), os.path.basename(name))
+                expected = {'ok': True, 'status': result.status, 'error': result.error,
+                            'tokens': tokens_json(result.tokens), 'ast': ast_json(result.ast),
+                            'diagnostics': [json_fields(d) for d in result.diagnostics]}
+                # Las tuplas del árbol llegan como listas
+                if response != json.loads(json.dumps(expected)):
+                    print(f"  {os.path.basename(name)}: RESPUESTA DISTINTA")
+                    ok = False
+
+            # Límite de concurrencia: jobs compilaciones largas a la vez; la siguiente debe rechazarse
+            big = gen_source(1.0)
+            replies = []
+
+            def slow():
+                with Client(path) as c:
+                    replies.append(c.compile(source=big, want=()))
+
+            threads = [threading.Thread(target=slow) for _ in range(args.jobs)]
+            for t in threads:
+                t.start()
+            time.sleep(0.3)
+            with Client(path) as client:
+                busy = client.compile(source="int x\n")
+            for t in threads:
+                t.join()
+            if busy['ok'] or not all(r['ok'] for r in replies):
+                print("  El servidor no aplica el límite de concurrencia")
+                ok = False
+
+            with Client(path) as client:
+                client.request({'op': 'shutdown'})
+            server.wait(timeout=10)
+        finally:
+            if server.poll() is None:
+                server.kill()
+
+    print(f"{len(files)} ficheros")
+    print(f"{'en frío (main.py)':<24} {cold:8.3f} s  {cold / len(files) * 1000:7.1f} ms/fichero")
+    print(f"{'en caliente (servidor)':<24} {warm:8.3f} s  {warm / len(files) * 1000:7.1f} ms/fichero")
+    print('OK' if ok else 'ERROR')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Escalado del grafo de flujo de control y de los análisis de flujo de datos.
+#
+#   python benchmarks/bench_dataflow.py [--max N] [--tolerance T]
+#
+# Genera una función con N sentencias (asignaciones, if/else y while anidados en ella)
+# y mide construir el grafo, resolver vida de variables y definiciones que alcanzan, y
+# buscar las asignaciones muertas. Comprueba que el tiempo por sentencia no crece con N.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from token_stream import TokenBuffer
+from cfg import build_cfg
+from dataflow import Liveness, ReachingDefinitions, find_dead_stores
+
+VARIABLES = 32
+
+
+def gen_function(n):
+    names = [f"a{i}" for i in range(VARIABLES)]
+    lines = ["def int f(int p): {", "    int " + ', '.join(names)]
+    for i in range(0, n, 4):
+        a, b, c = names[i % VARIABLES], names[(i * 7 + 1) % VARIABLES], names[(i * 13 + 2) % VARIABLES]
+        lines.append(f"    {a} = {b} + p * {i}")
+        lines.append(f"    if {a} > {c}: {{ {c} = {a} - 1 }} else {{ {b} = p }}")
+        lines.append(f"    while {b} < {i}: {{ {b} = {b} + 1 }}")
+    lines.append(f"    return {names[0]}")
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def analyze(function):
+    cfg = build_cfg(function.body, function)
+    liveness = Liveness(cfg)
+    ReachingDefinitions(cfg)
+    find_dead_stores(cfg, liveness)
+    return cfg
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--max', type=int, default=16_000, help="número máximo de sentencias")
+    argp.add_argument('--tolerance', type=float, default=2.5,
+                      help="máximo cociente admitido entre coste por sentencia grande/pequeño")
+    args = argp.parse_args()
+
+    sizes = [n for n in (1_000, 4_000, 16_000, 64_000) if n <= args.max]
+    lexer = Lexer().lexer
+    parser = Parser(production=True)
+
+    per_item = []
+    for n in sizes:
+        source = gen_function(n)
+        lexer.lineno = 1
+        lexer.input(source)
+        function = parser.parse_tokens(TokenBuffer(source).fill(lexer)).body[0]
+        blocks = len(analyze(function).blocks)
+        elapsed = best_of(lambda: analyze(function), 3)
+        per_item.append(elapsed / n)
+        print(f"n={n:>7}  bloques={blocks:>7}  {elapsed:9.4f} s  {elapsed / n * 1e6:7.2f} us/sentencia")
+
+    ratio = per_item[-1] / per_item[0]
+    ok = ratio <= args.tolerance
+    print(f"cociente {ratio:.2f} {'OK' if ok else 'NO LINEAL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
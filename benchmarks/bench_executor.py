@@ -0,0 +1,199 @@
+# Ejecución de programas Viper: compilador a closures, máquina virtual de bytecode y traducción
+# a Python frente al intérprete de referencia.
+#
+#   python benchmarks/bench_executor.py [--n N] [--repeat R]
+#
+# Programas con mucho bucle (sumas, bucles anidados, recursión, vectores y registros).
+# Además de medir, comprueba que todos los motores dejan las mismas variables globales; los
+# dos últimos programas comprueban además el orden de evaluación de v[índice] = valor.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from token_stream import TokenBuffer
+from executor import compile_program
+from tree_walker import TreeWalker
+from bytecode import compile_bytecode
+from vm import VirtualMachine
+from transpiler import transpile
+
+
+def gen_sum(n):
+    return f"""
+int i, s
+while i < {n}: {{
+    s = s + i * 2 - 1
+    i = i + 1
+}}
+"""
+
+
+def gen_nested(n):
+    side = max(1, int(n ** 0.5))
+    return f"""
+int i, j, s
+while i < {side}: {{
+    j = 0
+    while j < {side}: {{
+        if j < i: {{ s = s + 1 }} else {{ s = s - 1 }}
+        j = j + 1
+    }}
+    i = i + 1
+}}
+"""
+
+
+def gen_fib(n):
+    depth = max(2, min(22, n.bit_length() + 4))
+    return f"""
+def int fib(int n): {{
+    if n < 2: {{ return n }}
+    return fib(n - 1) + fib(n - 2)
+}}
+int r = fib({depth})
+"""
+
+
+def gen_vector(n):
+    return f"""
+int[64] v
+int i, k, s
+while k < {max(1, n // 64)}: {{
+    i = 0
+    while i < 64: {{
+        v[i] = v[i] + i * k
+        i = i + 1
+    }}
+    k = k + 1
+}}
+i = 0
+while i < 64: {{
+    s = s + v[i]
+    i = i + 1
+}}
+"""
+
+
+def gen_record(n):
+    return f"""
+type Punto: {{
+    int x
+    int y
+}}
+Punto p
+int i
+while i < {n}: {{
+    p.x = p.x + i
+    p.y = p.y - p.x / 7
+    i = i + 1
+}}
+"""
+
+
+def gen_store_index(n):
+    # El valor lee el vector con otro índice calculado antes de guardar
+    return f"""
+int[64] v
+int i, k
+while k < {max(1, n // 31)}: {{
+    i = 0
+    while i < 31: {{
+        v[i * 2] = v[i + 1] + 7
+        i = i + 1
+    }}
+    k = k + 1
+}}
+"""
+
+
+def gen_store_order(n):
+    # La llamada del valor cambia la variable del índice: el índice se calcula después
+    return f"""
+int[64] v
+int i, k
+int j = 2
+def int avanza(int a): {{
+    i = i + 1
+    return a
+}}
+while k < {max(1, n // 60)}: {{
+    i = 0
+    while i < 60: {{
+        v[i + 1] = avanza(7 + i) * j
+    }}
+    k = k + 1
+}}
+"""
+
+
+PROGRAMS = {
+    'suma': gen_sum,
+    'bucles anidados': gen_nested,
+    'fib recursivo': gen_fib,
+    'vector': gen_vector,
+    'registro': gen_record,
+    'índice guardado': gen_store_index,
+    'orden al guardar': gen_store_order,
+}
+
+
+def load(source, lexer, parser):
+    lexer.lineno = 1
+    lexer.input(source)
+    tree = parser.parse_tokens(TokenBuffer(source).fill(lexer))
+    SemanticAnalyzer().analyze(tree)
+    return tree
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--n', type=int, default=100_000, help="iteraciones de cada programa")
+    argp.add_argument('--repeat', type=int, default=3)
+    args = argp.parse_args()
+
+    lexer = Lexer().lexer
+    parser = Parser(production=True)
+
+    failed = False
+    for name, gen in PROGRAMS.items():
+        tree = load(gen(args.n), lexer, parser)
+
+        start = time.perf_counter()
+        program = compile_program(tree)
+        compile_time = time.perf_counter() - start
+        vm = VirtualMachine(compile_bytecode(tree))
+        python = transpile(tree)
+        walker = TreeWalker()
+
+        closure_time = best_of(program.run, args.repeat)
+        vm_time = best_of(vm.run, args.repeat)
+        python_time = best_of(python.run, args.repeat)
+        walker_time = best_of(lambda: walker.run(tree), args.repeat)
+
+        expected = walker.format_variables()
+        same = all(engine.format_variables() == expected for engine in (program, vm, python))
+        failed |= not same
+        print(f"{name:16} closures {closure_time:8.4f} s (compilar {compile_time * 1e3:6.2f} ms)"
+              f"  vm {vm_time:8.4f} s  python {python_time:8.4f} s  árbol {walker_time:8.4f} s  x{walker_time / closure_time:5.1f}"
+              f"  {'OK' if same else 'RESULTADOS DISTINTOS'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
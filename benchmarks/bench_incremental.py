@@ -0,0 +1,96 @@
+# Latencia de edición a diagnóstico con src/incremental.py frente a compilar el texto entero.
+#
+#   python benchmarks/bench_incremental.py [--mb 0.1,1,4] [--repeat K] [--format text|json]
+#
+# Para programas generados de varios tamaños mide, por tipo de edición, lo que tarda
+# Document.edit seguido de diagnostics() (y lo mismo con Document.update, que recibe el texto
+# completo y tiene que compararlo con el anterior) frente a ParserRunner.compile_source:
+#   - cuerpo:     un número dentro de una función del centro del programa;
+#   - al final:   una sentencia nueva al final;
+#   - tipo:       el tipo de una variable global que leen todas las sentencias sueltas, que
+#                 se vuelven a analizar.
+# Tras cada edición comprueba que el resultado coincide con el de la compilación completa.
+# Por defecto con los diagnósticos de --format json: con text cada declaración deja además un
+# mensaje de depuración, y la lista de diagnósticos (que hay que devolver entera) crece con el
+# programa.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_tokens import gen_source
+from diff_incremental import record
+from incremental import Document
+from main import ParserRunner
+
+
+def edits(source):
+    # (nombre, inicio, fin, texto nuevo)
+    middle = source.find("indice * ", len(source) // 2) + len("indice * ")
+    end = source.index(' ', middle)
+    declaration = source.index("float factor")
+    return [
+        ('cuerpo', middle, end, '7'),
+        ('al final', len(source), len(source), "resultado = resultado + 1\n"),
+        ('tipo', declaration, declaration + len("float"), 'int'),
+    ]
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--mb', default='0.1,1,4', help="tamaños de los programas en MB, separados por comas")
+    argp.add_argument('--repeat', type=int, default=3)
+    argp.add_argument('--format', choices=('text', 'json'), default='json')
+    args = argp.parse_args()
+
+    runner = ParserRunner(production=True, output_format=args.format)
+    ok = True
+    print(f"{'MB':>5} {'edición':<10} {'completa ms':>12} {'edit ms':>9} {'update ms':>10} {'aceleración':>12}")
+    for megabytes in (float(mb) for mb in args.mb.split(',')):
+        source = gen_source(megabytes)
+        full = timed(lambda: runner.compile_source(source, 'prog.vip'), args.repeat)
+        document = Document(runner, source, 'prog.vip')
+        for name, start, end, text in edits(source):
+            removed = source[start:end]
+            edited = source[:start] + text + source[end:]
+
+            def by_edit():
+                document.edit(start, end, text)
+                document.diagnostics()
+                document.edit(start, start + len(text), removed)
+
+            def by_update():
+                document.update(edited)
+                document.diagnostics()
+                document.update(source)
+
+            # Cada repetición hace la edición y la deshace: se cuenta la mitad
+            incremental = timed(by_edit, args.repeat) / 2
+            whole = timed(by_update, args.repeat) / 2
+
+            builds = document.full_builds
+            document.edit(start, end, text)
+            if document.full_builds != builds or record(document.result()) != record(
+                    runner.compile_source(edited, 'prog.vip')):
+                print(f"  {name}: DISTINTO")
+                ok = False
+            document.edit(start, start + len(text), removed)
+            print(f"{len(source) / 1e6:5.1f} {name:<10} {full * 1000:12.1f} {incremental * 1000:9.2f} "
+                  f"{whole * 1000:10.2f} {full / incremental:11.0f}x")
+    print('OK' if ok else 'ERROR')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
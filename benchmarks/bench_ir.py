@@ -0,0 +1,139 @@
+# Optimizaciones sobre la IR de tres direcciones: instrucciones ejecutadas antes y después de
+# CSE, propagación de copias y extracción de código invariante de los bucles.
+#
+#   python benchmarks/bench_ir.py [--n N]
+#
+# Se ejecutan los ejemplos de tests/ que pasan el análisis semántico y los programas de
+# bench_executor.py, más uno con lecturas repetidas de vectores y campos y otro con aritmética de
+# int invariante en un bucle interno (sale a su cabecera protegida). Además de contar,
+# comprueba que la IR, optimizada o no, deja las mismas variables que el compilador a closures.
+import argparse
+import glob
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer, SemanticError
+from token_stream import TokenBuffer
+from diagnostics import DiagnosticSink
+from executor import compile_program, ExecutionError
+from ir import lower_program
+from ir_optimizer import optimize_ir
+from ir_interpreter import IRInterpreter
+from bench_executor import PROGRAMS
+
+
+def gen_repeated_reads(n):
+    return f"""
+type Persona: {{
+    int edad
+    float altura
+}}
+Persona juan
+juan.edad = 30
+int[3] datos
+datos[0] = 1
+datos[1] = 2
+datos[2] = 3
+int i, total
+int limite = {n}
+while i < limite: {{
+    total = total + juan.edad * 2 + datos[0] + datos[1] + datos[2]
+    if juan.edad > 18 and datos[0] + datos[1] + datos[2] > 5: {{
+        total = total - juan.edad
+    }}
+    i = i + 1
+}}
+"""
+
+
+def gen_int_invariant(n):
+    side = max(1, int(n ** 0.5))
+    return f"""
+int fila, col, total
+int ancho = {side}
+while fila < ancho: {{
+    col = 0
+    while col < ancho: {{
+        total = total + fila * ancho * 3 + col
+        col = col + 1
+    }}
+    fila = fila + 1
+}}
+"""
+
+
+def load(source, lexer, parser):
+    # Árbol tipado, o None si el ejemplo tiene errores (los hay a propósito en tests/)
+    parser.diagnostics = DiagnosticSink()
+    lexer.lineno = 1
+    lexer.input(source)
+    tree = parser.parse_tokens(TokenBuffer(source).fill(lexer))
+    if tree is None or parser.diagnostics.has_errors:
+        return None
+    try:
+        SemanticAnalyzer().analyze(tree)
+    except SemanticError:
+        return None
+    return tree
+
+
+def execute(engine):
+    # (variables formateadas o mensaje de error, instrucciones ejecutadas)
+    try:
+        engine.run()
+        result = engine.format_variables()
+    except ExecutionError as e:
+        result = str(e)
+    return result, getattr(engine, 'executed', 0)
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--n', type=int, default=2_000, help="iteraciones de los programas generados")
+    args = argp.parse_args()
+
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, 'tests', '*.vip'))):
+        with open(path, encoding='utf-8') as f:
+            sources[os.path.basename(path)] = f.read()
+    for name, gen in PROGRAMS.items():
+        sources[name] = gen(args.n)
+    sources['lecturas repetidas'] = gen_repeated_reads(args.n)
+    sources['invariante entero'] = gen_int_invariant(args.n)
+
+    lexer = Lexer().lexer
+    parser = Parser(production=True)
+
+    failed = False
+    total_before = total_after = 0
+    for name, source in sources.items():
+        tree = load(source, lexer, parser)
+        if tree is None:
+            continue
+        expected, _ = execute(compile_program(tree))
+        program = lower_program(tree)
+        static_before = program.instruction_count()
+        result_before, before = execute(IRInterpreter(program))
+        optimize_ir(program)
+        result_after, after = execute(IRInterpreter(program))
+
+        same = result_before == result_after == expected
+        failed |= not same
+        total_before += before
+        total_after += after
+        saved = 100 * (before - after) / before if before else 0.0
+        print(f"{name:44} estáticas {static_before:5} -> {program.instruction_count():5}"
+              f"  ejecutadas {before:9} -> {after:9} (-{saved:5.1f} %)  {'OK' if same else 'RESULTADOS DISTINTOS'}")
+
+    saved = 100 * (total_before - total_after) / total_before if total_before else 0.0
+    print(f"{'total':44} ejecutadas {total_before} -> {total_after} (-{saved:.1f} %)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
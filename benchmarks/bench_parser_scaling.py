@@ -0,0 +1,83 @@
+# Escalado del parser con el tamaño del programa.
+#
+#   python benchmarks/bench_parser_scaling.py [--max N] [--tolerance T]
+#
+# Genera programas con N sentencias, N campos de registro, N parámetros y N
+# argumentos, y comprueba que el tiempo por elemento no crece con N.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from token_stream import TokenBuffer
+
+
+def gen_statements(n):
+    return ''.join(f"x{i} = {i} + y\n" for i in range(n))
+
+
+def gen_fields(n):
+    return "type R: {\n" + ''.join(f"  int f{i}\n" for i in range(n)) + "}\n"
+
+
+def gen_args(n):
+    return "x = f(" + ', '.join(str(i) for i in range(n)) + ")\n"
+
+
+def gen_ids(n):
+    return "int " + ', '.join(f"v{i}" for i in range(n)) + "\n"
+
+
+GENERATORS = {
+    'sentencias': gen_statements,
+    'campos': gen_fields,
+    'argumentos': gen_args,
+    'identificadores': gen_ids,
+}
+
+
+def time_parse(lexer, parser, source, repeat):
+    lexer.lineno = 1
+    lexer.input(source)
+    tokens = TokenBuffer(source).fill(lexer)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser.parse_tokens(tokens)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--max', type=int, default=100_000,
+                      help="tamaño máximo (hasta 1000000)")
+    argp.add_argument('--tolerance', type=float, default=2.5,
+                      help="máximo cociente admitido entre coste por elemento grande/pequeño")
+    args = argp.parse_args()
+
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= args.max]
+    lexer = Lexer().lexer
+    parser = Parser(production=True)
+
+    failed = False
+    for name, gen in GENERATORS.items():
+        per_item = []
+        for n in sizes:
+            elapsed = time_parse(lexer, parser, gen(n), repeat=3 if n < 100_000 else 1)
+            per_item.append(elapsed / n)
+            print(f"{name:16} n={n:>9}  {elapsed:9.4f} s  {elapsed / n * 1e6:7.2f} us/elem")
+        ratio = per_item[-1] / per_item[0]
+        ok = ratio <= args.tolerance
+        failed |= not ok
+        print(f"{name:16} cociente {ratio:.2f} {'OK' if ok else 'NO LINEAL'}\n")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
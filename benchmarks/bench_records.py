@@ -0,0 +1,127 @@
+# Vectores de registros guardados por columnas frente a un objeto por elemento.
+#
+#   python benchmarks/bench_records.py [--n N] [--repeat K]
+#
+# El programa declara Persona[N] gente, rellena sus campos con un bucle y calcula agregados
+# (con un bucle y con operaciones sobre columnas completas, sum(gente.edad)). Se mide con
+# closures, la máquina virtual y el programa traducido a Python, y se comprueba que los tres
+# dejan las mismas variables. Después se compara la memoria del vector (una columna por
+# campo) con la de los mismos datos en un registro por elemento: listas de ranuras, objetos
+# con __slots__ y diccionarios.
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from token_stream import TokenBuffer
+from executor import compile_program
+from bytecode import compile_bytecode
+from vm import VirtualMachine
+from transpiler import transpile
+from records import rows
+
+
+def gen_program(n):
+    return f"""
+type Persona: {{
+    int edad
+    float altura
+    bool activo
+    char inicial
+}}
+Persona[{n}] gente
+int i, mayores, total
+float suma
+while i < {n}: {{
+    gente[i].edad = i - i / 90 * 90
+    gente[i].altura = 1.5
+    gente[i].activo = gente[i].edad >= 18
+    gente[i].inicial = 'a'
+    i = i + 1
+}}
+i = 0
+while i < {n}: {{
+    if gente[i].activo: {{
+        mayores = mayores + 1
+    }}
+    i = i + 1
+}}
+total = sum(gente.edad)
+suma = sum(gente.altura * 2.0)
+"""
+
+
+def load(source):
+    lexer = Lexer().lexer
+    lexer.input(source)
+    tree = Parser(production=True).parse_tokens(TokenBuffer(source).fill(lexer))
+    SemanticAnalyzer().analyze(tree)
+    return tree
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def allocated(build):
+    # Bytes que siguen reservados tras construir el valor
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+class Persona:
+    __slots__ = ('edad', 'altura', 'activo', 'inicial')
+
+    def __init__(self, edad, altura, activo, inicial):
+        self.edad, self.altura, self.activo, self.inicial = edad, altura, activo, inicial
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--n', type=int, default=200_000, help="elementos del vector de registros")
+    argp.add_argument('--repeat', type=int, default=3)
+    args = argp.parse_args()
+
+    tree = load(gen_program(args.n))
+    engines = (('closures', compile_program(tree)), ('vm', VirtualMachine(compile_bytecode(tree))),
+               ('python', transpile(tree)))
+    print(f"Persona[{args.n}] gente")
+    results = []
+    for name, engine in engines:
+        seconds = best_of(engine.run, args.repeat)
+        results.append(engine.format_variables())
+        print(f"{name:9} {seconds:8.4f} s")
+
+    columns = engines[0][1].variables()['gente']
+    layouts = (
+        ('columnas', lambda: [column[:] for column in columns]),
+        ('listas', lambda: rows(columns)),
+        ('__slots__', lambda: [Persona(*row) for row in zip(*columns)]),
+        ('dict', lambda: [dict(zip(('edad', 'altura', 'activo', 'inicial'), row)) for row in zip(*columns)]),
+    )
+    for name, build in layouts:
+        print(f"{name:9} {allocated(build) / args.n:7.1f} bytes por elemento")
+
+    failed = any(result != results[0] for result in results)
+    print('OK' if not failed else 'RESULTADOS DISTINTOS')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Velocidad del lexer de PLY frente al escáner escrito a mano, en MB/s.
+#
+#   python benchmarks/bench_scanner.py [--mb M] [--repeat K]
+#
+# Mide los dos motores rellenando un TokenBuffer con tres fuentes de unos M megabytes:
+#   - código:      programa típico (funciones, bucles, vectores, registros);
+#   - comentarios: comentarios ''' ... ''' largos entre sentencias;
+#   - errores:     código salpicado de caracteres ilegales (cada uno, un diagnóstico).
+# Comprueba además que los dos motores producen los mismos tokens y diagnósticos.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_tokens import gen_source
+from diagnostics import DiagnosticSink
+from lexer import Lexer
+from scanner import Scanner
+from token_stream import TokenBuffer
+
+
+def gen_comments(megabytes):
+    comment = "'''\n" + ("Comentario largo que documenta la función siguiente. " * 40 + "\n") * 20 + "'''\n"
+    block = comment + "x = x + 1\n"
+    return block * max(1, int(megabytes * 1_000_000 / len(block)))
+
+
+def gen_errors(megabytes):
+    line = "total = total + valor ! @ $ \"texto\" 42 ?\n"
+    return line * max(1, int(megabytes * 1_000_000 / len(line)))
+
+
+SOURCES = {
+    'código': gen_source,
+    'comentarios': gen_comments,
+    'errores': gen_errors,
+}
+
+
+def lex(lexer, source):
+    sink = DiagnosticSink(source=source)
+    lexer_instance, lexer_object = lexer
+    lexer_instance.diagnostics = sink
+    lexer_object.lineno = 1
+    lexer_object.input(source)
+    return TokenBuffer(source).fill(lexer_object), sink.items
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--mb', type=float, default=2.0, help="tamaño aproximado de cada fuente en MB")
+    argp.add_argument('--repeat', type=int, default=3)
+    args = argp.parse_args()
+
+    ply = Lexer()
+    scanner = Scanner()
+    engines = {'ply': (ply, ply.lexer), 'escáner': (scanner, scanner)}
+
+    same = True
+    print(f"{'fuente':<12} {'MB':>6} {'PLY MB/s':>10} {'escáner MB/s':>13} {'aceleración':>12}")
+    for name, generate in SOURCES.items():
+        source = generate(args.mb)
+        speeds = {}
+        for engine, lexer in engines.items():
+            seconds = best_of(lambda: lex(lexer, source), args.repeat)
+            speeds[engine] = len(source) / 1e6 / seconds
+        print(f"{name:<12} {len(source) / 1e6:6.1f} {speeds['ply']:10.2f} {speeds['escáner']:13.2f} "
+              f"{speeds['escáner'] / speeds['ply']:11.1f}x")
+
+        (tokens, diags), (fast_tokens, fast_diags) = lex(engines['ply'], source), lex(engines['escáner'], source)
+        if (tokens.types != fast_tokens.types or tokens.values != fast_tokens.values
+                or tokens.linenos != fast_tokens.linenos or tokens.lexpos != fast_tokens.lexpos
+                or [(d.code, d.message, d.offset) for d in diags] != [(d.code, d.message, d.offset) for d in fast_diags]):
+            print(f"  {name}: TOKENS DISTINTOS")
+            same = False
+
+    print('OK' if same else 'DISTINTO')
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Rendimiento del analizador semántico en nodos por segundo.
+#
+#   python benchmarks/bench_semantic.py [--size N] [--depth D]
+#
+# Programas "anchos" (muchas sentencias) y "profundos" (bucles anidados y
+# cadenas largas de operaciones) generados sintéticamente.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from token_stream import TokenBuffer
+from ast_nodes import Expr
+
+
+def gen_wide(n):
+    lines = ["int x, y"]
+    for i in range(n):
+        lines.append(f"x = y * {i} + (x - {i})")
+    return '\n'.join(lines) + '\n'
+
+
+def gen_nested(depth):
+    return ("int x\n" + "while x < 5 : {\n" * depth + "x = x + 1\n" + "}\n" * depth)
+
+
+def gen_chain(length):
+    return "int x, a\nx = " + ' + '.join('a' for _ in range(length)) + "\n"
+
+
+def gen_functions(n):
+    # Muchas funciones, cada una con su ámbito, parámetros y variables locales
+    lines = ["int x"]
+    for i in range(n):
+        lines.append(f"def int f{i}(int a; float b) : {{\n  int c, d\n  c = a + x\n  d = c * a\n}}")
+    lines.extend(f"x = f{i}(x, 1.5)" for i in range(n))
+    return '\n'.join(lines) + '\n'
+
+
+def walk(tree):
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children())
+
+
+def reset_types(tree):
+    # El analizador guarda el tipo en cada expresión; se borra para medir desde cero
+    for node in walk(tree):
+        if isinstance(node, Expr):
+            node.type = None
+
+
+def bench(name, source, lexer, parser, repeat=3):
+    lexer.lineno = 1
+    lexer.input(source)
+    tree = parser.parse_tokens(TokenBuffer(source).fill(lexer))
+    nodes = sum(1 for _ in walk(tree))
+    best = float('inf')
+    for _ in range(repeat):
+        reset_types(tree)
+        # Sin nivel de depuración el analizador no genera trazas
+        start = time.perf_counter()
+        SemanticAnalyzer().analyze(tree)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:24} {nodes:>9} nodos  {best:8.4f} s  {nodes / best:12,.0f} nodos/s")
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--size', type=int, default=20_000, help="sentencias del programa ancho")
+    argp.add_argument('--depth', type=int, default=5_000, help="profundidad de los programas profundos")
+    args = argp.parse_args()
+
+    lexer = Lexer().lexer
+    parser = Parser(production=True)
+    bench("ancho", gen_wide(args.size), lexer, parser)
+    bench("bucles anidados", gen_nested(args.depth), lexer, parser)
+    bench("cadena a + a + ...", gen_chain(args.depth), lexer, parser)
+    bench("funciones", gen_functions(args.size // 4), lexer, parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Memoria máxima (RSS) al lexear fuentes muy grandes, leídas enteras o por bloques.
+#
+#   python benchmarks/bench_stream.py [--mb M ...] [--full-limit F]
+#
+# Escribe en un directorio temporal programas generados de M megabytes y lexea cada uno en
+# un proceso aparte:
+#   - bloques: ParserRunner con stream=True (fichero mapeado, decodificado por bloques y
+#     volcado .token escrito según se lexea);
+#   - entero:  el fichero leído como un solo str y los tokens en un TokenBuffer, como en la
+#     compilación normal (sólo hasta F megabytes).
+# Muestra el pico de RSS de cada proceso y comprueba que el de bloques no crece con el
+# tamaño del fichero y que su .token es el mismo que el del modo entero.
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from bench_tokens import gen_function
+
+# Cada proceso imprime su pico de RSS en kB (Linux) y el tiempo de lexeo
+CHILD = {
+    'bloques': """
+import resource, sys, time
+from main import ParserRunner
+runner = ParserRunner(production=True, stream=True)
+start = time.perf_counter()
+status, _ = runner.build_file(sys.argv[1], sys.argv[2], 'grande.vip')
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, time.perf_counter() - start, status)
+""",
+    'entero': """
+import resource, sys, time
+from scanner import Scanner
+from token_stream import TokenBuffer
+start = time.perf_counter()
+with open(sys.argv[1], encoding='utf-8') as f:
+    data = f.read()
+scanner = Scanner()
+scanner.input(data)
+tokens = TokenBuffer(data).fill(scanner)
+with open(sys.argv[2], 'w', encoding='utf-8') as out:
+    tokens.dump(out)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, time.perf_counter() - start, 'ok')
+""",
+}
+
+
+def write_source(path, megabytes):
+    size, k = 0, 0
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write("type Punto: {\n    float x\n    float y\n}\nPunto punto\nint resultado, limite = 12\n"
+                  "float factor = 0.5\n'''\nComentario\nlargo\n'''\n")
+        while size < megabytes * 1_000_000:
+            part = gen_function(k % 1000)
+            out.write(part)
+            size += len(part)
+            k += 1
+
+
+def run(mode, source, output):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run([sys.executable, '-c', CHILD[mode], source, output], env=env, cwd=SRC,
+                          capture_output=True, text=True, check=True)
+    rss, seconds, status = proc.stdout.split()[-3:]
+    return int(rss) / 1024, float(seconds), status
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--mb', type=float, nargs='+', default=[25, 100, 300], help="tamaños de fuente en MB")
+    argp.add_argument('--full-limit', type=float, default=25,
+                      help="tamaño máximo (MB) con el que se prueba la lectura entera")
+    args = argp.parse_args()
+
+    ok = True
+    peaks = []
+    print(f"{'MB':>6} {'modo':<8} {'RSS máx MB':>11} {'MB/s':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in args.mb:
+            source = os.path.join(tmp, 'grande.vip')
+            write_source(source, megabytes)
+            size = os.path.getsize(source) / 1e6
+            outputs = {}
+            for mode in ('bloques', 'entero'):
+                if mode == 'entero' and megabytes > args.full_limit:
+                    continue
+                outputs[mode] = os.path.join(tmp, mode + '.token')
+                rss, seconds, status = run(mode, source, outputs[mode])
+                print(f"{size:6.0f} {mode:<8} {rss:11.1f} {size / seconds:7.2f}")
+                if mode == 'bloques':
+                    peaks.append(rss)
+                ok &= status == 'ok'
+            if len(outputs) == 2:
+                with open(outputs['bloques'], 'rb') as a, open(outputs['entero'], 'rb') as b:
+                    while True:
+                        x, y = a.read(1 << 20), b.read(1 << 20)
+                        if x != y:
+                            print(f"  {size:.0f} MB: VOLCADOS DISTINTOS")
+                            ok = False
+                            break
+                        if not x:
+                            break
+
+    # El pico del modo por bloques no debe crecer con el fichero (margen para el ruido del asignador)
+    if peaks and max(peaks) > min(peaks) * 1.5:
+        print("La memoria del modo por bloques crece con el tamaño del fichero")
+        ok = False
+    print('OK' if ok else 'ERROR')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
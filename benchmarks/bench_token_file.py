@@ -0,0 +1,110 @@
+# Formato binario de tokens (.vtk) frente al volcado de texto y al lexer.
+#
+#   python benchmarks/bench_token_file.py [--mb M] [--repeat K]
+#
+# Con un programa generado de unos M megabytes mide:
+#   - el tamaño del volcado .token y del .vtk;
+#   - el tiempo de escribir el .vtk (token_file.encode) y de leerlo (TokenFile.loads);
+#   - el tiempo de llegar al árbol sintáctico lexeando la fuente, desde el .vtk pasado a un
+#     TokenBuffer y desde el .vtk directamente (el parser lee los tokens según los decodifica).
+# Comprueba además que el .vtk se convierte en el mismo volcado de texto y en el mismo árbol, y
+# que los programas de tests/ (y uno que acaba a medias) dan los mismos diagnósticos de sintaxis
+# compilados desde la fuente y desde su .vtk.
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_tokens import gen_source
+from diagnostics import render_text
+from main import ParserRunner
+from scanner import Scanner
+from token_file import TokenFile, encode
+from token_stream import TokenBuffer
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests')
+
+
+def syntax_diagnostics(result):
+    return [render_text(d) for d in result.diagnostics if d.code.startswith('syntax.')]
+
+
+def same_diagnostics():
+    # Fuente y .vtk tienen que dar los mismos diagnósticos de sintaxis (el final inesperado,
+    # por ejemplo, se sitúa en el último token)
+    runner = ParserRunner(production=True)
+    sources = [('fin_a_medias.vip', "int x\nx = 1 +")]
+    for path in sorted(glob.glob(os.path.join(TESTS, '*.vip'))):
+        with open(path, encoding='utf-8') as f:
+            sources.append((os.path.basename(path), f.read()))
+    different = []
+    for name, source in sources:
+        from_source = runner.compile_source(source, name)
+        if from_source.status == 'lexer':
+            continue
+        from_file = runner.compile_tokens(TokenFile.loads(encode(from_source.tokens)), name)
+        if (from_file.status, from_file.error, syntax_diagnostics(from_file)) != (
+                from_source.status, from_source.error, syntax_diagnostics(from_source)):
+            different.append(name)
+    return different
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--mb', type=float, default=2.0, help="tamaño aproximado de la fuente en MB")
+    argp.add_argument('--repeat', type=int, default=3)
+    args = argp.parse_args()
+
+    source = gen_source(args.mb)
+    runner = ParserRunner(production=True)
+    parser = runner.parser
+    scanner = Scanner()
+
+    def lex():
+        scanner.lineno = 1
+        scanner.input(source)
+        return TokenBuffer(source).fill(scanner)
+
+    tokens = lex()
+    text = tokens.dumps()
+    data = encode(tokens)
+
+    print(f"fuente {len(source) / 1e6:.1f} MB, {len(tokens)} tokens")
+    print(f".token  {len(text.encode()) / 1e6:8.2f} MB")
+    print(f".vtk    {len(data) / 1e6:8.2f} MB  {len(data) / len(tokens):5.2f} bytes/token")
+    timings = (
+        ('escribir .vtk', lambda: encode(tokens)),
+        ('leer .vtk', lambda: TokenFile.loads(data)),
+        ('fuente -> árbol', lambda: parser.parse_tokens(lex())),
+        ('.vtk -> TokenBuffer -> árbol', lambda: parser.parse_tokens(TokenFile.loads(data).to_buffer())),
+        ('.vtk -> árbol', lambda: parser.parse_tokens(TokenFile.loads(data))),
+    )
+    for label, fn in timings:
+        print(f"{label:<30} {best_of(fn, args.repeat):8.3f} s")
+
+    loaded = TokenFile.loads(data)
+    same = (loaded.dumps() == text and loaded.to_buffer().to_record() == tokens.to_record()
+            and runner.format_tree(parser.parse_tokens(loaded)) == runner.format_tree(parser.parse_tokens(tokens)))
+    different = same_diagnostics()
+    if different:
+        print(f"diagnósticos distintos desde el .vtk: {', '.join(different)}")
+    same = same and not different
+    print('OK' if same else 'DISTINTO')
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Memoria y tiempo del lexer y de los tokens en fuentes de varios megabytes.
+#
+#   python benchmarks/bench_tokens.py [--mb M] [--repeat K]
+#
+# Genera un programa de unos M megabytes (funciones con bucles, vectores y registros que
+# repiten los mismos nombres, como un programa real) y mide:
+#   - la memoria que retienen los tokens (TokenBuffer) y el árbol del parser;
+#   - cuántas cadenas distintas hay entre los valores de los tokens (con nombres
+#     internados, una por nombre);
+#   - el tiempo de lexear y de parsear desde el buffer.
+# Comprueba además que el volcado .token es el mismo que escribiendo tipo y valor de cada
+# token de PLY.
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from token_stream import TokenBuffer
+
+
+def gen_function(k):
+    return f"""
+def int calcular{k}(int limite; float factor): {{
+    int[16] valores
+    int indice = 0
+    int acumulado = 0
+    while indice < 16 and indice < limite: {{
+        valores[indice] = indice * {k} + acumulado
+        if valores[indice] >= 100: {{
+            acumulado = acumulado - valores[indice] / 2
+        }} else {{
+            acumulado = acumulado + valores[indice]
+        }}
+        indice = indice + 1
+    }}
+    return acumulado
+}}
+resultado = resultado + calcular{k}(limite, factor)
+punto.x = punto.x + 1.5 * factor
+"""
+
+
+def gen_source(megabytes):
+    parts = ["type Punto: {\n    float x\n    float y\n}\nPunto punto\nint resultado, limite = 12\nfloat factor = 0.5\n"]
+    size, k = len(parts[0]), 0
+    while size < megabytes * 1_000_000:
+        part = gen_function(k)
+        parts.append(part)
+        size += len(part)
+        k += 1
+    return ''.join(parts)
+
+
+def retained(build):
+    # (valor, bytes que siguen reservados tras construirlo)
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def lex(lexer, source):
+    lexer.lineno = 1
+    lexer.input(source)
+    return TokenBuffer(source).fill(lexer)
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--mb', type=float, default=4.0, help="tamaño aproximado de la fuente en MB")
+    argp.add_argument('--repeat', type=int, default=3)
+    args = argp.parse_args()
+
+    source = gen_source(args.mb)
+    lexer = Lexer().lexer
+    parser = Parser(production=True)
+
+    tokens, token_bytes = retained(lambda: lex(lexer, source))
+    tree, tree_bytes = retained(lambda: parser.parse_tokens(tokens))
+    distinct = len({id(value) for value in tokens.values if isinstance(value, str)})
+    lex_time = best_of(lambda: lex(lexer, source), args.repeat)
+    parse_time = best_of(lambda: parser.parse_tokens(tokens), args.repeat)
+
+    n = len(tokens)
+    print(f"fuente {len(source) / 1e6:.1f} MB, {n} tokens")
+    print(f"tokens  {token_bytes / 1e6:8.1f} MB  {token_bytes / n:6.1f} bytes/token  "
+          f"{distinct} cadenas distintas")
+    print(f"árbol   {tree_bytes / 1e6:8.1f} MB")
+    print(f"lexer   {lex_time:8.3f} s  {len(source) / 1e6 / lex_time:6.2f} MB/s")
+    print(f"parser  {parse_time:8.3f} s")
+
+    lexer.lineno = 1
+    lexer.input(source)
+    expected = ''.join(f"{tok.type} {tok.value}\n" for tok in iter(lexer.token, None))
+    same = tokens.dumps() == expected
+    print('OK' if same else 'VOLCADO DISTINTO')
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
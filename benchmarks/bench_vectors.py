@@ -0,0 +1,152 @@
+# Operaciones con vectores completos frente a los mismos cálculos elemento a elemento.
+#
+#   python benchmarks/bench_vectors.py [--n N] [--rounds R] [--repeat K]
+#
+# Cada programa rellena vectores de N elementos con un bucle y después repite R veces un
+# núcleo: escrito con operaciones de vector (z = x * 2.5 + y, dot(x, y), sum(v)...) o con un
+# bucle que hace lo mismo posición a posición. Se mide con closures, la máquina virtual y el
+# programa traducido a Python; se comprueba que las dos versiones dejan los mismos valores y
+# que la versión vectorial coincide con el intérprete de referencia.
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from token_stream import TokenBuffer
+from executor import compile_program, format_value
+from tree_walker import TreeWalker
+from bytecode import compile_bytecode
+from vm import VirtualMachine
+from transpiler import transpile
+import vectors
+
+
+def _fill(n):
+    return f"""
+float[{n}] x
+float[{n}] y
+float[{n}] z
+int[{n}] v
+int[{n}] w
+int i, j, r
+float f
+while i < {n}: {{
+    x[i] = f
+    y[i] = 2.0 - f
+    v[i] = i * 7 - {n}
+    i = i + 1
+    f = f + 0.5
+}}
+float s
+float d
+int total, mayor
+"""
+
+
+def gen_vectorized(n, rounds):
+    return _fill(n) + f"""
+while r < {rounds}: {{
+    z = x * 2.5 + y
+    s = s + dot(x, y)
+    w = v * 3 - v
+    total = total + sum(w)
+    mayor = max(w)
+    r = r + 1
+}}
+"""
+
+
+def gen_loops(n, rounds):
+    return _fill(n) + f"""
+while r < {rounds}: {{
+    j = 0
+    d = 0.0
+    while j < {n}: {{
+        z[j] = x[j] * 2.5 + y[j]
+        d = d + x[j] * y[j]
+        w[j] = v[j] * 3 - v[j]
+        total = total + w[j]
+        j = j + 1
+    }}
+    s = s + d
+    mayor = w[0]
+    j = 1
+    while j < {n}: {{
+        if w[j] > mayor: {{
+            mayor = w[j]
+        }}
+        j = j + 1
+    }}
+    r = r + 1
+}}
+"""
+
+
+# Variables que deben coincidir entre las dos versiones
+COMPARED = ('z', 's', 'w', 'total', 'mayor')
+
+
+def load(source, lexer, parser):
+    lexer.lineno = 1
+    lexer.input(source)
+    tree = parser.parse_tokens(TokenBuffer(source).fill(lexer))
+    SemanticAnalyzer().analyze(tree)
+    return tree
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compared(variables, types):
+    return [f"{name} = {format_value(variables[name], types[name], {})}" for name in COMPARED]
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--n', type=int, default=100_000, help="elementos de cada vector")
+    argp.add_argument('--rounds', type=int, default=10, help="repeticiones del núcleo")
+    argp.add_argument('--repeat', type=int, default=3)
+    args = argp.parse_args()
+
+    lexer = Lexer().lexer
+    parser = Parser(production=True)
+    types = {'z': ('vector', 'float', args.n), 's': 'float', 'w': ('vector', 'int', args.n),
+             'total': 'int', 'mayor': 'int'}
+
+    print(f"vectores de {args.n} elementos, {args.rounds} vueltas; operaciones en bloque con {vectors.BACKEND}")
+    results = {}
+    times = {}
+    for name, gen in (('vectorial', gen_vectorized), ('bucles', gen_loops)):
+        tree = load(gen(args.n, args.rounds), lexer, parser)
+        engines = {'closures': compile_program(tree), 'vm': VirtualMachine(compile_bytecode(tree)),
+                   'python': transpile(tree)}
+        for engine_name, engine in engines.items():
+            times[name, engine_name] = best_of(engine.run, args.repeat)
+            results[name, engine_name] = compared(engine.variables(), types)
+        if name == 'vectorial':
+            walker = TreeWalker()
+            results[name, 'árbol'] = compared(walker.run(tree), types)
+
+    expected = results['vectorial', 'árbol']
+    failed = any(result != expected for result in results.values())
+    for engine_name in ('closures', 'vm', 'python'):
+        vectorized, loops = times['vectorial', engine_name], times['bucles', engine_name]
+        print(f"{engine_name:9} vectorial {vectorized:8.4f} s  bucles {loops:8.4f} s  x{loops / vectorized:6.1f}")
+    print('OK' if not failed else 'RESULTADOS DISTINTOS')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Comparación diferencial de la compilación incremental (src/incremental.py) con la completa.
+#
+#   python benchmarks/diff_incremental.py [--docs N] [--edits E] [--seed S]
+#
+# Parte de los tests/*.vip y de programas generados y les aplica secuencias de ediciones
+# aleatorias con Document.edit: cambios de un token por otro de su clase (nombres, números,
+# tipos, operadores), sentencias y funciones insertadas o borradas (también las que empiezan
+# por '-' o '(' y se pueden unir a la anterior), saltos de línea y fragmentos sueltos que
+# rompen la sintaxis (casi siempre se deshacen en la edición siguiente). Tras cada edición
+# comprueba que el documento da lo mismo que ParserRunner.compile_source sobre el texto
+# completo: estado, diagnósticos, tokens y árbol (con líneas y columnas, y con los tipos de las
+# expresiones si no hay errores). Imprime el primer caso distinto que encuentre.
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ast_nodes import Node, VALUE
+from bench_tokens import gen_function
+from diff_scanner import FRAGMENTS
+from incremental import Document
+from main import ParserRunner
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests')
+
+PRELUDE = ("type Punto: {\n    float x\n    float y\n}\nPunto punto\nint resultado, limite = 12\n"
+           "float factor = 0.5\n")
+
+STATEMENTS = [
+    "int nuevo = 3\n", "resultado = resultado + 1\n", "-resultado = 2\n", "(punto).x = 1.0\n",
+    "(resultado) = 4\n", "limite = -limite\n", "float factor = 2.0\n", "punto.z = 1\n", "Punto otro\n",
+    "type Punto: {\n    int x\n}\n", "type Par: {\n    int a\n    int a\n}\n", "int[4] v\nv[5] = 1\n",
+    "def int calcular0(int limite; float factor): {\n    return limite\n}\n",
+    "def int doble(int n): {\n    return n * 2\n}\nresultado = doble(resultado)\n",
+    "def float sum(int n): {\n    return 1.0\n}\n", "int s = sum(v)\n", "if resultado > 3: {\n    int dentro\n}\n",
+    "while limite < 3: {\n    limite = limite + 1\n}\n", "return 1\n", "x\n", "/* comentario */\n",
+    "/* de dos\nlíneas */\n", "# comentario\n",
+    "'''\nlargo\n'''\n", "int a = '\"'\n", "'@'\n",
+]
+
+WORDS = {
+    'name': ['resultado', 'limite', 'factor', 'punto', 'indice', 'valores', 'acumulado', 'nuevo', 'calcular0',
+             'calcular1', 'doble', 'sum', 'Punto', 'x', 'y', 'z'],
+    'number': ['0', '1', '16', '100', '2.5', '0x1F', '07', '3'],
+    'type': ['int', 'float', 'char', 'bool'],
+    'operator': ['+', '-', '*', '/', '<', '>=', '==', 'and', 'or'],
+}
+TOKEN = re.compile(r"(?P<type>\b(?:int|float|char|bool)\b)|(?P<operator>[-+*/]|[<>]=?|==|\band\b|\bor\b)"
+                   r"|(?P<number>\b\d+(?:\.\d+)?\b)|(?P<name>\b[A-Za-z_]\w*\b)")
+
+
+def gen_program(rng):
+    return PRELUDE + ''.join(gen_function(rng.randrange(4)) for _ in range(rng.randint(1, 6)))
+
+
+def random_edit(rng, text):
+    # (inicio, fin, texto nuevo)
+    choice = rng.random()
+    if choice < 0.45 and text:
+        matches = list(TOKEN.finditer(text))
+        if matches:
+            m = rng.choice(matches)
+            return m.start(), m.end(), rng.choice(WORDS[m.lastgroup])
+    lines = [0] + [m.end() for m in re.finditer('\n', text)]
+    if choice < 0.7:
+        pos = rng.choice(lines)
+        return pos, pos, rng.choice(STATEMENTS)
+    if choice < 0.85 and len(lines) > 2:
+        k = rng.randrange(len(lines) - 1)
+        return lines[k], lines[rng.randint(k + 1, min(k + 4, len(lines) - 1))], ''
+    pos = rng.randint(0, len(text))
+    if choice < 0.92:
+        return pos, pos, rng.choice(('\n', ' ', '\n\n'))
+    if choice < 0.96:
+        return pos, min(pos + rng.randint(1, 3), len(text)), ''
+    return pos, pos, rng.choice(FRAGMENTS)
+
+
+def tree_record(tree, types):
+    if tree is None:
+        return None
+    nodes = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        values = tuple(getattr(node, name) for name, kind in zip(node.fields, node.field_kinds) if kind == VALUE)
+        extra = (getattr(node, 'type', None), getattr(node, 'offset', None)) if types else ()
+        nodes.append((node.tag, node.lineno, node.col, values) + extra)
+        stack.extend(reversed([child for child in node.children() if isinstance(child, Node)]))
+    return nodes
+
+
+def record(result):
+    diagnostics = [(d.severity, d.code, d.message, d.line, d.col) for d in result.diagnostics]
+    return (result.status, diagnostics, result.tokens.to_record(), tree_record(result.ast, result.status == 'ok'))
+
+
+def check(runner, document, name, history):
+    expected = record(runner.compile_source(document.text, 'doc.vip'))
+    quick = [(d.severity, d.code, d.message, d.line, d.col) for d in document.diagnostics()]
+    got = record(document.result())
+    if got == expected and quick == expected[1] and document.status == expected[0]:
+        return True
+    print(f"DISTINTO: {name}")
+    for start, end, text in history[-5:]:
+        print(f"  edición: [{start}:{end}] -> {text!r}")
+    print(f"  texto: {document.text!r}")
+    for what, x, y in zip(('estado', 'diagnósticos', 'tokens', 'árbol'), expected, got):
+        if x != y:
+            print(f"  {what}:")
+            print(f"    completo:    {x!r}"[:2000])
+            print(f"    incremental: {y!r}"[:2000])
+    if quick != expected[1]:
+        print(f"  diagnostics(): {quick!r}"[:2000])
+    return False
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--docs', type=int, default=200, help="documentos generados")
+    argp.add_argument('--edits', type=int, default=40, help="ediciones por documento")
+    argp.add_argument('--seed', type=int, default=0)
+    args = argp.parse_args()
+
+    rng = random.Random(args.seed)
+    sources = []
+    for path in sorted(glob.glob(os.path.join(TESTS_DIR, '*.vip'))):
+        with open(path, encoding='utf-8') as f:
+            sources.append((os.path.basename(path), f.read()))
+    sources += [(f"generado {k} (semilla {args.seed})", gen_program(rng)) for k in range(args.docs)]
+
+    edits = incremental = 0
+    for level in ('text', 'json'):
+        runner = ParserRunner(production=True, output_format=level)
+        for name, source in sources:
+            document = Document(runner, source, 'doc.vip')
+            history = []
+            if not check(runner, document, f"{name} ({level})", history):
+                sys.exit(1)
+            for _ in range(args.edits):
+                start, end, text = random_edit(rng, document.text)
+                removed = document.text[start:end]
+                for edit in ((start, end, text), (start, start + len(text), removed)):
+                    builds = document.full_builds
+                    history.append(edit)
+                    document.edit(*edit)
+                    edits += 1
+                    incremental += document.full_builds == builds
+                    if not check(runner, document, f"{name} ({level})", history):
+                        sys.exit(1)
+                    # Casi siempre se deshace una edición que rompe la sintaxis (la que obliga a
+                    # compilar el texto entero), para seguir probando el modo incremental
+                    if document.full_builds == builds or rng.random() < 0.2:
+                        break
+    print(f"{edits} ediciones iguales ({incremental} sin compilar el texto entero)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Comparación diferencial del escáner escrito a mano con el lexer de PLY.
+#
+#   python benchmarks/diff_scanner.py [--fuzz N] [--seed S] [--max-len L]
+#
+# Lexea con los dos motores todos los tests/*.vip y N entradas aleatorias (mezclas de
+# fragmentos de Viper válidos, casi válidos y caracteres sueltos) y comprueba que dan los
+# mismos tokens (tipo, valor, línea y posición), los mismos diagnósticos y la misma
+# excepción si la hay. El escáner se prueba también por bloques (Scanner.input_chunks),
+# partiendo cada entrada en trozos de tamaño aleatorio. Imprime el primer caso distinto
+# que encuentre.
+import argparse
+import glob
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from diagnostics import DiagnosticSink, DEBUG
+from lexer import Lexer
+from scanner import Scanner
+from token_stream import TokenBuffer
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests')
+
+FRAGMENTS = [
+    'int', 'float', 'char', 'bool', 'def', 'return', 'type', 'if', 'else', 'while', 'and', 'or', 'not',
+    'true', 'false', 'x', 'valor_1', '_tmp', 'A9', 'intx',
+    '0', '7', '42', '007', '0b101', '0b2', '0o17', '0o8', '0x1F', '0x1f', '0xG', '3.14', '1.', '.5', '1e10',
+    '2E-3', '1.5e+7', '1e', '1.5e', '00.5', '١٢.٣', '٣',
+    "'a'", "' '", "'\\\\'", "'\\''", "'\\n'", "'\\'", "''", "'''", "'''x'''", "'''\nlinea\n'''", "'é'",
+    "'\t'", "'\n'", "'",
+    '# comentario', '/* bloque */', '/* varias\nlineas */', '/**/', '/*/', '/* sin cerrar', '/', '*/',
+    '=', '==', '===', '>', '>=', '<', '<=', '+', '-', '*', '(', ')', '[', ']', '{', '}', ':', ';', ',', '.',
+    '"', '\\', '!', '@', '$', '%', '?', '\r', 'ñ', '\x00',
+    ' ', '  ', '\t', '\n', '\n\n',
+]
+
+
+def lex(make, data, chunks=None):
+    # (tokens, diagnósticos, excepción) de un motor; con chunks, la entrada llega por bloques
+    # y los diagnósticos no tienen el texto completo para calcular la columna
+    sink = DiagnosticSink(source=data if chunks is None else None, level=DEBUG)
+    lexer = make(sink)
+    lexer.lineno = 1
+    if chunks is None:
+        lexer.input(data)
+    else:
+        lexer.input_chunks(chunks)
+    buffer = TokenBuffer(data)
+    error = None
+    try:
+        buffer.fill(lexer)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    tokens = list(zip(buffer.types, buffer.values, buffer.linenos, buffer.lexpos))
+    # Los valores se comparan también por tipo: 1 y 1.0 son tokens distintos
+    tokens = [(code, type(value).__name__, value, line, pos) for code, value, line, pos in tokens]
+    diagnostics = [(d.severity, d.code, d.message, d.line, d.col) for d in sink.resolve()]
+    return tokens, diagnostics, error
+
+
+def ply_engine():
+    lexer = Lexer()
+
+    def make(sink):
+        lexer.diagnostics = sink
+        return lexer.lexer
+    return make
+
+
+def fast_engine():
+    scanner = Scanner()
+
+    def make(sink):
+        scanner.diagnostics = sink
+        return scanner
+    return make
+
+
+def fuzz_input(rng, max_len):
+    parts = []
+    for _ in range(rng.randint(1, max_len)):
+        if rng.random() < 0.1:
+            parts.append(chr(rng.randint(0, 0x7f if rng.random() < 0.8 else 0x2fff)))
+        else:
+            parts.append(rng.choice(FRAGMENTS))
+        if rng.random() < 0.5:
+            parts.append(rng.choice((' ', '\n', '')))
+    return ''.join(parts)
+
+
+def first_difference(a, b):
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i, x, y
+    return min(len(a), len(b)), a[len(b):len(b) + 1], b[len(a):len(a) + 1]
+
+
+def split(rng, data):
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, 8)
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def compare(name, data, ply, fast, rng):
+    expected = lex(ply, data)
+    chunks = split(rng, data)
+    for engine, got in (('escáner', lex(fast, data)), ('escáner por bloques', lex(fast, data, chunks))):
+        if expected == got:
+            continue
+        print(f"DISTINTO: {name} ({engine})")
+        print(f"  entrada: {data!r}")
+        if engine != 'escáner':
+            print(f"  bloques: {chunks!r}")
+        for what, x, y in zip(('tokens', 'diagnósticos', 'excepción'), expected, got):
+            if x != y:
+                if isinstance(x, list):
+                    i, x, y = first_difference(x, y)
+                    print(f"  {what} [{i}]:")
+                else:
+                    print(f"  {what}:")
+                print(f"    PLY:     {x!r}")
+                print(f"    {engine}: {y!r}")
+        return False
+    return True
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('--fuzz', type=int, default=5000, help="número de entradas aleatorias")
+    argp.add_argument('--seed', type=int, default=0)
+    argp.add_argument('--max-len', type=int, default=40, help="fragmentos por entrada aleatoria")
+    args = argp.parse_args()
+
+    ply, fast = ply_engine(), fast_engine()
+    rng = random.Random(args.seed)
+
+    paths = sorted(glob.glob(os.path.join(TESTS_DIR, '*.vip')))
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            data = f.read()
+        if not compare(os.path.basename(path), data, ply, fast, rng):
+            sys.exit(1)
+    print(f"{len(paths)} ficheros de tests/ iguales")
+
+    for i in range(args.fuzz):
+        if not compare(f"aleatoria {i} (semilla {args.seed})", fuzz_input(rng, args.max_len), ply, fast, rng):
+            sys.exit(1)
+    print(f"{args.fuzz} entradas aleatorias iguales")
+
+
+if __name__ == "__main__":
+    main()
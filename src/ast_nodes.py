@@ -0,0 +1,413 @@
+from array import array
+
+
+# ----------------------------- Códigos de nodo -----------------------------
+(PROGRAM, DECL, DECL_ASSIGN, ASSIGN, FUNC_DEF, RETURN, IF, WHILE, INSTANCE, TYPE_DEF,
+ BINOP, UNOP, CONST, VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL) = range(17)
+
+# Cómo se guarda cada campo: 'node' (un nodo), 'nodes' (lista de nodos o None)
+# o 'value' (tipos, nombres, operadores, literales...)
+NODE, NODES, VALUE = 'node', 'nodes', 'value'
+
+
+class Node:
+    __slots__ = ('lineno', 'col')
+    kind = -1
+    tag = None
+    fields = ()
+    field_kinds = ()
+
+    def children(self):
+        # Hijos directos en el orden de la tupla original
+        for name, fkind in zip(self.fields, self.field_kinds):
+            value = getattr(self, name)
+            if fkind == NODE:
+                yield value
+            elif fkind == NODES and value is not None:
+                yield from value
+
+    def to_tuple(self):
+        return to_tuple(self)
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({values})"
+
+
+# ----------------------------- Sentencias -----------------------------
+
+class Program(Node):
+    __slots__ = ('body',)
+    kind, tag = PROGRAM, 'program'
+    fields, field_kinds = ('body',), (NODES,)
+
+    def __init__(self, body, lineno=0, col=0):
+        self.body = body
+        self.lineno = lineno
+        self.col = col
+
+
+class Decl(Node):
+    __slots__ = ('type', 'ids')
+    kind, tag = DECL, 'decl'
+    fields, field_kinds = ('type', 'ids'), (VALUE, VALUE)
+
+    def __init__(self, type, ids, lineno=0, col=0):
+        self.type = type
+        self.ids = ids
+        self.lineno = lineno
+        self.col = col
+
+
+class DeclAssign(Node):
+    __slots__ = ('type', 'ids', 'expr')
+    kind, tag = DECL_ASSIGN, 'decl_assign'
+    fields, field_kinds = ('type', 'ids', 'expr'), (VALUE, VALUE, NODE)
+
+    def __init__(self, type, ids, expr, lineno=0, col=0):
+        self.type = type
+        self.ids = ids
+        self.expr = expr
+        self.lineno = lineno
+        self.col = col
+
+
+class Assign(Node):
+    __slots__ = ('target', 'expr')
+    kind, tag = ASSIGN, 'assign'
+    fields, field_kinds = ('target', 'expr'), (NODE, NODE)
+
+    def __init__(self, target, expr, lineno=0, col=0):
+        self.target = target
+        self.expr = expr
+        self.lineno = lineno
+        self.col = col
+
+
+class FuncDef(Node):
+    __slots__ = ('type', 'name', 'params', 'body')
+    kind, tag = FUNC_DEF, 'func_def'
+    fields, field_kinds = ('type', 'name', 'params', 'body'), (VALUE, VALUE, VALUE, NODES)
+
+    def __init__(self, type, name, params, body, lineno=0, col=0):
+        self.type = type
+        self.name = name
+        self.params = params
+        self.body = body
+        self.lineno = lineno
+        self.col = col
+
+
+class Return(Node):
+    __slots__ = ('expr',)
+    kind, tag = RETURN, 'return'
+    fields, field_kinds = ('expr',), (NODE,)
+
+    def __init__(self, expr, lineno=0, col=0):
+        self.expr = expr
+        self.lineno = lineno
+        self.col = col
+
+
+class If(Node):
+    __slots__ = ('cond', 'then', 'orelse')
+    kind, tag = IF, 'if'
+    fields, field_kinds = ('cond', 'then', 'orelse'), (NODE, NODES, NODES)
+
+    def __init__(self, cond, then, orelse, lineno=0, col=0):
+        self.cond = cond
+        self.then = then
+        self.orelse = orelse
+        self.lineno = lineno
+        self.col = col
+
+
+class While(Node):
+    __slots__ = ('cond', 'body')
+    kind, tag = WHILE, 'while'
+    fields, field_kinds = ('cond', 'body'), (NODE, NODES)
+
+    def __init__(self, cond, body, lineno=0, col=0):
+        self.cond = cond
+        self.body = body
+        self.lineno = lineno
+        self.col = col
+
+
+class Instance(Node):
+    __slots__ = ('type_name', 'name')
+    kind, tag = INSTANCE, 'instance'
+    fields, field_kinds = ('type_name', 'name'), (VALUE, VALUE)
+
+    def __init__(self, type_name, name, lineno=0, col=0):
+        self.type_name = type_name
+        self.name = name
+        self.lineno = lineno
+        self.col = col
+
+
+class TypeDef(Node):
+    __slots__ = ('name', 'record_fields')
+    kind, tag = TYPE_DEF, 'type_def'
+    fields, field_kinds = ('name', 'record_fields'), (VALUE, VALUE)
+
+    def __init__(self, name, record_fields, lineno=0, col=0):
+        self.name = name
+        self.record_fields = record_fields
+        self.lineno = lineno
+        self.col = col
+
+
+# ----------------------------- Expresiones -----------------------------
+
+# Las expresiones guardan el tipo que les asigna el análisis semántico (None hasta entonces)
+class Expr(Node):
+    __slots__ = ('type',)
+
+
+class BinOp(Expr):
+    __slots__ = ('op', 'left', 'right')
+    kind, tag = BINOP, 'binop'
+    fields, field_kinds = ('op', 'left', 'right'), (VALUE, NODE, NODE)
+
+    def __init__(self, op, left, right, lineno=0, col=0):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.type = None
+        self.lineno = lineno
+        self.col = col
+
+
+class UnOp(Expr):
+    __slots__ = ('op', 'operand')
+    kind, tag = UNOP, 'unop'
+    fields, field_kinds = ('op', 'operand'), (VALUE, NODE)
+
+    def __init__(self, op, operand, lineno=0, col=0):
+        self.op = op
+        self.operand = operand
+        self.type = None
+        self.lineno = lineno
+        self.col = col
+
+
+class Const(Expr):
+    __slots__ = ('value',)
+    kind, tag = CONST, 'const'
+    fields, field_kinds = ('value',), (VALUE,)
+
+    def __init__(self, value, lineno=0, col=0):
+        self.value = value
+        self.type = None
+        self.lineno = lineno
+        self.col = col
+
+
+class Var(Expr):
+    __slots__ = ('name',)
+    kind, tag = VAR, 'var'
+    fields, field_kinds = ('name',), (VALUE,)
+
+    def __init__(self, name, lineno=0, col=0):
+        self.name = name
+        self.type = None
+        self.lineno = lineno
+        self.col = col
+
+
+# safe: el índice está siempre dentro del vector (lo decide bounds.py; False hasta entonces)
+class ArrayAccess(Expr):
+    __slots__ = ('array', 'index', 'safe')
+    kind, tag = ARRAY_ACCESS, 'array_access'
+    fields, field_kinds = ('array', 'index'), (NODE, NODE)
+
+    def __init__(self, array, index, lineno=0, col=0):
+        self.array = array
+        self.index = index
+        self.safe = False
+        self.type = None
+        self.lineno = lineno
+        self.col = col
+
+
+# offset: posición del campo en el registro, o de su columna en un vector de registros
+# (la fija el análisis semántico; None hasta entonces)
+class FieldAccess(Expr):
+    __slots__ = ('obj', 'field', 'offset')
+    kind, tag = FIELD_ACCESS, 'field_access'
+    fields, field_kinds = ('obj', 'field'), (NODE, VALUE)
+
+    def __init__(self, obj, field, lineno=0, col=0):
+        self.obj = obj
+        self.field = field
+        self.offset = None
+        self.type = None
+        self.lineno = lineno
+        self.col = col
+
+
+class FuncCall(Expr):
+    __slots__ = ('name', 'args')
+    kind, tag = FUNC_CALL, 'func_call'
+    fields, field_kinds = ('name', 'args'), (VALUE, NODES)
+
+    def __init__(self, name, args, lineno=0, col=0):
+        self.name = name
+        self.args = args
+        self.type = None
+        self.lineno = lineno
+        self.col = col
+
+
+# Clase de nodo por código y por etiqueta de la tupla
+NODE_CLASSES = (Program, Decl, DeclAssign, Assign, FuncDef, Return, If, While, Instance, TypeDef,
+                BinOp, UnOp, Const, Var, ArrayAccess, FieldAccess, FuncCall)
+TAG_CLASSES = {cls.tag: cls for cls in NODE_CLASSES}
+
+
+# ----------------------------- Exportación a tuplas -----------------------------
+# Se recorre con una pila explícita para no depender del límite de recursión
+
+def to_tuple(tree):
+    if isinstance(tree, list):
+        return [to_tuple(item) for item in tree]
+    if not isinstance(tree, Node):
+        return tree
+
+    done = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children())
+            continue
+        values = [node.tag]
+        for name, fkind in zip(node.fields, node.field_kinds):
+            value = getattr(node, name)
+            if fkind == NODE:
+                value = done[id(value)]
+            elif fkind == NODES and value is not None:
+                value = [done[id(child)] for child in value]
+            values.append(value)
+        done[id(node)] = tuple(values)
+    return done[id(tree)]
+
+
+def from_tuple(tree):
+    if isinstance(tree, list):
+        return [from_tuple(item) for item in tree]
+    if not (isinstance(tree, tuple) and tree and tree[0] in TAG_CLASSES):
+        return tree
+
+    done = {}
+    stack = [(tree, False)]
+    while stack:
+        item, expanded = stack.pop()
+        cls = TAG_CLASSES[item[0]]
+        if not expanded:
+            stack.append((item, True))
+            for value, fkind in zip(item[1:], cls.field_kinds):
+                if fkind == NODE:
+                    stack.append((value, False))
+                elif fkind == NODES and value is not None:
+                    stack.extend((child, False) for child in value)
+            continue
+        values = []
+        for value, fkind in zip(item[1:], cls.field_kinds):
+            if fkind == NODE:
+                value = done[id(value)]
+            elif fkind == NODES and value is not None:
+                value = [done[id(child)] for child in value]
+            values.append(value)
+        done[id(item)] = cls(*values)
+    return done[id(tree)]
+
+
+# ----------------------------- Arena -----------------------------
+
+# Árbol guardado en arrays paralelos: un índice por nodo, campos en una lista plana.
+# Los hijos se referencian por índice, así que no hay un objeto Python por nodo.
+class NodeArena:
+    __slots__ = ('kinds', 'linenos', 'cols', 'offsets', 'slots')
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.linenos = array('I')
+        self.cols = array('I')
+        self.offsets = array('I')   # Inicio de los campos de cada nodo en slots
+        self.slots = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind, values, lineno=0, col=0):
+        # values: campos ya codificados (hijos como índices, listas como tuplas de índices)
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.linenos.append(lineno)
+        self.cols.append(col)
+        self.offsets.append(len(self.slots))
+        self.slots.extend(values)
+        return index
+
+    def field(self, index, position):
+        return self.slots[self.offsets[index] + position]
+
+    @classmethod
+    def from_tree(cls, tree):
+        # Devuelve la arena y el índice de la raíz (post-orden: los hijos van antes)
+        arena = cls()
+        indexes = {}
+        stack = [(tree, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children())
+                continue
+            values = []
+            for name, fkind in zip(node.fields, node.field_kinds):
+                value = getattr(node, name)
+                if fkind == NODE:
+                    value = indexes[id(value)]
+                elif fkind == NODES and value is not None:
+                    value = tuple(indexes[id(child)] for child in value)
+                values.append(value)
+            indexes[id(node)] = arena.add(node.kind, values, node.lineno, node.col)
+        return arena, indexes[id(tree)]
+
+    def to_tree(self, root):
+        # Como los hijos siempre tienen índices menores, basta un recorrido ascendente
+        built = {}
+        kinds, slots, offsets = self.kinds, self.slots, self.offsets
+        for index in range(root + 1):
+            cls = NODE_CLASSES[kinds[index]]
+            start = offsets[index]
+            values = []
+            for position, fkind in enumerate(cls.field_kinds):
+                value = slots[start + position]
+                if fkind == NODE:
+                    value = built.pop(value)
+                elif fkind == NODES and value is not None:
+                    value = [built.pop(child) for child in value]
+                values.append(value)
+            built[index] = cls(*values, lineno=self.linenos[index], col=self.cols[index])
+        return built[root]
+
+    # Representación serializable con marshal
+    def to_record(self):
+        return (self.kinds.tobytes(), self.linenos.tobytes(), self.cols.tobytes(),
+                self.offsets.tobytes(), tuple(self.slots))
+
+    @classmethod
+    def from_record(cls, record):
+        arena = cls()
+        kinds, linenos, cols, offsets, slots = record
+        arena.kinds.frombytes(kinds)
+        arena.linenos.frombytes(linenos)
+        arena.cols.frombytes(cols)
+        arena.offsets.frombytes(offsets)
+        arena.slots = list(slots)
+        return arena
@@ -0,0 +1,396 @@
+from ast_nodes import (DECL, DECL_ASSIGN, ASSIGN, FUNC_DEF, RETURN, IF, WHILE, INSTANCE, TYPE_DEF,
+                       BINOP, UNOP, CONST, VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL)
+from executor import int_div
+
+
+# ----------------------------- Eliminación de comprobaciones de rango -----------------------------
+# Análisis de intervalos de las variables int sobre el AST ya tipado. Un acceso v[e] cuyo
+# índice está seguro dentro de [0, N) (N: tamaño declarado en ('vector', base, N)) queda
+# marcado con node.safe = True y los backends lo ejecutan sin comprobar el índice.
+#
+# Se recorre el programa una sola vez, sin iterar hasta un punto fijo: al entrar en un
+# 'while', una variable que el cuerpo sólo modifica con x = x + k (k >= 0 constante) no baja
+# de su valor de entrada; con x = x - k no sube; cualquier otra escritura la deja sin cota.
+# La condición del bucle (y la de cada 'if') acota después el intervalo en cada rama. Así se
+# cubren los bucles i = 0; while i < N: ... i = i + 1 y también los que cuentan hacia atrás.
+#
+# Las funciones pueden escribir globales: cada llamada deja sin cota las que escribe la
+# función llamada (directamente o a través de otras llamadas).
+
+_INF = float('inf')
+_TOP = (-_INF, _INF)
+
+_NEGATED = {'<': '>=', '<=': '>', '>': '<=', '>=': '<'}
+_MIRRORED = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '=='}
+
+
+class BoundsAnalyzer:
+    def __init__(self):
+        self.writes = {}          # función -> globales que puede escribir (con sus llamadas)
+        self.accesses = 0
+        self.safe = 0
+
+    def analyze(self, program):
+        self.writes = _function_writes(program.body)
+        self._block(program.body, {})
+        return self.safe, self.accesses
+
+    # ----------------------------- Sentencias -----------------------------
+
+    def _block(self, statements, state):
+        # Devuelve el estado a la salida del bloque, o None si el bloque termina con 'return'
+        for stmt in statements:
+            state = self._statement(stmt, state)
+            if state is None:
+                return None
+        return state
+
+    def _statement(self, stmt, state):
+        kind = stmt.kind
+        if kind == DECL:
+            for name in stmt.ids:
+                _set(state, name, (0, 0) if stmt.type == 'int' else _TOP)
+        elif kind == DECL_ASSIGN:
+            # La expresión ve ya las variables declaradas (con el valor que tuvieran)
+            for name in stmt.ids:
+                state.pop(name, None)
+            value = self._expr(stmt.expr, state)
+            for name in stmt.ids:
+                _set(state, name, value if stmt.type == 'int' else _TOP)
+        elif kind == ASSIGN:
+            target = stmt.target
+            value = self._expr(stmt.expr, state)
+            if target.kind == VAR:
+                _set(state, target.name, value)     # Sólo tiene cota si el valor es int
+            else:
+                self._expr(target, state)
+        elif kind == INSTANCE:
+            state.pop(stmt.name, None)
+        elif kind == FUNC_DEF:
+            # El cuerpo se analiza aparte: parámetros y globales sin cota al entrar
+            self._block(stmt.body, {})
+        elif kind == RETURN:
+            self._expr(stmt.expr, state)
+            return None
+        elif kind == IF:
+            self._expr(stmt.cond, state)
+            then = self._block(stmt.then, self._refine(stmt.cond, dict(state), True))
+            orelse = self._block(stmt.orelse or [], self._refine(stmt.cond, dict(state), False))
+            return _join(then, orelse)
+        elif kind == WHILE:
+            head = self._loop_head(stmt, state)
+            self._expr(stmt.cond, head)
+            self._block(stmt.body, self._refine(stmt.cond, dict(head), True))
+            return self._refine(stmt.cond, head, False)
+        elif kind != TYPE_DEF:
+            self._expr(stmt, state)   # Expresión suelta
+        return state
+
+    def _loop_head(self, loop, state):
+        # Intervalos válidos en cada evaluación de la condición
+        head = dict(state)
+        steps = {}                # variable -> signos de sus incrementos; None si hay otra escritura
+        for name, step in self._loop_writes(loop):
+            if step is None or name not in steps:
+                steps[name] = None if step is None else {step}
+            elif steps[name] is not None:
+                steps[name].add(step)
+        for name, signs in steps.items():
+            lo, hi = head.get(name, _TOP)
+            if signs == {1}:
+                head[name] = (lo, _INF)
+            elif signs == {-1}:
+                head[name] = (-_INF, hi)
+            elif signs != {0}:
+                head.pop(name, None)
+        return head
+
+    def _loop_writes(self, loop):
+        # (variable, +1 / -1 / 0 según el incremento constante, o None) por cada escritura
+        stack = [loop.cond] + list(loop.body)
+        while stack:
+            node = stack.pop()
+            kind = node.kind
+            if kind == ASSIGN:
+                if node.target.kind == VAR:
+                    yield node.target.name, _step(node.target.name, node.expr)
+                stack.append(node.target)
+                stack.append(node.expr)
+            elif kind == DECL:
+                for name in node.ids:
+                    yield name, None
+            elif kind == DECL_ASSIGN:
+                for name in node.ids:
+                    yield name, None
+                stack.append(node.expr)
+            elif kind == INSTANCE:
+                yield node.name, None
+            elif kind in (RETURN,):
+                stack.append(node.expr)
+            elif kind == IF:
+                stack.append(node.cond)
+                stack.extend(node.then)
+                stack.extend(node.orelse or [])
+            elif kind == WHILE:
+                stack.append(node.cond)
+                stack.extend(node.body)
+            elif kind == FUNC_CALL:
+                for name in self.writes.get(node.name, ()):
+                    yield name, None
+                stack.extend(node.args)
+            elif kind != FUNC_DEF:
+                stack.extend(_expression_children(node))
+
+    # ----------------------------- Expresiones -----------------------------
+
+    def _expr(self, root, state):
+        # Intervalo del valor (_TOP si no es int o no se sabe) y marca de los accesos seguros.
+        # Las globales que escribe una llamada se olvidan antes de evaluar la expresión.
+        for name in self._call_writes(root):
+            state.pop(name, None)
+        values = {}
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            kind = node.kind
+            if kind == BINOP and node.op in ('and', 'or'):
+                # La parte derecha sólo se evalúa si la izquierda no decide
+                self._expr(node.left, state)
+                self._expr(node.right, self._refine(node.left, dict(state), node.op == 'and'))
+                values[id(node)] = _TOP
+                continue
+            if not expanded:
+                children = _expression_children(node)
+                if children:
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in children)
+                    continue
+            values[id(node)] = self._value(node, state, values)
+        return values[id(root)]
+
+    def _value(self, node, state, values):
+        kind = node.kind
+        if kind == ARRAY_ACCESS:
+            lo, hi = values[id(node.index)]
+            node.safe = node.index.type == 'int' and lo >= 0 and hi < node.array.type[2]
+            self.accesses += 1
+            self.safe += node.safe
+            return _TOP
+        if node.type != 'int':
+            return _TOP
+        if kind == CONST:
+            return (node.value, node.value)
+        if kind == VAR:
+            return state.get(node.name, _TOP)
+        if kind == UNOP:
+            lo, hi = values[id(node.operand)]
+            return (-hi, -lo)
+        if kind == BINOP and node.left.type == 'int' and node.right.type == 'int':
+            return _arith(node.op, values[id(node.left)], values[id(node.right)])
+        return _TOP
+
+    def _call_writes(self, root):
+        names = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.kind == FUNC_CALL:
+                names.update(self.writes.get(node.name, ()))
+            stack.extend(_expression_children(node))
+        return names
+
+    # ----------------------------- Condiciones -----------------------------
+
+    def _refine(self, cond, state, outcome):
+        # Estado acotado con lo que implica que la condición valga `outcome`
+        if cond.kind == UNOP and cond.op == 'not':
+            return self._refine(cond.operand, state, not outcome)
+        if cond.kind != BINOP:
+            return state
+        op = cond.op
+        if op in ('and', 'or'):
+            # a and b cierta (o a or b falsa): se cumplen las dos partes
+            if outcome == (op == 'and'):
+                state = self._refine(cond.left, state, outcome)
+                return self._refine(cond.right, state, outcome)
+            return state
+        if op not in _MIRRORED or cond.left.type != 'int' or cond.right.type != 'int':
+            return state
+        if not outcome:
+            if op == '==':
+                return state
+            op = _NEGATED[op]
+        left, right = _quiet_value(cond.left, state), _quiet_value(cond.right, state)
+        if cond.left.kind == VAR:
+            _narrow(state, cond.left.name, op, right)
+        if cond.right.kind == VAR:
+            _narrow(state, cond.right.name, _MIRRORED[op], left)
+        return state
+
+
+def analyze_bounds(program):
+    # Marca los accesos seguros; devuelve (seguros, accesos)
+    return BoundsAnalyzer().analyze(program)
+
+
+# ----------------------------- Intervalos -----------------------------
+
+def _set(state, name, interval):
+    if interval == _TOP:
+        state.pop(name, None)
+    else:
+        state[name] = interval
+
+
+def _join(a, b):
+    # Unión de dos estados (None: la rama no llega al final)
+    if a is None:
+        return b
+    if b is None:
+        return a
+    joined = {}
+    for name in a.keys() & b.keys():
+        (alo, ahi), (blo, bhi) = a[name], b[name]
+        joined[name] = (min(alo, blo), max(ahi, bhi))
+    return joined
+
+
+def _narrow(state, name, op, bound):
+    lo, hi = state.get(name, _TOP)
+    blo, bhi = bound
+    if op == '<':
+        hi = min(hi, bhi - 1)
+    elif op == '<=':
+        hi = min(hi, bhi)
+    elif op == '>':
+        lo = max(lo, blo + 1)
+    elif op == '>=':
+        lo = max(lo, blo)
+    else:
+        lo, hi = max(lo, blo), min(hi, bhi)
+    _set(state, name, (lo, hi))
+
+
+def _arith(op, a, b):
+    (alo, ahi), (blo, bhi) = a, b
+    if op == '+':
+        return (alo + blo, ahi + bhi)
+    if op == '-':
+        return (alo - bhi, ahi - blo)
+    if op == '*':
+        # 0 * inf vale 0 aquí: los extremos infinitos sólo indican que no hay cota
+        products = [x * y if x and y else 0 for x in a for y in b]
+        return (min(products), max(products))
+    if op == '/' and blo == bhi and blo > 0:
+        # Truncar hacia cero es creciente en el dividendo cuando el divisor es positivo
+        return tuple(x if x in (-_INF, _INF) else int_div(x, blo) for x in a)
+    return _TOP
+
+
+def _quiet_value(node, state):
+    # Intervalo de una expresión sin marcar accesos (ya se han marcado al evaluar la condición)
+    kind = node.kind
+    if node.type != 'int':
+        return _TOP
+    if kind == CONST:
+        return (node.value, node.value)
+    if kind == VAR:
+        return state.get(node.name, _TOP)
+    if kind == BINOP and node.left.kind in (CONST, VAR) and node.right.kind in (CONST, VAR):
+        return _arith(node.op, _quiet_value(node.left, state), _quiet_value(node.right, state))
+    return _TOP
+
+
+def _step(name, expr):
+    # +1 si la asignación es name = name + k, -1 si es name = name - k (k >= 0), 0 si k es 0
+    if expr.kind != BINOP or expr.op not in ('+', '-') or expr.type != 'int':
+        return None
+    left, right = expr.left, expr.right
+    if expr.op == '+' and right.kind == VAR and right.name == name:
+        left, right = right, left
+    if left.kind != VAR or left.name != name or right.kind != CONST or right.type != 'int':
+        return None
+    k = right.value if expr.op == '+' else -right.value
+    return (k > 0) - (k < 0)
+
+
+# ----------------------------- Escrituras de las funciones -----------------------------
+
+def _function_writes(statements):
+    # función -> globales que puede escribir, contando las funciones a las que llama. Se
+    # buscan las definiciones en todo el programa: también las que están dentro de un bloque.
+    direct, calls = {}, {}
+    definitions = [stmt for stmt in _all_statements(statements) if stmt.kind == FUNC_DEF]
+    for function in definitions:
+        # En orden: una asignación anterior a la declaración local escribe la global
+        local = {pname for _, pname in function.params}
+        assigned, called = set(), set()
+        for stmt in _all_statements(function.body):
+            kind = stmt.kind
+            if kind == ASSIGN and stmt.target.kind == VAR and stmt.target.name not in local:
+                assigned.add(stmt.target.name)
+            elif kind in (DECL, DECL_ASSIGN):
+                local.update(stmt.ids)
+            elif kind == INSTANCE:
+                local.add(stmt.name)
+            stack = list(_statement_expressions(stmt))
+            while stack:
+                node = stack.pop()
+                if node.kind == FUNC_CALL:
+                    called.add(node.name)
+                stack.extend(_expression_children(node))
+        direct[function.name] = assigned
+        calls[function.name] = called
+
+    writes = {name: set(names) for name, names in direct.items()}
+    changed = True
+    while changed:
+        changed = False
+        for name, called in calls.items():
+            for callee in called:
+                extra = writes.get(callee, set()) - writes[name]
+                if extra:
+                    writes[name] |= extra
+                    changed = True
+    return writes
+
+
+def _all_statements(statements):
+    # Sentencias en orden de aparición, entrando en los bloques de if y while (no en funciones)
+    stack = list(reversed(statements))
+    while stack:
+        stmt = stack.pop()
+        yield stmt
+        if stmt.kind == IF:
+            stack.extend(reversed(stmt.orelse or []))
+            stack.extend(reversed(stmt.then))
+        elif stmt.kind == WHILE:
+            stack.extend(reversed(stmt.body))
+
+
+def _statement_expressions(node):
+    kind = node.kind
+    if kind == ASSIGN:
+        return (node.target, node.expr)
+    if kind in (DECL_ASSIGN, RETURN):
+        return (node.expr,)
+    if kind in (IF, WHILE):
+        return (node.cond,)
+    if kind in (DECL, INSTANCE, TYPE_DEF, FUNC_DEF):
+        return ()
+    return _expression_children(node)
+
+
+def _expression_children(node):
+    kind = node.kind
+    if kind == BINOP:
+        return (node.left, node.right)
+    if kind == UNOP:
+        return (node.operand,)
+    if kind == ARRAY_ACCESS:
+        return (node.array, node.index)
+    if kind == FIELD_ACCESS:
+        return (node.obj,)
+    if kind == FUNC_CALL:
+        return node.args
+    return ()
@@ -0,0 +1,80 @@
+import hashlib
+import marshal
+import os
+import tempfile
+
+
+# Versión del formato de las entradas (cambiarla invalida la caché)
+FORMAT_VERSION = 9
+
+DEFAULT_CACHE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.vipercache'))
+
+# Módulos cuyo código determina tokens, AST y diagnósticos
+FRONTEND_MODULES = ('viper_tokens.py', 'lexer.py', 'parser.py', 'ast_nodes.py', 'semantic.py', 'symbols.py',
+                    'token_stream.py', 'diagnostics.py', 'executor.py',
+                    'bytecode.py', 'vm.py', 'transpiler.py',
+                    'optimizer.py', 'cfg.py', 'dataflow.py', 'ir.py', 'ir_optimizer.py', 'vectors.py',
+                    'bounds.py', 'records.py', 'scanner.py', 'source_file.py', 'token_file.py')
+
+
+def frontend_version():
+    # Hash de las fuentes del lexer, la gramática (y sus acciones) y el analizador
+    h = hashlib.sha256(str(FORMAT_VERSION).encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in FRONTEND_MODULES:
+        with open(os.path.join(here, name), 'rb') as f:
+            h.update(name.encode())
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+# Caché en disco de resultados por fichero, indexada por el hash del contenido
+class BuildCache:
+    def __init__(self, directory=None, version=None, variant=''):
+        self.directory = os.path.abspath(directory or DEFAULT_CACHE_DIR)
+        # variant separa entradas que dependen de opciones (p. ej. el nivel de diagnósticos)
+        self.version = (version or frontend_version()) + variant
+        self.hits = 0
+        self.misses = 0
+
+    # data: texto o bytes del fichero (p. ej. SourceFile.raw, sin decodificar)
+    def key(self, data):
+        h = hashlib.sha256(self.version.encode())
+        h.update(data.encode('utf-8') if isinstance(data, str) else data)
+        return h.hexdigest()
+
+    def _path(self, key):
+        # Dos niveles para no acumular miles de ficheros en un mismo directorio
+        return os.path.join(self.directory, key[:2], key[2:] + '.bin')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                version, record = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        if version != FORMAT_VERSION:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+
+    def put(self, key, record):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except OSError:
+            return  # Caché no escribible: se sigue sin ella
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump((FORMAT_VERSION, record), f)
+            os.replace(tmp, path)
+        except (OSError, ValueError):
+            # ValueError: el registro contiene algo que marshal no sabe serializar
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
@@ -0,0 +1,645 @@
+import marshal
+from array import array
+
+from ast_nodes import (DECL, DECL_ASSIGN, ASSIGN, FUNC_DEF, RETURN, IF, WHILE, INSTANCE, TYPE_DEF,
+                       BINOP, UNOP, CONST, VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL)
+from executor import ExecutionError, SCALAR_DEFAULTS, is_vector, const_value, format_value, has_call
+from vectors import REDUCTIONS
+
+
+# ----------------------------- Formato -----------------------------
+# Cada función es una secuencia de instrucciones de 4 palabras (op, a, b, c) sobre tres
+# bancos de registros de su marco: I (array 'q': int, bool y char como código), F (array 'd':
+# float) y O (lista: vectores y registros). Las constantes ocupan registros que ya vienen
+# rellenos en la plantilla del marco, así que no hay instrucciones de carga de constantes.
+# Las operaciones con vectores completos (v + w, -v, sum(v)...) son una sola instrucción VEC
+# cuyos operandos, de bancos distintos, se describen en la tabla vector_sites del programa.
+# VGETU/VSETU son VGET/VSET sin comprobar el índice, para los accesos que bounds.py marca seguros.
+# Un vector de registros es un registro de columnas (ver records.py): se crea con NEWREC y
+# gente[i].campo es FGET_O de la columna y VGET de su elemento; la columna de un campo vector
+# tiene vectores como elementos, que se leen y escriben con VGET_O/VSET_O.
+
+VBC_MAGIC = b'VBC\x01'
+VBC_VERSION = 4
+
+I, F, O = 0, 1, 2   # Bancos de registros
+
+OPCODES = (
+    'MOV_I', 'MOV_F', 'MOV_O',
+    'ADD_I', 'SUB_I', 'MUL_I', 'DIV_I', 'NEG_I',
+    'ADD_F', 'SUB_F', 'MUL_F', 'DIV_F', 'NEG_F',
+    'ADD_C', 'SUB_C', 'MUL_C', 'DIV_C', 'NEG_C',
+    'LT_I', 'LE_I', 'GT_I', 'GE_I', 'EQ_I',
+    'LT_F', 'LE_F', 'GT_F', 'GE_F', 'EQ_F',
+    'NOT', 'I2F',
+    'JMP', 'JF', 'JT',
+    'JLT_I', 'JLE_I', 'JGT_I', 'JGE_I', 'JEQ_I', 'JNE_I',
+    'GETG_I', 'GETG_F', 'GETG_O', 'SETG_I', 'SETG_F', 'SETG_O',
+    'NEWVEC_I', 'NEWVEC_F', 'VGET_I', 'VGET_F', 'VSET_I', 'VSET_F',
+    'NEWREC', 'FGET_I', 'FGET_F', 'FGET_O', 'FSET_I', 'FSET_F', 'FSET_O',
+    'CALL_I', 'CALL_F', 'CALL_O', 'RET_I', 'RET_F', 'RET_O', 'NORET', 'HALT', 'VEC',
+    'VGETU_I', 'VGETU_F', 'VSETU_I', 'VSETU_F',
+    'VGET_O', 'VSET_O', 'VGETU_O', 'VSETU_O',
+)
+(MOV_I, MOV_F, MOV_O, ADD_I, SUB_I, MUL_I, DIV_I, NEG_I, ADD_F, SUB_F, MUL_F, DIV_F, NEG_F,
+ ADD_C, SUB_C, MUL_C, DIV_C, NEG_C, LT_I, LE_I, GT_I, GE_I, EQ_I, LT_F, LE_F, GT_F, GE_F, EQ_F,
+ NOT, I2F, JMP, JF, JT, JLT_I, JLE_I, JGT_I, JGE_I, JEQ_I, JNE_I, GETG_I, GETG_F, GETG_O,
+ SETG_I, SETG_F, SETG_O, NEWVEC_I, NEWVEC_F, VGET_I, VGET_F, VSET_I, VSET_F, NEWREC, FGET_I,
+ FGET_F, FGET_O, FSET_I, FSET_F, FSET_O, CALL_I, CALL_F, CALL_O, RET_I, RET_F, RET_O, NORET,
+ HALT, VEC, VGETU_I, VGETU_F, VSETU_I, VSETU_F, VGET_O, VSET_O, VGETU_O, VSETU_O) = range(75)
+
+# Operaciones binarias por tipo de los operandos
+_ARITH = {
+    'int': {'+': ADD_I, '-': SUB_I, '*': MUL_I, '/': DIV_I},
+    'bool': {'+': ADD_I, '-': SUB_I, '*': MUL_I, '/': DIV_I},
+    'char': {'+': ADD_C, '-': SUB_C, '*': MUL_C, '/': DIV_C},
+    'float': {'+': ADD_F, '-': SUB_F, '*': MUL_F, '/': DIV_F},
+}
+_COMPARE_I = {'<': LT_I, '<=': LE_I, '>': GT_I, '>=': GE_I, '==': EQ_I}
+_COMPARE_F = {'<': LT_F, '<=': LE_F, '>': GT_F, '>=': GE_F, '==': EQ_F}
+# Saltos fusionados con la comparación (sólo banco I: sin NaN, la negación es exacta)
+_JUMP_IF = {'<': JLT_I, '<=': JLE_I, '>': JGT_I, '>=': JGE_I, '==': JEQ_I}
+_JUMP_UNLESS = {'<': JGE_I, '<=': JGT_I, '>': JLE_I, '>=': JLT_I, '==': JNE_I}
+
+_MOV = (MOV_I, MOV_F, MOV_O)
+_GETG = (GETG_I, GETG_F, GETG_O)
+_SETG = (SETG_I, SETG_F, SETG_O)
+_FGET = (FGET_I, FGET_F, FGET_O)
+_FSET = (FSET_I, FSET_F, FSET_O)
+_VGET = (VGET_I, VGET_F, VGET_O)
+_VSET = (VSET_I, VSET_F, VSET_O)
+_VGETU = (VGETU_I, VGETU_F, VGETU_O)
+_VSETU = (VSETU_I, VSETU_F, VSETU_O)
+_CALL = (CALL_I, CALL_F, CALL_O)
+_RET = (RET_I, RET_F, RET_O)
+
+
+def register_file(vtype):
+    if vtype == 'float':
+        return F
+    if vtype in SCALAR_DEFAULTS:
+        return I
+    return O
+
+
+def to_register(value, vtype):
+    # Valor de la representación común (la de executor) al de un registro
+    if vtype == 'char':
+        return ord(value)
+    if vtype == 'bool':
+        return int(value)
+    return value
+
+
+def from_register(value, vtype, records):
+    # Valor de un registro (o elemento) a la representación común
+    if vtype == 'char':
+        return chr(value)
+    if vtype == 'bool':
+        return bool(value)
+    if vtype in ('int', 'float'):
+        return value
+    if value is None:
+        return None
+    if is_vector(vtype) and vtype[1] in records:
+        return [from_register(column, ('vector', ftype, vtype[2]), records)
+                for column, (_, ftype) in zip(value, records[vtype[1]])]
+    if is_vector(vtype):
+        return [from_register(item, vtype[1], records) for item in value]
+    return [from_register(item, ftype, records) for item, (_, ftype) in zip(value, records[vtype])]
+
+
+class BytecodeFunction:
+    __slots__ = ('name', 'type', 'code', 'lines', 'int_template', 'float_template', 'obj_count', 'param_regs')
+
+    def __init__(self, name, ftype):
+        self.name = name
+        self.type = ftype
+        self.code = array('i')
+        self.lines = array('I')             # Línea de cada instrucción (para los errores)
+        self.int_template = array('q')
+        self.float_template = array('d')
+        self.obj_count = 0
+        self.param_regs = ()                # (banco, registro) de cada parámetro
+
+    def to_record(self):
+        return (self.name, self.type, self.code.tobytes(), self.lines.tobytes(), self.int_template.tobytes(),
+                self.float_template.tobytes(), self.obj_count, tuple(self.param_regs))
+
+    @classmethod
+    def from_record(cls, record):
+        name, ftype, code, lines, ints, floats, obj_count, param_regs = record
+        function = cls(name, ftype)
+        function.code.frombytes(code)
+        function.lines.frombytes(lines)
+        function.int_template.frombytes(ints)
+        function.float_template.frombytes(floats)
+        function.obj_count = obj_count
+        function.param_regs = param_regs
+        return function
+
+
+# Programa completo: la función 0 es el cuerpo principal y sus registros son las variables globales
+class BytecodeProgram:
+    __slots__ = ('functions', 'call_sites', 'vector_sites', 'records', 'record_names', 'globals')
+
+    def __init__(self):
+        self.functions = []
+        self.call_sites = []     # Por llamada: ((banco, registro origen, registro destino), ...)
+        self.vector_sites = []   # Por VEC: (operación, tipo base, ((banco, registro), ...), banco del resultado)
+        self.records = {}        # tipo -> ((campo, tipo), ...)
+        self.record_names = []   # Operando de NEWREC -> tipo
+        self.globals = []        # (nombre, tipo, banco, registro)
+
+    def dumps(self):
+        record = (VBC_VERSION, [f.to_record() for f in self.functions], self.call_sites, self.vector_sites,
+                  list(self.records.items()), self.record_names, self.globals)
+        return VBC_MAGIC + marshal.dumps(record)
+
+    @classmethod
+    def loads(cls, data):
+        if data[:len(VBC_MAGIC)] != VBC_MAGIC:
+            raise ValueError("No es un fichero de bytecode de Viper")
+        record = marshal.loads(data[len(VBC_MAGIC):])
+        if record[0] != VBC_VERSION:
+            raise ValueError(f"Versión de bytecode no soportada: {record[0]}")
+        _, functions, call_sites, vector_sites, records, record_names, global_vars = record
+        program = cls()
+        program.functions = [BytecodeFunction.from_record(f) for f in functions]
+        program.call_sites = call_sites
+        program.vector_sites = vector_sites
+        program.records = dict(records)
+        program.record_names = record_names
+        program.globals = global_vars
+        return program
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+    # Variables globales en la representación común, a partir de los bancos del marco principal
+    def variables(self, ints, floats, objs):
+        banks = (ints, floats, objs)
+        return {name: from_register(banks[bank][reg], vtype, self.records)
+                for name, vtype, bank, reg in self.globals}
+
+    def format_variables(self, ints, floats, objs):
+        layouts = {name: {field: (offset, ftype) for offset, (field, ftype) in enumerate(fields)}
+                   for name, fields in self.records.items()}
+        values = self.variables(ints, floats, objs)
+        return [f"{name} = {format_value(values[name], vtype, layouts)}" for name, vtype, _, _ in self.globals]
+
+    def disassemble(self):
+        lines = []
+        for index, function in enumerate(self.functions):
+            lines.append(f"función {index} {function.name}:")
+            code = function.code
+            for pc in range(0, len(code), 4):
+                op, a, b, c = code[pc:pc + 4]
+                lines.append(f"  {pc // 4:5}  {OPCODES[op]:9} {a:5} {b:5} {c:5}    # línea {function.lines[pc // 4]}")
+        return lines
+
+
+# ----------------------------- Compilador -----------------------------
+
+class _Registers:
+    __slots__ = ('template', 'free', 'zero')
+
+    def __init__(self, zero):
+        self.template = []
+        self.free = []
+        self.zero = zero
+
+    def alloc(self):
+        if self.free:
+            return self.free.pop()
+        return self.fresh()
+
+    def fresh(self, value=None):
+        # Registro nuevo (nunca reutilizado): las constantes sólo valen lo que dice la plantilla
+        self.template.append(self.zero if value is None else value)
+        return len(self.template) - 1
+
+
+# Estado de compilación de una función: código, registros, variables y temporales
+class _FunctionBuilder:
+    def __init__(self, function):
+        self.function = function
+        self.banks = (_Registers(0), _Registers(0.0), _Registers(None))
+        self.variables = {}      # nombre -> (banco, registro, tipo)
+        self.consts = {}         # (banco, valor) -> registro
+        self.temps = set()       # (banco, registro) de los temporales vivos
+        self.lineno = 0
+
+    def emit(self, op, a=0, b=0, c=0):
+        code = self.function.code
+        code.extend((op, a, b, c))
+        self.function.lines.append(self.lineno)
+        return len(code) - 4
+
+    def here(self):
+        return len(self.function.code) // 4
+
+    def patch(self, position, slot, target):
+        self.function.code[position + slot] = target
+
+    def declare(self, name, vtype):
+        bank = register_file(vtype)
+        reg = self.banks[bank].alloc()
+        self.variables[name] = (bank, reg, vtype)
+        return bank, reg
+
+    def const(self, bank, value):
+        key = (bank, value)
+        reg = self.consts.get(key)
+        if reg is None:
+            reg = self.consts[key] = self.banks[bank].fresh(value)
+        return reg
+
+    def temp(self, bank):
+        reg = self.banks[bank].alloc()
+        self.temps.add((bank, reg))
+        return reg
+
+    def release(self, bank, reg):
+        # Sólo se liberan temporales; las variables y constantes conservan su registro
+        if (bank, reg) in self.temps:
+            self.temps.discard((bank, reg))
+            self.banks[bank].free.append(reg)
+
+    def release_all(self, keep=()):
+        for bank, reg in list(self.temps):
+            if (bank, reg) not in keep:
+                self.release(bank, reg)
+
+    def finish(self):
+        function = self.function
+        try:
+            function.int_template = array('q', self.banks[I].template)
+        except OverflowError:
+            raise ExecutionError("Constante entera fuera del rango de 64 bits.") from None
+        function.float_template = array('d', self.banks[F].template)
+        function.obj_count = len(self.banks[O].template)
+
+
+class BytecodeCompiler:
+    def __init__(self):
+        self.program = BytecodeProgram()
+        self.function_index = {}     # nombre -> índice en program.functions
+        self.record_index = {}
+        self.param_types = {}        # índice de función -> tipos de sus parámetros
+        self.main = None
+        self.builder = None
+
+    def compile(self, ast):
+        program = self.program
+        main = BytecodeFunction('<main>', None)
+        program.functions.append(main)
+        self.main = self.builder = _FunctionBuilder(main)
+        self._block(ast.body)
+        self.main.emit(HALT)
+        self.main.finish()
+        program.globals = [(name, vtype, bank, reg) for name, (bank, reg, vtype) in self.main.variables.items()]
+        return program
+
+    # ----------------------------- Sentencias -----------------------------
+
+    def _block(self, statements):
+        builder = self.builder
+        for stmt in statements:
+            builder.lineno = stmt.lineno
+            _STATEMENT_COMPILERS[stmt.kind](self, stmt)
+            builder.release_all()
+
+    def _decl(self, stmt):
+        for name in stmt.ids:
+            bank, reg = self.builder.declare(name, stmt.type)
+            self._initialize(bank, reg, stmt.type)
+
+    def _initialize(self, bank, reg, vtype):
+        builder = self.builder
+        if is_vector(vtype) and vtype[1] in SCALAR_DEFAULTS:
+            builder.emit(NEWVEC_F if vtype[1] == 'float' else NEWVEC_I, reg, vtype[2])
+        elif bank == O:
+            builder.emit(NEWREC, reg, self._record(vtype))
+        else:
+            builder.emit(_MOV[bank], reg, builder.const(bank, to_register(SCALAR_DEFAULTS[vtype], vtype)))
+
+    def _decl_assign(self, stmt):
+        builder = self.builder
+        targets = [builder.declare(name, stmt.type) for name in stmt.ids]
+        bank, first = targets[0]
+        value = self._value(stmt.expr, stmt.type, first)
+        for _, reg in targets:
+            if reg != value:
+                builder.emit(_MOV[bank], reg, value)
+
+    def _instance(self, stmt):
+        _, reg = self.builder.declare(stmt.name, stmt.type_name)
+        self.builder.emit(NEWREC, reg, self._record(stmt.type_name))
+
+    def _type_def(self, stmt):
+        self.program.records[stmt.name] = tuple((name, ftype) for ftype, name in stmt.record_fields)
+
+    def _record(self, type_name):
+        # Operando de NEWREC: un tipo registro o un vector de registros
+        index = self.record_index.get(type_name)
+        if index is None:
+            if (type_name[1] if is_vector(type_name) else type_name) not in self.program.records:
+                raise ExecutionError(f"El tipo '{type_name}' no está definido.")
+            index = self.record_index[type_name] = len(self.program.record_names)
+            self.program.record_names.append(type_name)
+        return index
+
+    def _assign(self, stmt):
+        builder = self.builder
+        target = stmt.target
+        if target.kind == VAR:
+            local = builder.variables.get(target.name)
+            if local is not None:
+                bank, reg, vtype = local
+                value = self._value(stmt.expr, vtype, reg)
+                if value != reg:
+                    builder.emit(_MOV[bank], reg, value)
+                return
+            bank, reg, vtype = self._global(target)
+            builder.emit(_SETG[bank], reg, self._value(stmt.expr, vtype))
+        elif target.kind == ARRAY_ACCESS:
+            # El valor se evalúa antes que el vector y el índice, como en tree_walker
+            bank = register_file(target.type)
+            value = self._pinned(bank, self._value(stmt.expr, target.type), target.array, target.index)
+            vector = self._expr(target.array)
+            index = self._expr(target.index)
+            builder.emit((_VSETU if target.safe else _VSET)[bank], vector, index, value)
+        elif target.kind == FIELD_ACCESS:
+            bank = register_file(target.type)
+            value = self._pinned(bank, self._value(stmt.expr, target.type), target.obj)
+            builder.emit(_FSET[bank], self._expr(target.obj), target.offset, value)
+        else:
+            raise ExecutionError(f"Asignación a estructura no válida: {target.tag}", stmt.lineno, stmt.col)
+
+    def _func_def(self, stmt):
+        if self.builder is not self.main:
+            raise ExecutionError("No se pueden ejecutar funciones definidas dentro de otra función.",
+                                 stmt.lineno, stmt.col)
+        function = BytecodeFunction(stmt.name, stmt.type)
+        self.function_index[stmt.name] = len(self.program.functions)
+        self.param_types[len(self.program.functions)] = [ptype for ptype, _ in stmt.params]
+        self.program.functions.append(function)
+
+        self.builder = builder = _FunctionBuilder(function)
+        try:
+            function.param_regs = tuple(builder.declare(pname, ptype) for ptype, pname in stmt.params)
+            self._block(stmt.body)
+            builder.lineno = stmt.lineno
+            builder.emit(NORET, self.function_index[stmt.name])
+            builder.finish()
+        finally:
+            self.builder = self.main
+
+    def _return(self, stmt):
+        ftype = self.builder.function.type
+        self.builder.emit(_RET[register_file(ftype)], self._value(stmt.expr, ftype))
+
+    def _if(self, stmt):
+        builder = self.builder
+        skip = self._jump(stmt.cond, False)
+        builder.release_all()
+        self._block(stmt.then)
+        if stmt.orelse:
+            end = builder.emit(JMP)
+            self._patch_jump(skip, builder.here())
+            self._block(stmt.orelse)
+            builder.patch(end, 1, builder.here())
+        else:
+            self._patch_jump(skip, builder.here())
+
+    def _while(self, stmt):
+        # La condición va al final: una sola bifurcación por vuelta
+        builder = self.builder
+        entry = builder.emit(JMP)
+        top = builder.here()
+        self._block(stmt.body)
+        builder.patch(entry, 1, builder.here())
+        builder.lineno = stmt.lineno
+        back = self._jump(stmt.cond, True)
+        self._patch_jump(back, top)
+
+    def _expression_statement(self, stmt):
+        self._expr(stmt)
+
+    # ----------------------------- Saltos -----------------------------
+
+    def _jump(self, cond, when):
+        # Salto (a parchear) que se toma si la condición vale `when`
+        builder = self.builder
+        if (cond.kind == BINOP and cond.op in _JUMP_IF
+                and register_file(cond.left.type) == I and register_file(cond.right.type) == I):
+            left = self._expr(cond.left)
+            right = self._expr(cond.right)
+            table = _JUMP_IF if when else _JUMP_UNLESS
+            return builder.emit(table[cond.op], left, right)
+        return builder.emit(JT if when else JF, self._expr(cond))
+
+    def _patch_jump(self, position, target):
+        op = self.builder.function.code[position]
+        self.builder.patch(position, 1 if op in (JMP,) else 2 if op in (JF, JT) else 3, target)
+
+    # ----------------------------- Expresiones -----------------------------
+
+    def _value(self, node, vtype, dst=None):
+        # Registro con el valor de la expresión convertido al tipo de destino
+        source = node.type
+        if register_file(source) == register_file(vtype):
+            return self._expr(node, dst)
+        if vtype != 'float' or register_file(source) != I:
+            # Un registro de un banco no se puede copiar en otro: el análisis semántico sólo
+            # deja pasar int -> float
+            raise ExecutionError(f"No se puede usar un valor de tipo '{source}' donde se espera '{vtype}'.",
+                                 node.lineno, node.col)
+        reg = self._expr(node)
+        out = dst if dst is not None else self.builder.temp(F)
+        self.builder.emit(I2F, out, reg)
+        return out
+
+    def _pinned(self, bank, reg, *later):
+        # En el programa principal una variable es su propio registro y se lee al ejecutar la
+        # instrucción que la usa: si una llamada evaluada después puede cambiarla, se copia antes
+        builder = self.builder
+        if builder is self.main and (bank, reg) not in builder.temps and any(map(has_call, later)):
+            out = builder.temp(bank)
+            builder.emit(_MOV[bank], out, reg)
+            return out
+        return reg
+
+    def _global(self, var):
+        found = self.main.variables.get(var.name)
+        if found is None:
+            raise ExecutionError(f"La variable '{var.name}' no ha sido declarada.", var.lineno, var.col)
+        return found
+
+    def _out(self, bank, dst):
+        return dst if dst is not None else self.builder.temp(bank)
+
+    def _expr(self, node, dst=None):
+        # dst: registro donde conviene dejar el resultado (sólo lo escribe la última instrucción)
+        builder = self.builder
+        kind = node.kind
+        if node.type is None:
+            raise ExecutionError("El programa no ha pasado el análisis semántico.", node.lineno, node.col)
+        bank = register_file(node.type)
+
+        if kind == CONST:
+            reg = builder.const(bank, to_register(const_value(node.value), node.type))
+        elif kind == VAR:
+            local = builder.variables.get(node.name)
+            if local is not None:
+                reg = local[1]
+            else:
+                _, greg, _ = self._global(node)
+                reg = self._out(bank, dst)
+                builder.emit(_GETG[bank], reg, greg)
+        elif kind == BINOP:
+            return self._binop(node, dst)
+        elif kind == UNOP and bank == O:
+            operand = self._expr(node.operand)
+            builder.release(O, operand)
+            reg = self._vector(node, 'neg', ((O, operand),), dst)
+        elif kind == UNOP:
+            operand = self._expr(node.operand)
+            builder.release(bank, operand)
+            reg = self._out(bank, dst)
+            if node.op == 'not':
+                builder.emit(NOT, reg, operand)
+            else:
+                builder.emit({'float': NEG_F, 'char': NEG_C}.get(node.type, NEG_I), reg, operand)
+        elif kind == ARRAY_ACCESS:
+            vector = self._expr(node.array)
+            index = self._expr(node.index)
+            builder.release(O, vector)
+            builder.release(I, index)
+            reg = self._out(bank, dst)
+            builder.emit((_VGETU if node.safe else _VGET)[bank], reg, vector, index)
+        elif kind == FIELD_ACCESS:
+            record = self._expr(node.obj)
+            builder.release(O, record)
+            reg = self._out(bank, dst)
+            builder.emit(_FGET[bank], reg, record, node.offset)
+        elif kind == FUNC_CALL:
+            reg = self._call(node, dst)
+        else:
+            raise ExecutionError(f"Expresión desconocida: {node.tag}", node.lineno, node.col)
+
+        if dst is not None and reg != dst:
+            builder.emit(_MOV[bank], dst, reg)
+            return dst
+        return reg
+
+    def _binop(self, node, dst):
+        builder = self.builder
+        if node.op in ('and', 'or'):
+            out = builder.temp(I)
+            self._expr(node.left, out)
+            skip = builder.emit(JF if node.op == 'and' else JT, out)
+            self._expr(node.right, out)
+            builder.patch(skip, 2, builder.here())
+            if dst is not None:
+                builder.emit(MOV_I, dst, out)
+                return dst
+            return out
+
+        # La rama izquierda de una cadena (a + b + c + ...) se recorre sin recursión
+        spine = []
+        while node.kind == BINOP and node.op not in ('and', 'or'):
+            spine.append(node)
+            node = node.left
+        reg = self._expr(node)
+        last = len(spine) - 1
+        for position, step in enumerate(reversed(spine)):
+            optype = step.left.type
+            left_bank = register_file(optype)
+            right = self._expr(step.right)
+            if is_vector(optype) or is_vector(step.right.type):
+                right_bank = register_file(step.right.type)
+                builder.release(left_bank, reg)
+                builder.release(right_bank, right)
+                builder.lineno = step.lineno or builder.lineno
+                reg = self._vector(step, step.op, ((left_bank, reg), (right_bank, right)),
+                                   dst if position == last else None)
+                continue
+            if step.op in _COMPARE_I:
+                op = (_COMPARE_F if left_bank == F else _COMPARE_I)[step.op]
+                out_bank = I
+            else:
+                op = _ARITH[optype][step.op]
+                out_bank = left_bank
+            builder.release(left_bank, reg)
+            builder.release(left_bank, right)
+            out = dst if position == last and dst is not None else builder.temp(out_bank)
+            builder.lineno = step.lineno or builder.lineno
+            builder.emit(op, out, reg, right)
+            reg = out
+        return reg
+
+    def _vector(self, node, name, operands, dst):
+        # VEC con los operandos ya calculados (y liberados); el resultado va al banco de su tipo
+        vtype = node.left.type if node.kind == BINOP else node.operand.type if node.kind == UNOP else node.args[0].type
+        bank = register_file(node.type)
+        site = len(self.program.vector_sites)
+        self.program.vector_sites.append((name, vtype[1] if is_vector(vtype) else vtype, operands, bank))
+        out = self._out(bank, dst)
+        self.builder.emit(VEC, out, site)
+        return out
+
+    def _call(self, node, dst):
+        builder = self.builder
+        index = self.function_index.get(node.name)
+        if index is None and node.name in REDUCTIONS:
+            operands = tuple((O, self._expr(arg)) for arg in node.args)
+            for _, reg in operands:
+                builder.release(O, reg)
+            return self._vector(node, node.name, operands, dst)
+        if index is None:
+            raise ExecutionError(f"La función '{node.name}' no está definida.", node.lineno, node.col)
+        callee = self.program.functions[index]
+        arguments = []
+        for arg, (pbank, preg), ptype in zip(node.args, callee.param_regs, self.param_types[index]):
+            arguments.append((pbank, self._value(arg, ptype), preg))
+        site = len(self.program.call_sites)
+        self.program.call_sites.append(tuple(arguments))
+        for pbank, reg, _ in arguments:
+            builder.release(pbank, reg)
+        bank = register_file(callee.type)
+        out = self._out(bank, dst)
+        builder.emit(_CALL[bank], out, index, site)
+        return out
+
+
+
+def compile_bytecode(ast):
+    return BytecodeCompiler().compile(ast)
+
+
+_STATEMENT_COMPILERS = {
+    DECL: BytecodeCompiler._decl,
+    DECL_ASSIGN: BytecodeCompiler._decl_assign,
+    ASSIGN: BytecodeCompiler._assign,
+    FUNC_DEF: BytecodeCompiler._func_def,
+    RETURN: BytecodeCompiler._return,
+    IF: BytecodeCompiler._if,
+    WHILE: BytecodeCompiler._while,
+    INSTANCE: BytecodeCompiler._instance,
+    TYPE_DEF: BytecodeCompiler._type_def,
+    BINOP: BytecodeCompiler._expression_statement,
+    UNOP: BytecodeCompiler._expression_statement,
+    CONST: BytecodeCompiler._expression_statement,
+    VAR: BytecodeCompiler._expression_statement,
+    ARRAY_ACCESS: BytecodeCompiler._expression_statement,
+    FIELD_ACCESS: BytecodeCompiler._expression_statement,
+    FUNC_CALL: BytecodeCompiler._expression_statement,
+}
@@ -0,0 +1,159 @@
+from ast_nodes import DECL, DECL_ASSIGN, FUNC_DEF, RETURN, IF, WHILE, INSTANCE, TYPE_DEF
+
+
+# ----------------------------- Grafo de flujo de control -----------------------------
+# Cada bloque básico guarda una secuencia de elementos que se ejecutan siempre seguidos:
+# sentencias simples (declaraciones, asignaciones, return, expresiones) y, como último
+# elemento, la condición de un if o de un while. Las definiciones de funciones y de tipos
+# no ejecutan nada y no aparecen; cada función tiene su propio grafo.
+
+class BasicBlock:
+    __slots__ = ('index', 'items', 'succs', 'preds')
+
+    def __init__(self, index):
+        self.index = index
+        self.items = []
+        self.succs = []
+        self.preds = []
+
+    def __repr__(self):
+        return f"BasicBlock({self.index}, items={len(self.items)}, succs={[b.index for b in self.succs]})"
+
+
+class ControlFlowGraph:
+    __slots__ = ('blocks', 'entry', 'exit', 'function', 'declared', 'sequence')
+
+    def __init__(self, function=None):
+        self.blocks = []
+        self.function = function     # Nodo FuncDef, o None para el cuerpo principal
+        self.declared = {}           # Variable local -> número de orden del elemento que la declara
+        self.sequence = {}           # id del elemento -> número de orden en el código fuente
+        self.entry = self.new_block()
+        self.exit = self.new_block()
+
+    def is_local(self, name, item):
+        # Como en los backends, un nombre es local desde su declaración (incluida) en adelante
+        declared = self.declared.get(name)
+        return declared is not None and declared <= self.sequence[id(item)]
+
+    def new_block(self):
+        block = BasicBlock(len(self.blocks))
+        self.blocks.append(block)
+        return block
+
+    def link(self, source, target):
+        source.succs.append(target)
+        target.preds.append(source)
+
+    def postorder(self):
+        # DFS iterativo desde la entrada; los bloques inalcanzables van al final. Los sucesores
+        # se recorren al revés para que, en postorden inverso, el cuerpo de un bucle quede antes
+        # que el código que sigue al bucle (si no, cada vuelta lo recorrería entero otra vez)
+        order = []
+        seen = [False] * len(self.blocks)
+        seen[self.entry.index] = True
+        stack = [(self.entry, reversed(self.entry.succs))]
+        while stack:
+            block, succs = stack[-1]
+            for succ in succs:
+                if not seen[succ.index]:
+                    seen[succ.index] = True
+                    stack.append((succ, reversed(succ.succs)))
+                    break
+            else:
+                stack.pop()
+                order.append(block)
+        order.extend(block for block in self.blocks if not seen[block.index])
+        return order
+
+    def reverse_postorder(self):
+        order = self.postorder()
+        order.reverse()
+        return order
+
+
+# ----------------------------- Construcción -----------------------------
+# Se recorre con una pila explícita: sentencias pendientes y acciones (código, bloque) que
+# enlazan o abren bloques al terminar cada rama, así que el anidamiento no tiene límite.
+
+_START, _LINK = range(2)
+
+
+def build_cfg(statements, function=None):
+    cfg = ControlFlowGraph(function)
+    declared, sequence = cfg.declared, cfg.sequence
+    if function is not None:
+        declared.update((pname, -1) for _, pname in function.params)
+    current = cfg.new_block()
+    cfg.link(cfg.entry, current)
+
+    stack = list(reversed(statements))
+    while stack:
+        item = stack.pop()
+        if item.__class__ is tuple:
+            action, block = item
+            if action == _START:
+                current = block
+            else:
+                cfg.link(current, block)
+            continue
+
+        kind = item.kind
+        if kind in (FUNC_DEF, TYPE_DEF):
+            continue
+        if kind == IF:
+            sequence[id(item.cond)] = len(sequence)
+            current.items.append(item.cond)
+            then_block, join = cfg.new_block(), cfg.new_block()
+            cfg.link(current, then_block)
+            stack.append((_START, join))
+            if item.orelse:
+                else_block = cfg.new_block()
+                cfg.link(current, else_block)
+                stack.append((_LINK, join))
+                stack.extend(reversed(item.orelse))
+                stack.append((_START, else_block))
+            else:
+                cfg.link(current, join)
+            stack.append((_LINK, join))
+            stack.extend(reversed(item.then))
+            stack.append((_START, then_block))
+        elif kind == WHILE:
+            header, body, after = cfg.new_block(), cfg.new_block(), cfg.new_block()
+            cfg.link(current, header)
+            sequence[id(item.cond)] = len(sequence)
+            header.items.append(item.cond)
+            cfg.link(header, body)
+            cfg.link(header, after)
+            stack.append((_START, after))
+            stack.append((_LINK, header))   # Vuelta a la cabecera
+            stack.extend(reversed(item.body))
+            stack.append((_START, body))
+        else:
+            sequence[id(item)] = len(sequence)
+            if function is not None and kind in (DECL, DECL_ASSIGN, INSTANCE):
+                for name in (item.ids if kind != INSTANCE else (item.name,)):
+                    declared.setdefault(name, sequence[id(item)])
+            current.items.append(item)
+            if kind == RETURN:
+                # Lo que siga en el bloque queda en un bloque sin predecesores
+                cfg.link(current, cfg.exit)
+                current = cfg.new_block()
+    cfg.link(current, cfg.exit)
+    return cfg
+
+
+def build_cfgs(program):
+    # Grafo del cuerpo principal y de cada función (las funciones sólo se definen fuera de otras)
+    cfgs = [build_cfg(program.body)]
+    stack = list(reversed(program.body))
+    while stack:
+        stmt = stack.pop()
+        if stmt.kind == FUNC_DEF:
+            cfgs.append(build_cfg(stmt.body, stmt))
+        elif stmt.kind == IF:
+            stack.extend(reversed(stmt.orelse or ()))
+            stack.extend(reversed(stmt.then))
+        elif stmt.kind == WHILE:
+            stack.extend(reversed(stmt.body))
+    return cfgs
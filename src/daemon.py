@@ -0,0 +1,328 @@
+import argparse
+import json
+import math
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ast_nodes import Node, NODE, NODES
+from diagnostics import json_fields
+from main import ParserRunner
+from source_file import SourceFile
+from token_file import TokenFile
+from token_stream import TOKEN_NAMES
+
+
+# ----------------------------- Protocolo -----------------------------
+# Una petición o respuesta JSON por línea sobre un socket Unix; una conexión admite varias.
+#   {"op": "compile", "path": "prog.vip"}                    fichero (.vip, .txt o .vtk)
+#   {"op": "compile", "source": "int x\n", "filename": "a"}  texto
+#       "want": partes de la respuesta (por defecto ["tokens", "ast", "diagnostics"])
+#       "id":   se devuelve tal cual en la respuesta
+#   {"op": "ping"}       estado del servidor
+#   {"op": "shutdown"}   detiene el servidor
+# Respuesta a compile: {"ok": true, "status": "ok" | "lexer" | "syntax" | "semantic" | "runtime",
+#   "error", "tokens": [[tipo, valor, línea, posición], ...], "ast": {"tag", "line", "col", campos...},
+#   "diagnostics": [...como en --format json]}. Si la petición no se puede atender:
+#   {"ok": false, "error": "..."}. JSON no tiene infinitos ni NaN: un float así (1e999) va como
+#   texto, "inf", "-inf" o "nan".
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f'viper-{os.getuid()}.sock')
+PARTS = ('tokens', 'ast', 'diagnostics')
+
+
+def json_number(value):
+    if value.__class__ is float and not math.isfinite(value):
+        return repr(value)
+    return value
+
+
+# Árbol como JSON (recorrido con pila explícita: los hijos se convierten antes que el padre)
+def ast_json(tree):
+    if tree is None:
+        return None
+    done = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children() if isinstance(child, Node))
+            continue
+        fields = {'tag': node.tag, 'line': node.lineno, 'col': node.col}
+        for name, kind in zip(node.fields, node.field_kinds):
+            value = getattr(node, name)
+            if kind == NODE:
+                value = done[id(value)] if isinstance(value, Node) else value
+            elif kind == NODES and value is not None:
+                value = [done[id(child)] for child in value]
+            else:
+                value = json_number(value)
+            fields[name] = value
+        done[id(node)] = fields
+    return done[id(tree)]
+
+
+def tokens_json(tokens):
+    if isinstance(tokens, TokenFile):
+        tokens = tokens.to_buffer()
+    names = TOKEN_NAMES
+    return [[names[code], json_number(value), line, pos]
+            for code, value, line, pos in zip(tokens.types, tokens.values, tokens.linenos, tokens.lexpos)]
+
+
+# ----------------------------- Procesos de compilación -----------------------------
+# Cada proceso mantiene su ParserRunner (Lexer, Parser y tablas ya construidos) entre peticiones
+
+_worker_runner = None
+
+
+def _init_worker(options):
+    global _worker_runner
+    _worker_runner = ParserRunner(**options)
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _compile(request):
+    runner = _worker_runner
+    path = request.get('path')
+    filename = request.get('filename') or (os.path.basename(path) if path else '<entrada>')
+    if 'source' in request:
+        result = runner.compile_source(request['source'], filename)
+    elif path and path.endswith('.vtk'):
+        result = runner.compile_tokens(TokenFile.load(path), filename)
+    elif path:
+        with SourceFile(path) as source:
+            result = runner.compile_source(source.text(), filename)
+    else:
+        return {'ok': False, 'error': "La petición necesita 'path' o 'source'"}
+
+    want = request.get('want', PARTS)
+    response = {'ok': True, 'status': result.status, 'error': result.error}
+    if 'tokens' in want:
+        response['tokens'] = tokens_json(result.tokens)
+    if 'ast' in want:
+        response['ast'] = ast_json(result.ast)
+    if 'diagnostics' in want:
+        response['diagnostics'] = [json_fields(d) for d in result.diagnostics]
+    return response
+
+
+# ----------------------------- Servidor -----------------------------
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, jobs=1, max_pending=16, options=None):
+        # El socket se crea ya sólo accesible para el usuario (no hay un momento en que otro
+        # pueda conectarse antes de cambiarle los permisos)
+        mask = os.umask(0o077)
+        try:
+            super().__init__(path, _RequestHandler)
+        finally:
+            os.umask(mask)
+        self.path = path
+        self.jobs = jobs
+        self.options = options or {}
+        # Límite de concurrencia: jobs compilaciones a la vez y max_pending esperando turno;
+        # por encima se responde que el servidor está ocupado
+        self.slots = threading.BoundedSemaphore(jobs + max_pending)
+        self.pool_lock = threading.Lock()
+        self.pool = self._start_pool()
+        self.stats_lock = threading.Lock()    # Los contadores se actualizan desde varios hilos
+        self.served = 0
+        self.rejected = 0
+
+    def _start_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker, initargs=(self.options,))
+        # Se arrancan ya todos los procesos para que la primera petición no pague su construcción
+        for future in [pool.submit(_warm_up) for _ in range(self.jobs)]:
+            future.result()
+        return pool
+
+    def _restart_pool(self, broken):
+        # Si un proceso muere, el grupo entero queda inservible: se sustituye una sola vez
+        # aunque varias peticiones lo descubran a la vez
+        with self.pool_lock:
+            if self.pool is broken:
+                broken.shutdown(wait=False)
+                self.pool = self._start_pool()
+
+    def dispatch(self, request):
+        op = request.get('op', 'compile')
+        if op == 'ping':
+            with self.stats_lock:
+                return {'ok': True, 'pid': os.getpid(), 'jobs': self.jobs, 'served': self.served,
+                        'rejected': self.rejected}
+        if op == 'shutdown':
+            threading.Thread(target=self.shutdown).start()
+            return {'ok': True}
+        if op != 'compile':
+            return {'ok': False, 'error': f"Operación desconocida: {op}"}
+
+        if not self.slots.acquire(blocking=False):
+            with self.stats_lock:
+                self.rejected += 1
+            return {'ok': False, 'error': "Servidor ocupado, inténtalo de nuevo"}
+        pool = self.pool
+        try:
+            response = pool.submit(_compile, request).result()
+        except BrokenProcessPool:
+            self._restart_pool(pool)
+            response = {'ok': False, 'error': "El proceso de compilación terminó de forma inesperada"}
+        except Exception as e:
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        finally:
+            self.slots.release()
+        with self.stats_lock:
+            self.served += 1
+        return response
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("se esperaba un objeto")
+            except ValueError as e:
+                response = {'ok': False, 'error': f"Petición no válida: {e}"}
+            else:
+                response = self.server.dispatch(request)
+                if 'id' in request:
+                    response['id'] = request['id']
+            try:
+                reply = json.dumps(response, ensure_ascii=False, allow_nan=False)
+            except ValueError as e:
+                response = {'ok': False, 'error': f"Respuesta no representable en JSON: {e}",
+                            **({'id': response['id']} if 'id' in response else {})}
+                reply = json.dumps(response, ensure_ascii=False)
+            self.wfile.write(reply.encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+def serve(path=DEFAULT_SOCKET, jobs=1, max_pending=16, options=None):
+    if os.path.lexists(path):
+        # Sólo se borra un socket que ha dejado un servidor que ya no existe, nunca otro fichero
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            raise RuntimeError(f"{path} existe y no es un socket")
+        try:
+            with Client(path) as client:
+                client.request({'op': 'ping'})
+        except OSError:
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"Ya hay un servidor escuchando en {path}")
+    with CompileServer(path, jobs, max_pending, options) as server:
+        server.serve_forever()
+
+
+# ----------------------------- Cliente -----------------------------
+
+class Client:
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.rfile = self.sock.makefile('rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+    def request(self, request):
+        self.sock.sendall(json.dumps(request, ensure_ascii=False, allow_nan=False).encode('utf-8') + b'\n')
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError("El servidor ha cerrado la conexión")
+        return json.loads(line)
+
+    def compile(self, path=None, source=None, filename=None, want=PARTS):
+        request = {'op': 'compile', 'want': list(want)}
+        if source is not None:
+            request['source'] = source
+            if filename:
+                request['filename'] = filename
+        else:
+            request['path'] = os.path.abspath(path)
+        return self.request(request)
+
+
+# Para ejecutar desde consola:
+#   python daemon.py serve [-j N]             arranca el servidor
+#   python daemon.py compile f.vip [-]...     compila ficheros (o la entrada estándar con -)
+#   python daemon.py ping | stop
+if __name__ == "__main__":
+    argp = argparse.ArgumentParser(description="Servidor de compilación de Viper")
+    argp.add_argument('--socket', default=DEFAULT_SOCKET, help=f"socket Unix (por defecto {DEFAULT_SOCKET})")
+    commands = argp.add_subparsers(dest='command', required=True)
+
+    serve_args = commands.add_parser('serve', help="arranca el servidor")
+    serve_args.add_argument('-j', '--jobs', type=int, default=1, help="procesos de compilación")
+    serve_args.add_argument('--max-pending', type=int, default=16,
+                            help="peticiones que pueden esperar turno antes de responder 'ocupado'")
+    serve_args.add_argument('-O', '--optimize', action='store_true', help="como en main.py")
+    serve_args.add_argument('--scanner', choices=('ply', 'fast'), default='ply', help="como en main.py")
+
+    compile_args = commands.add_parser('compile', help="compila ficheros con el servidor")
+    compile_args.add_argument('files', nargs='+', help="ficheros .vip, .txt o .vtk; - lee el texto de la entrada")
+    compile_args.add_argument('--want', default=','.join(PARTS),
+                              help="partes de la respuesta separadas por comas (tokens, ast, diagnostics)")
+
+    commands.add_parser('ping', help="muestra el estado del servidor")
+    commands.add_parser('stop', help="detiene el servidor")
+    args = argp.parse_args()
+
+    if args.command == 'serve':
+        options = dict(production=True, output_format='json', optimize=args.optimize, scanner=args.scanner)
+        try:
+            serve(args.socket, args.jobs, args.max_pending, options)
+        except (RuntimeError, KeyboardInterrupt) as e:
+            if isinstance(e, RuntimeError):
+                print(e, file=sys.stderr)
+                sys.exit(1)
+        sys.exit(0)
+
+    failed = False
+    with Client(args.socket) as client:
+        if args.command == 'compile':
+            want = [part for part in args.want.split(',') if part]
+            for path in args.files:
+                if path == '-':
+                    response = client.compile(source=sys.stdin.read(), filename='<stdin>', want=want)
+                else:
+                    response = client.compile(path, want=want)
+                failed |= not response['ok'] or response['status'] != 'ok'
+                print(json.dumps(response, ensure_ascii=False))
+        else:
+            response = client.request({'op': 'ping' if args.command == 'ping' else 'shutdown'})
+            failed = not response['ok']
+            print(json.dumps(response, ensure_ascii=False))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,316 @@
+from heapq import heappop, heappush
+
+from ast_nodes import (Decl, DECL, DECL_ASSIGN, ASSIGN, RETURN, IF, WHILE, INSTANCE, FUNC_DEF, BINOP, UNOP,
+                       VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL)
+from cfg import build_cfgs
+from optimizer import is_pure
+
+
+# ----------------------------- Conjuntos de bits -----------------------------
+# Los conjuntos de los análisis son enteros de Python usados como vectores de bits: la
+# unión, la intersección y la diferencia cuestan una operación sobre palabras de máquina.
+
+class BitIndex:
+    __slots__ = ('items', 'bits')
+
+    def __init__(self):
+        self.items = []      # bit -> elemento
+        self.bits = {}       # elemento -> bit
+
+    def add(self, item):
+        bit = self.bits.get(item)
+        if bit is None:
+            bit = self.bits[item] = len(self.items)
+            self.items.append(item)
+        return bit
+
+    def mask(self, items):
+        bits = self.bits
+        result = 0
+        for item in items:
+            result |= 1 << bits[item]
+        return result
+
+    def members(self, mask):
+        items = self.items
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(items[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def __len__(self):
+        return len(self.items)
+
+
+# ----------------------------- Resolvedor -----------------------------
+
+def solve(cfg, gen, kill, forward=True, boundary=0, universe=None):
+    # Análisis genérico con lista de trabajo: out = gen | (in & ~kill) hacia delante,
+    # in = gen | (out & ~kill) hacia atrás. Por defecto es "may" (unión en las confluencias);
+    # con universe es "must": intersección, partiendo de que todo se cumple en todas partes.
+    # La lista es un montículo por posición en postorden inverso (o en postorden, hacia
+    # atrás): en grafos sin bucles basta una pasada y cada bucle sólo repite sus bloques.
+    blocks = cfg.blocks
+    must = universe is not None
+    initial = universe if must else 0
+    ins, outs = [initial] * len(blocks), [initial] * len(blocks)
+    order = cfg.reverse_postorder() if forward else cfg.postorder()
+    start = cfg.entry if forward else cfg.exit
+    position = [0] * len(blocks)
+    for i, block in enumerate(order):
+        position[block.index] = i
+    queued = [True] * len(blocks)
+    worklist = list(range(len(order)))   # Ya es un montículo
+    while worklist:
+        block = order[heappop(worklist)]
+        index = block.index
+        queued[index] = False
+        if forward:
+            if block is start:
+                incoming = boundary
+            elif must:
+                incoming = universe
+                for pred in block.preds:
+                    incoming &= outs[pred.index]
+            else:
+                incoming = 0
+                for pred in block.preds:
+                    incoming |= outs[pred.index]
+            ins[index] = incoming
+            value = gen[index] | (incoming & ~kill[index])
+            if value != outs[index]:
+                outs[index] = value
+                for succ in block.succs:
+                    if not queued[succ.index]:
+                        queued[succ.index] = True
+                        heappush(worklist, position[succ.index])
+        else:
+            if block is start:
+                outgoing = boundary
+            elif must:
+                outgoing = universe
+                for succ in block.succs:
+                    outgoing &= ins[succ.index]
+            else:
+                outgoing = 0
+                for succ in block.succs:
+                    outgoing |= ins[succ.index]
+            outs[index] = outgoing
+            value = gen[index] | (outgoing & ~kill[index])
+            if value != ins[index]:
+                ins[index] = value
+                for pred in block.preds:
+                    if not queued[pred.index]:
+                        queued[pred.index] = True
+                        heappush(worklist, position[pred.index])
+    return ins, outs
+
+
+# ----------------------------- Efectos de cada elemento -----------------------------
+# Una variable es (ámbito, nombre) con ámbito 'local' o 'global'. Escribir en un elemento
+# de un vector o en un campo de un registro no define la variable: la usa (la referencia).
+
+LOCAL, GLOBAL = 'local', 'global'
+
+
+def item_effects(cfg, item):
+    # (variables usadas, variables definidas, contiene llamadas)
+    def variable(name):
+        if cfg.function is not None and cfg.is_local(name, item):
+            return LOCAL, name
+        return GLOBAL, name
+
+    kind = item.kind
+    uses, defs, expressions = [], [], []
+    if kind == DECL:
+        defs = [variable(name) for name in item.ids]
+    elif kind == DECL_ASSIGN:
+        defs = [variable(name) for name in item.ids]
+        expressions.append(item.expr)
+    elif kind == INSTANCE:
+        defs = [variable(item.name)]
+    elif kind == ASSIGN:
+        target = item.target
+        if target.kind == VAR:
+            defs = [variable(target.name)]
+        else:
+            expressions.append(target)
+        expressions.append(item.expr)
+    elif kind == RETURN:
+        expressions.append(item.expr)
+    else:
+        expressions.append(item)   # Condición o expresión suelta
+
+    calls = False
+    while expressions:
+        node = expressions.pop()
+        kind = node.kind
+        if kind == VAR:
+            uses.append(variable(node.name))
+        elif kind == BINOP:
+            expressions.append(node.left)
+            expressions.append(node.right)
+        elif kind == UNOP:
+            expressions.append(node.operand)
+        elif kind == ARRAY_ACCESS:
+            expressions.append(node.array)
+            expressions.append(node.index)
+        elif kind == FIELD_ACCESS:
+            expressions.append(node.obj)
+        elif kind == FUNC_CALL:
+            calls = True
+            expressions.extend(node.args)
+    return uses, defs, calls
+
+
+class _Effects:
+    # Efectos de todos los elementos del grafo como máscaras sobre un mismo índice de variables
+    def __init__(self, cfg):
+        self.variables = BitIndex()
+        raw = []
+        for block in cfg.blocks:
+            for item in block.items:
+                uses, defs, calls = item_effects(cfg, item)
+                for var in uses + defs:
+                    self.variables.add(var)
+                raw.append((item, uses, defs, calls))
+        # Las globales se ven desde fuera: las leen las funciones llamadas y quien ejecuta el programa
+        self.globals = self.variables.mask(var for var in self.variables.items if var[0] == GLOBAL)
+        self.items = {}
+        for item, uses, defs, calls in raw:
+            use = self.variables.mask(uses) | (self.globals if calls else 0)
+            self.items[id(item)] = (use, self.variables.mask(defs), calls)
+
+
+# ----------------------------- Vida de variables -----------------------------
+
+class Liveness:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        effects = self.effects = _Effects(cfg)
+        self.variables = effects.variables
+        gen, kill = [], []
+        for block in cfg.blocks:
+            use = defs = 0
+            for item in reversed(block.items):
+                item_use, item_defs, _ = effects.items[id(item)]
+                use = (use & ~item_defs) | item_use
+                defs |= item_defs
+            gen.append(use)
+            kill.append(defs)
+        self.live_in, self.live_out = solve(cfg, gen, kill, forward=False, boundary=effects.globals)
+
+    def live_variables(self, mask):
+        return self.variables.members(mask)
+
+
+# ----------------------------- Definiciones que alcanzan -----------------------------
+
+class ReachingDefinitions:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        effects = _Effects(cfg)
+        self.definitions = BitIndex()   # (elemento o None, variable); None: valor de entrada
+        by_variable = {}
+
+        def define(item, var):
+            bit = self.definitions.add((item, var))
+            by_variable[var] = by_variable.get(var, 0) | (1 << bit)
+            return bit
+
+        # A la entrada toda variable tiene ya un valor: parámetro, global o el inicial del marco
+        boundary = 0
+        for var in effects.variables.items:
+            boundary |= 1 << define(None, var)
+
+        item_defs = {}
+        for block in cfg.blocks:
+            for item in block.items:
+                _, defs, calls = effects.items[id(item)]
+                strong = [define(item, var) for var in effects.variables.members(defs)]
+                # Una llamada puede escribir cualquier global: la define sin matar las demás
+                weak = [define(item, var) for var in effects.variables.members(effects.globals)] if calls else []
+                item_defs[id(item)] = (strong, weak)
+
+        gen, kill = [], []
+        for block in cfg.blocks:
+            block_gen = block_kill = 0
+            for item in block.items:
+                strong, weak = item_defs[id(item)]
+                for bit in strong:
+                    killed = by_variable[self.definitions.items[bit][1]]
+                    block_kill |= killed
+                    block_gen = (block_gen & ~killed) | (1 << bit)
+                for bit in weak:
+                    block_gen |= 1 << bit
+            gen.append(block_gen)
+            kill.append(block_kill)
+        self.by_variable = by_variable
+        self.reach_in, self.reach_out = solve(cfg, gen, kill, forward=True, boundary=boundary)
+
+    def reaching(self, block, var=None):
+        # Definiciones que llegan al principio del bloque (de una variable, si se indica)
+        mask = self.reach_in[block.index]
+        if var is not None:
+            mask &= self.by_variable.get(var, 0)
+        return self.definitions.members(mask)
+
+
+# ----------------------------- Asignaciones muertas -----------------------------
+
+def find_dead_stores(cfg, liveness=None):
+    # Asignaciones a variables que nadie lee después y cuya expresión no tiene efectos
+    liveness = liveness or Liveness(cfg)
+    effects = liveness.effects.items
+    dead = []
+    for block in cfg.blocks:
+        live = liveness.live_out[block.index]
+        for item in reversed(block.items):
+            use, defs, _ = effects[id(item)]
+            kind = item.kind
+            removable = (kind == DECL_ASSIGN or kind == ASSIGN and item.target.kind == VAR)
+            if removable and not defs & live and is_pure(item.expr):
+                dead.append(item)
+                if kind == DECL_ASSIGN:
+                    live &= ~defs   # Queda la declaración, que también define
+                continue
+            live = (live & ~defs) | use
+    return dead
+
+
+def eliminate_dead_stores(program):
+    # Se repite hasta que no queda nada: quitar una asignación puede dejar muerta otra anterior
+    removed = 0
+    while True:
+        dead = {}
+        for cfg in build_cfgs(program):
+            dead.update((id(item), item) for item in find_dead_stores(cfg))
+        if not dead:
+            return removed
+        removed += len(dead)
+        _rewrite_blocks(program, dead)
+
+
+def _rewrite_blocks(program, dead):
+    # Las asignaciones muertas desaparecen; una declaración con valor se queda en declaración
+    stack = [(program, 'body')]
+    while stack:
+        node, attr = stack.pop()
+        statements = getattr(node, attr)
+        if statements is None:
+            continue
+        result = []
+        for stmt in statements:
+            if id(stmt) in dead:
+                if stmt.kind == DECL_ASSIGN:
+                    result.append(Decl(stmt.type, stmt.ids, stmt.lineno, stmt.col))
+                continue
+            result.append(stmt)
+            if stmt.kind == IF:
+                stack.append((stmt, 'then'))
+                stack.append((stmt, 'orelse'))
+            elif stmt.kind in (WHILE, FUNC_DEF):
+                stack.append((stmt, 'body'))
+        setattr(node, attr, result)
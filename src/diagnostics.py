@@ -0,0 +1,181 @@
+import json
+import sys
+from array import array
+from bisect import bisect_right
+
+
+# ----------------------------- Severidades -----------------------------
+DEBUG, NOTE, WARNING, ERROR = 'debug', 'note', 'warning', 'error'
+_LEVELS = {DEBUG: 0, NOTE: 1, WARNING: 2, ERROR: 3}
+
+# Prefijo del formato de texto según la fase (primera parte del código)
+_TEXT_PREFIX = {
+    'lexer': '[Lexer Error]',
+    'syntax': '[Syntax Error]',
+    'semantic': '[Semantic Error]',
+    'runtime': '[Runtime Error]',
+    'optimizer': '[Optimizer]',
+}
+
+
+class Diagnostic:
+    __slots__ = ('severity', 'code', 'message', 'file', 'line', 'col', 'offset')
+
+    def __init__(self, severity, code, message, file=None, line=0, col=None, offset=None):
+        self.severity = severity
+        self.code = code            # '<fase>.<motivo>', por ejemplo 'lexer.illegal-char'
+        self.message = message
+        self.file = file
+        self.line = line
+        self.col = col              # Se calcula a partir de offset sólo cuando hace falta
+        self.offset = offset
+
+    @property
+    def phase(self):
+        return self.code.split('.', 1)[0]
+
+    def to_record(self):
+        return (self.severity, self.code, self.message, self.line, self.col)
+
+    @classmethod
+    def from_record(cls, record, file=None):
+        severity, code, message, line, col = record
+        return cls(severity, code, message, file, line, col)
+
+    def __repr__(self):
+        return f"Diagnostic({self.severity!r}, {self.code!r}, {self.message!r}, line={self.line}, col={self.col})"
+
+
+# Tabla de inicios de línea: la columna de un offset se obtiene con una búsqueda binaria
+class LineIndex:
+    __slots__ = ('starts',)
+
+    def __init__(self, text):
+        starts = array('I', [0])
+        find = text.find
+        pos = find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        self.starts = starts
+
+    # A partir de las posiciones de los saltos de línea (p. ej. las de un fichero .vtk)
+    @classmethod
+    def from_newlines(cls, offsets):
+        index = cls('')
+        index.starts.extend(offset + 1 for offset in offsets)
+        return index
+
+    def line_col(self, offset):
+        # Línea y columna (ambas desde 1)
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def column(self, offset):
+        return self.line_col(offset)[1]
+
+
+# Recolector de diagnósticos de una compilación
+class DiagnosticSink:
+    def __init__(self, file=None, source=None, level=NOTE, line_index=None):
+        self.file = file
+        self.source = source
+        self.level = _LEVELS[level]
+        self.items = []
+        self._line_index = line_index    # Sin texto fuente, las columnas pueden salir de un LineIndex dado
+
+    def wants(self, severity):
+        return _LEVELS[severity] >= self.level
+
+    def report(self, severity, code, message, line=0, offset=None, col=None):
+        if _LEVELS[severity] < self.level:
+            return None
+        diag = Diagnostic(severity, code, message, self.file, line, col, offset)
+        self.items.append(diag)
+        return diag
+
+    def error(self, code, message, line=0, offset=None, col=None):
+        return self.report(ERROR, code, message, line, offset, col)
+
+    def warning(self, code, message, line=0, offset=None, col=None):
+        return self.report(WARNING, code, message, line, offset, col)
+
+    def note(self, code, message, line=0, offset=None, col=None):
+        return self.report(NOTE, code, message, line, offset, col)
+
+    def debug(self, code, message, line=0, offset=None, col=None):
+        return self.report(DEBUG, code, message, line, offset, col)
+
+    @property
+    def has_errors(self):
+        return any(d.severity == ERROR for d in self.items)
+
+    def _resolve(self, diag):
+        if diag.col is None and diag.offset is not None and (self.source is not None or self._line_index is not None):
+            if self._line_index is None:
+                self._line_index = LineIndex(self.source)
+            diag.col = self._line_index.column(diag.offset)
+        return diag
+
+    def resolve(self):
+        # Calcula las columnas pendientes; la tabla de líneas sólo se construye si hay alguna
+        for diag in self.items:
+            self._resolve(diag)
+        return self.items
+
+
+# ----------------------------- Salida -----------------------------
+
+def render_text(diag):
+    if diag.severity == DEBUG:
+        return diag.message
+    prefix = _TEXT_PREFIX.get(diag.phase, '[Error]')
+    if diag.phase in ('semantic', 'runtime') and diag.line:
+        return f"{prefix} Línea {diag.line}: {diag.message}"
+    return f"{prefix} {diag.message}"
+
+
+def json_fields(diag):
+    return {
+        'severity': diag.severity,
+        'code': diag.code,
+        'file': diag.file,
+        'line': diag.line,
+        'col': diag.col,
+        'message': diag.message,
+    }
+
+
+def render_json(diag):
+    return json.dumps(json_fields(diag), ensure_ascii=False)
+
+
+# Escritura de diagnósticos como JSON, una línea por diagnóstico, con buffer propio
+class JsonLinesWriter:
+    def __init__(self, stream=None, level=NOTE, buffer_size=1 << 16):
+        self.stream = stream or sys.stdout
+        self.level = _LEVELS[level]
+        self.buffer_size = buffer_size
+        self._chunks = []
+        self._pending = 0
+
+    def format(self, diagnostics):
+        return ''.join(render_json(d) + '\n' for d in diagnostics if _LEVELS[d.severity] >= self.level)
+
+    def write(self, diagnostics):
+        self.write_text(self.format(diagnostics))
+
+    def write_text(self, text):
+        if not text:
+            return
+        self._chunks.append(text)
+        self._pending += len(text)
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._chunks:
+            self.stream.write(''.join(self._chunks))
+            self._chunks = []
+            self._pending = 0
+        self.stream.flush()
@@ -0,0 +1,806 @@
+import operator
+
+from ast_nodes import (DECL, DECL_ASSIGN, ASSIGN, FUNC_DEF, RETURN, IF, WHILE, INSTANCE, TYPE_DEF,
+                       BINOP, UNOP, CONST, VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL)
+from vectors import (VectorError, REDUCTIONS, OVERFLOW_MESSAGE, INT_MIN, INT_MAX, vector_maker, elementwise,
+                     negate, reduce)
+from records import rows
+
+
+class ExecutionError(Exception):
+    def __init__(self, message, lineno=None, col=None):
+        self.message = message
+        self.lineno = lineno
+        self.col = col
+        if lineno is not None:
+            message = f"[Runtime Error] Línea {lineno}: {message}"
+        super().__init__(message)
+
+
+# ----------------------------- Valores -----------------------------
+# int, float y bool son los de Python y char es un str de longitud 1. Los vectores de int y
+# float son array.array (ver vectors.py), los de bool y char y los registros son listas; un
+# registro guarda sus campos en el orden en que se declararon y un vector de registros, una
+# columna por campo (ver records.py).
+
+SCALAR_DEFAULTS = {'int': 0, 'float': 0.0, 'bool': False, 'char': '\0'}
+
+
+def is_vector(vtype):
+    return isinstance(vtype, tuple) and vtype[0] == 'vector'
+
+
+def const_value(value):
+    # true/false llegan como texto desde el lexer
+    if value == 'true':
+        return True
+    if value == 'false':
+        return False
+    return value
+
+
+def coerce(value, source, target):
+    # Conversiones automáticas sin pérdida: char -> int/float, int -> float
+    if source == target:
+        return value
+    if source == 'char':
+        value = ord(value)
+    if target == 'float':
+        return float(value)
+    return value
+
+
+def format_value(value, vtype, records):
+    if vtype == 'bool':
+        return 'true' if value else 'false'
+    if vtype == 'char':
+        if value in ("'", '\\'):
+            return f"'\\{value}'"
+        return f"'{value}'" if value.isprintable() else f"'\\x{ord(value):02x}'"
+    if vtype in ('int', 'float'):
+        return repr(value)
+    if is_vector(vtype):
+        items = rows(value) if vtype[1] in records else value
+        return '[' + ', '.join(format_value(item, vtype[1], records) for item in items) + ']'
+    if value is None:
+        return '-'
+    layout = records[vtype]
+    fields = ', '.join(f"{name}: {format_value(value[offset], ftype, records)}"
+                       for name, (offset, ftype) in layout.items())
+    return f"{vtype}{{{fields}}}"
+
+
+def int_div(a, b):
+    # División entera truncando hacia cero, como en C
+    q = a // b
+    if q < 0 and q * b != a:
+        q += 1
+    return q
+
+
+# ----------------------------- Programa compilado -----------------------------
+
+# Ámbito de compilación: nombre -> índice en el marco (lista) de la función o del programa
+class _Scope:
+    __slots__ = ('slots', 'types', 'template')
+
+    def __init__(self):
+        self.slots = {}
+        self.types = []
+        self.template = []   # Valor inicial de cada posición (escalares; None para vectores y registros)
+
+    def declare(self, name, vtype):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.types)
+            self.types.append(vtype)
+            self.template.append(SCALAR_DEFAULTS.get(vtype) if isinstance(vtype, str) else None)
+        return slot
+
+
+class _Function:
+    __slots__ = ('name', 'type', 'param_types', 'body', 'template')
+
+    def __init__(self, name, ftype, param_types):
+        self.name = name
+        self.type = ftype
+        self.param_types = param_types
+        self.body = None
+        self.template = None
+
+
+class CompiledProgram:
+    __slots__ = ('_body', '_globals', '_scope', 'records')
+
+    def __init__(self, body, global_values, scope, records):
+        self._body = body
+        self._globals = global_values
+        self._scope = scope
+        self.records = records
+
+    def run(self):
+        # Las funciones comparten la lista de globales, así que se reinicia en el sitio
+        g = self._globals
+        g[:] = self._scope.template
+        try:
+            self._body(g)
+        except RecursionError:
+            raise ExecutionError("Se ha superado la profundidad máxima de llamadas.") from None
+        return self.variables()
+
+    def variables(self):
+        g = self._globals
+        return {name: g[slot] for name, slot in self._scope.slots.items()}
+
+    def format_variables(self):
+        g, types = self._globals, self._scope.types
+        return [f"{name} = {format_value(g[slot], types[slot], self.records)}"
+                for name, slot in self._scope.slots.items()]
+
+
+# ----------------------------- Compilador a closures -----------------------------
+# Cada sentencia y cada expresión del AST (ya tipado por SemanticAnalyzer) se convierte una
+# sola vez en una función anidada f(marco). Las variables se resuelven al compilar a una
+# posición del marco, así que ejecutar no busca nombres ni recorre el árbol. Las sentencias
+# devuelven None, salvo 'return' (y los bloques que lo contienen), que devuelven el valor.
+
+class ClosureCompiler:
+    def __init__(self):
+        self.records = {}       # tipo -> {campo: (posición, tipo)}
+        self.functions = {}     # nombre -> _Function
+        self.global_scope = _Scope()
+        self.global_values = []
+        self.scope = self.global_scope
+        self.function = None    # Función que se está compilando
+
+    def compile(self, program):
+        body, _ = self._block(program.body)
+        return CompiledProgram(body, self.global_values, self.global_scope, self.records)
+
+    # ----------------------------- Sentencias -----------------------------
+
+    def _block(self, statements):
+        # Devuelve (closure, puede_retornar)
+        compiled = []
+        can_return = False
+        for stmt in statements:
+            fn, returns = _STATEMENT_COMPILERS[stmt.kind](self, stmt)
+            if fn is not None:
+                compiled.append(fn)
+                can_return = can_return or returns
+        return _sequence(compiled, can_return), can_return
+
+    def _decl(self, stmt):
+        slots = [self.scope.declare(name, stmt.type) for name in stmt.ids]
+        make = self._allocator(stmt.type)
+        if make is not None:
+            def run(f):
+                for i in slots:
+                    f[i] = make()
+        elif len(slots) == 1:
+            i, value = slots[0], SCALAR_DEFAULTS[stmt.type]
+
+            def run(f):
+                f[i] = value
+        else:
+            value = SCALAR_DEFAULTS[stmt.type]
+
+            def run(f):
+                for i in slots:
+                    f[i] = value
+        return run, False
+
+    def _decl_assign(self, stmt):
+        # Como en el análisis semántico, las variables existen ya al evaluar la expresión
+        slots = [self.scope.declare(name, stmt.type) for name in stmt.ids]
+        expr = self._coerced(stmt.expr, stmt.type)
+        if len(slots) == 1:
+            i = slots[0]
+
+            def run(f):
+                f[i] = expr(f)
+        else:
+            def run(f):
+                value = expr(f)
+                for i in slots:
+                    f[i] = value
+        return run, False
+
+    def _instance(self, stmt):
+        i = self.scope.declare(stmt.name, stmt.type_name)
+        make = self._allocator(stmt.type_name)
+
+        def run(f):
+            f[i] = make()
+        return run, False
+
+    def _type_def(self, stmt):
+        self.records[stmt.name] = {name: (offset, ftype)
+                                   for offset, (ftype, name) in enumerate(stmt.record_fields)}
+        return None, False
+
+    def _assign(self, stmt):
+        target = stmt.target
+        kind = target.kind
+        if kind == VAR:
+            is_local, i, vtype = self._resolve(target)
+            expr = self._coerced(stmt.expr, vtype)
+            if is_local:
+                def run(f):
+                    f[i] = expr(f)
+            else:
+                g = self.global_values
+
+                def run(f):
+                    g[i] = expr(f)
+            return run, False
+
+        expr = self._coerced(stmt.expr, target.type)
+        if kind == ARRAY_ACCESS:
+            array, index = self._expr(target.array), self._expr(target.index)
+            n = target.array.type[2]
+            lineno, col = target.lineno, target.col
+            if target.safe:
+                # Índice siempre dentro del vector (bounds.py): sin comprobación
+                def run(f):
+                    value = expr(f)
+                    try:
+                        array(f)[index(f)] = value
+                    except OverflowError:
+                        raise ExecutionError(OVERFLOW_MESSAGE, lineno, col) from None
+                return run, False
+
+            # El valor se evalúa antes que el vector y el índice, como en tree_walker: una
+            # llamada en el valor puede cambiar las variables del índice
+            def run(f):
+                value = expr(f)
+                vector, i = array(f), index(f)
+                if not 0 <= i < n:
+                    raise _index_error(i, n, lineno, col)
+                try:
+                    vector[i] = value
+                except OverflowError:    # Un int que no cabe en un vector de 64 bits
+                    raise ExecutionError(OVERFLOW_MESSAGE, lineno, col) from None
+            return run, False
+
+        if kind == FIELD_ACCESS:
+            obj = self._expr(target.obj)
+            offset = target.offset
+
+            def run(f):
+                obj(f)[offset] = expr(f)
+            return run, False
+
+        raise ExecutionError(f"Asignación a estructura no válida: {target.tag}", stmt.lineno, stmt.col)
+
+    def _func_def(self, stmt):
+        if self.function is not None:
+            raise ExecutionError("No se pueden ejecutar funciones definidas dentro de otra función.",
+                                 stmt.lineno, stmt.col)
+        function = _Function(stmt.name, stmt.type, [ptype for ptype, _ in stmt.params])
+        self.functions[stmt.name] = function   # Antes del cuerpo: permite la recursión
+
+        self.scope, self.function = _Scope(), function
+        try:
+            for ptype, pname in stmt.params:
+                self.scope.declare(pname, ptype)
+            function.body, _ = self._block(stmt.body)
+            function.template = self.scope.template
+        finally:
+            self.scope, self.function = self.global_scope, None
+        return None, False
+
+    def _return(self, stmt):
+        expr = self._coerced(stmt.expr, self.function.type)
+
+        def run(f):
+            return expr(f)
+        return run, True
+
+    def _if(self, stmt):
+        cond = self._expr(stmt.cond)
+        then, then_returns = self._block(stmt.then)
+        if not stmt.orelse:
+            def run(f):
+                if cond(f):
+                    return then(f)
+            return run, then_returns
+
+        orelse, else_returns = self._block(stmt.orelse)
+
+        def run(f):
+            if cond(f):
+                return then(f)
+            return orelse(f)
+        return run, then_returns or else_returns
+
+    def _while(self, stmt):
+        cond = self._expr(stmt.cond)
+        body, returns = self._block(stmt.body)
+        if returns:
+            def run(f):
+                while cond(f):
+                    result = body(f)
+                    if result is not None:
+                        return result
+        else:
+            def run(f):
+                while cond(f):
+                    body(f)
+        return run, returns
+
+    def _expression_statement(self, stmt):
+        expr = self._expr(stmt)
+
+        def run(f):
+            expr(f)
+        return run, False
+
+    # ----------------------------- Variables y valores -----------------------------
+
+    def _resolve(self, var):
+        # (es_local, posición, tipo); dentro de una función, lo no declarado en ella es global
+        slot = self.scope.slots.get(var.name)
+        if slot is not None:
+            return True, slot, self.scope.types[slot]
+        slot = self.global_scope.slots.get(var.name)
+        if slot is None:
+            raise ExecutionError(f"La variable '{var.name}' no ha sido declarada.", var.lineno, var.col)
+        return False, slot, self.global_scope.types[slot]
+
+    def _allocator(self, vtype):
+        # Función que crea un valor nuevo de un tipo compuesto (None para los escalares)
+        if is_vector(vtype):
+            make = vector_maker(vtype)
+            if make is not None:
+                return make
+            base, n = vtype[1], vtype[2]
+            if base in SCALAR_DEFAULTS:
+                default = SCALAR_DEFAULTS[base]
+                return lambda: [default] * n
+            if base in self.records:
+                # Vector de registros: una columna (un vector de n elementos) por campo
+                columns = [self._allocator(('vector', ftype, n)) for _, ftype in self.records[base].values()]
+                return lambda: [make() for make in columns]
+            make = self._allocator(base)     # Columna de un campo vector: n vectores
+            return lambda: [make() for _ in range(n)]
+        if vtype in SCALAR_DEFAULTS:
+            return None
+        layout = self.records.get(vtype)
+        if layout is None:
+            raise ExecutionError(f"El tipo '{vtype}' no está definido.")
+        makers = [self._allocator(ftype) for _, ftype in layout.values()]
+        template = [SCALAR_DEFAULTS.get(ftype) if isinstance(ftype, str) else None
+                    for _, ftype in layout.values()]
+        if not any(makers):
+            return template.copy
+        return lambda: [make() if make else value for make, value in zip(makers, template)]
+
+    def _coerced(self, node, target):
+        return _coerce_closure(self._expr(node), node.type, target)
+
+    # ----------------------------- Expresiones -----------------------------
+
+    def _expr(self, root):
+        # Post-orden con pila explícita; cada nodo se compila una vez que lo están sus hijos
+        compiled = {}
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node.type is None:
+                raise ExecutionError("El programa no ha pasado el análisis semántico.", node.lineno, node.col)
+            if not expanded:
+                children = _expression_children(node)
+                if children:
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in reversed(children))
+                    continue
+            compiled[id(node)] = _EXPRESSION_COMPILERS[node.kind](self, node, compiled)
+        return compiled[id(root)]
+
+    def _const(self, node, compiled):
+        value = const_value(node.value)
+        return lambda f: value
+
+    def _var(self, node, compiled):
+        is_local, i, _ = self._resolve(node)
+        if is_local:
+            return lambda f: f[i]
+        g = self.global_values
+        return lambda f: g[i]
+
+    def _binop(self, node, compiled):
+        op, optype = node.op, node.left.type
+        left, right = compiled[id(node.left)], compiled[id(node.right)]
+        lineno, col = node.lineno, node.col
+
+        if op == 'and':
+            return lambda f: left(f) and right(f)
+        if op == 'or':
+            return lambda f: left(f) or right(f)
+
+        if is_vector(node.type):
+            return _vector_closure(op, node.type[1], left, right, lineno, col)
+
+        if optype == 'char' and op not in _COMPARE_OPS:
+            # Aritmética de caracteres sobre sus códigos, dentro del rango de 8 bits
+            fn = int_div if op == '/' else _ARITH_OPS[op]
+
+            def char_op(f):
+                try:
+                    return chr(fn(ord(left(f)), ord(right(f))) % 256)
+                except ZeroDivisionError:
+                    raise ExecutionError("División por cero.", lineno, col) from None
+            return char_op
+
+        if op == '/':
+            if optype == 'int':
+                def div(f):
+                    try:
+                        value = int_div(left(f), right(f))
+                    except ZeroDivisionError:
+                        raise ExecutionError("División por cero.", lineno, col) from None
+                    if value > INT_MAX:      # INT_MIN / -1
+                        raise ExecutionError(OVERFLOW_MESSAGE, lineno, col)
+                    return value
+            else:
+                def div(f):
+                    try:
+                        return left(f) / right(f)
+                    except ZeroDivisionError:
+                        raise ExecutionError("División por cero.", lineno, col) from None
+            return div
+
+        # Formas frecuentes en bucles (i + 1, i < n, a * b) sin llamar a las closures de los hijos
+        lslot = self._local_slot(node.left)
+        if optype == 'int' and op in _ARITH_OPS:
+            # Los int son de 64 bits, como en la máquina virtual
+            rslot = self._local_slot(node.right)
+            if lslot is not None and node.right.kind == CONST:
+                return _int_local_const(_ARITH_OPS[op], lslot, const_value(node.right.value), lineno, col)
+            if lslot is not None and rslot is not None:
+                return _int_local_local(_ARITH_OPS[op], lslot, rslot, lineno, col)
+            return _int_expr_expr(_ARITH_OPS[op], left, right, lineno, col)
+        if node.right.kind == CONST:
+            value = const_value(node.right.value)
+            if lslot is not None:
+                return _local_const(op, lslot, value)
+            return _expr_const(op, left, value)
+        rslot = self._local_slot(node.right)
+        if lslot is not None and rslot is not None:
+            return _local_local(op, lslot, rslot)
+        return _expr_expr(op, left, right)
+
+    def _local_slot(self, node):
+        if node.kind != VAR:
+            return None
+        return self.scope.slots.get(node.name)
+
+    def _unop(self, node, compiled):
+        operand = compiled[id(node.operand)]
+        if node.op == 'not':
+            return lambda f: not operand(f)
+        if node.type == 'char':
+            return lambda f: chr(-ord(operand(f)) % 256)
+        if is_vector(node.type):
+            base, lineno, col = node.type[1], node.lineno, node.col
+
+            def negated(f):
+                try:
+                    return negate(base, operand(f))
+                except VectorError as e:
+                    raise ExecutionError(e.message, lineno, col) from None
+            return negated
+        if node.type == 'int':
+            lineno, col = node.lineno, node.col
+
+            def negated(f):
+                value = -operand(f)
+                if value > INT_MAX:      # -INT_MIN
+                    raise ExecutionError(OVERFLOW_MESSAGE, lineno, col)
+                return value
+            return negated
+        return lambda f: -operand(f)
+
+    def _array_access(self, node, compiled):
+        array, index = compiled[id(node.array)], compiled[id(node.index)]
+        n = node.array.type[2]
+        lineno, col = node.lineno, node.col
+        if node.safe:
+            # v[i] con v e i locales es la forma de los bucles: se lee el marco directamente
+            vslot, islot = self._local_slot(node.array), self._local_slot(node.index)
+            if vslot is not None and islot is not None:
+                return lambda f: f[vslot][f[islot]]
+
+            def unchecked(f):
+                i = index(f)        # Primero el índice, como con comprobación
+                return array(f)[i]
+            return unchecked
+
+        def access(f):
+            i = index(f)
+            if 0 <= i < n:
+                return array(f)[i]
+            raise _index_error(i, n, lineno, col)
+        return access
+
+    def _field_access(self, node, compiled):
+        obj = compiled[id(node.obj)]
+        offset = node.offset
+        return lambda f: obj(f)[offset]
+
+    def _func_call(self, node, compiled):
+        function = self.functions.get(node.name)
+        if function is None and node.name in REDUCTIONS:
+            return _reduction_closure(node, [compiled[id(arg)] for arg in node.args])
+        if function is None:
+            raise ExecutionError(f"La función '{node.name}' no está definida.", node.lineno, node.col)
+        args = [_coerce_closure(compiled[id(arg)], arg.type, ptype)
+                for arg, ptype in zip(node.args, function.param_types)]
+        name, lineno, col = function.name, node.lineno, node.col
+        nargs = len(args)
+
+        # El cuerpo y la plantilla del marco se leen al llamar: así funciona la recursión
+        if nargs == 1:
+            arg0 = args[0]
+
+            def call(f):
+                frame = function.template[:]
+                frame[0] = arg0(f)
+                result = function.body(frame)
+                if result is None:
+                    raise ExecutionError(f"La función '{name}' terminó sin ejecutar 'return'.", lineno, col)
+                return result
+        elif nargs == 2:
+            arg0, arg1 = args
+
+            def call(f):
+                frame = function.template[:]
+                frame[0] = arg0(f)
+                frame[1] = arg1(f)
+                result = function.body(frame)
+                if result is None:
+                    raise ExecutionError(f"La función '{name}' terminó sin ejecutar 'return'.", lineno, col)
+                return result
+        else:
+            def call(f):
+                frame = function.template[:]
+                for i in range(nargs):
+                    frame[i] = args[i](f)
+                result = function.body(frame)
+                if result is None:
+                    raise ExecutionError(f"La función '{name}' terminó sin ejecutar 'return'.", lineno, col)
+                return result
+        return call
+
+
+def compile_program(program):
+    return ClosureCompiler().compile(program)
+
+
+def _coerce_closure(expr, source, target):
+    if source == target or source not in SCALAR_DEFAULTS or target not in SCALAR_DEFAULTS:
+        return expr
+    return lambda f: coerce(expr(f), source, target)
+
+
+def _vector_closure(op, base, left, right, lineno, col):
+    # Aritmética de vectores completos: el resultado es un vector nuevo
+    def run(f):
+        try:
+            return elementwise(op, base, left(f), right(f))
+        except VectorError as e:
+            raise ExecutionError(e.message, lineno, col) from None
+    return run
+
+
+def _reduction_closure(node, args):
+    name, base, lineno, col = node.name, node.type, node.lineno, node.col
+
+    def run(f):
+        try:
+            return reduce(name, base, *[arg(f) for arg in args])
+        except VectorError as e:
+            raise ExecutionError(e.message, lineno, col) from None
+    return run
+
+
+def _index_error(i, n, lineno, col):
+    return ExecutionError(f"Índice {i} fuera de rango para un vector de tamaño {n}.", lineno, col)
+
+
+def has_call(root):
+    # True si la expresión llama a una función (que puede cambiar las variables globales)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.kind == FUNC_CALL:
+            return True
+        stack.extend(_expression_children(node))
+    return False
+
+
+def _expression_children(node):
+    kind = node.kind
+    if kind == BINOP:
+        return (node.left, node.right)
+    if kind == UNOP:
+        return (node.operand,)
+    if kind == ARRAY_ACCESS:
+        return (node.array, node.index)
+    if kind == FIELD_ACCESS:
+        return (node.obj,)
+    if kind == FUNC_CALL:
+        return node.args
+    return ()
+
+
+def _sequence(statements, can_return):
+    if not statements:
+        return lambda f: None
+    if can_return:
+        def run(f):
+            for stmt in statements:
+                result = stmt(f)
+                if result is not None:
+                    return result
+        return run
+    if len(statements) == 1:
+        return statements[0]
+    if len(statements) == 2:
+        first, second = statements
+
+        def run(f):
+            first(f)
+            second(f)
+        return run
+
+    def run(f):
+        for stmt in statements:
+            stmt(f)
+    return run
+
+
+# ----------------------------- Operadores especializados -----------------------------
+
+_ARITH_OPS = {'+': operator.add, '-': operator.sub, '*': operator.mul}
+_COMPARE_OPS = {'==': operator.eq, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+
+def _expr_expr(op, left, right):
+    if op == '+':
+        return lambda f: left(f) + right(f)
+    if op == '-':
+        return lambda f: left(f) - right(f)
+    if op == '*':
+        return lambda f: left(f) * right(f)
+    if op == '<':
+        return lambda f: left(f) < right(f)
+    if op == '<=':
+        return lambda f: left(f) <= right(f)
+    if op == '>':
+        return lambda f: left(f) > right(f)
+    if op == '>=':
+        return lambda f: left(f) >= right(f)
+    if op == '==':
+        return lambda f: left(f) == right(f)
+    raise ExecutionError(f"Operador desconocido: {op}")
+
+
+def _expr_const(op, left, c):
+    if op == '+':
+        return lambda f: left(f) + c
+    if op == '-':
+        return lambda f: left(f) - c
+    if op == '*':
+        return lambda f: left(f) * c
+    if op == '<':
+        return lambda f: left(f) < c
+    if op == '<=':
+        return lambda f: left(f) <= c
+    if op == '>':
+        return lambda f: left(f) > c
+    if op == '>=':
+        return lambda f: left(f) >= c
+    if op == '==':
+        return lambda f: left(f) == c
+    raise ExecutionError(f"Operador desconocido: {op}")
+
+
+def _local_const(op, i, c):
+    if op == '+':
+        return lambda f: f[i] + c
+    if op == '-':
+        return lambda f: f[i] - c
+    if op == '*':
+        return lambda f: f[i] * c
+    if op == '<':
+        return lambda f: f[i] < c
+    if op == '<=':
+        return lambda f: f[i] <= c
+    if op == '>':
+        return lambda f: f[i] > c
+    if op == '>=':
+        return lambda f: f[i] >= c
+    if op == '==':
+        return lambda f: f[i] == c
+    raise ExecutionError(f"Operador desconocido: {op}")
+
+
+def _local_local(op, i, j):
+    if op == '+':
+        return lambda f: f[i] + f[j]
+    if op == '-':
+        return lambda f: f[i] - f[j]
+    if op == '*':
+        return lambda f: f[i] * f[j]
+    if op == '<':
+        return lambda f: f[i] < f[j]
+    if op == '<=':
+        return lambda f: f[i] <= f[j]
+    if op == '>':
+        return lambda f: f[i] > f[j]
+    if op == '>=':
+        return lambda f: f[i] >= f[j]
+    if op == '==':
+        return lambda f: f[i] == f[j]
+    raise ExecutionError(f"Operador desconocido: {op}")
+
+
+def _int_expr_expr(fn, left, right, lineno, col):
+    def run(f):
+        value = fn(left(f), right(f))
+        if INT_MIN <= value <= INT_MAX:
+            return value
+        raise ExecutionError(OVERFLOW_MESSAGE, lineno, col)
+    return run
+
+
+def _int_local_const(fn, i, c, lineno, col):
+    def run(f):
+        value = fn(f[i], c)
+        if INT_MIN <= value <= INT_MAX:
+            return value
+        raise ExecutionError(OVERFLOW_MESSAGE, lineno, col)
+    return run
+
+
+def _int_local_local(fn, i, j, lineno, col):
+    def run(f):
+        value = fn(f[i], f[j])
+        if INT_MIN <= value <= INT_MAX:
+            return value
+        raise ExecutionError(OVERFLOW_MESSAGE, lineno, col)
+    return run
+
+
+# ----------------------------- Tablas de despacho -----------------------------
+
+_STATEMENT_COMPILERS = {
+    DECL: ClosureCompiler._decl,
+    DECL_ASSIGN: ClosureCompiler._decl_assign,
+    ASSIGN: ClosureCompiler._assign,
+    FUNC_DEF: ClosureCompiler._func_def,
+    RETURN: ClosureCompiler._return,
+    IF: ClosureCompiler._if,
+    WHILE: ClosureCompiler._while,
+    INSTANCE: ClosureCompiler._instance,
+    TYPE_DEF: ClosureCompiler._type_def,
+    BINOP: ClosureCompiler._expression_statement,
+    UNOP: ClosureCompiler._expression_statement,
+    CONST: ClosureCompiler._expression_statement,
+    VAR: ClosureCompiler._expression_statement,
+    ARRAY_ACCESS: ClosureCompiler._expression_statement,
+    FIELD_ACCESS: ClosureCompiler._expression_statement,
+    FUNC_CALL: ClosureCompiler._expression_statement,
+}
+
+_EXPRESSION_COMPILERS = {
+    CONST: ClosureCompiler._const,
+    VAR: ClosureCompiler._var,
+    BINOP: ClosureCompiler._binop,
+    UNOP: ClosureCompiler._unop,
+    ARRAY_ACCESS: ClosureCompiler._array_access,
+    FIELD_ACCESS: ClosureCompiler._field_access,
+    FUNC_CALL: ClosureCompiler._func_call,
+}
@@ -0,0 +1,710 @@
+import argparse
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from heapq import heapify, heappop, heappush
+
+from ast_nodes import Node, Expr, Program, FUNC_DEF, TYPE_DEF
+from diagnostics import DiagnosticSink, render_json, render_text, ERROR
+from main import FileResult, ParserRunner
+from scanner import Scanner
+from semantic import SemanticAnalyzer, SemanticError
+from symbols import SymbolTable
+from token_stream import TOKEN_CODES, TokenBuffer
+
+
+# ----------------------------- Compilación incremental -----------------------------
+# Un documento guarda el programa partido en unidades de sentencias de primer nivel: cada
+# función, cada tipo y cada tramo de sentencias sueltas seguidas (hasta RUN_LIMIT). Cada
+# unidad tiene sus tokens, su árbol y sus diagnósticos. Al editar el texto sólo se vuelven
+# a lexear y parsear las unidades que toca la edición, y sólo se vuelven a analizar esas
+# unidades y las que dependen de lo que definen (ver _Environment).
+#
+# Los resultados son los mismos que los de ParserRunner.compile_source sobre el texto
+# completo. Si el texto tiene errores de sintaxis se compila entero: PLY se recupera de un
+# error volviendo a empezar el parse en el token siguiente, y eso no se puede reproducir
+# por unidades. El documento vuelve al modo incremental en cuanto el texto vuelve a parsear.
+
+RUN_LIMIT = 32      # Sentencias sueltas seguidas como máximo en una misma unidad
+BLOCK_SIZE = 64     # Unidades por bloque del índice de posiciones (_Units)
+
+_KEY_GAP = 1 << 64  # Separación inicial entre las claves de orden de dos unidades seguidas
+
+# Una sentencia que empieza por '-' o '(' puede continuar la anterior: tras `x = a` el parser
+# lee `-b = 1` como `x = a - b = 1` y `(b).c = 1` como una llamada a `a`. Una unidad que empieza
+# por uno de estos tokens se vuelve a parsear junto con la anterior.
+_JOINING = frozenset((TOKEN_CODES['MINUS'], TOKEN_CODES['LPAREN']))
+
+
+class _Unit:
+    __slots__ = ('statements', 'tokens', 'length', 'newlines', 'origin', 'key', 'block',
+                 'lexer_diagnostics', 'diagnostics', 'failed', 'reads', 'writes')
+
+    def __init__(self, statements, tokens, length, newlines, origin, lexer_diagnostics):
+        self.statements = statements
+        self.tokens = tokens                # TokenBuffer propio (sin el texto)
+        self.length = length                # Caracteres del texto que cubre (hasta la unidad siguiente)
+        self.newlines = newlines            # Líneas que avanza el lexer en ese texto (no cuenta los
+                                            # saltos dentro de comentarios /* */)
+        self.origin = origin                # (inicio, línea) con los que se calcularon tokens, árbol y diagnósticos
+        self.key = 0                        # Orden en el documento (ver Document._assign_keys)
+        self.block = None
+        self.lexer_diagnostics = lexer_diagnostics
+        self.diagnostics = []               # Del análisis semántico
+        self.failed = False                 # El análisis terminó con un error
+        self.reads = None                   # Claves del estado global que ha leído (None: sin analizar)
+        self.writes = {}                    # Claves que ha definido -> valor
+
+
+def _unit_key(unit):
+    return unit.key
+
+
+# Nodos de unas sentencias (recorrido con pila explícita)
+def _nodes(statements):
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(child for child in node.children() if isinstance(child, Node))
+
+
+def _slice(buffer, lo, hi):
+    tokens = TokenBuffer()
+    tokens.types = buffer.types[lo:hi]
+    tokens.values = buffer.values[lo:hi]
+    tokens.linenos = buffer.linenos[lo:hi]
+    tokens.lexpos = buffer.lexpos[lo:hi]
+    return tokens
+
+
+# Unidades en orden, en bloques de hasta BLOCK_SIZE (algo más tras una inserción). Cada bloque
+# sabe cuántos caracteres y líneas cubre, así que encontrar la unidad de una posición o la
+# posición de una unidad recorre los bloques y un solo bloque, no todas las unidades, y las
+# unidades no guardan posiciones absolutas que haya que desplazar tras cada edición.
+class _Units:
+    def __init__(self, units):
+        self.blocks = []
+        self.chars = []
+        self.lines = []
+        self._store(0, 0, units)
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    def __bool__(self):
+        return bool(self.blocks)
+
+    def walk(self):
+        # (unidad, inicio, línea) de todas las unidades
+        start, line = 0, 1
+        for block in self.blocks:
+            for unit in block:
+                yield unit, start, line
+                start += unit.length
+                line += unit.newlines
+
+    def unit(self, b, i):
+        return self.blocks[b][i]
+
+    def find(self, offset):
+        # (bloque, índice, inicio, línea) de la unidad que contiene offset (la última si está al final)
+        start, line = 0, 1
+        last = len(self.blocks) - 1
+        for b, block in enumerate(self.blocks):
+            if b < last and offset >= start + self.chars[b]:
+                start += self.chars[b]
+                line += self.lines[b]
+                continue
+            for i, unit in enumerate(block):
+                if i == len(block) - 1 or offset < start + unit.length:
+                    return b, i, start, line
+                start += unit.length
+                line += unit.newlines
+
+    def position(self, unit):
+        start, line = 0, 1
+        for b, block in enumerate(self.blocks):
+            if block is not unit.block:
+                start += self.chars[b]
+                line += self.lines[b]
+                continue
+            for other in block:
+                if other is unit:
+                    return start, line
+                start += other.length
+                line += other.newlines
+        raise ValueError("La unidad no está en el documento")
+
+    def previous(self, b, i):
+        if i > 0:
+            return b, i - 1
+        if b > 0:
+            return b - 1, len(self.blocks[b - 1]) - 1
+        return None
+
+    def next(self, b, i):
+        if i + 1 < len(self.blocks[b]):
+            return b, i + 1
+        if b + 1 < len(self.blocks):
+            return b + 1, 0
+        return None
+
+    def between(self, b0, i0, b1, i1):
+        # Unidades desde (b0, i0) hasta (b1, i1), ambas incluidas
+        if b0 == b1:
+            return self.blocks[b0][i0:i1 + 1]
+        units = self.blocks[b0][i0:]
+        for b in range(b0 + 1, b1):
+            units += self.blocks[b]
+        return units + self.blocks[b1][:i1 + 1]
+
+    def replace(self, b0, i0, b1, i1, units):
+        # Sustituye las unidades de (b0, i0) a (b1, i1), ambas incluidas, por units
+        blocks = self.blocks
+        merged = blocks[b0][:i0] + units + blocks[b1][i1 + 1:]
+        end = b1 + 1
+        # Un bloque pequeño se junta con el siguiente para que no se acumulen bloques casi vacíos
+        if len(merged) < BLOCK_SIZE and end < len(blocks):
+            merged += blocks[end]
+            end += 1
+        self._store(b0, end, merged)
+
+    def _store(self, b0, end, units):
+        # Los bloques b0..end-1 pasan a ser units, partidas si no caben en uno
+        if len(units) > 2 * BLOCK_SIZE:
+            new_blocks = [units[k:k + BLOCK_SIZE] for k in range(0, len(units), BLOCK_SIZE)]
+        else:
+            new_blocks = [units] if units else []
+        for block in new_blocks:
+            for unit in block:
+                unit.block = block
+        self.blocks[b0:end] = new_blocks
+        self.chars[b0:end] = [sum(unit.length for unit in block) for block in new_blocks]
+        self.lines[b0:end] = [sum(unit.newlines for unit in block) for block in new_blocks]
+
+
+# ----------------------------- Dependencias entre unidades -----------------------------
+# El estado global del análisis son las variables globales, los tipos, las funciones y las
+# predefinidas ya usadas, con claves ('var' | 'type' | 'function' | 'builtin', nombre). Una
+# unidad se analiza con un _UnitAnalyzer que lee ese estado a través de un _Environment: cada
+# clave leída y cada clave definida quedan anotadas. Lo que ve una unidad es lo que definió
+# la primera unidad anterior que escribió la clave, igual que en el análisis de todo el texto.
+# Cuando cambia lo que define una unidad se vuelven a analizar las unidades posteriores que
+# leyeron esas claves (y, en cadena, las que dependan de ellas).
+
+class _Environment:
+    __slots__ = ('document', 'unit', 'reads', 'writes')
+
+    def __init__(self, document, unit):
+        self.document = document
+        self.unit = unit
+        self.reads = set()
+        self.writes = {}
+
+    def read(self, key):
+        writes = self.writes
+        if key in writes:
+            return writes[key]
+        self.reads.add(key)
+        return self.document._visible(key, self.unit)
+
+    def write(self, key, value):
+        self.writes[key] = value
+
+
+# Tabla de símbolos cuyo ámbito global es el del documento (a través del entorno)
+class _GlobalSymbols(SymbolTable):
+    __slots__ = ('env',)
+
+    def __init__(self, env):
+        super().__init__()
+        self.env = env
+
+    def declare(self, name, value):
+        if len(self._scopes) > 1:
+            return super().declare(name, value)
+        if name not in self._bindings and self.env.read(('var', name)) is not None:
+            return False
+        if not super().declare(name, value):
+            return False
+        self.env.write(('var', name), value)
+        return True
+
+    def lookup(self, name, default=None):
+        versions = self._bindings.get(name)
+        if versions is not None:
+            return versions[-1][1]
+        value = self.env.read(('var', name))
+        return default if value is None else value
+
+
+# type_table y functions del analizador
+class _GlobalTable:
+    __slots__ = ('env', 'kind')
+
+    def __init__(self, env, kind):
+        self.env = env
+        self.kind = kind
+
+    def __contains__(self, name):
+        return self.env.read((self.kind, name)) is not None
+
+    def get(self, name, default=None):
+        value = self.env.read((self.kind, name))
+        return default if value is None else value
+
+    def __getitem__(self, name):
+        value = self.env.read((self.kind, name))
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self.env.write((self.kind, name), value)
+
+
+# Predefinidas ya usadas (_builtins_used)
+class _GlobalSet:
+    __slots__ = ('env', 'kind')
+
+    def __init__(self, env, kind):
+        self.env = env
+        self.kind = kind
+
+    def __contains__(self, name):
+        return self.env.read((self.kind, name)) is not None
+
+    def add(self, name):
+        self.env.write((self.kind, name), True)
+
+
+class _UnitAnalyzer(SemanticAnalyzer):
+    def __init__(self, env, diagnostics):
+        super().__init__(diagnostics=diagnostics)
+        self.symbols = _GlobalSymbols(env)
+        self.type_table = _GlobalTable(env, 'type')
+        self.functions = _GlobalTable(env, 'function')
+        self._builtins_used = _GlobalSet(env, 'builtin')
+
+
+# ----------------------------- Documento -----------------------------
+
+class Document:
+    def __init__(self, runner, text='', filename=None):
+        self.runner = runner
+        self.parser = runner.parser
+        self.level = runner.level
+        self.filename = filename
+        self.scanner = Scanner()    # Lexea desde cualquier inicio de unidad (mismos tokens que PLY)
+        self.text = text
+        self.full_builds = 0        # Veces que se ha lexeado y parseado el texto entero
+        self._rebuild()
+
+    # ----------------------------- Ediciones -----------------------------
+
+    # Sustituye text[start:end] por replacement
+    def edit(self, start, end, replacement):
+        self._apply(start, end, self.text[:start] + replacement + self.text[end:])
+
+    # Nuevo texto completo: la edición es lo que queda entre el prefijo y el sufijo comunes
+    def update(self, text):
+        old = self.text
+        limit = min(len(old), len(text))
+        start = _common_prefix(old, text, limit)
+        if start == len(old) == len(text):
+            return
+        end = len(old) - _common_suffix(old, text, limit - start)
+        self._apply(start, end, text)
+
+    def _apply(self, e0, e1, text):
+        delta = len(text) - len(self.text)
+        self.text = text
+        units = self._units
+        if not units:
+            return self._rebuild()
+
+        # Unidades afectadas: de la que contiene el carácter anterior a la edición (un token
+        # pegado al principio puede unirse con el anterior) a la que contiene su final
+        b0, i0, start, line = units.find(max(e0 - 1, 0))
+        b1, i1, end, _ = units.find(e1)
+        end += units.unit(b1, i1).length
+        edit_end = e1 + delta
+        while True:
+            after = units.next(b1, i1)
+            new_end = end + delta
+            if after is not None:
+                following = units.unit(*after)
+                # La unidad siguiente se incluye si empieza en la línea en la que acaba la edición
+                # (cambian sus columnas) o si puede continuar la última sentencia
+                if following.tokens.types[0] in _JOINING or text.find('\n', edit_end, new_end) == -1:
+                    b1, i1 = after
+                    end += following.length
+                    continue
+            try:
+                buffer, follow, diagnostics, end_line = self._lex(start, new_end if after is not None else None,
+                                                                  line)
+            except Exception:
+                return self._rebuild()
+            # El lexer tiene que volver a encontrar el primer token de la unidad siguiente en su
+            # sitio; si no (p. ej. se ha abierto un comentario), la unidad siguiente también cambia
+            if after is not None and (follow is None or follow.lexpos != new_end
+                                      or TOKEN_CODES[follow.type] != following.tokens.types[0]
+                                      or follow.value != following.tokens.values[0]):
+                b1, i1 = after
+                end += following.length
+                continue
+            before = units.previous(b0, i0)
+            if before is not None and (not len(buffer) or buffer.types[0] in _JOINING):
+                # Sin tokens el texto se une a la unidad anterior; con '-' o '(' se parsea con ella
+                previous = units.unit(*before)
+                b0, i0 = before
+                start -= previous.length
+                line -= previous.newlines
+                continue
+            if not len(buffer):
+                if after is None:
+                    return self._rebuild()
+                b1, i1 = after
+                end += following.length
+                continue
+            break
+
+        new_units = self._parse(buffer, diagnostics, start, new_end, line, end_line)
+        if new_units is None:
+            return self._rebuild()
+        self._replace(b0, i0, b1, i1, new_units)
+
+    # ----------------------------- Lexer y parser -----------------------------
+
+    # Tokens de text[start:stop] (hasta el final si stop es None), el primer token desde stop,
+    # los diagnósticos del lexer y la línea en la que se para
+    def _lex(self, start, stop, line):
+        sink = DiagnosticSink(file=self.filename, level=self.level)
+        scanner = self.scanner
+        scanner.diagnostics = sink
+        scanner.lineno = line
+        scanner.input(self.text, start)
+        buffer = TokenBuffer(self.text)
+        follow = None
+        for tok in scanner:
+            if stop is not None and tok.lexpos >= stop:
+                follow = tok
+                break
+            buffer.append(tok)
+        return buffer, follow, sink.items, follow.lineno if follow is not None else scanner.lineno
+
+    # Unidades de text[start:end], o None si no es una secuencia de sentencias completas. Las
+    # líneas de cada una son las del lexer (las de sus tokens), que no siempre coinciden con
+    # los saltos de línea del texto
+    def _parse(self, buffer, diagnostics, start, end, line, end_line):
+        sink = DiagnosticSink(file=self.filename, level=self.level)
+        self.parser.diagnostics = sink
+        starts = {}
+        try:
+            tree = self.parser.parse_tokens(buffer, starts)
+        except Exception:
+            return None
+        if tree is None or sink.has_errors:
+            return None
+
+        groups = []
+        for stmt in tree.body:
+            if (stmt.kind in (FUNC_DEF, TYPE_DEF) or not groups or groups[-1][0].kind in (FUNC_DEF, TYPE_DEF)
+                    or len(groups[-1]) >= RUN_LIMIT):
+                groups.append([stmt])
+            else:
+                groups[-1].append(stmt)
+
+        # Cada unidad cubre desde su primer token hasta el de la siguiente (la primera, desde start)
+        bounds = [start] + [starts[id(group[0])] for group in groups[1:]] + [end]
+        units = []
+        d = 0
+        for k, group in enumerate(groups):
+            lo, hi = bounds[k], bounds[k + 1]
+            first, last = bisect_left(buffer.lexpos, lo), bisect_left(buffer.lexpos, hi)
+            newlines = (buffer.linenos[last] if last < len(buffer) else end_line) - line
+            own = []
+            while d < len(diagnostics) and (k == len(groups) - 1 or diagnostics[d].offset < hi):
+                own.append(diagnostics[d])
+                d += 1
+            units.append(_Unit(group, _slice(buffer, first, last), hi - lo, newlines, (lo, line), own))
+            line += newlines
+        return units
+
+    def _rebuild(self):
+        self.full_builds += 1
+        self._units = None
+        self._broken = None
+        self._writers = {}      # clave -> unidades que la definen
+        self._readers = {}      # clave -> unidades que la han leído
+        self._failed = set()
+        self._noisy = set()     # Unidades con diagnósticos
+        units = None
+        try:
+            buffer, _, diagnostics, end_line = self._lex(0, None, 1)
+        except Exception:
+            buffer = None
+        if buffer is not None and len(buffer):
+            units = self._parse(buffer, diagnostics, 0, len(self.text), 1, end_line)
+        if units is None:
+            # Sin sentencias o con errores: compilación completa, como ParserRunner
+            self._broken = self.runner.compile_source(self.text, self.filename)
+            return
+        for k, unit in enumerate(units, 1):
+            unit.key = k * _KEY_GAP
+        self._units = _Units(units)
+        self._analyze(units)
+
+    # ----------------------------- Análisis -----------------------------
+
+    def _replace(self, b0, i0, b1, i1, new_units):
+        units = self._units
+        removed = units.between(b0, i0, b1, i1)
+        before, after = units.previous(b0, i0), units.next(b1, i1)
+        low = units.unit(*before).key if before is not None else 0
+        high = units.unit(*after).key if after is not None else None
+
+        for unit in removed:
+            self._forget(unit)
+        # Lo que definían las unidades quitadas deja de verse en las posteriores que lo leyeron
+        pending = set()
+        for unit in removed:
+            for key in unit.writes:
+                pending.update(reader for reader in self._readers.get(key, ()) if reader.key > unit.key)
+
+        units.replace(b0, i0, b1, i1, new_units)
+        if not self._assign_keys(new_units, low, high):
+            for k, unit in enumerate(units, 1):
+                unit.key = k * _KEY_GAP
+        pending.update(new_units)
+        self._analyze(pending)
+
+    def _assign_keys(self, new_units, low, high):
+        # Claves entre las de las unidades vecinas; False si no caben (hay que renumerar todas)
+        if high is None:
+            high = low + (len(new_units) + 1) * _KEY_GAP
+        step = (high - low) // (len(new_units) + 1)
+        if step == 0:
+            return False
+        for k, unit in enumerate(new_units, 1):
+            unit.key = low + k * step
+        return True
+
+    # Analiza las unidades en orden, y después las posteriores que leían algo que ha cambiado
+    def _analyze(self, pending):
+        pending = set(pending)
+        heap = [(unit.key, unit) for unit in pending]
+        heapify(heap)
+        while heap:
+            _, unit = heappop(heap)
+            old = unit.writes
+            if unit.reads is not None:
+                # Unidad ya analizada que depende de una que ha cambiado: se ponen al día sus
+                # posiciones y se borran los tipos de sus expresiones antes de repetir el análisis
+                self._forget(unit)
+                self._settle(unit, *self._units.position(unit))
+                for node in _nodes(unit.statements):
+                    if isinstance(node, Expr):
+                        node.type = None
+            self._analyze_unit(unit)
+            self._remember(unit)
+            writes = unit.writes
+            for key in old.keys() | writes.keys():
+                if old.get(key) != writes.get(key):
+                    for reader in self._readers.get(key, ()):
+                        if reader.key > unit.key and reader not in pending:
+                            pending.add(reader)
+                            heappush(heap, (reader.key, reader))
+
+    def _analyze_unit(self, unit):
+        env = _Environment(self, unit)
+        sink = DiagnosticSink(file=self.filename, level=self.level)
+        unit.failed = False
+        # Mismo tratamiento de errores que ParserRunner
+        try:
+            _UnitAnalyzer(env, sink).analyze(unit.statements)
+        except SemanticError as e:
+            sink.error('semantic.error', e.message, e.lineno or 0, col=e.col)
+            unit.failed = True
+        except Exception as e:
+            sink.error('semantic.error', str(e))
+            unit.failed = True
+        unit.reads = env.reads
+        unit.writes = env.writes
+        unit.diagnostics = sink.items
+
+    # Valor de una clave para una unidad: el de la primera unidad anterior que la definió
+    def _visible(self, key, unit):
+        found = None
+        for writer in self._writers.get(key, ()):
+            if writer.key < unit.key and (found is None or writer.key < found.key):
+                found = writer
+        return None if found is None else found.writes[key]
+
+    def _remember(self, unit):
+        for key in unit.writes:
+            self._writers.setdefault(key, []).append(unit)
+        for key in unit.reads:
+            self._readers.setdefault(key, set()).add(unit)
+        if unit.failed:
+            self._failed.add(unit)
+        if unit.diagnostics or unit.lexer_diagnostics:
+            self._noisy.add(unit)
+
+    def _forget(self, unit):
+        for key in unit.writes:
+            writers = self._writers[key]
+            writers.remove(unit)
+            if not writers:
+                del self._writers[key]
+        for key in unit.reads or ():
+            readers = self._readers[key]
+            readers.discard(unit)
+            if not readers:
+                del self._readers[key]
+        self._failed.discard(unit)
+        self._noisy.discard(unit)
+
+    # Desplaza líneas y posiciones de una unidad que se ha movido desde que se lexeó. Los mensajes
+    # del lexer llevan la línea, así que si hay alguno y ha cambiado la línea se vuelve a lexear.
+    def _settle(self, unit, start, line):
+        origin_start, origin_line = unit.origin
+        lines, chars = line - origin_line, start - origin_start
+        if lines:
+            for node in _nodes(unit.statements):
+                node.lineno += lines
+            unit.tokens.linenos = array('I', [lineno + lines for lineno in unit.tokens.linenos])
+            for diag in unit.diagnostics:
+                if diag.line:
+                    diag.line += lines
+        if chars:
+            unit.tokens.lexpos = array('I', [pos + chars for pos in unit.tokens.lexpos])
+        if unit.lexer_diagnostics:
+            if lines:
+                end = start + unit.length
+                unit.lexer_diagnostics = self._lex(start, end if end < len(self.text) else None, line)[2]
+            elif chars:
+                for diag in unit.lexer_diagnostics:
+                    diag.offset += chars
+        unit.origin = (start, line)
+
+    # ----------------------------- Resultados -----------------------------
+
+    @property
+    def status(self):
+        if self._units is None:
+            return self._broken.status
+        if self._failed:
+            return 'semantic'
+        # Como en ParserRunner: un error del lexer del que se ha recuperado también cuenta
+        if any(diag.severity == ERROR for unit in self._noisy for diag in unit.lexer_diagnostics):
+            return 'lexer'
+        return 'ok'
+
+    # Diagnósticos en el orden de la compilación completa: los del lexer y después los del
+    # análisis hasta el primer error. Sólo se recorren las unidades que tienen alguno.
+    def diagnostics(self):
+        if self._units is None:
+            return self._broken.diagnostics
+        noisy = sorted(self._noisy, key=_unit_key)
+        if len(noisy) > len(self._units.blocks):
+            positions = {unit: (start, line) for unit, start, line in self._units.walk()}
+        else:
+            positions = {unit: self._units.position(unit) for unit in noisy}
+        failure = min(self._failed, key=_unit_key).key if self._failed else None
+        lexer, semantic = [], []
+        for unit in noisy:
+            self._settle(unit, *positions[unit])
+            lexer += unit.lexer_diagnostics
+            if failure is None or unit.key <= failure:
+                semantic += unit.diagnostics
+        return lexer + semantic
+
+    # Resultado completo (como el de ParserRunner.compile_source, sin backends). Los nodos del
+    # árbol son los de las unidades: se reutilizan, y se actualizan, en las ediciones siguientes.
+    def result(self):
+        if self._units is None:
+            return self._broken
+        result = FileResult()
+        tokens = TokenBuffer(self.text)
+        body = []
+        for unit, start, line in self._units.walk():
+            self._settle(unit, start, line)
+            tokens.types += unit.tokens.types
+            tokens.values += unit.tokens.values
+            tokens.linenos += unit.tokens.linenos
+            tokens.lexpos += unit.tokens.lexpos
+            body += unit.statements
+        result.tokens = tokens
+        result.ast = Program(body, body[0].lineno, body[0].col)
+        result.diagnostics = self.diagnostics()
+        result.status = self.status
+        return result
+
+
+# Longitud del prefijo común de a y b (como mucho limit), comparando por trozos
+def _common_prefix(a, b, limit):
+    pos, size = 0, 1 << 16
+    while pos < limit:
+        end = min(pos + size, limit)
+        if a[pos:end] == b[pos:end]:
+            pos = end
+        elif size == 1:
+            break
+        else:
+            size //= 2
+    return pos
+
+
+def _common_suffix(a, b, limit):
+    la, lb = len(a), len(b)
+    pos, size = 0, 1 << 16
+    while pos < limit:
+        end = min(pos + size, limit)
+        if a[la - end:la - pos] == b[lb - end:lb - pos]:
+            pos = end
+        elif size == 1:
+            break
+        else:
+            size //= 2
+    return pos
+
+
+# Para ejecutar desde consola: vigila un fichero y, cada vez que cambia, muestra sus diagnósticos
+#   python incremental.py fichero.vip [--format json] [--interval S]
+if __name__ == "__main__":
+    argp = argparse.ArgumentParser(description="Compilación incremental de un fichero de Viper")
+    argp.add_argument('file')
+    argp.add_argument('--format', choices=('text', 'json'), default='text')
+    argp.add_argument('--interval', type=float, default=0.2, help="segundos entre comprobaciones del fichero")
+    args = argp.parse_args()
+
+    runner = ParserRunner(production=True, output_format=args.format)
+    render = render_json if args.format == 'json' else render_text
+    filename = os.path.basename(args.file)
+    document = None
+    mtime = None
+    try:
+        while True:
+            current = os.stat(args.file).st_mtime_ns
+            if current != mtime:
+                mtime = current
+                with open(args.file, encoding='utf-8') as f:
+                    text = f.read()
+                start = time.perf_counter()
+                if document is None:
+                    document = Document(runner, text, filename)
+                else:
+                    document.update(text)
+                diagnostics = document.diagnostics()
+                elapsed = time.perf_counter() - start
+                for diag in diagnostics:
+                    print(render(diag))
+                print(f"-- {filename}: {document.status} ({elapsed * 1000:.1f} ms)", file=sys.stderr, flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
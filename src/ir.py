@@ -0,0 +1,472 @@
+from ast_nodes import (DECL, DECL_ASSIGN, ASSIGN, FUNC_DEF, RETURN, IF, WHILE, INSTANCE, TYPE_DEF,
+                       BINOP, UNOP, CONST, VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL)
+from executor import ExecutionError, SCALAR_DEFAULTS, is_vector, const_value, coerce, format_value, has_call
+from vectors import REDUCTIONS
+
+
+# ----------------------------- Formato -----------------------------
+# Código de tres direcciones: cada instrucción tiene como mucho un destino y sus operandos
+# son nombres o inmediatos. Los nombres de las globales empiezan por '@', los temporales
+# por '%' y el resto son variables locales de la función. Las etiquetas son instrucciones
+# 'label' y los saltos van a su nombre.
+#
+#   x = copy a                   x = add.int a, b        (sub mul div lt le gt ge eq)
+#   x = neg.int a   x = not a    x = ord a (char -> int)  x = float a (int -> float)
+#   x = load v, i, n             store v, i, valor, n    (n: tamaño del vector)
+#   x = getfield r, pos, campo   setfield r, pos, campo, valor
+#   x = newvec tipo, n           x = newrec Tipo
+#   x = call f, a, b...          ret a                   noret f
+#   jump L    branch c, Lsi, Lno    label L
+#   x = vec.int +, a, b          x = vec.float sum, v    (vectores completos: + - * / == neg
+#                                                         sum min max dot; tipo: el tipo base)
+
+_BINARY_OPS = {'+': 'add', '-': 'sub', '*': 'mul', '/': 'div',
+               '<': 'lt', '<=': 'le', '>': 'gt', '>=': 'ge', '==': 'eq'}
+
+# Posición de los operandos en args según la operación ('call' y 'vec': todos menos el primero)
+VARIADIC = frozenset(('call', 'vec'))
+OPERANDS = {
+    'copy': (0,), 'neg': (0,), 'not': (0,), 'ord': (0,), 'float': (0,),
+    'add': (0, 1), 'sub': (0, 1), 'mul': (0, 1), 'div': (0, 1),
+    'lt': (0, 1), 'le': (0, 1), 'gt': (0, 1), 'ge': (0, 1), 'eq': (0, 1),
+    'load': (0, 1), 'store': (0, 1, 2), 'getfield': (0,), 'setfield': (0, 3),
+    'newvec': (), 'newrec': (), 'ret': (0,), 'noret': (), 'jump': (), 'branch': (0,), 'label': (),
+}
+
+TERMINATORS = frozenset(('jump', 'branch', 'ret', 'noret'))
+
+
+class Imm:
+    __slots__ = ('value', 'type')
+
+    def __init__(self, value, vtype):
+        self.value = value
+        self.type = vtype
+
+    # repr distingue 0.0 de -0.0 y el tipo distingue 1 de 1.0 y de true
+    def __eq__(self, other):
+        return other.__class__ is Imm and self.type == other.type and repr(self.value) == repr(other.value)
+
+    def __hash__(self):
+        return hash((self.type, repr(self.value)))
+
+    def __repr__(self):
+        return format_value(self.value, self.type, {})
+
+
+class Instr:
+    __slots__ = ('op', 'dst', 'args', 'type', 'lineno')
+
+    def __init__(self, op, dst, args, vtype=None, lineno=0):
+        self.op = op
+        self.dst = dst
+        self.args = args
+        self.type = vtype
+        self.lineno = lineno
+
+    def operands(self):
+        if self.op in VARIADIC:
+            return self.args[1:]
+        return [self.args[i] for i in OPERANDS[self.op]]
+
+    def uses(self):
+        # Nombres (no inmediatos) que lee la instrucción
+        return [arg for arg in self.operands() if arg.__class__ is str]
+
+    def replace_operands(self, mapping):
+        # Sustituye los operandos que aparecen en mapping; devuelve si cambió alguno
+        positions = range(1, len(self.args)) if self.op in VARIADIC else OPERANDS[self.op]
+        args = list(self.args)
+        changed = False
+        for i in positions:
+            new = mapping.get(args[i]) if args[i].__class__ is str else None
+            if new is not None and new != args[i]:
+                args[i] = new
+                changed = True
+        if changed:
+            self.args = tuple(args)
+        return changed
+
+    def __repr__(self):
+        if self.op == 'label':
+            return f"{self.args[0]}:"
+        op = self.op if self.type is None else f"{self.op}.{self.type}"
+        text = op if not self.args else f"{op} {', '.join(str(arg) if arg.__class__ is str else repr(arg) for arg in self.args)}"
+        if self.op == 'copy':
+            text = repr(self.args[0]) if self.args[0].__class__ is Imm else self.args[0]
+        return text if self.dst is None else f"{self.dst} = {text}"
+
+
+class IRFunction:
+    __slots__ = ('name', 'type', 'params', 'variables', 'code', 'loops', 'temps')
+
+    def __init__(self, name, ftype=None, params=()):
+        self.name = name
+        self.type = ftype
+        self.params = list(params)     # Nombres de los parámetros, en orden
+        self.variables = {}            # Variable -> tipo (valor inicial del marco, como la plantilla)
+        self.code = []
+        self.loops = []                # (etiqueta de cabecera, etiqueta de salida), los internos primero
+        self.temps = 0
+
+    def temp(self):
+        self.temps += 1
+        return f"%{self.temps}"
+
+    def dump(self):
+        params = ', '.join(self.params)
+        header = "función <main>:" if self.type is None else f"función {self.name}({params}) -> {_type_name(self.type)}:"
+        return [header] + [repr(instr) if instr.op == 'label' else f"    {instr!r}" for instr in self.code]
+
+
+class IRProgram:
+    __slots__ = ('main', 'functions', 'records')
+
+    def __init__(self):
+        self.main = IRFunction('<main>')
+        self.functions = {}      # nombre -> IRFunction, en orden de definición
+        self.records = {}        # tipo -> ((campo, tipo), ...)
+
+    def all_functions(self):
+        return [self.main] + list(self.functions.values())
+
+    def instruction_count(self):
+        return sum(1 for function in self.all_functions() for instr in function.code if instr.op != 'label')
+
+    def dump(self):
+        lines = []
+        for name, fields in self.records.items():
+            lines.append(f"tipo {name}: " + ', '.join(f"{_type_name(ftype)} {field}" for field, ftype in fields))
+        if lines:
+            lines.append("")
+        for function in self.all_functions():
+            lines += function.dump()
+            lines.append("")
+        return '\n'.join(lines)
+
+
+def _type_name(vtype):
+    if is_vector(vtype):
+        return f"{vtype[1]}[{vtype[2]}]"
+    return vtype
+
+
+# ----------------------------- Traducción desde el AST -----------------------------
+# Las sentencias se recorren con una pila explícita (como en cfg.build_cfg) y las
+# expresiones en post-orden; 'and' y 'or' se traducen a saltos para evaluar en cortocircuito.
+
+_LABEL, _JUMP, _LOOP = range(3)
+
+
+class IRBuilder:
+    def __init__(self):
+        self.program = IRProgram()
+        self.function = self.program.main
+        self.locals = None       # Nombres ya declarados en la función actual (None en el cuerpo principal)
+        self.labels = 0
+        self.lineno = 0
+
+    def build(self, program):
+        self._block(program.body)
+        return self.program
+
+    def _emit(self, op, dst, args, vtype=None):
+        self.function.code.append(Instr(op, dst, tuple(args), vtype, self.lineno))
+
+    def _label(self):
+        self.labels += 1
+        return f"L{self.labels}"
+
+    # ----------------------------- Sentencias -----------------------------
+
+    def _block(self, statements):
+        stack = list(reversed(statements))
+        while stack:
+            item = stack.pop()
+            if item.__class__ is tuple:
+                action, value = item
+                if action == _LABEL:
+                    self._emit('label', None, (value,))
+                elif action == _JUMP:
+                    self._emit('jump', None, (value,))
+                else:
+                    self.function.loops.append(value)
+                continue
+
+            self.lineno = item.lineno
+            kind = item.kind
+            if kind == IF:
+                cond = self._expr(item.cond)
+                then_label, end_label = self._label(), self._label()
+                else_label = self._label() if item.orelse else end_label
+                self._emit('branch', None, (cond, then_label, else_label))
+                stack.append((_LABEL, end_label))
+                if item.orelse:
+                    stack.extend(reversed(item.orelse))
+                    stack.append((_LABEL, else_label))
+                    stack.append((_JUMP, end_label))
+                stack.extend(reversed(item.then))
+                stack.append((_LABEL, then_label))
+            elif kind == WHILE:
+                head, body, end = self._label(), self._label(), self._label()
+                self._emit('label', None, (head,))
+                self._emit('branch', None, (self._expr(item.cond), body, end))
+                stack.append((_LOOP, (head, end)))
+                stack.append((_LABEL, end))
+                stack.append((_JUMP, head))
+                stack.extend(reversed(item.body))
+                stack.append((_LABEL, body))
+            else:
+                _STATEMENT_BUILDERS[kind](self, item)
+
+    def _declare(self, name, vtype):
+        if self.locals is not None:
+            self.locals.add(name)
+        self.function.variables.setdefault(self._name(name), vtype)
+        return self._name(name)
+
+    def _initialize(self, name, vtype):
+        if is_vector(vtype):
+            self._emit('newvec', name, (vtype[1], vtype[2]))
+        elif vtype in SCALAR_DEFAULTS:
+            self._emit('copy', name, (Imm(SCALAR_DEFAULTS[vtype], vtype),))
+        else:
+            if vtype not in self.program.records:
+                raise ExecutionError(f"El tipo '{vtype}' no está definido.", self.lineno)
+            self._emit('newrec', name, (vtype,))
+
+    def _decl(self, stmt):
+        for name in stmt.ids:
+            self._initialize(self._declare(name, stmt.type), stmt.type)
+
+    def _decl_assign(self, stmt):
+        # Como en el análisis semántico, las variables existen ya al evaluar la expresión
+        names = [self._declare(name, stmt.type) for name in stmt.ids]
+        if len(names) == 1 and stmt.expr.type == stmt.type:
+            self._assign_to(names[0], stmt.expr)
+            return
+        value = self._coerced(stmt.expr, stmt.type)
+        for name in names:
+            self._emit('copy', name, (value,))
+
+    def _instance(self, stmt):
+        self._initialize(self._declare(stmt.name, stmt.type_name), stmt.type_name)
+
+    def _type_def(self, stmt):
+        self.program.records[stmt.name] = tuple((name, ftype) for ftype, name in stmt.record_fields)
+
+    def _assign(self, stmt):
+        target = stmt.target
+        kind = target.kind
+        if kind == VAR:
+            name, vtype = self._resolve(target.name)
+            if stmt.expr.type == vtype:
+                self._assign_to(name, stmt.expr)
+            else:
+                self._emit('copy', name, (self._coerced(stmt.expr, vtype),))
+        elif kind == ARRAY_ACCESS:
+            # El valor se evalúa antes que el vector y el índice, como en tree_walker
+            value = self._pinned(self._coerced(stmt.expr, target.type), target.array, target.index)
+            array = self._expr(target.array)
+            index = self._expr(target.index)
+            self._emit('store', None, (array, index, value, target.array.type[2]))
+        elif kind == FIELD_ACCESS:
+            value = self._pinned(self._coerced(stmt.expr, target.type), target.obj)
+            obj = self._expr(target.obj)
+            self._emit('setfield', None, (obj, target.offset, target.field, value))
+        else:
+            raise ExecutionError(f"Asignación a estructura no válida: {target.tag}", stmt.lineno, stmt.col)
+
+    def _pinned(self, value, *later):
+        # Una global se lee al ejecutar la instrucción que la usa: si una llamada evaluada
+        # después puede cambiarla, se copia antes a un temporal
+        if isinstance(value, str) and value.startswith('@') and any(map(has_call, later)):
+            temp = self.function.temp()
+            self._emit('copy', temp, (value,))
+            return temp
+        return value
+
+    def _assign_to(self, name, expr):
+        # La operación raíz escribe directamente en la variable (sin copia intermedia)
+        value = self._expr(expr, name)
+        if value != name:
+            self._emit('copy', name, (value,))
+
+    def _func_def(self, stmt):
+        if self.locals is not None:
+            raise ExecutionError("No se pueden ejecutar funciones definidas dentro de otra función.",
+                                 stmt.lineno, stmt.col)
+        function = IRFunction(stmt.name, stmt.type, [pname for _, pname in stmt.params])
+        self.program.functions[stmt.name] = function   # Antes del cuerpo: permite la recursión
+        main, self.function, self.locals = self.function, function, set()
+        try:
+            for ptype, pname in stmt.params:
+                self._declare(pname, ptype)
+            self._block(stmt.body)
+            if not function.code or function.code[-1].op != 'ret':
+                self.lineno = stmt.lineno
+                self._emit('noret', None, (stmt.name,))
+        finally:
+            self.function, self.locals = main, None
+
+    def _return(self, stmt):
+        self._emit('ret', None, (self._coerced(stmt.expr, self.function.type),))
+
+    def _expression_statement(self, stmt):
+        self._expr(stmt)
+
+    # ----------------------------- Variables -----------------------------
+
+    def _name(self, name):
+        # Como en los backends: dentro de una función, un nombre es local desde su declaración
+        if self.locals is not None and name in self.locals:
+            return name
+        return '@' + name
+
+    def _resolve(self, name):
+        ir_name = self._name(name)
+        vtype = self.function.variables.get(ir_name) if self.locals is not None else None
+        if vtype is None:
+            vtype = self.program.main.variables.get(ir_name)
+        if vtype is None:
+            raise ExecutionError(f"La variable '{name}' no ha sido declarada.", self.lineno)
+        return ir_name, vtype
+
+    # ----------------------------- Expresiones -----------------------------
+
+    def _coerced(self, node, target):
+        return self._coerce(self._expr(node), node.type, target)
+
+    def _coerce(self, value, source, target):
+        if source == target or source not in SCALAR_DEFAULTS or target not in SCALAR_DEFAULTS:
+            return value
+        if value.__class__ is Imm:
+            return Imm(coerce(value.value, source, target), target)
+        if source == 'char':
+            code = self.function.temp()
+            self._emit('ord', code, (value,))
+            value = code
+        if target == 'float':
+            result = self.function.temp()
+            self._emit('float', result, (value,))
+            value = result
+        return value
+
+    def _expr(self, root, dst=None):
+        # Devuelve el operando con el valor; la operación raíz escribe en dst si se indica
+        values = {}
+        pending = {}             # and/or a medio evaluar: id -> (resultado, etiqueta final)
+        stack = [(root, 0)]
+        while stack:
+            node, state = stack.pop()
+            kind = node.kind
+            if node.type is None:
+                raise ExecutionError("El programa no ha pasado el análisis semántico.", node.lineno, node.col)
+            if kind == CONST:
+                values[id(node)] = Imm(const_value(node.value), node.type)
+                continue
+            if kind == VAR:
+                values[id(node)] = self._resolve(node.name)[0]
+                continue
+
+            if kind == BINOP and node.op in ('and', 'or'):
+                if state == 0:
+                    stack.append((node, 1))
+                    stack.append((node.left, 0))
+                elif state == 1:
+                    result, rest, done = self.function.temp(), self._label(), self._label()
+                    self._emit('copy', result, (values.pop(id(node.left)),))
+                    targets = (rest, done) if node.op == 'and' else (done, rest)
+                    self._emit('branch', None, (result,) + targets)
+                    self._emit('label', None, (rest,))
+                    pending[id(node)] = (result, done)
+                    stack.append((node, 2))
+                    stack.append((node.right, 0))
+                else:
+                    result, done = pending.pop(id(node))
+                    self._emit('copy', result, (values.pop(id(node.right)),))
+                    self._emit('label', None, (done,))
+                    values[id(node)] = result
+                continue
+
+            if state == 0:
+                stack.append((node, 1))
+                stack.extend((child, 0) for child in reversed(_expression_children(node)))
+                continue
+
+            target = dst if node is root and dst is not None else self.function.temp()
+            if kind == BINOP:
+                left, right = values.pop(id(node.left)), values.pop(id(node.right))
+                if is_vector(node.left.type) or is_vector(node.right.type):
+                    base = node.type[1] if is_vector(node.type) else node.left.type[1]
+                    self._emit('vec', target, (node.op, left, right), base)
+                else:
+                    self._emit(_BINARY_OPS[node.op], target, (left, right), node.left.type)
+            elif kind == UNOP:
+                operand = values.pop(id(node.operand))
+                if is_vector(node.type):
+                    self._emit('vec', target, ('neg', operand), node.type[1])
+                elif node.op == 'not':
+                    self._emit('not', target, (operand,))
+                else:
+                    self._emit('neg', target, (operand,), node.type)
+            elif kind == ARRAY_ACCESS:
+                array, index = values.pop(id(node.array)), values.pop(id(node.index))
+                self._emit('load', target, (array, index, node.array.type[2]))
+            elif kind == FIELD_ACCESS:
+                obj = values.pop(id(node.obj))
+                self._emit('getfield', target, (obj, node.offset, node.field))
+            else:   # FUNC_CALL
+                function = self.program.functions.get(node.name)
+                if function is None and node.name in REDUCTIONS:
+                    args = [values.pop(id(arg)) for arg in node.args]
+                    self._emit('vec', target, [node.name] + args, node.type)
+                    values[id(node)] = target
+                    continue
+                if function is None:
+                    raise ExecutionError(f"La función '{node.name}' no está definida.", node.lineno, node.col)
+                args = [values.pop(id(arg)) for arg in node.args]
+                args = [self._coerce(arg, node_arg.type, function.variables[param])
+                        for arg, node_arg, param in zip(args, node.args, function.params)]
+                self._emit('call', target, [node.name] + args)
+            values[id(node)] = target
+        return values[id(root)]
+
+
+def lower_program(program):
+    return IRBuilder().build(program)
+
+
+def _expression_children(node):
+    kind = node.kind
+    if kind == BINOP:
+        return (node.left, node.right)
+    if kind == UNOP:
+        return (node.operand,)
+    if kind == ARRAY_ACCESS:
+        return (node.array, node.index)
+    if kind == FIELD_ACCESS:
+        return (node.obj,)
+    if kind == FUNC_CALL:
+        return node.args
+    return ()
+
+
+# ----------------------------- Tablas de despacho -----------------------------
+
+_STATEMENT_BUILDERS = {
+    DECL: IRBuilder._decl,
+    DECL_ASSIGN: IRBuilder._decl_assign,
+    ASSIGN: IRBuilder._assign,
+    FUNC_DEF: IRBuilder._func_def,
+    RETURN: IRBuilder._return,
+    INSTANCE: IRBuilder._instance,
+    TYPE_DEF: IRBuilder._type_def,
+    BINOP: IRBuilder._expression_statement,
+    UNOP: IRBuilder._expression_statement,
+    CONST: IRBuilder._expression_statement,
+    VAR: IRBuilder._expression_statement,
+    ARRAY_ACCESS: IRBuilder._expression_statement,
+    FIELD_ACCESS: IRBuilder._expression_statement,
+    FUNC_CALL: IRBuilder._expression_statement,
+}
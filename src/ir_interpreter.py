@@ -0,0 +1,193 @@
+from executor import ExecutionError, SCALAR_DEFAULTS, is_vector, format_value, int_div
+from ir import Imm
+from vectors import VectorError, TYPECODES, OVERFLOW_MESSAGE, INT_MIN, INT_MAX, new_vector, vector_op
+
+
+# ----------------------------- Intérprete de la IR -----------------------------
+# Ejecuta el código de tres direcciones tal cual y cuenta las instrucciones ejecutadas
+# (las etiquetas no cuentan). No pretende ser rápido: sirve para comprobar que la IR, antes
+# y después de optimizarla, calcula lo mismo que los demás backends y para medir cuántas
+# instrucciones se ahorran. Los valores se representan como en executor.py.
+
+_NO_RETURN = object()
+
+
+class IRInterpreter:
+    def __init__(self, program):
+        self.program = program
+        self.records = {name: {field: (offset, ftype) for offset, (field, ftype) in enumerate(fields)}
+                        for name, fields in program.records.items()}
+        self.labels = {}          # función -> {etiqueta: posición}
+        for function in program.all_functions():
+            self.labels[function.name] = {instr.args[0]: i for i, instr in enumerate(function.code)
+                                          if instr.op == 'label'}
+        self.globals = {}
+        self.executed = 0
+
+    def run(self):
+        main = self.program.main
+        self.executed = 0
+        self.globals = {name: _initial(vtype) for name, vtype in main.variables.items()}
+        try:
+            self._execute(main, {})
+        except RecursionError:
+            raise ExecutionError("Se ha superado la profundidad máxima de llamadas.") from None
+        return self.variables()
+
+    def variables(self):
+        return {name[1:]: value for name, value in self.globals.items()}
+
+    def format_variables(self):
+        types = self.program.main.variables
+        return [f"{name[1:]} = {format_value(value, types[name], self.records)}"
+                for name, value in self.globals.items()]
+
+    def _execute(self, function, frame):
+        g = self.globals
+        code, labels = function.code, self.labels[function.name]
+
+        def read(operand):
+            if operand.__class__ is Imm:
+                return operand.value
+            return g[operand] if operand[0] == '@' else frame[operand]
+
+        pc, end = 0, len(code)
+        while pc < end:
+            instr = code[pc]
+            pc += 1
+            op = instr.op
+            if op == 'label':
+                continue
+            self.executed += 1
+            args = instr.args
+            if op == 'copy':
+                value = read(args[0])
+            elif op in _BINARY:
+                value = _binary(op, instr.type, read(args[0]), read(args[1]), instr.lineno)
+            elif op == 'branch':
+                pc = labels[args[1] if read(args[0]) else args[2]]
+                continue
+            elif op == 'jump':
+                pc = labels[args[0]]
+                continue
+            elif op == 'load':
+                i, n = read(args[1]), args[2]
+                if not 0 <= i < n:
+                    raise ExecutionError(f"Índice {i} fuera de rango para un vector de tamaño {n}.", instr.lineno)
+                value = read(args[0])[i]
+            elif op == 'store':
+                i, n = read(args[1]), args[3]
+                if not 0 <= i < n:
+                    raise ExecutionError(f"Índice {i} fuera de rango para un vector de tamaño {n}.", instr.lineno)
+                try:
+                    read(args[0])[i] = read(args[2])
+                except OverflowError:
+                    raise ExecutionError(OVERFLOW_MESSAGE, instr.lineno) from None
+                continue
+            elif op == 'getfield':
+                value = read(args[0])[args[1]]
+            elif op == 'setfield':
+                read(args[0])[args[1]] = read(args[3])
+                continue
+            elif op == 'not':
+                value = not read(args[0])
+            elif op == 'neg':
+                value = read(args[0])
+                value = chr(-ord(value) % 256) if instr.type == 'char' else -value
+                if instr.type == 'int' and value > INT_MAX:
+                    raise ExecutionError(OVERFLOW_MESSAGE, instr.lineno)
+            elif op == 'ord':
+                value = ord(read(args[0]))
+            elif op == 'float':
+                value = float(read(args[0]))
+            elif op == 'vec':
+                try:
+                    value = vector_op(args[0], instr.type, *[read(arg) for arg in args[1:]])
+                except VectorError as e:
+                    raise ExecutionError(e.message, instr.lineno) from None
+            elif op == 'newvec':
+                value = self._new_vector(args[0], args[1])
+            elif op == 'newrec':
+                value = self._new_record(args[0])
+            elif op == 'call':
+                value = self._call(args[0], [read(arg) for arg in args[1:]])
+                if value is _NO_RETURN:
+                    raise ExecutionError(f"La función '{args[0]}' terminó sin ejecutar 'return'.", instr.lineno)
+            elif op == 'ret':
+                return read(args[0])
+            elif op == 'noret':
+                return _NO_RETURN
+            else:
+                raise ExecutionError(f"Instrucción desconocida: {op}", instr.lineno)
+            dst = instr.dst
+            if dst[0] == '@':
+                g[dst] = value
+            else:
+                frame[dst] = value
+        return None
+
+    def _call(self, name, args):
+        function = self.program.functions[name]
+        frame = {var: _initial(vtype) for var, vtype in function.variables.items()}
+        frame.update(zip(function.params, args))
+        return self._execute(function, frame)
+
+    def _new_record(self, type_name):
+        layout = self.records.get(type_name)
+        if layout is None:
+            raise ExecutionError(f"El tipo '{type_name}' no está definido.")
+        record = []
+        for _, ftype in layout.values():
+            if is_vector(ftype):
+                record.append(self._new_vector(ftype[1], ftype[2]))
+            elif ftype in SCALAR_DEFAULTS:
+                record.append(SCALAR_DEFAULTS[ftype])
+            else:
+                record.append(self._new_record(ftype))
+        return record
+
+    def _new_vector(self, base, n):
+        if base in TYPECODES:
+            return new_vector(base, n)
+        if base in SCALAR_DEFAULTS:
+            return [SCALAR_DEFAULTS[base]] * n
+        if base in self.records:
+            # Vector de registros: una columna por campo (ver records.py)
+            return [self._new_vector(ftype, n) for _, ftype in self.records[base].values()]
+        return [self._new_vector(base[1], base[2]) for _ in range(n)]
+
+
+def _initial(vtype):
+    # Como la plantilla de los marcos: escalares a su valor por defecto, el resto sin crear
+    return SCALAR_DEFAULTS.get(vtype) if isinstance(vtype, str) else None
+
+
+def _binary(op, vtype, a, b, lineno):
+    if op in _COMPARE:
+        return _COMPARE[op](a, b)
+    if vtype == 'char':
+        return chr(_binary(op, 'int', ord(a), ord(b), lineno) % 256)
+    if op == 'div':
+        try:
+            value = int_div(a, b) if vtype == 'int' else a / b
+        except ZeroDivisionError:
+            raise ExecutionError("División por cero.", lineno) from None
+    else:
+        value = _ARITH[op](a, b)
+    # Los int son de 64 bits, como en los demás motores
+    if vtype == 'int' and not INT_MIN <= value <= INT_MAX:
+        raise ExecutionError(OVERFLOW_MESSAGE, lineno)
+    return value
+
+
+_ARITH = {'add': lambda a, b: a + b, 'sub': lambda a, b: a - b, 'mul': lambda a, b: a * b}
+_COMPARE = {'lt': lambda a, b: a < b, 'le': lambda a, b: a <= b, 'gt': lambda a, b: a > b,
+            'ge': lambda a, b: a >= b, 'eq': lambda a, b: a == b}
+_BINARY = frozenset(_ARITH) | frozenset(_COMPARE) | {'div'}
+
+
+def run_ir(program):
+    # (variables del programa, instrucciones ejecutadas)
+    interpreter = IRInterpreter(program)
+    variables = interpreter.run()
+    return variables, interpreter.executed
@@ -0,0 +1,564 @@
+import operator
+from collections import Counter
+
+from cfg import ControlFlowGraph
+from dataflow import BitIndex, solve
+from executor import int_div
+from ir import Imm, Instr, TERMINATORS
+from vectors import INT_MIN, INT_MAX
+
+
+# Operaciones que calculan un valor a partir de sus operandos (candidatas a CSE)
+_EXPRESSION_OPS = frozenset(('add', 'sub', 'mul', 'div', 'lt', 'le', 'gt', 'ge', 'eq',
+                             'neg', 'not', 'ord', 'float', 'load', 'getfield'))
+_MEMORY_OPS = frozenset(('load', 'getfield'))
+_MEMORY_WRITES = frozenset(('store', 'setfield', 'call'))
+_COMMUTATIVE = frozenset(('add', 'mul', 'eq'))
+# Sin efectos y sin posibilidad de fallo: se pueden quitar si nadie usa el resultado o sacar
+# de un bucle. La división y 'load' pueden fallar: sólo se mueven en los casos de _is_safe;
+# también la aritmética de int, que falla si el resultado no cabe en 64 bits (ver
+# _guarded_candidate).
+_SAFE_OPS = frozenset(('copy', 'add', 'sub', 'mul', 'lt', 'le', 'gt', 'ge', 'eq',
+                       'neg', 'not', 'ord', 'float', 'getfield'))
+_INT_ARITHMETIC = frozenset(('add', 'sub', 'mul', 'neg'))
+_COMPARE = {'lt': operator.lt, 'le': operator.le, 'gt': operator.gt, 'ge': operator.ge, 'eq': operator.eq}
+_ARITH = {'add': operator.add, 'sub': operator.sub, 'mul': operator.mul}
+
+_ROUNDS = 4
+
+
+def _is_safe(instr):
+    # Una lectura con índice constante dentro del vector o una división por una constante
+    # distinta de cero tampoco pueden fallar (entre int, tampoco por -1: INT_MIN / -1 no cabe)
+    op = instr.op
+    if op in _INT_ARITHMETIC and instr.type == 'int':
+        return False
+    if op in _SAFE_OPS:
+        return True
+    if op == 'load':
+        index = instr.args[1]
+        return index.__class__ is Imm and 0 <= index.value < instr.args[2]
+    if op == 'div':
+        divisor = instr.args[1]
+        return (divisor.__class__ is Imm and divisor.value not in (0, '\0')
+                and not (instr.type == 'int' and divisor.value == -1))
+    return False
+
+
+def _guarded_candidate(instr):
+    # Aritmética de int: sólo puede fallar por desbordamiento, y siempre con el mismo error en
+    # su línea. Sale de un bucle sólo a una cabecera protegida (ver hoist_loop_invariants)
+    return instr.op in _INT_ARITHMETIC and instr.type == 'int'
+
+
+# ----------------------------- Bloques básicos -----------------------------
+# Se reutiliza el grafo de cfg.py con instrucciones como elementos: un bloque empieza en
+# una etiqueta y termina en un salto, un 'ret' o un 'noret'.
+
+def build_blocks(function):
+    # (grafo, bloques en el orden del código)
+    cfg = ControlFlowGraph()
+    blocks, by_label = [], {}
+    block = None
+    for instr in function.code:
+        if block is None or instr.op == 'label' and block.items:
+            block = cfg.new_block()
+            blocks.append(block)
+        block.items.append(instr)
+        if instr.op == 'label':
+            by_label[instr.args[0]] = block
+        if instr.op in TERMINATORS:
+            block = None
+
+    cfg.link(cfg.entry, blocks[0] if blocks else cfg.exit)
+    for i, block in enumerate(blocks):
+        last = block.items[-1]
+        if last.op == 'jump':
+            cfg.link(block, by_label[last.args[0]])
+        elif last.op == 'branch':
+            cfg.link(block, by_label[last.args[1]])
+            if last.args[2] != last.args[1]:
+                cfg.link(block, by_label[last.args[2]])
+        elif last.op in ('ret', 'noret'):
+            cfg.link(block, cfg.exit)
+        else:
+            cfg.link(block, blocks[i + 1] if i + 1 < len(blocks) else cfg.exit)
+    return cfg, blocks
+
+
+# ----------------------------- Efectos de las llamadas -----------------------------
+# Para cada función, las globales que puede escribir (también a través de las funciones a
+# las que llama) y si escribe en vectores o registros, que pueden ser de quien la llama.
+# Sin este resumen, una llamada tendría que invalidar todo lo que depende de una global.
+
+def call_effects(program):
+    written = {name: set() for name in program.functions}
+    memory = dict.fromkeys(program.functions, False)
+    callees = {name: set() for name in program.functions}
+    for name, function in program.functions.items():
+        for instr in function.code:
+            if instr.dst is not None and instr.dst[0] == '@':
+                written[name].add(instr.dst)
+            if instr.op in ('store', 'setfield'):
+                memory[name] = True
+            elif instr.op == 'call':
+                callees[name].add(instr.args[0])
+    changed = True
+    while changed:
+        changed = False
+        for name in program.functions:
+            for callee in callees[name]:
+                if not written[callee] <= written[name] or memory[callee] and not memory[name]:
+                    written[name] |= written[callee]
+                    memory[name] = memory[name] or memory[callee]
+                    changed = True
+    return {name: (frozenset(written[name]), memory[name]) for name in program.functions}
+
+
+def _call_effect(instr, effects):
+    # (globales escritas o None si pueden ser todas, escribe en memoria)
+    effect = effects.get(instr.args[0]) if effects is not None else None
+    return effect if effect is not None else (None, True)
+
+
+def _flatten(function, blocks):
+    function.code = [instr for block in blocks for instr in block.items]
+
+
+def _expression_key(instr):
+    if instr.op not in _EXPRESSION_OPS or instr.dst is None:
+        return None
+    operands = instr.operands()
+    if instr.op in _COMMUTATIVE:
+        operands = sorted(operands, key=repr)
+    # Además de los operandos: el tamaño del vector en 'load' y la posición del campo en 'getfield'
+    extra = instr.args[2] if instr.op == 'load' else instr.args[1] if instr.op == 'getfield' else None
+    return (instr.op, instr.type, extra) + tuple(operands)
+
+
+# ----------------------------- Subexpresiones comunes -----------------------------
+# Expresiones disponibles (análisis "must" hacia delante). Una expresión deja de estar
+# disponible cuando se redefine un operando; las lecturas de memoria, también cuando se
+# escribe en un vector o un campo o se llama a una función, que además puede cambiar
+# cualquier global. Dentro de un bloque se reutiliza el nombre que ya tiene el valor; entre
+# bloques, un temporal canónico que se copia tras cada cálculo original de la expresión.
+
+def eliminate_common_subexpressions(function, effects=None):
+    cfg, blocks = build_blocks(function)
+    expressions = BitIndex()
+    keys = {}
+    for block in blocks:
+        for instr in block.items:
+            key = _expression_key(instr)
+            if key is not None:
+                keys[id(instr)] = key
+                expressions.add(key)
+    if not expressions:
+        return 0
+
+    using, memory, globals_ = {}, 0, 0
+    for bit, key in enumerate(expressions.items):
+        if key[0] in _MEMORY_OPS:
+            memory |= 1 << bit
+        for name in key[3:]:
+            if name.__class__ is str:
+                using[name] = using.get(name, 0) | (1 << bit)
+                if name[0] == '@':
+                    globals_ |= 1 << bit
+
+    def killed(instr):
+        mask = 0
+        if instr.op == 'call':
+            written, writes_memory = _call_effect(instr, effects)
+            mask = memory if writes_memory else 0
+            if written is None:
+                mask |= globals_
+            else:
+                for name in written:
+                    mask |= using.get(name, 0)
+        elif instr.op in _MEMORY_WRITES:
+            mask = memory
+        if instr.dst is not None:
+            mask |= using.get(instr.dst, 0)
+        return mask
+
+    gen, kill = [0] * len(cfg.blocks), [0] * len(cfg.blocks)
+    for block in blocks:
+        block_gen = block_kill = 0
+        for instr in block.items:
+            mask = killed(instr)
+            block_gen &= ~mask
+            block_kill |= mask
+            key = keys.get(id(instr))
+            if key is not None:
+                bit = 1 << expressions.bits[key]
+                if not mask & bit:
+                    block_gen |= bit
+        gen[block.index], kill[block.index] = block_gen, block_kill
+    available, _ = solve(cfg, gen, kill, universe=(1 << len(expressions)) - 1)
+
+    canonical = {}            # expresión -> temporal que guarda su último valor
+    replaced = 0
+    for block in blocks:
+        avail = available[block.index]
+        holder = {}           # bit -> nombre que tiene ahora el valor de la expresión
+        for instr in block.items:
+            key = keys.get(id(instr))
+            bit = expressions.bits[key] if key is not None else None
+            if bit is not None and avail >> bit & 1:
+                source = holder.get(bit)
+                if source is None:
+                    source = canonical.get(key)
+                    if source is None:
+                        source = canonical[key] = function.temp()
+                instr.op, instr.args, instr.type = 'copy', (source,), None
+                replaced += 1
+            mask = killed(instr)
+            if mask:
+                avail &= ~mask
+                holder = {b: name for b, name in holder.items() if not mask >> b & 1}
+            if instr.dst is not None:
+                holder = {b: name for b, name in holder.items() if name != instr.dst}
+            if bit is not None and not mask >> bit & 1:
+                avail |= 1 << bit
+                holder[bit] = instr.dst
+
+    if canonical:
+        for block in blocks:
+            items = []
+            for instr in block.items:
+                items.append(instr)
+                key = _expression_key(instr)
+                if key in canonical:
+                    items.append(Instr('copy', canonical[key], (instr.dst,), None, instr.lineno))
+            block.items = items
+    _flatten(function, blocks)
+    return replaced
+
+
+# ----------------------------- Propagación de copias -----------------------------
+# Copias disponibles (análisis "must"): tras 'x = copy y', y mientras no se redefinan ni x
+# ni y, los usos de x pueden leer y. Con inmediatos es además propagación de constantes.
+
+def propagate_copies(function, effects=None):
+    cfg, blocks = build_blocks(function)
+    copies = BitIndex()
+    pairs = {}
+    for block in blocks:
+        for instr in block.items:
+            if instr.op == 'copy' and instr.args[0] != instr.dst:
+                pairs[id(instr)] = copies.add((instr.dst, instr.args[0]))
+    if not copies:
+        return 0
+
+    involving, globals_ = {}, 0
+    for bit, (dst, source) in enumerate(copies.items):
+        for name in (dst, source):
+            if name.__class__ is str:
+                involving[name] = involving.get(name, 0) | (1 << bit)
+                if name[0] == '@':
+                    globals_ |= 1 << bit
+
+    def killed(instr):
+        mask = 0
+        if instr.op == 'call':
+            written = _call_effect(instr, effects)[0]
+            if written is None:
+                mask = globals_
+            else:
+                for name in written:
+                    mask |= involving.get(name, 0)
+        if instr.dst is not None:
+            mask |= involving.get(instr.dst, 0)
+        return mask
+
+    gen, kill = [0] * len(cfg.blocks), [0] * len(cfg.blocks)
+    for block in blocks:
+        block_gen = block_kill = 0
+        for instr in block.items:
+            mask = killed(instr)
+            block_gen &= ~mask
+            block_kill |= mask
+            bit = pairs.get(id(instr))
+            if bit is not None:
+                block_gen |= 1 << bit
+        gen[block.index], kill[block.index] = block_gen, block_kill
+    available, _ = solve(cfg, gen, kill, universe=(1 << len(copies)) - 1)
+
+    replaced = 0
+    for block in blocks:
+        mapping = {}          # x -> (y, bit)
+        for bit in range(len(copies)):
+            if available[block.index] >> bit & 1:
+                dst, source = copies.items[bit]
+                mapping[dst] = (source, bit)
+        for instr in block.items:
+            if mapping and instr.replace_operands({name: source for name, (source, _) in mapping.items()}):
+                replaced += 1
+            mask = killed(instr)
+            if mask:
+                mapping = {name: entry for name, entry in mapping.items() if not mask >> entry[1] & 1}
+            bit = pairs.get(id(instr))
+            if bit is not None:
+                mapping[instr.dst] = (copies.items[bit][1], bit)
+    _flatten(function, blocks)
+    return replaced
+
+
+# ----------------------------- Plegado de constantes -----------------------------
+# Una operación con todos sus operandos inmediatos pasa a ser una copia del resultado, que la
+# propagación de copias lleva a sus usos. No se pliega lo que fallaría al ejecutarse
+# (desbordamiento, división por cero): el error se sigue dando en su línea.
+
+def _folded(instr):
+    op, vtype = instr.op, instr.type
+    values = [operand.value for operand in instr.operands()]
+    if op in _COMPARE:
+        return Imm(_COMPARE[op](*values), 'bool')
+    if op == 'not':
+        return Imm(not values[0], 'bool')
+    if op == 'ord':
+        return Imm(ord(values[0]), 'int')
+    if op == 'float':
+        return Imm(float(values[0]), 'float')
+    if vtype not in ('int', 'float'):
+        return None     # char: aritmética módulo 256, se deja al intérprete
+    if op == 'neg':
+        value = -values[0]
+    elif op == 'div':
+        if values[1] == 0:
+            return None
+        value = int_div(*values) if vtype == 'int' else values[0] / values[1]
+    elif op in _ARITH:
+        value = _ARITH[op](*values)
+    else:
+        return None
+    if vtype == 'int' and not INT_MIN <= value <= INT_MAX:
+        return None
+    return Imm(value, vtype)
+
+
+def fold_constants(function):
+    folded = 0
+    for instr in function.code:
+        if (instr.dst is None or instr.op not in _EXPRESSION_OPS or instr.op in _MEMORY_OPS
+                or any(operand.__class__ is not Imm for operand in instr.operands())):
+            continue
+        value = _folded(instr)
+        if value is not None:
+            instr.op, instr.args, instr.type = 'copy', (value,), None
+            folded += 1
+    return folded
+
+
+# ----------------------------- Código muerto -----------------------------
+
+def remove_dead_code(function):
+    # Temporales que nadie lee, copias de una variable en sí misma y saltos a la etiqueta siguiente
+    removed = 0
+    while True:
+        used = Counter(name for instr in function.code for name in instr.uses())
+        code = []
+        for i, instr in enumerate(function.code):
+            op = instr.op
+            if _is_safe(instr) and instr.dst[0] == '%' and not used[instr.dst]:
+                continue
+            if op == 'copy' and instr.args[0] == instr.dst:
+                continue
+            if op == 'jump' and i + 1 < len(function.code):
+                following = function.code[i + 1]
+                if following.op == 'label' and following.args[0] == instr.args[0]:
+                    continue
+            code.append(instr)
+        if len(code) == len(function.code):
+            return removed
+        removed += len(function.code) - len(code)
+        function.code = code
+
+
+# ----------------------------- Código invariante en bucles -----------------------------
+# Un temporal que se define una sola vez, con una operación segura y cuyos operandos no
+# cambian dentro del bucle, se calcula antes de la etiqueta de cabecera. Los temporales
+# sólo se usan detrás de su definición, así que moverlo delante del bucle no cambia nada
+# aunque el bucle no llegue a dar ninguna vuelta. Los bucles internos se tratan primero: lo
+# que sale de ellos puede volver a salir del bucle que los contiene.
+#
+# La aritmética de int invariante puede desbordarse, así que sólo sale del bucle si en la
+# primera vuelta se ejecuta seguro y antes que cualquier instrucción que pudiera fallar con
+# otro error: en el tramo recto del principio de la condición (va delante de la cabecera,
+# como las seguras) o del cuerpo. La del cuerpo va a una cabecera protegida, que repite la
+# condición y sólo se ejecuta si se entra en el bucle:
+#
+#       <condición, con temporales nuevos>
+#       branch c, L.pre, Lfin
+#   L.pre:
+#       <invariantes>
+#       jump Lcuerpo
+#   L:
+#       <condición>
+#       branch c, Lcuerpo, Lfin
+#   Lcuerpo:
+#
+# Así un desbordamiento se da o no igual que sin optimizar, con el mismo mensaje y línea. La
+# condición sólo se repite si es un tramo recto sin llamadas.
+
+_PREHEADER = '.pre'
+_CONDITION_OPS = _EXPRESSION_OPS | {'copy', 'vec'}
+
+
+def _loop_test(region, end):
+    # Posición en la región del salto que decide si se da otra vuelta, o None
+    for i, instr in enumerate(region):
+        if (instr.op == 'branch' and instr.args[2] == end and i + 1 < len(region)
+                and region[i + 1].op == 'label' and region[i + 1].args[0] == instr.args[1]):
+            return i
+    return None
+
+
+def _repeatable(condition):
+    return all(instr.op in _CONDITION_OPS and instr.dst[0] == '%' for instr in condition)
+
+
+def _first_iteration(instructions, skip):
+    # Aritmética de int del tramo recto que se ejecuta en la primera vuelta sin que antes pueda
+    # fallar otra cosa (salvo aritmética de int de la misma línea, que daría el mismo error)
+    lines = set()
+    for instr in instructions:
+        if instr.op in TERMINATORS or instr.op == 'label':
+            return
+        if id(instr) in skip or _is_safe(instr):
+            continue
+        if not _guarded_candidate(instr):
+            return
+        if lines <= {instr.lineno}:
+            yield instr
+        lines.add(instr.lineno)
+
+
+def hoist_loop_invariants(function, effects=None):
+    definitions = Counter(instr.dst for instr in function.code if instr.dst is not None)
+    hoisted = 0
+    for head, end in function.loops:
+        code = function.code
+        start = stop = preheader = None
+        for i, instr in enumerate(code):
+            if instr.op == 'label':
+                if instr.args[0] == head:
+                    start = i
+                elif instr.args[0] == end:
+                    stop = i
+                elif instr.args[0] == head + _PREHEADER:
+                    preheader = i
+        if start is None or stop is None:
+            continue
+        region = code[start:stop]
+        defined = {instr.dst for instr in region if instr.dst is not None}
+        any_global = writes = False
+        for instr in region:
+            if instr.op == 'call':
+                written, writes_memory = _call_effect(instr, effects)
+                if written is None:
+                    any_global = True
+                else:
+                    defined |= written
+                writes = writes or writes_memory
+            elif instr.op in _MEMORY_WRITES:
+                writes = True
+
+        def invariant(operand):
+            if operand.__class__ is Imm or operand in moved_names:
+                return True
+            return operand not in defined and not (any_global and operand[0] == '@')
+
+        def movable(instr):
+            dst = instr.dst
+            return (dst is not None and dst[0] == '%' and dst not in moved_names and definitions[dst] == 1
+                    and all(invariant(operand) for operand in instr.operands()))
+
+        test = _loop_test(region, end)
+        guarded = test is not None and (preheader is not None or _repeatable(region[1:test]))
+        moved, moved_names, behind_guard = [], set(), set()
+
+        def move(instr, guard):
+            moved.append(instr)
+            moved_names.add(instr.dst)
+            if guard or any(operand in behind_guard for operand in instr.operands()):
+                behind_guard.add(instr.dst)
+
+        changed = True
+        while changed:
+            changed = False
+            for instr in region:
+                if _is_safe(instr) and not (instr.op in _MEMORY_OPS and writes) and movable(instr):
+                    move(instr, False)
+                    changed = True
+            skip = {id(instr) for instr in moved}
+            for instr in _first_iteration(region[1:], skip):
+                if movable(instr):
+                    move(instr, False)
+                    changed = True
+            if guarded:
+                for instr in _first_iteration(region[test + 2:], skip):
+                    if movable(instr):
+                        move(instr, True)
+                        changed = True
+        if not moved:
+            continue
+        ids = {id(instr) for instr in moved}
+        rest = [instr for instr in region if id(instr) not in ids]
+        if preheader is not None:
+            # Ya hay cabecera protegida: termina en el salto al cuerpo, justo antes de la etiqueta
+            function.code = code[:start - 1] + moved + code[start - 1:start] + rest + code[stop:]
+        elif behind_guard:
+            before = [instr for instr in moved if instr.dst not in behind_guard]
+            after = [instr for instr in moved if instr.dst in behind_guard]
+            guard = _preheader(function, head, rest, rest.index(region[test]), definitions)
+            function.code = (code[:start] + before + guard[:-1] + after + guard[-1:] + rest + code[stop:])
+        else:
+            function.code = code[:start] + moved + rest + code[stop:]
+        hoisted += len(moved)
+    return hoisted
+
+
+def _preheader(function, head, region, test, definitions):
+    # Copia de la condición (con temporales nuevos) que salta a la cabecera protegida, su
+    # etiqueta y el salto final al cuerpo; lo que se saca del bucle va antes de ese salto
+    renamed = {}
+    code = []
+    for instr in region[1:test]:
+        copy = Instr(instr.op, None, instr.args, instr.type, instr.lineno)
+        copy.replace_operands(renamed)
+        copy.dst = renamed[instr.dst] = function.temp()
+        definitions[copy.dst] = 1
+        code.append(copy)
+    branch = region[test]
+    label = head + _PREHEADER
+    condition = renamed.get(branch.args[0], branch.args[0])
+    code.append(Instr('branch', None, (condition, label, branch.args[2]), None, branch.lineno))
+    code.append(Instr('label', None, (label,), None, branch.lineno))
+    code.append(Instr('jump', None, (branch.args[1],), None, branch.lineno))
+    return code
+
+
+# ----------------------------- Pasada completa -----------------------------
+
+def optimize_function(function, effects=None):
+    changes = 0
+    for _ in range(_ROUNDS):
+        round_changes = (propagate_copies(function, effects) + fold_constants(function)
+                         + eliminate_common_subexpressions(function, effects)
+                         + propagate_copies(function, effects) + remove_dead_code(function)
+                         + hoist_loop_invariants(function, effects))
+        if not round_changes:
+            break
+        changes += round_changes
+    return changes
+
+
+def optimize_ir(program):
+    # Devuelve el programa (modificado en el sitio) y cuántas instrucciones menos tiene
+    before = program.instruction_count()
+    effects = call_effects(program)
+    for function in program.all_functions():
+        optimize_function(function, effects)
+    return program, before - program.instruction_count()
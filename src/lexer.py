@@ -1,11 +1,16 @@
 import ply.lex as lex
 import re
+import sys
 from viper_tokens import tokens, reserved
+from diagnostics import DiagnosticSink
+
+_intern = sys.intern
 
 class Lexer:
     tokens = tokens
     
-    def __init__(self):
+    def __init__(self, diagnostics=None):
+        self.diagnostics = diagnostics if diagnostics is not None else DiagnosticSink()
         self.lexer = lex.lex(module=self)
 
     # Comentarios multilínea
@@ -16,14 +21,17 @@ class Lexer:
 
     def t_MULTILINE_COMMENT_UNCLOSED(self, t):
         r"\'\'\'(.|\n)*"  # Comentarios sin cerrar
-        print(f"[Lexer Error] Comentario multilínea no cerrado en línea {t.lineno}")
+        self.diagnostics.error('lexer.unclosed-comment',
+                               f"Comentario multilínea no cerrado en línea {t.lineno}", t.lineno, t.lexpos)
         t.lexer.skip(len(t.value))
         return None
 
-    # Identificadores y palabras reservadas
+    # Identificadores y palabras reservadas. El nombre se interna: todas sus apariciones (en
+    # los tokens, el AST y las tablas de símbolos) comparten una sola cadena
     def t_ID(self, t):
         r'[a-zA-Z_][a-zA-Z_0-9]*'
-        t.type = reserved.get(t.value, 'ID')
+        t.value = value = _intern(t.value)
+        t.type = reserved.get(value, 'ID')
         return t
 
     # Números flotantes (incluye notación científica)
@@ -33,12 +41,15 @@ class Lexer:
             t.value = float(t.value)
             return t
         except ValueError:
-            print(f"[Lexer Error] Número flotante mal formado '{t.value}' en línea {t.lineno}")
+            self.diagnostics.error('lexer.bad-float',
+                                   f"Número flotante mal formado '{t.value}' en línea {t.lineno}", t.lineno, t.lexpos)
             t.lexer.skip(len(t.value))
 
     def t_INVALID_LEADING_ZERO(self, t):
         r'0[0-9]+'
-        print(f"[Lexer Error] Número decimal con ceros no significativos: '{t.value}' en línea {t.lineno}")
+        self.diagnostics.error('lexer.leading-zero',
+                               f"Número decimal con ceros no significativos: '{t.value}' en línea {t.lineno}",
+                               t.lineno, t.lexpos)
         return None
     # Números enteros en decimal, binario, octal, hexadecimal (no permitir ceros no significativos)
     def t_NUMBER(self, t):
@@ -61,7 +72,8 @@ class Lexer:
             t.value = raw
             return t
         else:
-            print(f"[Lexer Error] Carácter inválido '{raw}' en línea {t.lineno}")
+            self.diagnostics.error('lexer.bad-char', f"Carácter inválido '{raw}' en línea {t.lineno}",
+                                   t.lineno, t.lexpos)
             return None
 
 
@@ -73,10 +85,12 @@ class Lexer:
     # Manejo de errores
     def t_error(self, t):
         if t.value[0] in ["'", "\"", "\\"]:  
-            print(f"[Lexer Error] Carácter ilegal '{t.value[0]}' en línea {t.lineno}, ignorado.")
+            self.diagnostics.error('lexer.illegal-char',
+                                   f"Carácter ilegal '{t.value[0]}' en línea {t.lineno}, ignorado.", t.lineno, t.lexpos)
             t.lexer.skip(1)
         else:
-            print(f"[Lexer Error] Carácter ilegal '{t.value[0]}' en línea {t.lineno}")
+            self.diagnostics.error('lexer.illegal-char',
+                                   f"Carácter ilegal '{t.value[0]}' en línea {t.lineno}", t.lineno, t.lexpos)
             t.lexer.skip(1)
 
 
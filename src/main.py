@@ -1,80 +1,527 @@
-import sys
+import argparse
+import filecmp
+import fnmatch
 import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
 from lexer import Lexer
+from scanner import Scanner
 from parser import Parser
-from semantic import SemanticAnalyzer
+from semantic import SemanticAnalyzer, SemanticError
+from token_stream import TokenBuffer
+from source_file import SourceFile
+from token_file import TokenFile, encode as encode_tokens
+from build_cache import BuildCache, DEFAULT_CACHE_DIR
+from ast_nodes import Node, NodeArena
+from executor import compile_program, ExecutionError
+from bytecode import compile_bytecode
+from vm import run_bytecode
+from transpiler import transpile, PythonProgram
+from ir import lower_program
+from ir_optimizer import optimize_ir
+from optimizer import optimize
+from dataflow import eliminate_dead_stores
+from bounds import analyze_bounds
+from diagnostics import DiagnosticSink, Diagnostic, JsonLinesWriter, render_text, DEBUG, NOTE, ERROR
 
 
-class ParserRunner:
+DEFAULT_PATTERNS = ('*.vip', '*.txt')
+OUTPUT_DIRS = ('tokens', 'bytecode', 'python', 'ir')   # Salidas dentro del directorio de entrada
+
+
+# Resultado de compilar un fichero: tokens, AST, estado y diagnósticos de todas las fases
+class FileResult:
+    __slots__ = ('status', 'error', 'tokens', 'ast', 'diagnostics', 'output', 'bytecode', 'python', 'ir', 'vtk')
+
     def __init__(self):
-        self.lexer_instance = Lexer()
-        self.lexer = self.lexer_instance.lexer
-        self.parser = Parser()
-
-    def pretty_print(self, tree, indent=0):
-        if isinstance(tree, tuple):
-            print("  " * indent + str(tree[0]))
-            for child in tree[1:]:
-                self.pretty_print(child, indent + 1)
-        elif isinstance(tree, list):
-            for item in tree:
-                self.pretty_print(item, indent)
+        self.status = 'ok'
+        self.error = None
+        self.tokens = None
+        self.ast = None
+        self.diagnostics = []
+        self.output = None      # Variables globales tras ejecutar el programa (con --run)
+        self.bytecode = None    # Contenido del .vbc (con --emit-bytecode)
+        self.python = None      # Contenido del .vpyc: fuente y objeto código (con --emit-python)
+        self.ir = None          # Volcado de la IR de tres direcciones (con --emit-ir)
+        self.vtk = None         # Tokens en binario, contenido del .vtk (con --emit-tokens)
+
+    def to_record(self):
+        # El AST se guarda como arena (arrays + lista plana) para que marshal lo serialice
+        ast = None
+        if self.ast is not None:
+            arena, root = NodeArena.from_tree(self.ast)
+            ast = (arena.to_record(), root)
+        diagnostics = [d.to_record() for d in self.diagnostics]
+        return (self.status, self.error, self.tokens.to_record(), ast, diagnostics, self.output, self.bytecode,
+                self.python, self.ir, self.vtk)
+
+    @classmethod
+    def from_record(cls, record, data, filename=None):
+        result = cls()
+        (result.status, result.error, tokens, ast, diagnostics, result.output, result.bytecode, result.python,
+         result.ir, result.vtk) = record
+        result.tokens = TokenBuffer.from_record(tokens, data)
+        result.diagnostics = [Diagnostic.from_record(d, filename) for d in diagnostics]
+        if ast is not None:
+            arena, root = ast
+            result.ast = NodeArena.from_record(arena).to_tree(root)
+        return result
+
+
+class ParserRunner:
+    def __init__(self, production=False, cache_dir=None, output_format='text', execute=False, engine='closures',
+                 emit_bytecode=False, emit_python=False, emit_ir=False, optimize=False, scanner='ply',
+                 stream=False, emit_tokens=False):
+        # Opciones con las que se reconstruye el runner en cada proceso del modo por lotes
+        self.options = dict(production=production, cache_dir=cache_dir, output_format=output_format,
+                            execute=execute, engine=engine, emit_bytecode=emit_bytecode,
+                            emit_python=emit_python, emit_ir=emit_ir, optimize=optimize, scanner=scanner, stream=stream,
+                            emit_tokens=emit_tokens)
+        # Los dos motores dan los mismos tokens y diagnósticos, así que la caché no los distingue.
+        # El modo por bloques sólo lo tiene el escáner escrito a mano.
+        if scanner == 'fast' or stream:
+            self.lexer_instance = self.lexer = Scanner()
         else:
-            print("  " * indent + str(tree))
+            self.lexer_instance = Lexer()
+            self.lexer = self.lexer_instance.lexer
+        self.parser = Parser(production=production)
+        self.production = production
+        self.output_format = output_format
+        self.execute = execute
+        self.engine = engine
+        self.emit_bytecode = emit_bytecode
+        self.emit_python = emit_python
+        self.emit_ir = emit_ir
+        self.optimize = optimize
+        self.stream = stream
+        self.emit_tokens = emit_tokens
+        # El formato de texto incluye las trazas de depuración del analizador; el JSON no
+        self.level = DEBUG if output_format == 'text' else NOTE
+        self.cache_dir = cache_dir
+        variant = (self.level + (f'-run-{engine}' if execute else '') + ('-vbc' if emit_bytecode else '')
+                   + ('-py' if emit_python else '') + ('-ir' if emit_ir else '') + ('-O' if optimize else '')
+                   + ('-vtk' if emit_tokens else ''))
+        self.cache = BuildCache(cache_dir, variant=variant) if cache_dir else None
+        self.json_writer = JsonLinesWriter(sys.stdout) if output_format == 'json' else None
+
+    # Líneas del árbol indentado (recorrido con pila explícita)
+    def format_tree(self, tree):
+        lines = []
+        stack = [(tree, 0)]
+        while stack:
+            item, indent = stack.pop()
+            if isinstance(item, Node):
+                lines.append("  " * indent + item.tag)
+                stack.extend((getattr(item, name), indent + 1) for name in reversed(item.fields))
+            elif isinstance(item, tuple):
+                lines.append("  " * indent + str(item[0]))
+                stack.extend((child, indent + 1) for child in reversed(item[1:]))
+            elif isinstance(item, list):
+                stack.extend((child, indent) for child in reversed(item))
+            else:
+                lines.append("  " * indent + str(item))
+        return lines
+
+    def pretty_print(self, tree):
+        lines = self.format_tree(tree)
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+
+    # Lexea, parsea y analiza una entrada; los diagnósticos de cada fase quedan en el resultado
+    def compile_source(self, data, filename=None):
+        result = FileResult()
+        sink = DiagnosticSink(file=filename, source=data, level=self.level)
+        self.lexer_instance.diagnostics = sink
+
+        self.lexer.lineno = 1
+        self.lexer.input(data)
+
+        # Se lexea una sola vez: el mismo buffer sirve para el volcado y para el parser
+        result.tokens = TokenBuffer(data)
+        try:
+            result.tokens.fill(self.lexer)
+        except Exception as e:
+            result.status = 'lexer'
+            result.error = str(e)
+        if self.emit_tokens:
+            result.vtk = encode_tokens(result.tokens)
+        return self._compile_tokens(result, sink, filename)
+
+    # Parsea y analiza los tokens de un .vtk sin lexear (las columnas salen de sus saltos de línea)
+    def compile_tokens(self, tokens, filename=None):
+        result = FileResult()
+        result.tokens = tokens
+        sink = DiagnosticSink(file=filename, level=self.level, line_index=tokens.line_index)
+        return self._compile_tokens(result, sink, filename)
+
+    def _compile_tokens(self, result, sink, filename):
+        self.parser.diagnostics = sink
+        if result.status == 'ok':
+            try:
+                result.ast = self.parser.parse_tokens(result.tokens)
+            except Exception as e:
+                result.status = 'syntax'
+                result.error = str(e)
+
+        if result.status == 'ok':
+            try:
+                SemanticAnalyzer(diagnostics=sink).analyze(result.ast)
+            except SemanticError as e:
+                sink.error('semantic.error', e.message, e.lineno or 0, col=e.col)
+                result.status = 'semantic'
+            except Exception as e:
+                sink.error('semantic.error', str(e))
+                result.status = 'semantic'
+
+        # Sólo se optimiza, compila y ejecuta un programa sin ningún error (el parser puede recuperarse
+        # y dejar el AST vacío)
+        if self.optimize and result.status == 'ok' and result.ast is not None and not sink.has_errors:
+            result.ast, removed = optimize(result.ast)
+            sink.note('optimizer.removed', f"Se han eliminado {removed} nodos del árbol.")
+            stores = eliminate_dead_stores(result.ast)
+            sink.note('optimizer.dead-stores', f"Se han eliminado {stores} asignaciones cuyo valor no se usa.")
+            safe, accesses = analyze_bounds(result.ast)
+            sink.note('optimizer.bounds', f"{safe} de {accesses} accesos a vectores no necesitan comprobar el índice.")
+
+        if ((self.execute or self.emit_bytecode or self.emit_python or self.emit_ir) and result.status == 'ok'
+                and result.ast is not None and not sink.has_errors):
+            try:
+                self._run_backend(result, filename)
+            except ExecutionError as e:
+                sink.error('runtime.error', e.message, e.lineno or 0, col=e.col)
+                result.status = 'runtime'
+
+        result.status = _final_status(result, sink)
+        result.diagnostics = sink.resolve()
+        return result
+
+    def _run_backend(self, result, filename):
+        bytecode = python = None
+        if self.emit_bytecode or self.engine == 'vm':
+            bytecode = compile_bytecode(result.ast)
+            if self.emit_bytecode:
+                result.bytecode = bytecode.dumps()
+        if self.emit_python or self.engine == 'python':
+            python = transpile(result.ast, filename)
+            if self.emit_python:
+                result.python = python.dumps()
+        if self.emit_ir:
+            program = lower_program(result.ast)
+            if self.optimize:
+                optimize_ir(program)
+            result.ir = program.dump()
+        if not self.execute:
+            return
+        if self.engine == 'vm':
+            result.output = run_bytecode(bytecode).format_variables()
+        elif self.engine == 'python':
+            python.run()
+            result.output = python.format_variables()
+        else:
+            program = compile_program(result.ast)
+            program.run()
+            result.output = program.format_variables()
+
+    # Compila (o recupera de la caché) un fichero y devuelve su estado y el texto a emitir
+    def build_file(self, input_path, output_path, filename, artifacts=None):
+        if self.stream:
+            return self.stream_file(input_path, output_path, filename)
+
+        # El fichero se mapea en memoria: con la caché, un fichero sin cambios no llega a decodificarse
+        with SourceFile(input_path) as source:
+            result = None
+            if self.cache is not None:
+                key = self.cache.key(source.raw)
+                record = self.cache.get(key)
+                if record is not None:
+                    result = FileResult.from_record(record, '', filename)
+            if result is None and input_path.endswith('.vtk'):
+                result = self.compile_tokens(TokenFile.loads(bytes(source.raw)), filename)
+            elif result is None:
+                result = self.compile_source(source.text(), filename)
+                if self.cache is not None:
+                    self.cache.put(key, result.to_record())
+
+        _write_if_changed(output_path, result.tokens.dumps())
+        for kind, path in (artifacts or {}).items():
+            content = _artifact(result, kind)
+            if content is not None:
+                _write_if_changed(path, content)
+        return result.status, self.report(result, filename)
+
+    # Modo por bloques (--stream): sólo se lexea. El fichero se decodifica por bloques y el .token
+    # se escribe según salen los tokens, así que la memoria no depende del tamaño del fichero.
+    # Sin caché: guardaría todos los tokens.
+    def stream_file(self, input_path, output_path, filename):
+        result = FileResult()
+        sink = DiagnosticSink(file=filename, level=self.level)
+        self.lexer.diagnostics = sink
+        self.lexer.lineno = 1
+
+        directory = os.path.dirname(output_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with SourceFile(input_path) as source, os.fdopen(fd, "w", encoding="utf-8") as out:
+            self.lexer.input_chunks(source.chunks())
+            try:
+                self.lexer.dump_into(out)
+            except Exception as e:
+                result.status = 'lexer'
+                result.error = str(e)
+        _replace_if_changed(tmp, output_path)
+
+        result.status = _final_status(result, sink)
+        result.diagnostics = sink.resolve()
+        return result.status, self.report(result, filename)
+
+    # Procesa un fichero completo y devuelve su estado: 'ok', 'lexer', 'syntax', 'semantic' o 'runtime'
+    def process_file(self, input_path, output_path, filename, artifacts=None):
+        status, text = self.build_file(input_path, output_path, filename, artifacts)
+        self.emit(text)
+        return status
 
-    def run(self, input_dir='tests'):
+    def emit(self, text):
+        if self.json_writer is not None:
+            self.json_writer.write_text(text)
+        elif text:
+            sys.stdout.write(text)
+
+    def finish(self):
+        if self.json_writer is not None:
+            self.json_writer.flush()
+        else:
+            sys.stdout.flush()
+
+    # Texto de salida de un fichero según el formato elegido
+    def report(self, result, filename):
+        if self.output_format == 'json':
+            return self.report_json(result, filename)
+        return self.report_text(result, filename)
+
+    def report_text(self, result, filename):
+        by_phase = {'lexer': [], 'syntax': [], 'semantic': [], 'runtime': []}
+        for diag in result.diagnostics:
+            by_phase.setdefault(diag.phase, []).append(render_text(diag))
+
+        # Sólo se corta el informe si el lexer o el parser se detuvieron (result.error); de los
+        # errores de los que se recuperan se sigue mostrando todo
+        lines = [f"\U0001F7E1 Procesando {filename}..."]
+        lines += by_phase['lexer']
+        if result.status == 'lexer' and result.error is not None:
+            lines.append(f"\u274C Error en {filename}: {result.error}")
+            lines.append(f"\u274C {filename} tuvo errores.\n")
+            return "\n".join(lines) + "\n"
+
+        token_name = os.path.splitext(filename)[0] + ".token"
+        lines.append(f"\u2705 {filename} procesado correctamente. Tokens en: tests/tokens/{token_name}")
+        if self.stream:
+            return "\n".join(lines) + "\n"
+        lines += by_phase['syntax']
+        if result.status == 'syntax' and result.error is not None:
+            lines.append(f"\u274C Error de sintaxis en {filename}: {result.error}\n")
+            return "\n".join(lines) + "\n"
+
+        lines.append(f"\U0001F333 Árbol sintáctico de {filename}:\n")
+        lines += self.format_tree(result.ast)
+        lines.append("")
+        lines += by_phase['semantic']
+        lines += by_phase.get('optimizer', ())
+        if result.output is not None or by_phase['runtime']:
+            lines.append(f"\u25B6\uFE0F Ejecución de {filename}:")
+            lines += ("  " + line for line in result.output or ())
+            lines += by_phase['runtime']
+            lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def report_json(self, result, filename):
+        diagnostics = result.diagnostics
+        if result.error is not None:
+            # El fallo que detuvo la compilación también se emite como diagnóstico
+            diagnostics = diagnostics + [Diagnostic('error', result.status + '.aborted', result.error, filename)]
+        return self.json_writer.format(diagnostics)
+
+    # Lista ordenada (relativa a input_dir) de los ficheros a procesar
+    def collect_files(self, input_dir, recursive=False, include=DEFAULT_PATTERNS, exclude=()):
+        def matches(relpath, patterns):
+            name = os.path.basename(relpath)
+            return any(fnmatch.fnmatch(relpath if '/' in pat else name, pat) for pat in patterns)
+
+        found = []
+        for root, dirs, files in os.walk(input_dir):
+            rel_root = os.path.relpath(root, input_dir)
+            if not recursive:
+                dirs[:] = []
+            else:
+                # El directorio de salida de tokens nunca es una entrada
+                dirs[:] = sorted(d for d in dirs if not (rel_root == '.' and d in OUTPUT_DIRS))
+            for filename in files:
+                relpath = filename if rel_root == '.' else os.path.join(rel_root, filename).replace(os.sep, '/')
+                if matches(relpath, include) and not matches(relpath, exclude):
+                    found.append(relpath)
+        return sorted(found)
+
+    def run(self, input_dir='tests', jobs=1, recursive=False, include=DEFAULT_PATTERNS, exclude=()):
         input_dir = os.path.join(os.path.dirname(__file__), '..', input_dir)
         output_dir = os.path.join(input_dir, 'tokens')
+        bytecode_dir = os.path.join(input_dir, 'bytecode')
+        python_dir = os.path.join(input_dir, 'python')
+        ir_dir = os.path.join(input_dir, 'ir')
         os.makedirs(output_dir, exist_ok=True)
 
-        for filename in os.listdir(input_dir):
-            if filename.endswith(".vip") or filename.endswith(".txt"):
-                input_path = os.path.join(input_dir, filename)
-                output_path = os.path.join(output_dir, os.path.splitext(filename)[0] + ".token")
-
-                print(f"\U0001F7E1 Procesando {filename}...")
-
-                with open(input_path, "r", encoding="utf-8") as f:
-                    data = f.read()
-
-                self.lexer.lineno = 1
-                self.lexer.input(data)
-
-                success = True
-                with open(output_path, "w", encoding="utf-8") as out:
-                    while True:
-                        try:
-                            tok = self.lexer.token()
-                        except Exception as e:
-                            print(f"\u274C Error en {filename}: {e}")
-                            success = False
-                            break
-                        if not tok:
-                            break
-                        out.write(f"{tok.type} {tok.value}\n")
-
-                if success:
-                    print(f"\u2705 {filename} procesado correctamente. Tokens en: tests/tokens/{os.path.basename(output_path)}")
-                    try:
-                        result = self.parser.parse(data, lexer=self.lexer)
-                        print(f"\U0001F333 Árbol sintáctico de {filename}:\n")
-                        self.pretty_print(result)
-                        print()
-                        
-                        semantic = SemanticAnalyzer()
-                        try:
-                            semantic.analyze(result)
-                        except Exception as e:
-                            print(f"[Semantic Error] {e}")
-
-                    except Exception as e:
-                        print(f"\u274C Error de sintaxis en {filename}: {e}\n")
-                else:
-                    print(f"\u274C {filename} tuvo errores.\n")
+        work = []
+        for relpath in self.collect_files(input_dir, recursive, include, exclude):
+            input_path = os.path.join(input_dir, relpath)
+            stem = os.path.splitext(relpath)[0]
+            output_path = os.path.join(output_dir, stem + ".token")
+            artifacts = {}
+            if self.emit_bytecode:
+                artifacts['vbc'] = os.path.join(bytecode_dir, stem + ".vbc")
+            if self.emit_python:
+                artifacts['py'] = os.path.join(python_dir, stem + ".py")
+                artifacts['vpyc'] = os.path.join(python_dir, stem + ".vpyc")
+            if self.emit_ir:
+                artifacts['ir'] = os.path.join(ir_dir, stem + ".ir")
+            if self.emit_tokens:
+                artifacts['vtk'] = os.path.join(output_dir, stem + ".vtk")
+            work.append((input_path, output_path, relpath, artifacts))
+
+        if jobs <= 1:
+            results = [(item[2], self.process_file(*item)) for item in work]
+            self.finish()
+            return results
+
+        # Modo por lotes: cada proceso mantiene su propio Lexer/Parser ya construido,
+        # y la salida de cada fichero se emite en el mismo orden que en modo secuencial
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(self.options,)) as pool:
+            chunksize = max(1, len(work) // (jobs * 4))
+            for item, (status, output) in zip(work, pool.map(_process_in_worker, work, chunksize=chunksize)):
+                self.emit(output)
+                results.append((item[2], status))
+        self.finish()
+        return results
+
+
+# El lexer y el parser se recuperan de sus errores y la compilación sigue: un fichero con algún
+# error no queda 'ok', sino con la fase del primero
+def _final_status(result, sink):
+    if result.status == 'ok':
+        for diag in sink.items:
+            if diag.severity == ERROR:
+                return diag.phase
+    return result.status
+
+
+# Contenido de cada fichero generado además del .token (None si el programa no llegó a compilarse)
+def _artifact(result, kind):
+    if kind == 'vbc':
+        return result.bytecode
+    if kind == 'ir':
+        return result.ir
+    if kind == 'vtk':
+        return result.vtk
+    if result.python is None:
+        return None
+    if kind == 'py':
+        return PythonProgram.loads(result.python).source
+    return result.python
+
+
+# Sólo se reescribe la salida (.token, .vtk, .vbc, .py, .vpyc o .ir) si su contenido cambia
+def _write_if_changed(path, content):
+    binary = isinstance(content, bytes)
+    try:
+        with open(path, "rb" if binary else "r", encoding=None if binary else "utf-8") as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb" if binary else "w", encoding=None if binary else "utf-8") as out:
+        out.write(content)
+    return True
+
+
+# Como _write_if_changed, para un volcado ya escrito en tmp
+def _replace_if_changed(tmp, path):
+    try:
+        same = filecmp.cmp(tmp, path, shallow=False)
+    except OSError:
+        same = False
+    if same:
+        os.unlink(tmp)
+    else:
+        os.replace(tmp, path)
+    return not same
+
+
+# ----------------------------- Procesos del modo por lotes -----------------------------
+
+_worker_runner = None
+
+
+def _init_worker(options):
+    global _worker_runner
+    _worker_runner = ParserRunner(**options)
+
+
+def _process_in_worker(item):
+    # El texto se devuelve al proceso principal para que lo emita en orden
+    return _worker_runner.build_file(*item)
+
 
 # Para ejecutar desde consola:
 if __name__ == "__main__":
-    lexer_only = '--lexer' in sys.argv 
-    runner = ParserRunner()
-    runner.run()
+    argp = argparse.ArgumentParser(description="Compilador de Viper")
+    argp.add_argument('input_dir', nargs='?', default='tests')
+    argp.add_argument('--lexer', action='store_true')
+    argp.add_argument('--production', action='store_true',
+                      help="usa las tablas precompiladas del parser")
+    argp.add_argument('-j', '--jobs', type=int, default=1,
+                      help="número de procesos para compilar en paralelo")
+    argp.add_argument('-r', '--recursive', action='store_true',
+                      help="recorre también los subdirectorios")
+    argp.add_argument('--include', action='append',
+                      help="patrón glob de ficheros a procesar (por defecto *.vip y *.txt)")
+    argp.add_argument('--exclude', action='append', default=[],
+                      help="patrón glob de ficheros a ignorar")
+    argp.add_argument('--cache', action='store_true',
+                      help="reutiliza los resultados de ficheros que no han cambiado")
+    argp.add_argument('--cache-dir', help=f"directorio de la caché (por defecto {DEFAULT_CACHE_DIR})")
+    argp.add_argument('--format', choices=('text', 'json'), default='text',
+                      help="text: salida habitual por pantalla; json: sólo diagnósticos, uno por línea")
+    argp.add_argument('--run', action='store_true',
+                      help="ejecuta los programas sin errores y muestra sus variables globales")
+    argp.add_argument('--engine', choices=('closures', 'vm', 'python'), default='closures',
+                      help="motor de ejecución para --run: closures, la máquina virtual de bytecode "
+                           "o el programa traducido a Python")
+    argp.add_argument('--emit-bytecode', action='store_true',
+                      help="guarda el bytecode de cada programa en <entrada>/bytecode/*.vbc")
+    argp.add_argument('--emit-python', action='store_true',
+                      help="guarda cada programa traducido a Python en <entrada>/python/ (.py y .vpyc compilado)")
+    argp.add_argument('--emit-ir', action='store_true',
+                      help="guarda la representación intermedia de tres direcciones de cada programa en "
+                           "<entrada>/ir/*.ir (optimizada con -O)")
+    argp.add_argument('-O', '--optimize', action='store_true',
+                      help="pliega constantes, elimina código muerto y quita las comprobaciones de rango que "
+                           "no hacen falta antes de ejecutar o generar código")
+    argp.add_argument('--scanner', choices=('ply', 'fast'), default='ply',
+                      help="motor del lexer: las reglas de PLY o el escáner escrito a mano (mismos tokens)")
+    argp.add_argument('--emit-tokens', action='store_true',
+                      help="guarda también los tokens en binario en <entrada>/tokens/*.vtk; un .vtk se puede "
+                           "compilar sin lexear con --include '*.vtk'")
+    argp.add_argument('--stream', action='store_true',
+                      help="sólo lexea, leyendo cada fichero por bloques y escribiendo su .token según se lexea "
+                           "(para fuentes muy grandes; usa el escáner escrito a mano y no usa la caché)")
+    args = argp.parse_args()
+
+    lexer_only = args.lexer
+    cache_dir = args.cache_dir or (DEFAULT_CACHE_DIR if args.cache else None)
+    runner = ParserRunner(production=args.production, cache_dir=cache_dir, output_format=args.format,
+                          execute=args.run, engine=args.engine, emit_bytecode=args.emit_bytecode,
+                          emit_python=args.emit_python, emit_ir=args.emit_ir, optimize=args.optimize,
+                          scanner=args.scanner, stream=args.stream, emit_tokens=args.emit_tokens)
+    runner.run(args.input_dir, jobs=args.jobs, recursive=args.recursive,
+               include=args.include or DEFAULT_PATTERNS, exclude=args.exclude)
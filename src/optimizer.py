@@ -0,0 +1,258 @@
+from ast_nodes import (Node, Const, DECL_ASSIGN, ASSIGN, FUNC_DEF, RETURN, IF, WHILE, BINOP, UNOP, CONST,
+                       VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL)
+from executor import const_value, int_div
+from vectors import INT_MIN, INT_MAX
+
+
+_COMPARISONS = frozenset(('==', '>', '<', '>=', '<='))
+
+_EXPRESSION_KINDS = frozenset((BINOP, UNOP, CONST, VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL))
+
+
+# Optimizador del AST ya tipado por SemanticAnalyzer: pliega constantes, simplifica
+# identidades algebraicas y elimina ramas y bucles con condición constante y el código
+# que sigue a un 'return'. Modifica el árbol en el sitio y cuenta los nodos eliminados.
+# Nunca pliega una operación que fallaría al ejecutarse (división por cero, desbordamiento):
+# el error se sigue dando en tiempo de ejecución, en su línea.
+class ASTOptimizer:
+    def __init__(self):
+        self.removed = 0
+        self._blocks = []       # Bloques pendientes: (nodo, atributo con la lista de sentencias)
+
+    def optimize(self, program):
+        before = count_nodes(program)
+        self._blocks.append((program, 'body'))
+        while self._blocks:
+            node, attr = self._blocks.pop()
+            setattr(node, attr, self._block(getattr(node, attr)))
+        self.removed += before - count_nodes(program)
+        return program
+
+    # ----------------------------- Sentencias -----------------------------
+
+    def _block(self, statements):
+        # Las ramas de un 'if' constante se insertan en su lugar y se vuelven a procesar
+        result = []
+        pending = list(reversed(statements))
+        while pending:
+            stmt = pending.pop()
+            kind = stmt.kind
+            if kind == IF:
+                stmt.cond = self._expr(stmt.cond)
+                value = _constant(stmt.cond)
+                if value is not None:
+                    pending.extend(reversed((stmt.then if value else stmt.orelse) or ()))
+                    continue
+                self._blocks.append((stmt, 'then'))
+                if stmt.orelse:
+                    self._blocks.append((stmt, 'orelse'))
+            elif kind == WHILE:
+                stmt.cond = self._expr(stmt.cond)
+                if _constant(stmt.cond) is False:
+                    continue
+                self._blocks.append((stmt, 'body'))
+            elif kind == FUNC_DEF:
+                self._blocks.append((stmt, 'body'))
+            elif kind in (DECL_ASSIGN, RETURN):
+                stmt.expr = self._expr(stmt.expr)
+            elif kind == ASSIGN:
+                stmt.expr = self._expr(stmt.expr)
+                target = stmt.target
+                if target.kind == ARRAY_ACCESS:
+                    target.index = self._expr(target.index)
+            elif kind in _EXPRESSION_KINDS:
+                stmt = self._expr(stmt)
+            result.append(stmt)
+            if kind == RETURN:
+                break           # Lo que sigue en el bloque no se ejecuta nunca
+        return result
+
+    # ----------------------------- Expresiones -----------------------------
+
+    def _expr(self, root):
+        # Post-orden con pila explícita: cada nodo se simplifica cuando ya lo están sus hijos
+        done = {}               # id del nodo original -> nodo que lo sustituye
+        stack = [(root, False)]
+        while stack:
+            original, expanded = stack.pop()
+            node, kind = original, original.kind
+            if not expanded and kind in (BINOP, UNOP, ARRAY_ACCESS, FUNC_CALL):
+                stack.append((node, True))
+                if kind == BINOP:
+                    stack.append((node.right, False))
+                    stack.append((node.left, False))
+                elif kind == UNOP:
+                    stack.append((node.operand, False))
+                elif kind == ARRAY_ACCESS:
+                    stack.append((node.index, False))
+                else:
+                    stack.extend((arg, False) for arg in node.args)
+                continue
+            if kind == BINOP:
+                node.left, node.right = done.pop(id(node.left)), done.pop(id(node.right))
+                node = self._binop(node)
+            elif kind == UNOP:
+                node.operand = done.pop(id(node.operand))
+                node = self._unop(node)
+            elif kind == ARRAY_ACCESS and expanded:
+                node.index = done.pop(id(node.index))
+            elif kind == FUNC_CALL and expanded:
+                node.args = [done.pop(id(arg)) for arg in node.args]
+            done[id(original)] = node
+        return done[id(root)]
+
+    def _binop(self, node):
+        op, optype = node.op, node.left.type
+        left, right = node.left, node.right
+        if left.kind == CONST and right.kind == CONST:
+            value = _fold_binop(op, optype, const_value(left.value), const_value(right.value))
+            if value is not None:
+                return _const(value, node)
+
+        if op in ('and', 'or'):
+            # Cortocircuito: la parte que ya no se evalúa desaparece; la que sí, se conserva
+            a, b = _constant(left), _constant(right)
+            if a is not None:
+                return right if a == (op == 'and') else left
+            if b is not None and (b == (op == 'and') or is_pure(left)):
+                return left if b == (op == 'and') else right
+            return node
+
+        # Con vectores (v * 1, 0 * v...) no: el resultado es siempre un vector nuevo
+        if optype not in ('int', 'float') or node.type != optype:
+            return node
+        a, b = _number(left), _number(right)
+        if op == '*':
+            if b == 1:
+                return left
+            if a == 1:
+                return right
+            if optype == 'int' and (a == 0 and is_pure(right) or b == 0 and is_pure(left)):
+                return _const(0, node)
+        elif op == '/':
+            if b == 1:
+                return left
+        elif op == '+':
+            # En coma flotante x + 0.0 no es x cuando x es -0.0
+            if optype == 'int' and b == 0:
+                return left
+            if optype == 'int' and a == 0:
+                return right
+        elif op == '-':
+            if b == 0:
+                return left
+        return node
+
+    def _unop(self, node):
+        operand = node.operand
+        if operand.kind == CONST:
+            value = const_value(operand.value)
+            if node.op == 'not':
+                return _const(not value, node)
+            if node.type == 'char':
+                return _const(chr(-ord(value) % 256), node)
+            if node.type == 'int' and not INT_MIN <= -value <= INT_MAX:
+                return node
+            return _const(-value, node)
+        # not not b == b y -(-x) == x, siempre que el tipo no cambie por el camino (con int no:
+        # -x se desborda si x es INT_MIN)
+        if (operand.kind == UNOP and operand.op == node.op and operand.operand.type == node.type
+                and isinstance(node.type, str) and node.type != 'int'):
+            return operand.operand
+        return node
+
+
+def optimize(program):
+    optimizer = ASTOptimizer()
+    optimizer.optimize(program)
+    return program, optimizer.removed
+
+
+def count_nodes(tree):
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(child for child in node.children() if isinstance(child, Node))
+    return count
+
+
+def _const(value, node):
+    # Nodo constante con la forma que da el lexer (true/false como texto) y el tipo del original
+    if isinstance(value, bool):
+        value = 'true' if value else 'false'
+    const = Const(value, node.lineno, node.col)
+    const.type = node.type
+    return const
+
+
+def _constant(node):
+    # Valor de una condición constante, o None
+    if node.kind != CONST or node.type != 'bool':
+        return None
+    return const_value(node.value)
+
+
+def _number(node):
+    if node.kind != CONST:
+        return None
+    return const_value(node.value)
+
+
+def is_pure(node):
+    # Sin llamadas ni operaciones que puedan fallar: se puede dejar de evaluar sin cambiar nada.
+    # La aritmética de int falla si el resultado no cabe en 64 bits
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        kind = node.kind
+        if kind in (FUNC_CALL, ARRAY_ACCESS) or kind == BINOP and node.op == '/':
+            return False
+        if kind in (BINOP, UNOP) and node.type == 'int' and node.op in ('+', '-', '*'):
+            return False
+        if kind == BINOP:
+            stack.append(node.left)
+            stack.append(node.right)
+        elif kind == UNOP:
+            stack.append(node.operand)
+        elif kind == FIELD_ACCESS:
+            stack.append(node.obj)
+    return True
+
+
+def _fold_binop(op, optype, a, b):
+    # Resultado de la operación con dos constantes, o None si no se debe plegar
+    if op in _COMPARISONS:
+        if op == '==':
+            return a == b
+        if op == '<':
+            return a < b
+        if op == '<=':
+            return a <= b
+        if op == '>':
+            return a > b
+        return a >= b
+    if op == 'and':
+        return a and b
+    if op == 'or':
+        return a or b
+    if op == '/' and b in (0, '\0'):
+        return None
+    if optype == 'char':
+        x, y = ord(a), ord(b)
+        return chr(_ARITH[op](x, y) % 256)
+    if optype == 'int':
+        value = _ARITH[op](a, b)
+        return value if INT_MIN <= value <= INT_MAX else None
+    if optype == 'float':
+        return a / b if op == '/' else _ARITH[op](a, b)
+    return None
+
+
+_ARITH = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': int_div,
+}
@@ -0,0 +1,178 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from array import array
+
+import ply.yacc as yacc
+
+
+# Versión del formato del fichero de tablas (cambiarla invalida todas las cachés)
+FORMAT_VERSION = 1
+
+# Ubicación fija de las tablas precompiladas (se puede redirigir con VIPER_TABLES_DIR)
+DEFAULT_TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables')
+
+
+def tables_dir():
+    return os.environ.get('VIPER_TABLES_DIR', DEFAULT_TABLES_DIR)
+
+
+# ----------------------------- Hash de la gramática -----------------------------
+
+def _grammar_functions(module):
+    # Reglas p_* en orden de definición (el orden fija el símbolo inicial)
+    cls = module if isinstance(module, type) else type(module)
+    funcs = []
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if name.startswith('p_') and callable(value) and name != 'p_error':
+                funcs.append((name, value.__doc__ or ''))
+    return funcs
+
+
+def grammar_hash(module):
+    # Sólo depende de la gramática: tokens, precedencias y producciones
+    h = hashlib.sha256()
+    h.update(repr((FORMAT_VERSION, yacc.__tabversion__)).encode())
+    h.update(repr(tuple(module.tokens)).encode())
+    h.update(repr(getattr(module, 'precedence', ())).encode())
+    for name, doc in _grammar_functions(module):
+        h.update(name.encode())
+        h.update(b'\0')
+        h.update(' '.join(doc.split()).encode())
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+def table_path(signature, directory=None):
+    return os.path.join(directory or tables_dir(), f'parsetab-{signature}.vpt')
+
+
+# ----------------------------- Codificación compacta -----------------------------
+
+# Las acciones None (error explícito por 'nonassoc') se guardan con este valor
+_NO_ACTION = -2 ** 31
+
+def _encode_table(table, symbols, nstates):
+    # Cada estado se guarda como: nº de entradas, y pares (símbolo, valor)
+    index = {sym: i for i, sym in enumerate(symbols)}
+    data = array('i')
+    for state in range(nstates):
+        entries = table.get(state, {})
+        data.append(len(entries))
+        for sym, value in entries.items():
+            data.append(index[sym])
+            data.append(_NO_ACTION if value is None else value)
+    return data.tobytes()
+
+
+def _decode_table(raw, symbols, nstates):
+    data = array('i')
+    data.frombytes(raw)
+    table = {}
+    pos = 0
+    for state in range(nstates):
+        count = data[pos]
+        pos += 1
+        entries = {}
+        for _ in range(count):
+            value = data[pos + 1]
+            entries[symbols[data[pos]]] = None if value == _NO_ACTION else value
+            pos += 2
+        table[state] = entries
+    return table
+
+
+def save_tables(parser, signature, path):
+    action, goto = parser.action, parser.goto
+    nstates = len(action)
+    terminals = tuple(sorted({sym for entries in action.values() for sym in entries}))
+    nonterminals = tuple(sorted({sym for entries in goto.values() for sym in entries}))
+    productions = tuple(
+        (p.str, p.name, p.len, p.func, None, None) for p in parser.productions
+    )
+    payload = (
+        FORMAT_VERSION, yacc.__tabversion__, signature, 'LALR',
+        nstates, terminals, nonterminals,
+        _encode_table(action, terminals, nstates), _encode_table(goto, nonterminals, nstates),
+        productions,
+    )
+
+    # Escritura atómica: otro proceso nunca ve un fichero a medias
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump(payload, f)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    # Se eliminan las tablas de gramáticas anteriores
+    for name in os.listdir(directory):
+        if name.startswith('parsetab-') and name.endswith('.vpt') and name != os.path.basename(path):
+            try:
+                os.unlink(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def load_tables(signature, path):
+    # Un fichero que no se puede leer o no tiene la forma esperada (truncado, de otra versión
+    # o escrito a medias) no es un error: las tablas se vuelven a construir
+    try:
+        with open(path, 'rb') as f:
+            payload = marshal.load(f)
+        (version, tabversion, stored, method, nstates, terminals, nonterminals,
+         raw_action, raw_goto, productions) = payload
+        if version != FORMAT_VERSION or tabversion != yacc.__tabversion__ or stored != signature:
+            return None
+
+        lr = yacc.LRTable()
+        lr.lr_method = method
+        lr.lr_action = _decode_table(raw_action, terminals, nstates)
+        lr.lr_goto = _decode_table(raw_goto, nonterminals, nstates)
+        lr.lr_productions = [yacc.MiniProduction(*p) for p in productions]
+    except (OSError, EOFError, ValueError, TypeError, IndexError, KeyError):
+        return None
+    return lr
+
+
+# ----------------------------- Construcción del parser -----------------------------
+
+def _generate(module):
+    # Generación completa sin parser.out ni parsetab.py
+    return yacc.yacc(module=module, debug=False, write_tables=False,
+                     errorlog=yacc.NullLogger())
+
+
+def production_parser(module, directory=None):
+    # Camino rápido: tablas precompiladas sin reflexión de la gramática
+    signature = grammar_hash(module)
+    path = table_path(signature, directory)
+    lr = load_tables(signature, path)
+    if lr is None:
+        parser = _generate(module)
+        try:
+            save_tables(parser, signature, path)
+        except OSError:
+            pass  # Sistema de ficheros de sólo lectura: se usa la tabla en memoria
+        return parser
+
+    pdict = {name: getattr(module, name) for name, _ in _grammar_functions(module)}
+    lr.bind_callables(pdict)
+    return yacc.LRParser(lr, module.p_error)
+
+
+# Precompila las tablas: python parse_tables.py [directorio]
+if __name__ == "__main__":
+    from parser import Parser
+    if len(sys.argv) > 1:
+        os.environ['VIPER_TABLES_DIR'] = sys.argv[1]
+    parser = Parser(production=True)
+    print(f"Tablas en {table_path(grammar_hash(parser))}")
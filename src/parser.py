@@ -1,12 +1,24 @@
 import ply.yacc as yacc
 from viper_tokens import tokens as token_list
+import parse_tables
+from diagnostics import DiagnosticSink
+from ast_nodes import (Program, Decl, DeclAssign, Assign, FuncDef, Return, If, While, Instance,
+                       TypeDef, BinOp, UnOp, Const, Var, ArrayAccess, FieldAccess, FuncCall, ARRAY_ACCESS, VAR,
+                       CONST)
 
 
 class Parser:
-    def __init__(self):
+    def __init__(self, production=False, diagnostics=None):
         self.tokens = token_list
-        self.parser = yacc.yacc(module=self, write_tables=True)
-        self.current_block = None 
+        self.diagnostics = diagnostics if diagnostics is not None else DiagnosticSink()
+        if production:
+            # Tablas precompiladas (sin parser.out ni regeneración de parsetab.py)
+            self.parser = parse_tables.production_parser(self)
+        else:
+            self.parser = yacc.yacc(module=self, write_tables=True)
+        self.function_depth = 0  # Cuerpos de función abiertos mientras se reducen sus sentencias
+        self.statement_starts = None  # id(sentencia) -> posición de su primer token (sólo si se pide)
+        self.replay_lexer = None      # Lexer que reproduce los tokens que se parsean (para situar el final)
 
     # ----------------------------- Precedencia de operadores -----------------------------
     precedence = (
@@ -17,6 +29,7 @@ class Parser:
         ('left', 'PLUS', 'MINUS'),
         ('left', 'TIMES', 'DIVIDE'),
         ('right', 'UMINUS'),  
+        ('left', 'LBRACKET', 'DOT'),  # v[i] y r.campo ligan más que cualquier operador
     )
 
     # ----------------------------- Reglas del parser -----------------------------
@@ -24,17 +37,20 @@ class Parser:
     # ----------------------------- Program -----------------------------
     def p_program(self, p):
         'program : statement_list'
-        p[0] = ('program', p[1])
+        first = p[1][0]
+        p[0] = Program(p[1], first.lineno, first.col)
 
     # ----------------------------- Statement List -----------------------------
-    
+    # Las listas se amplían en el sitio (append) para que construirlas sea lineal
+
     def p_statement_list(self, p):
         '''statement_list : statement
                           | statement_list statement '''
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
     
     # ----------------------------- Statements -----------------------------
     def p_statement(self, p):
@@ -46,59 +62,86 @@ class Parser:
                     | statement_instance
                     | statement_type_def'''
         p[0] = p[1]
+        if self.statement_starts is not None:
+            # Con tracking, la posición de un no terminal es la de su primer token (también con
+            # paréntesis: la de `(a).x = 1` es la del paréntesis y no la del nodo)
+            self.statement_starts[id(p[0])] = p.lexpos(1)
     
     def p_statement_declaration(self, p):
         '''statement_declaration : type id_list
                                 | type id_list ASSIGN expression'''
+        lineno, col = self._position(p, 1)
         if len(p) == 3:
-            p[0] = ('decl', p[1], p[2])
+            p[0] = Decl(p[1], p[2], lineno, col)
         else:
-            p[0] = ('decl_assign', p[1], p[2], p[4])
+            p[0] = DeclAssign(p[1], p[2], p[4], lineno, col)
     # Regla para asignaciones
     def p_statement_assign(self, p):
         'statement_assign : expression ASSIGN expression'
-        p[0] = ('assign', p[1], p[3])
+        p[0] = Assign(p[1], p[3], p[1].lineno, p[1].col)
 
     # Regla para funciones
     def p_statement_function(self, p):
-        'statement_function : DEF type ID LPAREN param_list RPAREN COLON LBRACE statement_list RBRACE'
-        self.current_block = 'function'
-        p[0] = ('func_def', p[2], p[3], p[5], p[9])
-        self.current_block = None  # Salimos del bloque de la función
+        'statement_function : DEF type ID LPAREN param_list RPAREN COLON LBRACE function_body_start statement_list RBRACE'
+        self.function_depth -= 1  # Salimos del bloque de la función
+        p[0] = FuncDef(p[2], p[3], p[5], p[10], *self._position(p, 1))
+
+    # Marcador vacío: se reduce antes que las sentencias del cuerpo, así que los
+    # 'return' del cuerpo ya ven que están dentro de una función
+    def p_function_body_start(self, p):
+        'function_body_start :'
+        self.function_depth += 1
 
     # Regla para `return`
     def p_statement_return(self, p):
         'statement_return : RETURN expression'
-        if self.current_block == 'function':
-            p[0] = ('return', p[2])
+        if self.function_depth > 0:
+            p[0] = Return(p[2], *self._position(p, 1))
         else:
-            print(f"[Syntax Error] 'return' fuera de una función en línea {p.lineno(1)}")
+            self.diagnostics.error('syntax.return-outside-function',
+                                   f"'return' fuera de una función en línea {p.lineno(1)}", p.lineno(1), p.lexpos(1))
             raise SyntaxError("El 'return' debe estar dentro de una función.")
 
     # Regla para `if`
     def p_statement_if(self, p):
         '''statement_if : IF expression COLON LBRACE statement_list RBRACE
                         | IF expression COLON LBRACE statement_list RBRACE ELSE LBRACE statement_list RBRACE'''
+        lineno, col = self._position(p, 1)
         if len(p) == 7:
-            p[0] = ('if', p[2], p[5], None)  # sin else
+            p[0] = If(p[2], p[5], None, lineno, col)  # sin else
         else:
-            p[0] = ('if', p[2], p[5], p[9])  # con else
+            p[0] = If(p[2], p[5], p[9], lineno, col)  # con else
 
 
     # Regla para `instance` (declaración de instancias)
     def p_statement_instance(self, p):
         'statement_instance : ID ID'
-        p[0] = ('instance', p[1], p[2])
+        p[0] = Instance(p[1], p[2], *self._position(p, 1))
+
+    # Vector de registros: `Persona[100] gente` declara un vector de tipo ('vector', 'Persona', 100),
+    # como `int[100] v`. `Persona[100]` empieza igual que el acceso `v[i]`, así que se lee como
+    # tal y aquí se comprueba que sea un nombre de tipo con un tamaño entero literal
+    def p_statement_instance_vector(self, p):
+        'statement_instance : expression_array_access ID'
+        access = p[1]
+        if access.array.kind != VAR or access.index.kind != CONST or access.index.value.__class__ is not int:
+            self.diagnostics.error('syntax.invalid-vector-type',
+                                   f"Tipo de vector no válido en la línea {access.lineno}: se esperaba Tipo[tamaño]",
+                                   access.lineno, p.lexpos(2))
+            raise SyntaxError("Tipo de vector no válido.")
+        p[0] = Decl(('vector', access.array.name, access.index.value), [p[2]], access.lineno, access.col)
 
     # Regla para 'while'
     def p_statement_while(self, p):
         'statement : WHILE expression COLON LBRACE statement_list RBRACE'
-        p[0] = ('while', p[2], p[5])
+        p[0] = While(p[2], p[5], *self._position(p, 1))
+        if self.statement_starts is not None:
+            self.statement_starts[id(p[0])] = p.lexpos(1)
 
     # ----------------------------- Type Definitions -----------------------------
     def p_statement_type_def(self, p):
         'statement_type_def : TYPE ID COLON LBRACE field_list RBRACE'
-        p[0] = ('type_def', p[2], p[5])
+        p[0] = TypeDef(p[2], p[5], *self._position(p, 1))
 
     def p_id_list_single(self, p):
         'id_list : ID'
@@ -106,7 +149,8 @@ class Parser:
 
     def p_id_list_rec(self, p):
         'id_list : id_list COMMA ID'
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
     def p_type(self, p):
         '''type : base_type
@@ -114,7 +158,8 @@ class Parser:
         if len(p) == 2:
             p[0] = p[1]
         else:
-            p[0] = ('vector', p[1], p[3])  
+            p[0] = ('vector', p[1], p[3])
+        self._propagate_position(p)
 
     def p_base_type(self, p):
         '''base_type : INT
@@ -122,6 +167,7 @@ class Parser:
                     | CHAR
                     | BOOL'''
         p[0] = p[1]
+        self._propagate_position(p)
 
 
     # ----------------------------- Expressions -----------------------------
@@ -143,7 +189,7 @@ class Parser:
                             | expression MINUS expression
                             | expression TIMES expression
                             | expression DIVIDE expression'''
-        p[0] = ('binop', p[2], p[1], p[3])
+        p[0] = BinOp(p[2], p[1], p[3], p[1].lineno, p[1].col)
 
     # Reglas de operaciones de comparación
     def p_expression_comparacion(self, p):
@@ -152,18 +198,18 @@ class Parser:
                                 | expression GE expression
                                 | expression LT expression
                                 | expression LE expression'''
-        p[0] = ('binop', p[2], p[1], p[3])
+        p[0] = BinOp(p[2], p[1], p[3], p[1].lineno, p[1].col)
 
     # Expresión lógica (AND, OR)
     def p_expression_logica(self, p):
         '''expression_logica : expression AND expression
                             | expression OR expression'''
-        p[0] = ('binop', p[2], p[1], p[3])
+        p[0] = BinOp(p[2], p[1], p[3], p[1].lineno, p[1].col)
 
     def p_expression_unaria(self, p):
         '''expression_unaria : MINUS expression %prec UMINUS
                             | NOT expression'''
-        p[0] = ('unop', p[1], p[2])
+        p[0] = UnOp(p[1], p[2], *self._position(p, 1))
 
     def p_expression_group(self, p):
         'expression_group : LPAREN expression RPAREN'
@@ -175,26 +221,33 @@ class Parser:
                             | TRUE
                             | FALSE
                             | CHARACTER'''
-        p[0] = ('const', p[1])  
+        p[0] = Const(p[1], *self._position(p, 1))
 
     # Para el acceso a una variable
     def p_expression_var(self, p):
         'expression_var : ID'
-        p[0] = ('var', p[1])
+        p[0] = Var(p[1], *self._position(p, 1))
 
     # Para el acceso a un índice de un array
     def p_expression_array_access(self, p):
         'expression_array_access : expression LBRACKET expression RBRACKET'
-        p[0] = ('array_access', p[1], p[3]) 
+        p[0] = ArrayAccess(p[1], p[3], p[1].lineno, p[1].col)
 
     # Para el acceso a campos
+    # Los vectores de registros se guardan por columnas (una por campo): gente[i].edad se
+    # construye como gente.edad[i], el elemento i de la columna 'edad'
     def p_expression_field_access(self, p):
         'expression_field_access : expression DOT ID'
-        p[0] = ('field_access', p[1], p[3])
+        obj = p[1]
+        if obj.kind == ARRAY_ACCESS:
+            column = FieldAccess(obj.array, p[3], obj.lineno, obj.col)
+            p[0] = ArrayAccess(column, obj.index, obj.lineno, obj.col)
+        else:
+            p[0] = FieldAccess(obj, p[3], obj.lineno, obj.col)
 
     def p_expression_func_call(self, p):
         'expression_func_call : ID LPAREN arg_list RPAREN'
-        p[0] = ('func_call', p[1], p[3])
+        p[0] = FuncCall(p[1], p[3], *self._position(p, 1))
 
     # ----------------------------- Parameters -----------------------------
 
@@ -204,7 +257,8 @@ class Parser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_param(self, p):
         'param : type ID'
@@ -220,7 +274,8 @@ class Parser:
             else:
                 p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     # ----------------------------- Field List -----------------------------
     def p_field_list(self, p):
@@ -229,7 +284,8 @@ class Parser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
 
     def p_field(self, p):
         'field : type ID'
@@ -241,16 +297,49 @@ class Parser:
         'empty :'
         p[0] = None
 
+    # ----------------------------- Posiciones -----------------------------
+    def _position(self, p, n):
+        # (línea, columna) del símbolo n; la columna (desde 1) se obtiene de lexpos
+        lexpos = p.lexpos(n)
+        return p.lineno(n), lexpos - p.lexer.lexdata.rfind('\n', 0, lexpos)
+
+    def _propagate_position(self, p):
+        # Los no terminales no tienen posición en PLY: se copia la del primer símbolo
+        p.set_lineno(0, p.lineno(1))
+        p.set_lexpos(0, p.lexpos(1))
+
     # ----------------------------- Error Handling -----------------------------
     def p_error(self, p):
         if p:
-            print(f"[Syntax Error] No se esperaba '{p.value}' (tipo: {p.type}) en la línea {p.lineno}")
+            self.diagnostics.error('syntax.unexpected-token',
+                                   f"No se esperaba '{p.value}' (tipo: {p.type}) en la línea {p.lineno}",
+                                   p.lineno, p.lexpos)
         else:
-            print("[Syntax Error] Fin de entrada inesperado")
+            # Al final no hay token que señalar: se sitúa en el último que se leyó. Los dos
+            # lexers de reproducción (TokenBuffer y TokenFile) guardan su posición
+            lexer = self.replay_lexer
+            if lexer is not None and lexer.index:
+                self.diagnostics.error('syntax.unexpected-eof', "Fin de entrada inesperado",
+                                       lexer.lineno, lexer.lexpos)
+            else:
+                self.diagnostics.error('syntax.unexpected-eof', "Fin de entrada inesperado")
 
     def parse(self, input_text, lexer=None):
+        self.function_depth = 0
         return self.parser.parse(input_text, lexer=lexer)
 
+    # Parsea un TokenBuffer ya lexeado, sin volver a pasar por el lexer. Con starts (un dict) se
+    # anota en él dónde empieza cada sentencia (ver statement_starts)
+    def parse_tokens(self, buffer, starts=None):
+        self.function_depth = 0
+        self.statement_starts = starts
+        self.replay_lexer = lexer = buffer.replay()
+        try:
+            return self.parser.parse(None, lexer=lexer, tracking=starts is not None)
+        finally:
+            self.statement_starts = None
+            self.replay_lexer = None
+
 """ def p_record_type(self, p):
         'record_type : TYPE ID COLON LBRACE field_list RBRACE'
         p[0] = ('record', p[2], p[5])  
@@ -0,0 +1,39 @@
+# ----------------------------- Disposición de los registros -----------------------------
+# Cada tipo registro tiene una disposición fija: sus campos en orden de declaración, cada uno
+# en una posición y con un tipo. El análisis semántico resuelve cada acceso r.campo a esa
+# posición (FieldAccess.offset), así que los backends leen y escriben campos por índice, sin
+# buscar el nombre: un registro es una lista de ranuras (una clase con __slots__ en el código
+# traducido a Python).
+#
+# Los vectores de registros (Persona[100] gente) se guardan por columnas, sin ningún objeto
+# por elemento: el vector es una lista con una columna por campo, en la misma posición que el
+# campo en el registro, y cada columna es un vector con ese campo de todos los elementos (un
+# array de C para int y float). Así gente.edad es un vector de int de 100 elementos y
+# gente[i].edad, que el parser construye como gente.edad[i], su elemento i.
+
+
+class RecordLayout:
+    __slots__ = ('name', 'fields', 'offsets')
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = tuple(fields)     # ((campo, tipo), ...) en orden de declaración
+        self.offsets = {field: offset for offset, (field, _) in enumerate(self.fields)}
+
+    def __contains__(self, field):
+        return field in self.offsets
+
+    def field(self, name):
+        # (posición, tipo) del campo
+        offset = self.offsets[name]
+        return offset, self.fields[offset][1]
+
+    def column(self, name, n):
+        # (posición, tipo) de la columna del campo en un vector de n registros
+        offset, ftype = self.field(name)
+        return offset, ('vector', ftype, n)
+
+
+def rows(columns):
+    # Elementos de un vector de registros (por columnas) como registros sueltos, uno por fila
+    return [list(row) for row in zip(*columns)]
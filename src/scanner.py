@@ -0,0 +1,366 @@
+import re
+import string
+import sys
+
+from viper_tokens import reserved
+from token_stream import TOKEN_CODES, TOKEN_NAMES, Token
+from diagnostics import DiagnosticSink
+
+# Escáner escrito a mano: recorre la entrada una sola vez decidiendo por la clase del primer
+# carácter, sin la expresión maestra de PLY. Produce los mismos tokens, con el mismo valor,
+# línea y posición, y los mismos diagnósticos que lexer.Lexer (benchmarks/diff_scanner.py
+# compara los dos).
+
+_intern = sys.intern
+
+# ----------------------------- Clases de carácter -----------------------------
+_SPACE, _NEWLINE, _LETTER, _DIGIT, _OPERATOR, _COMPARE, _QUOTE, _HASH, _SLASH, _OTHER = range(10)
+
+_CLASSES = {' ': _SPACE, '\t': _SPACE, '\n': _NEWLINE, "'": _QUOTE, '#': _HASH, '/': _SLASH}
+_CLASSES.update(dict.fromkeys(string.ascii_letters + '_', _LETTER))
+_CLASSES.update(dict.fromkeys(string.digits, _DIGIT))
+
+# Operadores de un carácter y comparaciones que admiten '=' detrás
+_OPERATORS = {
+    '(': 'LPAREN', ')': 'RPAREN', '[': 'LBRACKET', ']': 'RBRACKET', '{': 'LBRACE', '}': 'RBRACE',
+    ':': 'COLON', ';': 'SEMICOLON', ',': 'COMMA', '.': 'DOT', '+': 'PLUS', '-': 'MINUS', '*': 'TIMES',
+}
+_OPERATORS = {char: TOKEN_CODES[name] for char, name in _OPERATORS.items()}
+_CLASSES.update(dict.fromkeys(_OPERATORS, _OPERATOR))
+
+_COMPARISONS = {'=': ('ASSIGN', 'EQ'), '>': ('GT', 'GE'), '<': ('LT', 'LE')}
+_COMPARISONS = {char: (TOKEN_CODES[one], TOKEN_CODES[two], char + '=') for char, (one, two) in _COMPARISONS.items()}
+_CLASSES.update(dict.fromkeys(_COMPARISONS, _COMPARE))
+
+_ID = TOKEN_CODES['ID']
+_KEYWORDS = {word: TOKEN_CODES[name] for word, name in reserved.items()}
+_DIVIDE = TOKEN_CODES['DIVIDE']
+_NUMBER = TOKEN_CODES['NUMBER']
+_FLOAT_NUMBER = TOKEN_CODES['FLOAT_NUMBER']
+_CHARACTER = TOKEN_CODES['CHARACTER']
+
+# Tramos de caracteres de una misma clase (sin retroceso)
+_name_tail = re.compile(r'[a-zA-Z_0-9]*').match
+_newlines = re.compile(r'\n*').match
+_decimals = re.compile(r'\d*').match       # \d como en t_FLOAT_NUMBER: cualquier dígito Unicode
+_ascii_digits = re.compile(r'[0-9]*').match
+_BASES = {'b': re.compile(r'[01]*').match, 'o': re.compile(r'[0-7]*').match,
+          'x': re.compile(r'[0-9A-F]*').match}
+
+
+# ¿Hay un literal de carácter ('x', '\\' o '\'') en pos? Tras la barra sólo valen esos dos escapes
+def _is_character(data, pos):
+    second = data[pos + 1:pos + 2]
+    if second == '\\':
+        return data[pos + 2:pos + 3] in ('\\', "'") and data.startswith("'", pos + 3)
+    return second not in ('', "'") and data.startswith("'", pos + 2)
+
+
+# Margen de la ventana en modo por bloques: ningún token se decide mirando más de estos
+# caracteres por delante, así que los que empiezan antes de n - _LOOKAHEAD se pueden leer
+_LOOKAHEAD = 4
+
+# Resultado de _number además de los códigos de token
+_LEADING_ZERO, _BAD_DIGIT = -1, -2
+
+
+class Scanner:
+    # Misma interfaz que el lexer de PLY que usan ParserRunner y el parser
+    def __init__(self, diagnostics=None):
+        self.diagnostics = diagnostics if diagnostics is not None else DiagnosticSink()
+        self.lexdata = ''
+        self.lineno = 1
+        self.lexpos = 0
+        self._tokens = iter(())
+
+    # Con pos se empieza a lexear en esa posición, que tiene que ser un límite entre tokens fuera de
+    # un comentario (p. ej. el inicio de una sentencia); lineno es entonces la línea de pos
+    def input(self, data, pos=0):
+        self.lexdata = data
+        self.lexpos = pos
+        self._tokens = self._window(data, pos, 0, 0, self.lineno, True)
+
+    # Entrada por bloques (p. ej. SourceFile.chunks()): los tokens salen según se leen y sólo se
+    # guarda el trozo de texto que queda entre un bloque y el siguiente
+    def input_chunks(self, chunks):
+        self.lexdata = ''
+        self.lexpos = 0
+        self._tokens = self._scan_chunks(chunks)
+
+    def token(self):
+        tok = next(self._tokens, None)
+        if tok is None:
+            return None
+        code, value, self.lineno, self.lexpos = tok
+        return Token(TOKEN_NAMES[code], value, self.lineno, self.lexpos, self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
+
+    # Vuelca los tokens directamente en los arrays de un TokenBuffer, sin crear objetos token
+    def scan_into(self, buffer):
+        types, values, linenos, lexpos = buffer.types, buffer.values, buffer.linenos, buffer.lexpos
+        for code, value, lineno, pos in self._tokens:
+            types.append(code)
+            values.append(value)
+            linenos.append(lineno)
+            lexpos.append(pos)
+        return buffer
+
+    # Escribe el volcado .token (mismo formato que TokenBuffer.dumps) según se lexea, sin guardar
+    # los tokens. Si el lexer lanza una excepción, lo escrito hasta entonces queda en out.
+    def dump_into(self, out, batch=1 << 14):
+        names = TOKEN_NAMES
+        lines = []
+        try:
+            for code, value, lineno, pos in self._tokens:
+                lines.append(f"{names[code]} {value}\n")
+                if len(lines) >= batch:
+                    out.write(''.join(lines))
+                    lines.clear()
+        finally:
+            out.write(''.join(lines))
+
+    # Tuplas (código, valor, línea, posición) de tokens a partir de data[pos:].
+    #   base:       posición de data[0] en la entrada completa
+    #   line_start: posición en la entrada del inicio de la línea en la que empieza data
+    #   final:      data llega hasta el final de la entrada
+    # Si no es final, se para antes del primer token que podría continuar en el bloque
+    # siguiente. Devuelve (posición de parada, línea, comentario abierto en esa posición o None).
+    def _window(self, data, pos, base, line_start, lineno, final):
+        n = len(data)
+        limit = n if final else n - _LOOKAHEAD
+        classes = _CLASSES.get
+        operators = _OPERATORS
+        keyword = _KEYWORDS.get
+        intern = _intern
+        name_tail = _name_tail
+
+        while pos < limit:
+            c = data[pos]
+            kind = classes(c, _OTHER)
+
+            if kind == _SPACE:
+                pos += 1
+
+            elif kind == _LETTER:
+                end = name_tail(data, pos + 1).end()
+                if end == n and not final:
+                    break
+                value = intern(data[pos:end])
+                yield keyword(value, _ID), value, lineno, base + pos
+                pos = end
+
+            elif kind == _OPERATOR:
+                yield operators[c], c, lineno, base + pos
+                pos += 1
+
+            elif kind == _NEWLINE:
+                end = _newlines(data, pos).end()
+                lineno += end - pos
+                pos = end
+
+            elif kind == _COMPARE:
+                one, two, text = _COMPARISONS[c]
+                if data.startswith('=', pos + 1):
+                    yield two, text, lineno, base + pos
+                    pos += 2
+                else:
+                    yield one, c, lineno, base + pos
+                    pos += 1
+
+            elif kind == _DIGIT or (kind == _OTHER and c.isdecimal()):
+                code, end, seen = _number(data, pos)
+                if seen + 3 > n and not final:
+                    break
+                if code == _NUMBER:
+                    yield _NUMBER, int(data[pos:end], 0), lineno, base + pos
+                elif code == _FLOAT_NUMBER:
+                    yield _FLOAT_NUMBER, float(data[pos:end]), lineno, base + pos
+                elif code == _LEADING_ZERO:
+                    self._error('lexer.leading-zero', f"Número decimal con ceros no significativos: "
+                                f"'{data[pos:end]}' en línea {lineno}", lineno, data, pos, base, line_start)
+                else:
+                    # Dígito Unicode que no forma un flotante: ninguna regla lo acepta
+                    self._error('lexer.illegal-char', f"Carácter ilegal '{c}' en línea {lineno}",
+                                lineno, data, pos, base, line_start)
+                pos = end
+
+            elif kind == _HASH:
+                # Comentario de línea: hasta el salto de línea, sin incluirlo
+                end = data.find('\n', pos)
+                if end == -1:
+                    if not final:
+                        return pos, lineno, '#'
+                    end = n
+                pos = end
+
+            elif kind == _SLASH:
+                # Comentario /* ... */ (como en PLY, sus saltos de línea no cuentan) o división
+                end = data.find('*/', pos + 2) if data.startswith('*', pos + 1) else -1
+                if end != -1:
+                    pos = end + 2
+                elif not final and data.startswith('*', pos + 1):
+                    return pos, lineno, '/*'
+                else:
+                    yield _DIVIDE, c, lineno, base + pos
+                    pos += 1
+
+            elif kind == _QUOTE and data.startswith("''", pos + 1):
+                # Comentario multilínea: hasta el primer ''' que lo cierra
+                end = data.find("'''", pos + 3)
+                if end != -1:
+                    lineno += data.count('\n', pos, end + 3)
+                    pos = end + 3
+                elif not final:
+                    return pos, lineno, "'''"
+                else:
+                    self._error('lexer.unclosed-comment', f"Comentario multilínea no cerrado en línea {lineno}",
+                                lineno, data, pos, base, line_start)
+                    pos = n
+
+            elif kind == _QUOTE and _is_character(data, pos):
+                end = pos + 4 if data[pos + 1] == '\\' else pos + 3
+                raw = data[pos + 1:end - 1]
+                if raw[0] == '\\':
+                    yield _CHARACTER, raw[1], lineno, base + pos
+                elif 32 <= ord(raw) <= 126:
+                    yield _CHARACTER, raw, lineno, base + pos
+                else:
+                    self._error('lexer.bad-char', f"Carácter inválido '{raw}' en línea {lineno}",
+                                lineno, data, pos, base, line_start)
+                pos = end
+
+            else:
+                suffix = ", ignorado." if c in ("'", "\"", "\\") else ""
+                self._error('lexer.illegal-char', f"Carácter ilegal '{c}' en línea {lineno}{suffix}",
+                            lineno, data, pos, base, line_start)
+                pos += 1
+
+        if final:
+            self.lineno = lineno
+            self.lexpos = base + pos
+        return pos, lineno, None
+
+    # Recorre los bloques con _window. Entre dos bloques se guarda sólo lo que queda sin leer
+    # (el último token a medias), salvo dentro de un comentario, que se salta bloque a bloque
+    # sin guardarlo; sólo /* ... */ sin cerrar obliga a conservar su texto para volver a lexearlo.
+    def _scan_chunks(self, chunks):
+        lineno = self.lineno
+        base = line_start = 0
+        data = ''
+        comment = None      # (apertura, posición, línea, columna, saltos de línea, texto guardado)
+        chunks = iter(chunks)
+        final = False
+        while not final:
+            chunk = next(chunks, None)
+            final = chunk is None
+            data += chunk or ''
+            pos = 0
+
+            if comment is not None:
+                opener, start, start_line, start_col, newlines, held = comment
+                closer = {'#': '\n', '/*': '*/', "'''": "'''"}[opener]
+                end = data.find(closer)
+                if end == -1 and not final:
+                    # Se conservan los últimos caracteres por si el cierre queda partido entre bloques
+                    keep = max(len(data) - len(closer) + 1, 0)
+                    if opener == "'''":
+                        newlines += data.count('\n', 0, keep)
+                    elif opener == '/*':
+                        held.append(data[:keep])
+                    comment = (opener, start, start_line, start_col, newlines, held)
+                    line_start = _advance_line_start(data, keep, base, line_start)
+                    base += keep
+                    data = data[keep:]
+                    continue
+                comment = None
+                if end != -1:
+                    if opener == "'''":
+                        lineno = start_line + newlines + data.count('\n', 0, end)
+                        pos = end + 3
+                    elif opener == '/*':
+                        pos = end + 2
+                    else:
+                        pos = end
+                elif opener == "'''":
+                    self.diagnostics.error('lexer.unclosed-comment',
+                                           f"Comentario multilínea no cerrado en línea {start_line}",
+                                           start_line, start, start_col)
+                    break
+                elif opener == '/*':
+                    # Sin cierre no era un comentario: se vuelve a lexear desde la '/'
+                    data = ''.join(held) + data
+                    base, line_start, lineno = start, start - start_col + 1, start_line
+                else:
+                    break
+
+            pos, lineno, opener = yield from self._window(data, pos, base, line_start, lineno, final)
+            if opener is not None:
+                col = _column(data, pos, base, line_start)
+                comment = (opener, base + pos, lineno, col, 0, [data[pos:pos + len(opener)]])
+                pos += len(opener)
+            line_start = _advance_line_start(data, pos, base, line_start)
+            base += pos
+            data = data[pos:]
+
+    def _error(self, code, message, lineno, data, pos, base, line_start):
+        self.diagnostics.error(code, message, lineno, base + pos, _column(data, pos, base, line_start))
+
+
+# Columna (desde 1) de data[pos], sabiendo dónde empieza la línea en la que empieza data
+def _column(data, pos, base, line_start):
+    newline = data.rfind('\n', 0, pos)
+    return pos - newline if newline != -1 else base + pos - line_start + 1
+
+
+# Inicio de la línea en la que queda la entrada tras descartar data[:pos]
+def _advance_line_start(data, pos, base, line_start):
+    newline = data.rfind('\n', 0, pos)
+    return base + newline + 1 if newline != -1 else line_start
+
+
+# Número en pos según el orden de las reglas de PLY (flotante, ceros no significativos, entero):
+# (código, fin, hasta dónde se ha mirado), con código _FLOAT_NUMBER, _NUMBER, _LEADING_ZERO o
+# _BAD_DIGIT. Lo mirado no incluye los 3 caracteres que puede mirar la prueba del exponente.
+def _number(data, pos):
+    run = _decimals(data, pos).end()
+    after = data[run:run + 1]
+    if after == '.' and _decimals(data, run + 1).end() > run + 1:
+        stop = _exponent(data, _decimals(data, run + 1).end())
+        return _FLOAT_NUMBER, stop, stop
+    if after in ('e', 'E'):
+        stop = _exponent(data, run)
+        if stop != run:
+            return _FLOAT_NUMBER, stop, stop
+
+    if data[pos] == '0':
+        end = _ascii_digits(data, pos + 1).end()
+        if end > pos + 1:
+            return _LEADING_ZERO, end, run
+        digits = _BASES.get(data[pos + 1:pos + 2])
+        if digits is not None:
+            end = digits(data, pos + 2).end()
+            if end > pos + 2:
+                return _NUMBER, end, max(end, run)
+        return _NUMBER, pos + 1, run
+
+    end = _ascii_digits(data, pos).end()
+    if end == pos:
+        return _BAD_DIGIT, pos + 1, run
+    return _NUMBER, end, run
+
+
+# Fin del exponente ([eE][-+]?\d+) que empieza en pos, o pos si no lo hay
+def _exponent(data, pos):
+    if data[pos:pos + 1] not in ('e', 'E'):
+        return pos
+    start = pos + 2 if data[pos + 1:pos + 2] in ('+', '-') else pos + 1
+    end = _decimals(data, start).end()
+    return end if end > start else pos
@@ -1,132 +1,161 @@
+from ast_nodes import (Node, Expr, NODE_CLASSES, DECL, DECL_ASSIGN, ASSIGN, TYPE_DEF, INSTANCE,
+                       FUNC_DEF, RETURN, IF, FUNC_CALL, ARRAY_ACCESS, FIELD_ACCESS, BINOP, UNOP, CONST,
+                       VAR, WHILE)
+
+
+from symbols import SymbolTable
+from diagnostics import DiagnosticSink, DEBUG
+from vectors import REDUCTIONS, TYPECODES, INT_MAX
+from records import RecordLayout
+
+
+_COMPARISONS = frozenset(('==', '>', '<', '>=', '<='))
+_SCALAR_TYPES = frozenset(('int', 'float', 'char', 'bool'))
+
+
 class SemanticError(Exception):
-    def __init__(self, message, lineno=None):
+    def __init__(self, message, lineno=None, col=None):
+        self.message = message
+        self.lineno = lineno
+        self.col = col
         if lineno is not None:
             message = f"[Semantic Error] Línea {lineno}: {message}"
         super().__init__(message)
 
 
 class SemanticAnalyzer:
-    def __init__(self):
-        self.symbol_stack = [{}]  # Tabla de símbolos para variables
+    def __init__(self, diagnostics=None):
+        self.diagnostics = diagnostics if diagnostics is not None else DiagnosticSink()
+        self._trace = self.diagnostics.wants(DEBUG)  # Mensajes de depuración sólo si se piden
+        self.symbols = SymbolTable()  # Tabla de símbolos para variables
         self.type_table = {}    # Tabla de tipos (si es necesario)
         self.functions = {}     # Funciones definidas
+        self._builtins_used = set()   # Predefinidas (sum, min...) ya llamadas: no se pueden redefinir
         self.current_function = None
+        self._stack = []        # Pila de trabajo del recorrido
     
     def _enter_scope(self):
-        self.symbol_stack.append({})
+        self.symbols.enter_scope()
 
     def _exit_scope(self):
-        self.symbol_stack.pop()
-
-    def _current_scope(self):
-        return self.symbol_stack[-1]
+        self.symbols.exit_scope()
 
     def _declare_variable(self, name, vtype):
-        current = self._current_scope()
-        if name in current:
+        if not self.symbols.declare(name, vtype):
             raise SemanticError(f"La variable '{name}' ya está declarada en este ámbito.")
-        current[name] = vtype
 
     def _lookup_variable(self, name):
-        for scope in reversed(self.symbol_stack):
-            if name in scope:
-                return scope[name]
-        raise SemanticError(f"La variable '{name}' no ha sido declarada.")
+        vtype = self.symbols.lookup(name)
+        if vtype is None:
+            raise SemanticError(f"La variable '{name}' no ha sido declarada.")
+        return vtype
  
     def analyze(self, node):
         if isinstance(node, list):
-            for n in node:
-                self.analyze(n)
-        elif isinstance(node, tuple):
-            tag = node[0]
-            method_name = f"_handle_{tag}"
-            
-            if hasattr(self, method_name):
-                return getattr(self, method_name)(node)
-            else:
-                raise Exception(f"No se ha definido el método para analizar: {tag}")
+            self._run(node)
+        elif isinstance(node, Node):
+            handler = _NODE_DISPATCH[node.kind]
+            if handler is None:
+                raise Exception(f"No se ha definido el método para analizar: {node.tag}")
+            stack = self._stack
+            base = len(stack)
+            result = handler(self, node)
+            # Los bloques que haya apilado el manejador se recorren aquí
+            self._drain(base)
+            return result
 
     def _analyze_statement(self, nodo):
-        nodetype = nodo[0]
-
-        if nodetype == 'decl':
-            self._handle_declaration(nodo)
-        elif nodetype == 'decl_assign':
-            self._handle_decl_assign(nodo)
-        elif nodetype == 'assign':
-            self._handle_assignment(nodo)
-        elif nodetype == 'type_def':
-            self._handle_type_definition(nodo)
-        elif nodetype == 'instance':
-            self._handle_instance(nodo)
-        elif nodetype == 'func_def':
-            self._handle_function_definition(nodo)
-        elif nodetype == 'return':
-            self._handle_return(nodo)
-        elif nodetype == 'if':
-            self._handle_if(nodo)
-        elif nodetype == 'func_call':
-            self._handle_func_call(nodo)  # Manejo de llamada a función
-        elif nodetype == 'array_access':
-            self._handle_array_access(nodo)  # Manejo de acceso a arrays
-        elif nodetype == 'binop':
-            self._handle_binop(nodo)  # Manejo de operaciones binarias
-        elif nodetype == 'const':
-            self._handle_const(nodo)  # Manejo de constantes
-        elif nodetype == 'var':
-            self._handle_var(nodo)  # Manejo de variables
-        elif nodetype == 'while':
-            self._handle_while(nodo)
-        else:
-            raise SemanticError(f"Tipo de sentencia desconocido: {nodetype}")
+        self._run([nodo])
+
+    # ----------------------------- Recorrido con pila explícita -----------------------------
+    # Los bloques (cuerpos de funciones, if y while) se apilan en lugar de recursar, así que
+    # la profundidad de anidamiento no está limitada por la pila de Python. En la pila hay
+    # sentencias pendientes o tuplas (acción, nodo) que cierran un bloque.
+
+    def _run(self, statements):
+        base = len(self._stack)
+        self._push_block(statements)
+        self._drain(base)
+
+    def _push_block(self, statements, finish=None, node=None):
+        stack = self._stack
+        if finish is not None:
+            stack.append((finish, node))
+        stack.extend(reversed(statements))
+
+    def _drain(self, base):
+        stack = self._stack
+        dispatch = _STATEMENT_DISPATCH
+        item = None
+        try:
+            while len(stack) > base:
+                item = stack.pop()
+                if item.__class__ is tuple:
+                    finish, node = item
+                    finish(self, node)
+                    continue
+                handler = dispatch[item.kind]
+                if handler is None:
+                    raise SemanticError(f"Tipo de sentencia desconocido: {item.tag}")
+                handler(self, item)
+        except SemanticError as e:
+            # Si el error no trae posición se usa la de la sentencia que lo produjo
+            if e.lineno is None and isinstance(item, Node):
+                e.lineno, e.col = item.lineno, item.col
+            del stack[base:]
+            raise
+        except BaseException:
+            del stack[base:]
+            raise
 
     def _handle_declaration(self, stmt):
-        tipo, lista_ids = stmt[1], stmt[2]
-        
+        tipo, lista_ids = stmt.type, stmt.ids
+        # Persona[100] gente: vector de un tipo registro, que tiene que estar ya definido
+        if _is_vector(tipo) and tipo[1] not in _SCALAR_TYPES and tipo[1] not in self.type_table:
+            raise SemanticError(f"El tipo '{tipo[1]}' no está definido.")
+
         for var in lista_ids:
             self._declare_variable(var, tipo)
-            print(f"Declarada variable '{var}' de tipo {tipo}")  # Depuración
+            if self._trace:
+                self.diagnostics.debug('semantic.trace', f"Declarada variable '{var}' de tipo {tipo}",
+                                       stmt.lineno, col=stmt.col)
 
     def _handle_assignment(self, node):
-        _, lhs, rhs = node  # Desempaquetamos la asignación
+        lhs, rhs = node.target, node.expr
 
         # Primero analizamos el lado derecho (expresión)
         self.analyze(rhs)
 
         # Comprobamos el tipo de la variable en el lado izquierdo
-        if lhs[0] == 'var':  # Si es una variable
-            var_name = lhs[1]
-            self._lookup_variable(var_name)
-            print(f"Asignando a la variable '{var_name}'")  # Depuración
-        elif lhs[0] in ('array_access', 'field_access'):  # Si es acceso a un array o campo
+        if lhs.kind == VAR:  # Si es una variable
+            var_name = lhs.name
+            _check_value(self._lookup_variable(var_name), rhs.type)
+            if self._trace:
+                self.diagnostics.debug('semantic.trace', f"Asignando a la variable '{var_name}'",
+                                       node.lineno, col=node.col)
+        elif lhs.kind in (ARRAY_ACCESS, FIELD_ACCESS):  # Si es acceso a un array o campo
             self.analyze(lhs)
+            _check_value(lhs.type, rhs.type)
         else:
-            raise SemanticError(f"Asignación a estructura no válida: {lhs[0]}")
-
-        # Si el lado derecho es una llamada a función (func_call), debemos verificar que la función exista
-        if rhs[0] == 'func_call':
-            func_name = rhs[1]
-            if func_name not in self.functions:
-                raise SemanticError(f"La función '{func_name}' no está definida.")
-            
-            # Analizar los argumentos
-            for arg in rhs[2]:
-                self.analyze(arg)
+            raise SemanticError(f"Asignación a estructura no válida: {lhs.tag}")
 
 
     def _handle_decl_assign(self, node):
-        _, tipo, lista_ids, expr = node
+        tipo, lista_ids, expr = node.type, node.ids, node.expr
         for var in lista_ids:
             self._declare_variable(var, tipo)
         self.analyze(expr)  # Analizamos la expresión
+        _check_value(tipo, expr.type)
 
 
 
     def _handle_function_definition(self, stmt):
-        func_type, func_name, params, body = stmt[1], stmt[2], stmt[3], stmt[4]
+        func_type, func_name, params, body = stmt.type, stmt.name, stmt.params, stmt.body
 
         if func_name in self.functions:
             raise SemanticError(f"La función '{func_name}' ya está definida.")
+        if func_name in self._builtins_used:
+            raise SemanticError(f"La función '{func_name}' se define después de usar la predefinida con el mismo nombre.")
 
         self.functions[func_name] = {'type': func_type, 'params': params}
 
@@ -136,17 +165,17 @@ class SemanticAnalyzer:
             self._declare_variable(param_name, param_type)
 
         self.current_function = func_name
-        for stmt in body:
-            self._analyze_statement(stmt)
-        self.current_function = None
+        self._push_block(body, SemanticAnalyzer._finish_function_definition, stmt)
 
+    def _finish_function_definition(self, stmt):
+        self.current_function = None
         self._exit_scope()
 
     def _handle_return(self, stmt):
         if self.current_function is None:
             raise SemanticError(f"El 'return' debe estar dentro de una función.")
         
-        expr = stmt[1]
+        expr = stmt.expr
         
         func_type = self.functions[self.current_function]['type']
         expr_type = self._get_expression_type(expr)
@@ -155,111 +184,247 @@ class SemanticAnalyzer:
             raise SemanticError(f"El tipo de la expresión de retorno '{expr_type}' no coincide con el tipo de la función '{func_type}'.")
 
     def _handle_if(self, stmt):
-        condition, true_stmt, false_stmt = stmt[1], stmt[2], stmt[3]
+        condition, true_body, false_body = stmt.cond, stmt.then, stmt.orelse
         
         condition_type = self._get_expression_type(condition)
         
         if condition_type != 'bool':
             raise SemanticError(f"La condición del 'if' debe ser de tipo 'bool', pero es '{condition_type}'.")
 
-        self._analyze_statement(true_stmt)
-        if false_stmt:
-            self._analyze_statement(false_stmt)
+        if false_body:
+            self._push_block(false_body)
+        self._push_block(true_body)
 
     def _handle_while(self, stmt):
-        condition, body = stmt[1], stmt[2]
+        condition, body = stmt.cond, stmt.body
 
         condition_type = self._get_expression_type(condition)
         if condition_type != 'bool':
             raise SemanticError("La condición del 'while' debe ser de tipo 'bool'.")
 
-        for inner_stmt in body:
-            self._analyze_statement(inner_stmt)
+        self._push_block(body)
         
+    # Los registros guardan sus campos en orden de declaración (records.RecordLayout)
+    def _handle_type_definition(self, stmt):
+        if stmt.name in self.type_table:
+            raise SemanticError(f"El tipo '{stmt.name}' ya está definido.")
+        names = set()
+        for _, field_name in stmt.record_fields:
+            if field_name in names:
+                raise SemanticError(f"El campo '{field_name}' está repetido en el tipo '{stmt.name}'.")
+            names.add(field_name)
+        self.type_table[stmt.name] = RecordLayout(stmt.name, ((name, ftype) for ftype, name in stmt.record_fields))
+
+    def _handle_instance(self, stmt):
+        if stmt.type_name not in self.type_table:
+            raise SemanticError(f"El tipo '{stmt.type_name}' no está definido.")
+        self._declare_variable(stmt.name, stmt.type_name)
+
     def _handle_program(self, node):
-        for stmt in node[1]:
-            self._analyze_statement(stmt)
+        self._push_block(node.body)
+
+    # ----------------------------- Tipos de las expresiones -----------------------------
+    # Cada nodo de expresión se tipa una sola vez: el resultado queda en node.type y las
+    # comprobaciones posteriores (return, if, while, asignaciones) o los backends lo reutilizan.
 
-    def _handle_func_call(self, node):
-        func_name = node[1]
-        args = node[2]
+    def _handle_expression(self, node):
+        return self._get_expression_type(node)
+
+    def _get_expression_type(self, expr):
+        if expr.type is not None:
+            return expr.type
+
+        # Post-orden con pila explícita: los hijos se tipan antes que el padre y el
+        # operando izquierdo antes que el derecho, sin consumir marcos de Python
+        stack = [(expr, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node.type is not None:
+                continue
+            kind = node.kind
+
+            if kind == CONST:
+                node.type = _const_type(node.value)
+                if node.type == 'int' and node.value > INT_MAX:
+                    raise SemanticError("Constante entera fuera del rango de 64 bits.", node.lineno, node.col)
+            elif kind == VAR:
+                node.type = self._lookup_variable(node.name)
+            elif not expanded:
+                stack.append((node, True))
+                if kind == BINOP:
+                    stack.append((node.right, False))
+                    stack.append((node.left, False))
+                elif kind == UNOP:
+                    stack.append((node.operand, False))
+                elif kind == ARRAY_ACCESS:
+                    stack.append((node.array, False))
+                    stack.append((node.index, False))  # Primero el índice
+                elif kind == FIELD_ACCESS:
+                    stack.append((node.obj, False))
+                elif kind == FUNC_CALL:
+                    self._check_call(node)
+                    stack.extend((arg, False) for arg in reversed(node.args))
+                else:
+                    raise SemanticError(f"Expresión desconocida: {node.tag}")
+            else:
+                node.type = self._combine_type(node)
+        return expr.type
+
+    def _combine_type(self, node):
+        # Tipo de un nodo cuyos hijos ya están tipados
+        kind = node.kind
+        if kind == BINOP:
+            left_type, right_type = node.left.type, node.right.type
+            if _is_vector(left_type) or _is_vector(right_type):
+                return _vector_binop_type(node.op, left_type, right_type)
+            if left_type != right_type:
+                raise SemanticError(f"Los tipos de los operandos no coinciden: {left_type} vs {right_type}.")
+            # Devuelve el tipo de resultado esperado (por ejemplo, bool si es comparación)
+            if node.op in _COMPARISONS:
+                return 'bool'
+            return left_type
+        if kind == UNOP:
+            operand_type = node.operand.type
+            if _is_vector(operand_type) and (node.op == 'not' or operand_type[1] not in TYPECODES):
+                raise SemanticError(f"El operador '{node.op}' no se aplica a un vector de tipo '{operand_type[1]}'.")
+            return 'bool' if node.op == 'not' else operand_type
+        if kind == ARRAY_ACCESS:
+            array_type = node.array.type
+            if not (isinstance(array_type, tuple) and array_type[0] == 'vector'):
+                raise SemanticError(f"Acceso con índice a una expresión de tipo '{array_type}', que no es un vector.")
+            if node.index.type != 'int':
+                raise SemanticError(f"El índice de un vector debe ser de tipo 'int', pero es '{node.index.type}'.")
+            # Un índice constante se comprueba ya aquí contra el tamaño declarado
+            index = _constant_index(node.index)
+            if index is not None and not 0 <= index < array_type[2]:
+                raise SemanticError(f"Índice {index} fuera de rango para un vector de tamaño {array_type[2]}.",
+                                    node.lineno, node.col)
+            if array_type[1] in self.type_table:
+                # Guardado por columnas: un elemento no existe como registro, sólo sus campos
+                raise SemanticError(f"Un elemento de un vector de '{array_type[1]}' sólo se puede usar a través de sus campos (v[i].campo).",
+                                    node.lineno, node.col)
+            return array_type[1]
+        if kind == FIELD_ACCESS:
+            # Campo de un registro, o columna del campo en un vector de registros
+            obj_type = node.obj.type
+            type_name = obj_type[1] if _is_vector(obj_type) else obj_type
+            record = self.type_table.get(type_name)
+            if record is None:
+                raise SemanticError(f"Acceso al campo '{node.field}' de una expresión de tipo '{obj_type}', que no es un registro.")
+            if node.field not in record:
+                raise SemanticError(f"El tipo '{type_name}' no tiene el campo '{node.field}'.")
+            if not _is_vector(obj_type):
+                node.offset, field_type = record.field(node.field)
+            else:
+                node.offset, field_type = record.column(node.field, obj_type[2])
+            return field_type
+        # FUNC_CALL
+        if node.name not in self.functions:
+            return _reduction_type(node)
+        for arg, (param_type, _) in zip(node.args, self.functions[node.name]['params']):
+            _check_value(param_type, arg.type)
+        return self.functions[node.name]['type']
+
+    def _check_call(self, node):
+        func_name = node.name
+        args = node.args
 
         if func_name not in self.functions:
-            raise SemanticError(f"La función '{func_name}' no está definida.")
+            if func_name not in REDUCTIONS:
+                raise SemanticError(f"La función '{func_name}' no está definida.")
+            # Predefinida: los tipos de los argumentos se comprueban cuando ya están tipados
+            if len(args) != REDUCTIONS[func_name]:
+                raise SemanticError(f"La función '{func_name}' requiere {REDUCTIONS[func_name]} parámetros, pero se le dieron {len(args)}.")
+            self._builtins_used.add(func_name)
+            return
         
         func_params = self.functions[func_name]['params']
         if len(args) != len(func_params):
             raise SemanticError(f"La función '{func_name}' requiere {len(func_params)} parámetros, pero se le dieron {len(args)}.")
 
-    def _handle_const(self, node):
-        return node[1]  # Retornamos el valor de la constante
-    
-    def _handle_binop(self, node):
-        left_expr = node[1]
-        right_expr = node[2]
-        
-        # Analizar los tipos de los operandos (izquierdo y derecho)
-        left_type = self._get_expression_type(left_expr)
-        right_type = self._get_expression_type(right_expr)
-
-        # Verificar que los operandos sean del mismo tipo
-        if left_type != right_type:
-            raise SemanticError(f"Los tipos de los operandos no coinciden: '{left_type}' vs '{right_type}'.")
-
-        return left_type
 
-    def _handle_binop(self, node):
-        # El nodo binop debe tener tres elementos: el operador y los dos operandos
-        operator = node[1]  # El operador: +
-        left_expr = node[2]  # El operando izquierdo
-        right_expr = node[3]  # El operando derecho
-        
-        # Verificamos los tipos de los operandos
-        left_type = self._get_expression_type(left_expr)
-        right_type = self._get_expression_type(right_expr)
-        
-        # Comprobamos si los tipos de los operandos coinciden
-        if left_type != right_type:
-            raise SemanticError(f"Los tipos de los operandos no coinciden: '{left_type}' vs '{right_type}'.")
-        
-        return left_type  # Devolvemos el tipo resultante de la operación
-
-    def _get_expression_type(self, expr):
-        if isinstance(expr, tuple):  # Si es una expresión compleja (binaria, unaria)
-            if expr[0] == 'binop':
-                operator = expr[1]
-                left_expr = expr[2]
-                right_expr = expr[3]
-                left_type = self._get_expression_type(left_expr)
-                right_type = self._get_expression_type(right_expr)
-
-                if left_type != right_type:
-                    raise SemanticError(f"Los tipos de los operandos no coinciden: {left_type} vs {right_type}.")
-
-                # Devuelve el tipo de resultado esperado (por ejemplo, bool si es comparación)
-                if operator in ['==', '>', '<', '>=', '<=']:
-                    return 'bool'
-                return left_type
-
-        elif isinstance(expr, str):  # Si es una variable
-            return self._lookup_variable(expr)
-        elif isinstance(expr, (int, float, bool)):
-            if isinstance(expr, bool):
-                return 'bool'
-            elif isinstance(expr, int):
-                return 'int'
-            elif isinstance(expr, float):
-                return 'float'
-        else:
-            raise SemanticError(f"Expresión desconocida: {expr}")
-
-
-    def _handle_array_access(self, node):
-        self.analyze(node[1])  # Analizamos el índice del array
-        
-        var_name = node[0][1]  # El nombre del array
-        return self._lookup_variable(var_name)
-    
-    def _handle_var(self, node):
-        var_name = node[1]
-        return self._lookup_variable(var_name)
+def _is_vector(vtype):
+    return isinstance(vtype, tuple) and vtype[0] == 'vector'
+
+
+def _check_value(target_type, value_type):
+    # Una variable, un campo o un parámetro sólo recibe un valor de su mismo tipo (un vector,
+    # además, del mismo tamaño: los backends se fían del tamaño declarado). La única conversión
+    # automática es int -> float, que hacen todos los backends
+    if target_type != value_type and not (target_type == 'float' and value_type == 'int'):
+        raise SemanticError(f"No se puede usar un valor de tipo '{value_type}' donde se espera '{target_type}'.")
+
+
+def _constant_index(node):
+    # Valor de un índice entero literal (o literal con signo menos), o None
+    negate = node.kind == UNOP and node.op == '-'
+    if negate:
+        node = node.operand
+    if node.kind != CONST or node.type != 'int':
+        return None
+    return -node.value if negate else node.value
+
+
+def _vector_binop_type(op, left_type, right_type):
+    # Con vectores: == entre vectores del mismo tipo y + - * / elemento a elemento entre dos
+    # vectores numéricos del mismo tipo o entre uno y un escalar de su tipo base
+    if op == '==' and left_type == right_type:
+        return 'bool'
+    vector_type = left_type if _is_vector(left_type) else right_type
+    other = right_type if vector_type is left_type else left_type
+    if op in ('+', '-', '*', '/') and vector_type[1] in TYPECODES and other in (vector_type, vector_type[1]):
+        return vector_type
+    raise SemanticError(f"El operador '{op}' no se aplica a los operandos: {left_type} vs {right_type}.")
+
+
+def _reduction_type(node):
+    # sum, min y max de un vector numérico, o dot de dos del mismo tipo: escalar del tipo base
+    arg_types = [arg.type for arg in node.args]
+    vector_type = arg_types[0]
+    if not (_is_vector(vector_type) and vector_type[1] in TYPECODES) or any(t != vector_type for t in arg_types):
+        types = ', '.join(str(t) for t in arg_types)
+        raise SemanticError(f"La función '{node.name}' requiere vectores de int o float del mismo tipo, pero se le dieron: {types}.")
+    return vector_type[1]
+
+
+def _const_type(value):
+    # Los literales true/false llegan como texto desde el lexer y los caracteres como str de longitud 1
+    if isinstance(value, bool) or value in ('true', 'false'):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    return 'char'
+
+
+# ----------------------------- Tablas de despacho -----------------------------
+# Se calculan una sola vez, indexadas por el código de nodo
+
+_STATEMENT_HANDLERS = {
+    DECL: '_handle_declaration',
+    DECL_ASSIGN: '_handle_decl_assign',
+    ASSIGN: '_handle_assignment',
+    TYPE_DEF: '_handle_type_definition',
+    INSTANCE: '_handle_instance',
+    FUNC_DEF: '_handle_function_definition',
+    RETURN: '_handle_return',
+    IF: '_handle_if',
+    FUNC_CALL: '_handle_expression',
+    ARRAY_ACCESS: '_handle_expression',
+    BINOP: '_handle_expression',
+    CONST: '_handle_expression',
+    VAR: '_handle_expression',
+    WHILE: '_handle_while',
+}
+
+_STATEMENT_DISPATCH = tuple(
+    getattr(SemanticAnalyzer, _STATEMENT_HANDLERS.get(cls.kind, ''), None) for cls in NODE_CLASSES
+)
+
+# analyze() sobre un nodo suelto usa el manejador _handle_<etiqueta>; las expresiones se tipan
+_NODE_DISPATCH = tuple(
+    SemanticAnalyzer._handle_expression if issubclass(cls, Expr)
+    else getattr(SemanticAnalyzer, f"_handle_{cls.tag}", None)
+    for cls in NODE_CLASSES
+)
@@ -0,0 +1,62 @@
+import codecs
+import io
+import mmap
+import os
+
+
+CHUNK_SIZE = 1 << 20    # Bytes que se decodifican de cada vez en modo por bloques
+
+
+# Decodificador UTF-8 con la misma traducción de saltos de línea (\r\n y \r a \n) que open() en modo texto
+def _decoder():
+    return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+
+
+# Fichero fuente mapeado en memoria. Los bytes no se copian al leer el fichero: el hash de la
+# caché se calcula sobre el mapa y el texto sólo se decodifica si hace falta (entero o por bloques)
+class SourceFile:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # mmap no admite ficheros vacíos
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # Contenido sin decodificar (admite el protocolo de buffer, p. ej. para hashlib)
+    @property
+    def raw(self):
+        return self._map if self._map is not None else b''
+
+    def text(self):
+        return _decoder().decode(self.raw, final=True)
+
+    # Texto decodificado en trozos de unos chunk_size bytes. Las páginas ya decodificadas se
+    # devuelven al sistema, así que la memoria usada no crece con el tamaño del fichero.
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        decoder = _decoder()
+        released = 0
+        for start in range(0, self.size, chunk_size):
+            end = min(start + chunk_size, self.size)
+            text = decoder.decode(self._map[start:end], final=end == self.size)
+            released = self._release(released, end)
+            if text:
+                yield text
+
+    def _release(self, start, end):
+        # madvise necesita un inicio alineado a página; devuelve hasta dónde se ha liberado
+        end -= end % mmap.PAGESIZE
+        if end > start and hasattr(mmap, 'MADV_DONTNEED'):
+            self._map.madvise(mmap.MADV_DONTNEED, start, end - start)
+            return end
+        return start
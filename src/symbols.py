@@ -0,0 +1,58 @@
+import sys
+
+
+_intern = sys.intern
+
+
+# Tabla de símbolos plana: un único diccionario nombre -> pila de declaraciones.
+# Cada ámbito guarda los nombres que declaró (registro para deshacer), así que
+# buscar es O(1) sea cual sea la profundidad y salir de un ámbito sólo cuesta
+# tantas operaciones como declaraciones hizo.
+class SymbolTable:
+    __slots__ = ('_bindings', '_scopes')
+
+    def __init__(self):
+        self._bindings = {}   # nombre -> [(profundidad, valor), ...] (la última es la visible)
+        self._scopes = [[]]   # nombres declarados en cada ámbito abierto
+
+    @property
+    def depth(self):
+        return len(self._scopes) - 1
+
+    def enter_scope(self):
+        self._scopes.append([])
+
+    def exit_scope(self):
+        bindings = self._bindings
+        for name in self._scopes.pop():
+            versions = bindings[name]
+            versions.pop()
+            if not versions:
+                del bindings[name]
+
+    def declare(self, name, value):
+        # Devuelve False si el nombre ya está declarado en el ámbito actual
+        name = _intern(name)
+        depth = len(self._scopes) - 1
+        versions = self._bindings.get(name)
+        if versions is None:
+            self._bindings[name] = [(depth, value)]
+        elif versions[-1][0] == depth:
+            return False
+        else:
+            versions.append((depth, value))
+        self._scopes[-1].append(name)
+        return True
+
+    def lookup(self, name, default=None):
+        versions = self._bindings.get(name)
+        if versions is None:
+            return default
+        return versions[-1][1]
+
+    def __contains__(self, name):
+        return name in self._bindings
+
+    def in_current_scope(self, name):
+        versions = self._bindings.get(name)
+        return versions is not None and versions[-1][0] == len(self._scopes) - 1
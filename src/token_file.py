@@ -0,0 +1,289 @@
+import argparse
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from diagnostics import LineIndex
+from token_stream import TOKEN_CODES, TOKEN_NAMES, TokenBuffer, Token
+
+
+# ----------------------------- Formato .vtk -----------------------------
+# Tokens de un fichero en binario, por columnas:
+#   cabecera     VTK_MAGIC, versión, tabla de tipos (nombres en el orden de sus códigos),
+#                repositorio de valores y número de tokens
+#   columnas     tipos (un byte por token), índices en el repositorio, incrementos de línea,
+#                incrementos de posición y posiciones de los saltos de línea de la fuente
+# Todos los enteros son varints (7 bits por byte, el bit alto indica que sigue otro byte); las
+# columnas van precedidas de su longitud en bytes. El repositorio guarda una sola vez cada valor
+# distinto (nombres, operadores, números y caracteres); las cadenas se internan al leerlo.
+# Los saltos de línea permiten calcular columnas sin el texto fuente.
+
+VTK_MAGIC = b'VTK\x01'
+VTK_VERSION = 1
+
+_STR, _INT, _FLOAT = 0, 1, 2    # Etiquetas de los valores del repositorio
+_double = struct.Struct('<d')
+
+
+def _put_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _varints(values):
+    out = bytearray()
+    append = out.append
+    for value in values:
+        if value < 0x80:
+            append(value)
+        else:
+            _put_varint(out, value)
+    return out
+
+
+def _deltas(values):
+    previous = 0
+    for value in values:
+        yield value - previous
+        previous = value
+
+
+# Escritor en bloque: el contenido .vtk de un TokenBuffer
+def encode(buffer):
+    pool = {}
+    indexes = array('I', [pool.setdefault((type(value), value), len(pool)) for value in buffer.values])
+
+    out = bytearray(VTK_MAGIC)
+    _put_varint(out, VTK_VERSION)
+    _put_varint(out, len(TOKEN_NAMES))
+    for name in TOKEN_NAMES:
+        _put_varint(out, len(name))
+        out += name.encode('ascii')
+
+    _put_varint(out, len(pool))
+    for kind, value in pool:
+        if kind is int:
+            out.append(_INT)
+            _put_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif kind is float:
+            out.append(_FLOAT)
+            out += _double.pack(value)
+        else:
+            text = value.encode('utf-8')
+            out.append(_STR)
+            _put_varint(out, len(text))
+            out += text
+
+    newlines = []
+    find = buffer.lexdata.find
+    pos = find('\n')
+    while pos != -1:
+        newlines.append(pos)
+        pos = find('\n', pos + 1)
+
+    _put_varint(out, len(buffer))
+    columns = (buffer.types.tobytes(), _varints(indexes), _varints(_deltas(buffer.linenos)),
+               _varints(_deltas(buffer.lexpos)), _varints(_deltas(newlines)))
+    for column in columns:
+        _put_varint(out, len(column))
+    for column in columns:
+        out += column
+    return bytes(out)
+
+
+def save(buffer, path):
+    with open(path, 'wb') as f:
+        f.write(encode(buffer))
+
+
+# ----------------------------- Lectura -----------------------------
+
+class _Reader:
+    __slots__ = ('data', 'pos')
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def varint(self):
+        data = self.data
+        pos = self.pos
+        byte = data[pos]
+        pos += 1
+        value = byte & 0x7f
+        shift = 7
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+        self.pos = pos
+        return value
+
+    def take(self, n):
+        start = self.pos
+        self.pos = start + n
+        return self.data[start:self.pos]
+
+
+def _decode_varints(column):
+    # Con todos los bytes por debajo de 0x80 cada byte es un varint completo
+    if not column or max(column) < 0x80:
+        return column.tolist()
+    reader = _Reader(column)
+    values = []
+    while reader.pos < len(column):
+        values.append(reader.varint())
+    return values
+
+
+# Tokens de un fichero .vtk. Las columnas son vistas sobre los bytes leídos, sin copiarlos:
+# replay() los decodifica según los pide el parser y to_buffer() los pasa a un TokenBuffer.
+# Se usa como un TokenBuffer ya lexeado: Parser.parse_tokens, dumps() (volcado .token) y to_record().
+class TokenFile:
+    __slots__ = ('names', 'codes', 'pool', 'count', 'types', 'indexes', 'lines', 'lexpos', 'newlines',
+                 '_line_index')
+
+    @classmethod
+    def loads(cls, data):
+        view = memoryview(data)
+        if view[:len(VTK_MAGIC)] != VTK_MAGIC:
+            raise ValueError("No es un fichero de tokens de Viper")
+        try:
+            return cls._read(_Reader(view, len(VTK_MAGIC)))
+        except (IndexError, struct.error, UnicodeDecodeError):
+            raise ValueError("Fichero de tokens truncado o corrupto") from None
+
+    @classmethod
+    def _read(cls, reader):
+        version = reader.varint()
+        if version != VTK_VERSION:
+            raise ValueError(f"Versión de fichero de tokens no soportada: {version}")
+
+        tokens = cls()
+        tokens.names = tuple(str(reader.take(reader.varint()), 'ascii') for _ in range(reader.varint()))
+        unknown = [name for name in tokens.names if name not in TOKEN_CODES]
+        if unknown:
+            raise ValueError(f"Tipos de token desconocidos: {', '.join(unknown)}")
+        # Tabla de traducción de los códigos del fichero a los de esta versión del lexer
+        tokens.codes = bytes(TOKEN_CODES[name] for name in tokens.names).ljust(256, b'\0')
+
+        pool = []
+        for _ in range(reader.varint()):
+            kind = reader.take(1)[0]
+            if kind == _INT:
+                value = reader.varint()
+                pool.append(value >> 1 if not value & 1 else -((value + 1) >> 1))
+            elif kind == _FLOAT:
+                pool.append(_double.unpack(reader.take(8))[0])
+            else:
+                pool.append(sys.intern(str(reader.take(reader.varint()), 'utf-8')))
+        tokens.pool = pool
+
+        tokens.count = reader.varint()
+        sizes = [reader.varint() for _ in range(5)]
+        tokens.types, tokens.indexes, tokens.lines, tokens.lexpos, tokens.newlines = (
+            reader.take(size) for size in sizes)
+        if len(tokens.types) != tokens.count or reader.pos != len(reader.data):
+            raise ValueError("Fichero de tokens truncado o corrupto")
+        tokens._line_index = None
+        return tokens
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        names, pool = self.names, self.pool
+        for code, index in zip(self.types, _decode_varints(self.indexes)):
+            yield names[code], pool[index]
+
+    # Inicios de línea de la fuente (para las columnas de los diagnósticos)
+    @property
+    def line_index(self):
+        if self._line_index is None:
+            self._line_index = LineIndex.from_newlines(accumulate(_decode_varints(self.newlines)))
+        return self._line_index
+
+    def to_buffer(self):
+        buffer = TokenBuffer()
+        buffer.types.frombytes(bytes(self.types).translate(self.codes))
+        pool = self.pool
+        buffer.values = [pool[index] for index in _decode_varints(self.indexes)]
+        buffer.linenos.extend(accumulate(_decode_varints(self.lines)))
+        buffer.lexpos.extend(accumulate(_decode_varints(self.lexpos)))
+        return buffer
+
+    def replay(self):
+        return FileReplayLexer(self)
+
+    def dumps(self):
+        return ''.join(f"{name} {value}\n" for name, value in self)
+
+    def to_record(self):
+        return self.to_buffer().to_record()
+
+
+# Sustituto del texto fuente en Parser._position: rfind('\n', 0, pos) con los saltos de línea del fichero
+class _SourceLines:
+    __slots__ = ('starts',)
+
+    def __init__(self, line_index):
+        self.starts = line_index.starts
+
+    def rfind(self, sub, start, end):
+        line_start = self.starts[bisect_right(self.starts, end) - 1]
+        return line_start - 1 if line_start > start else -1
+
+
+# Fuente de tokens para yacc que decodifica un TokenFile según se lee (como ReplayLexer)
+class FileReplayLexer:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.lexdata = _SourceLines(tokens.line_index)
+        self.input(None)
+
+    def input(self, data):
+        # Las líneas y posiciones se guardan como incrementos desde 0
+        self.index = 0
+        self.lineno = 0
+        self.lexpos = 0
+        self._readers = (_Reader(self.tokens.indexes), _Reader(self.tokens.lines), _Reader(self.tokens.lexpos))
+
+    def token(self):
+        tokens = self.tokens
+        i = self.index
+        if i >= tokens.count:
+            return None
+        self.index = i + 1
+
+        indexes, lines, lexpos = self._readers
+        value = tokens.pool[indexes.varint()]
+        self.lineno += lines.varint()
+        self.lexpos += lexpos.varint()
+        return Token(tokens.names[tokens.types[i]], value, self.lineno, self.lexpos, self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
+
+
+# Conversor a texto: el volcado .token de un .vtk
+if __name__ == "__main__":
+    argp = argparse.ArgumentParser(description="Conversor de ficheros de tokens de Viper")
+    argp.add_argument('tokens', help="fichero .vtk generado con main.py --emit-tokens")
+    args = argp.parse_args()
+    sys.stdout.write(TokenFile.load(args.tokens).dumps())
@@ -0,0 +1,124 @@
+from array import array
+
+from viper_tokens import tokens as token_list
+
+
+# Códigos compactos para los tipos de token (índice en la lista de tokens)
+TOKEN_CODES = {name: code for code, name in enumerate(token_list)}
+TOKEN_NAMES = tuple(token_list)
+
+
+# Tokens de un fichero guardados una sola vez en arrays paralelos
+class TokenBuffer:
+    __slots__ = ('types', 'values', 'linenos', 'lexpos', 'lexdata')
+
+    def __init__(self, lexdata=''):
+        self.types = array('B')      # Código del tipo de token
+        self.values = []             # Valor del token (str, int, float)
+        self.linenos = array('I')    # Línea del token
+        self.lexpos = array('I')     # Posición absoluta en la entrada
+        self.lexdata = lexdata
+
+    def __len__(self):
+        return len(self.types)
+
+    def __iter__(self):
+        names = TOKEN_NAMES
+        for code, value in zip(self.types, self.values):
+            yield names[code], value
+
+    def append(self, tok):
+        self.types.append(TOKEN_CODES[tok.type])
+        self.values.append(tok.value)
+        self.linenos.append(tok.lineno)
+        self.lexpos.append(tok.lexpos)
+
+    def fill(self, lexer):
+        # Consume el lexer hasta el final. Si el lexer lanza una excepción
+        # los tokens leídos hasta ese momento quedan en el buffer.
+        scan_into = getattr(lexer, 'scan_into', None)
+        if scan_into is not None:
+            # scanner.Scanner escribe directamente en los arrays
+            return scan_into(self)
+        append = self.append
+        token = lexer.token
+        while True:
+            tok = token()
+            if not tok:
+                break
+            append(tok)
+        return self
+
+    def dumps(self):
+        # Mismo formato que el volcado original: "<TIPO> <valor>" por línea
+        names = TOKEN_NAMES
+        return ''.join(f"{names[code]} {value}\n" for code, value in zip(self.types, self.values))
+
+    def dump(self, out):
+        out.write(self.dumps())
+
+    # Representación serializable con marshal (para la caché de compilación)
+    def to_record(self):
+        return (self.types.tobytes(), tuple(self.values), self.linenos.tobytes(), self.lexpos.tobytes())
+
+    @classmethod
+    def from_record(cls, record, lexdata=''):
+        buffer = cls(lexdata)
+        types, values, linenos, lexpos = record
+        buffer.types.frombytes(types)
+        buffer.values = list(values)
+        buffer.linenos.frombytes(linenos)
+        buffer.lexpos.frombytes(lexpos)
+        return buffer
+
+    def replay(self):
+        return ReplayLexer(self)
+
+
+# Token ligero para el parser: los atributos que yacc lee de un LexToken, sin __dict__
+class Token:
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos, lexer):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.lexer = lexer
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+# Fuente de tokens para yacc que reproduce un TokenBuffer sin volver a lexear
+class ReplayLexer:
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.lexdata = buffer.lexdata
+        self.lineno = 1
+        self.lexpos = 0
+        self.index = 0
+
+    def input(self, data):
+        # El buffer ya contiene la entrada; sólo se rebobina
+        self.index = 0
+
+    def token(self):
+        buffer = self.buffer
+        i = self.index
+        if i >= len(buffer.types):
+            return None
+        self.index = i + 1
+
+        self.lineno = lineno = buffer.linenos[i]
+        self.lexpos = lexpos = buffer.lexpos[i]
+        return Token(TOKEN_NAMES[buffer.types[i]], buffer.values[i], lineno, lexpos, self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
@@ -0,0 +1,576 @@
+import argparse
+import keyword
+import marshal
+import sys
+from importlib.util import MAGIC_NUMBER
+
+from ast_nodes import (DECL, DECL_ASSIGN, ASSIGN, FUNC_DEF, RETURN, IF, WHILE, INSTANCE, TYPE_DEF,
+                       BINOP, UNOP, CONST, VAR, ARRAY_ACCESS, FIELD_ACCESS, FUNC_CALL)
+from executor import ExecutionError, SCALAR_DEFAULTS, is_vector, const_value, coerce, format_value, int_div
+from vectors import VectorError, REDUCTIONS, TYPECODES, OVERFLOW_MESSAGE, INT_MIN, INT_MAX, new_vector, vector_op
+
+
+# ----------------------------- Formato -----------------------------
+# El programa se traduce a un módulo de Python: cada función de Viper es una función
+# 'f_<nombre>', cada registro una clase 'T_<tipo>' con __slots__ y el cuerpo principal
+# la función '_main', que devuelve las variables globales en orden de declaración. Las
+# variables locales se llaman 'l_<nombre>' y las globales 'g_<nombre>'; las globales que
+# no usa ninguna función son locales de '_main' (acceso rápido en los bucles).
+#
+# Un .vpyc guarda el código fuente y el objeto código ya compilado (marshal), como un .pyc:
+# si la versión de Python que lo carga es otra, se vuelve a compilar desde el fuente.
+
+VPY_MAGIC = b'VPY\x01'
+VPY_VERSION = 1
+
+# Precedencias de Python: sólo se ponen los paréntesis imprescindibles
+_OR, _AND, _NOT, _COMPARE, _SUM, _PRODUCT, _UNARY, _ATOM = range(1, 9)
+
+_BINARY_PRECEDENCE = {
+    'or': _OR, 'and': _AND,
+    '<': _COMPARE, '<=': _COMPARE, '>': _COMPARE, '>=': _COMPARE, '==': _COMPARE,
+    '+': _SUM, '-': _SUM, '*': _PRODUCT, '/': _PRODUCT,
+}
+
+
+class _NoReturn(Exception):
+    def __init__(self, name):
+        super().__init__(name)
+        self.name = name
+
+
+def _out_of_range(i, n, lineno, col):
+    raise ExecutionError(f"Índice {i} fuera de rango para un vector de tamaño {n}.", lineno, col)
+
+
+def _overflow(lineno, col):
+    raise ExecutionError(OVERFLOW_MESSAGE, lineno, col)
+
+
+# Nombres de ayuda que ve el código generado
+_RUNTIME = {
+    '_int_div': int_div,
+    '_oob': _out_of_range,
+    '_ovf': _overflow,
+    '_NoReturn': _NoReturn,
+    '_new_vector': new_vector,
+    '_vec': vector_op,
+}
+
+
+def field_name(name):
+    # Los campos se usan como atributos: una palabra reservada de Python lleva '_' detrás
+    return name + '_' if keyword.iskeyword(name) else name
+
+
+def to_common(value, vtype, records):
+    # Valor del módulo generado a la representación común (registros como listas)
+    if value is None or vtype in SCALAR_DEFAULTS or is_vector(vtype):
+        return value
+    return [to_common(getattr(value, field_name(field)), ftype, records) for field, ftype in records[vtype]]
+
+
+class PythonProgram:
+    __slots__ = ('filename', 'source', 'code', 'positions', 'globals', 'records', '_main', '_values')
+
+    def __init__(self, filename, source, code, positions, global_vars, records):
+        self.filename = filename
+        self.source = source
+        self.code = code
+        self.positions = positions   # Por línea del fuente generado: (línea, columna) en el .vip
+        self.globals = global_vars   # [(nombre, tipo)] en orden de declaración
+        self.records = records       # tipo -> ((campo, tipo), ...)
+        self._main = None
+        self._values = None
+
+    def run(self):
+        if self._main is None:
+            namespace = dict(_RUNTIME, __name__='__viper__')
+            exec(self.code, namespace)
+            self._main = namespace['_main']
+        try:
+            self._values = self._main()
+        except ZeroDivisionError as e:
+            raise ExecutionError("División por cero.", *self._position(e.__traceback__, 0)) from None
+        except VectorError as e:
+            raise ExecutionError(e.message, *self._position(e.__traceback__, 0)) from None
+        except OverflowError as e:    # Un int que no cabe en un vector de 64 bits
+            raise ExecutionError(OVERFLOW_MESSAGE, *self._position(e.__traceback__, 0)) from None
+        except _NoReturn as e:
+            # La posición es la de la llamada, no la del final de la función
+            raise ExecutionError(f"La función '{e.name}' terminó sin ejecutar 'return'.",
+                                 *self._position(e.__traceback__, 1)) from None
+        except RecursionError:
+            raise ExecutionError("Se ha superado la profundidad máxima de llamadas.") from None
+        return self.variables()
+
+    def _position(self, traceback, skip):
+        # Línea del .vip del marco generado más interno (menos 'skip' marcos)
+        lines = []
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == self.filename:
+                lines.append(traceback.tb_lineno)
+            traceback = traceback.tb_next
+        if len(lines) <= skip:
+            return None, None
+        return self.positions[lines[-1 - skip] - 1]
+
+    def variables(self):
+        return {name: to_common(value, vtype, self.records)
+                for (name, vtype), value in zip(self.globals, self._values)}
+
+    def format_variables(self):
+        layouts = {name: {field: (offset, ftype) for offset, (field, ftype) in enumerate(fields)}
+                   for name, fields in self.records.items()}
+        values = self.variables()
+        return [f"{name} = {format_value(values[name], vtype, layouts)}" for name, vtype in self.globals]
+
+    def dumps(self):
+        record = (VPY_VERSION, MAGIC_NUMBER, self.filename, self.source, marshal.dumps(self.code),
+                  self.positions, self.globals, list(self.records.items()))
+        return VPY_MAGIC + marshal.dumps(record)
+
+    @classmethod
+    def loads(cls, data):
+        if data[:len(VPY_MAGIC)] != VPY_MAGIC:
+            raise ValueError("No es un fichero de Python generado desde Viper")
+        version, magic, filename, source, code, positions, global_vars, records = marshal.loads(data[len(VPY_MAGIC):])
+        if version != VPY_VERSION:
+            raise ValueError(f"Versión de .vpyc no soportada: {version}")
+        # Como con un .pyc: el objeto código sólo vale para la misma versión de Python
+        code = marshal.loads(code) if magic == MAGIC_NUMBER else compile(source, filename, 'exec')
+        return cls(filename, source, code, positions, global_vars, dict(records))
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+
+# ----------------------------- Generador -----------------------------
+
+# Código de una función (o de '_main') mientras se genera
+class _Unit:
+    def __init__(self, name, ftype=None):
+        self.name = name
+        self.type = ftype
+        self.lines = []          # (texto, posición)
+        self.params = ()
+        self.locals = {}         # nombre -> tipo, en orden de declaración
+        self.uses_globals = set()
+
+    def declare(self, name, vtype):
+        self.locals.setdefault(name, vtype)
+
+
+class PythonTranspiler:
+    def __init__(self, filename='<viper>'):
+        self.filename = filename
+        self.records = {}        # tipo -> ((campo, tipo), ...)
+        self.functions = {}      # nombre -> (tipo, [tipos de los parámetros])
+        self.module = []         # Clases y funciones, en orden: (texto, posición)
+        self.main = _Unit('_main')
+        self.unit = self.main
+        self.indent = 1
+        self.position = (0, 0)
+
+    def transpile(self, program):
+        self._block(program.body)
+        lines = self.module + self._assemble(self.main, self._main_header())
+        source = '\n'.join(text for text, _ in lines) + '\n'
+        positions = [position for _, position in lines]
+        code = compile(source, self.filename, 'exec')
+        return PythonProgram(self.filename, source, code, positions, list(self.main.locals.items()), self.records)
+
+    def _main_header(self):
+        shared = [f'g_{name}' for name in self.main.locals if name in self.main.uses_globals]
+        header = ['def _main():']
+        if shared:
+            header.append('    global ' + ', '.join(shared))
+        return header
+
+    def _assemble(self, unit, header):
+        # Cabecera, inicialización de todas las variables (como la plantilla del marco) y cuerpo
+        prefix = 'g_' if unit is self.main else 'l_'
+        lines = [(text, self.position) for text in header]
+        for name, vtype in unit.locals.items():
+            if name in unit.params:
+                continue
+            lines.append((f'    {prefix}{name} = {self._default(vtype)}', self.position))
+        lines.extend(unit.lines)
+        if unit is self.main:
+            values = ', '.join(f'g_{name}' for name in unit.locals)
+            lines.append((f'    return [{values}]', self.position))
+        return lines
+
+    def _emit(self, text):
+        self.unit.lines.append(('    ' * self.indent + text, self.position))
+
+    def _default(self, vtype):
+        # Valor inicial en el marco: escalares a cero; vectores y registros se crean al declararlos
+        if vtype in SCALAR_DEFAULTS:
+            return repr(SCALAR_DEFAULTS[vtype])
+        return 'None'
+
+    def _allocation(self, vtype):
+        if is_vector(vtype) and vtype[1] in TYPECODES:
+            return f'_new_vector({vtype[1]!r}, {vtype[2]})'
+        if is_vector(vtype) and vtype[1] in SCALAR_DEFAULTS:
+            return f'[{SCALAR_DEFAULTS[vtype[1]]!r}] * {vtype[2]}'
+        if is_vector(vtype) and vtype[1] in self.records:
+            # Vector de registros: una lista con una columna por campo (ver records.py)
+            columns = ', '.join(self._allocation(('vector', ftype, vtype[2])) for _, ftype in self.records[vtype[1]])
+            return f'[{columns}]'
+        if is_vector(vtype):
+            return f'[{self._allocation(vtype[1])} for _ in range({vtype[2]})]'
+        if vtype in SCALAR_DEFAULTS:
+            return repr(SCALAR_DEFAULTS[vtype])
+        if vtype not in self.records:
+            raise ExecutionError(f"El tipo '{vtype}' no está definido.", *self.position)
+        return f'T_{vtype}()'
+
+    # ----------------------------- Sentencias -----------------------------
+
+    def _block(self, statements):
+        if not statements:
+            self._emit('pass')
+        for stmt in statements:
+            self.position = (stmt.lineno, stmt.col)
+            _STATEMENT_TRANSPILERS[stmt.kind](self, stmt)
+
+    def _declare(self, name, vtype):
+        self.unit.declare(name, vtype)
+        return self._name(name)[0]
+
+    def _decl(self, stmt):
+        names = [self._declare(name, stmt.type) for name in stmt.ids]
+        if stmt.type in SCALAR_DEFAULTS:
+            self._emit(' = '.join(names) + f' = {self._allocation(stmt.type)}')
+        else:
+            for name in names:
+                self._emit(f'{name} = {self._allocation(stmt.type)}')
+
+    def _decl_assign(self, stmt):
+        # Como en el análisis semántico, las variables existen ya al evaluar la expresión
+        names = [self._declare(name, stmt.type) for name in stmt.ids]
+        self._emit(' = '.join(names) + ' = ' + self._coerced(stmt.expr, stmt.type))
+
+    def _instance(self, stmt):
+        name = self._declare(stmt.name, stmt.type_name)
+        self._emit(f'{name} = {self._allocation(stmt.type_name)}')
+
+    def _type_def(self, stmt):
+        fields = tuple((name, ftype) for ftype, name in stmt.record_fields)
+        self.records[stmt.name] = fields
+        slots = repr(tuple(field_name(name) for name, _ in fields))
+        lines = [f'class T_{stmt.name}:', f'    __slots__ = {slots}', '',
+                 '    def __init__(self):']
+        lines += [f'        self.{field_name(name)} = {self._allocation(ftype)}' for name, ftype in fields]
+        if not fields:
+            lines.append('        pass')
+        self.module.extend((text, self.position) for text in lines + [''])
+
+    def _assign(self, stmt):
+        target = stmt.target
+        kind = target.kind
+        if kind == VAR:
+            name, vtype = self._name(target.name, target)
+            self._emit(f'{name} = {self._coerced(stmt.expr, vtype)}')
+            return
+        expr = self._coerced(stmt.expr, target.type)
+        if kind == ARRAY_ACCESS:
+            # Python evalúa el valor antes que el vector y el índice, como tree_walker. El índice
+            # comprobado va en _s, que no comparte con las lecturas de vectores del valor (_i)
+            array = self._operand(target.array, _ATOM)
+            index, n = target.index, target.array.type[2]
+            if index.kind == CONST and 0 <= const_value(index.value) < n:
+                i = repr(const_value(index.value))
+            elif target.safe:
+                i = self._expr(index)
+            else:
+                check = f', {n}, {target.lineno}, {target.col})'
+                if index.kind == VAR:
+                    i = self._name(index.name, index)[0]
+                    i = f'{i} if 0 <= {i} < {n} else _oob({i}{check}'
+                else:
+                    i = f'_s if 0 <= (_s := {self._expr(index)}) < {n} else _oob(_s{check}'
+            self._emit(f'{array}[{i}] = {expr}')
+            return
+        if kind == FIELD_ACCESS:
+            self._emit(f'{self._field(self._operand(target.obj, _ATOM), target)} = {expr}')
+            return
+        raise ExecutionError(f"Asignación a estructura no válida: {target.tag}", stmt.lineno, stmt.col)
+
+    def _func_def(self, stmt):
+        if self.unit is not self.main:
+            raise ExecutionError("No se pueden ejecutar funciones definidas dentro de otra función.",
+                                 stmt.lineno, stmt.col)
+        param_types = [ptype for ptype, _ in stmt.params]
+        self.functions[stmt.name] = (stmt.type, param_types)   # Antes del cuerpo: permite la recursión
+
+        unit = self.unit = _Unit(stmt.name, stmt.type)
+        unit.params = [pname for _, pname in stmt.params]
+        indent, self.indent = self.indent, 1
+        try:
+            for ptype, pname in stmt.params:
+                unit.declare(pname, ptype)
+            self._block(stmt.body)
+            if not stmt.body or stmt.body[-1].kind != RETURN:
+                self._emit(f'raise _NoReturn({stmt.name!r})')
+        finally:
+            self.unit, self.indent = self.main, indent
+
+        params = ', '.join(f'l_{pname}' for pname in unit.params)
+        header = [f'def f_{stmt.name}({params}):']
+        if unit.uses_globals:
+            header.append('    global ' + ', '.join(f'g_{name}' for name in sorted(unit.uses_globals)))
+        self.main.uses_globals |= unit.uses_globals
+        self.position = (stmt.lineno, stmt.col)
+        self.module.extend(self._assemble(unit, header))
+        self.module.append(('', self.position))
+
+    def _return(self, stmt):
+        if self.unit is self.main:
+            raise ExecutionError("'return' fuera de una función.", stmt.lineno, stmt.col)
+        self._emit(f'return {self._coerced(stmt.expr, self.unit.type)}')
+
+    def _if(self, stmt):
+        self._emit(f'if {self._expr(stmt.cond)}:')
+        self._nested(stmt.then)
+        if stmt.orelse:
+            self.position = (stmt.lineno, stmt.col)
+            self._emit('else:')
+            self._nested(stmt.orelse)
+
+    def _while(self, stmt):
+        self._emit(f'while {self._expr(stmt.cond)}:')
+        self._nested(stmt.body)
+
+    def _nested(self, statements):
+        self.indent += 1
+        try:
+            self._block(statements)
+        finally:
+            self.indent -= 1
+
+    def _expression_statement(self, stmt):
+        self._emit(self._expr(stmt))
+
+    # ----------------------------- Variables -----------------------------
+
+    def _name(self, name, node=None):
+        # (nombre en Python, tipo); dentro de una función, lo no declarado en ella es global
+        unit = self.unit
+        if unit is not self.main and name in unit.locals:
+            return f'l_{name}', unit.locals[name]
+        vtype = self.main.locals.get(name)
+        if vtype is None:
+            position = (node.lineno, node.col) if node is not None else self.position
+            raise ExecutionError(f"La variable '{name}' no ha sido declarada.", *position)
+        if unit is not self.main:
+            unit.uses_globals.add(name)
+        return f'g_{name}', vtype
+
+    # ----------------------------- Expresiones -----------------------------
+
+    def _expr(self, root):
+        return self._operand(root, 0)
+
+    def _operand(self, root, precedence):
+        # Texto de la expresión, entre paréntesis si su precedencia es menor que la pedida
+        text, own = self._generate(root)
+        return f'({text})' if own < precedence else text
+
+    def _coerced(self, node, target):
+        source = node.type
+        if source == target or source not in SCALAR_DEFAULTS or target not in SCALAR_DEFAULTS:
+            return self._expr(node)
+        if node.kind == CONST:
+            return repr(coerce(const_value(node.value), source, target))
+        return _coerce_text(self._expr(node), source, target)
+
+    def _generate(self, root):
+        # Post-orden con pila explícita: (texto, precedencia) de cada nodo
+        generated = {}
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node.type is None:
+                raise ExecutionError("El programa no ha pasado el análisis semántico.", node.lineno, node.col)
+            if not expanded:
+                children = _expression_children(node)
+                if children:
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in reversed(children))
+                    continue
+            generated[id(node)] = _EXPRESSION_TRANSPILERS[node.kind](self, node, generated)
+        return generated[id(root)]
+
+    def _child(self, generated, node, precedence):
+        text, own = generated[id(node)]
+        return f'({text})' if own < precedence else text
+
+    def _const(self, node, generated):
+        value = const_value(node.value)
+        text = repr(value)
+        return text, _UNARY if text.startswith('-') else _ATOM
+
+    def _var(self, node, generated):
+        return self._name(node.name, node)[0], _ATOM
+
+    def _binop(self, node, generated):
+        op, optype = node.op, node.left.type
+        if is_vector(node.type):
+            a, b = self._child(generated, node.left, 0), self._child(generated, node.right, 0)
+            return f'_vec({op!r}, {node.type[1]!r}, {a}, {b})', _ATOM
+        if optype == 'char' and op in ('+', '-', '*', '/'):
+            # Aritmética de caracteres sobre sus códigos, dentro del rango de 8 bits
+            a, b = self._child(generated, node.left, _ATOM), self._child(generated, node.right, _ATOM)
+            value = f'_int_div(ord({a}), ord({b}))' if op == '/' else f'ord({a}) {op} ord({b})'
+            return f'chr(({value}) % 256)', _ATOM
+        if op == '/' and optype == 'int':
+            value = f'_int_div({self._child(generated, node.left, 0)}, {self._child(generated, node.right, 0)})'
+            return _int_checked(value, node), _ATOM
+
+        precedence = _BINARY_PRECEDENCE[op]
+        # Las comparaciones de Python se encadenan: un operando que compara va entre paréntesis
+        left_min = precedence + 1 if precedence == _COMPARE else precedence
+        left = self._child(generated, node.left, left_min)
+        right = self._child(generated, node.right, precedence + 1)
+        if optype == 'int' and op in ('+', '-', '*'):
+            return _int_checked(f'{left} {op} {right}', node), _ATOM
+        return f'{left} {op} {right}', precedence
+
+    def _unop(self, node, generated):
+        if node.op == 'not':
+            return f'not {self._child(generated, node.operand, _NOT)}', _NOT
+        if node.type == 'char':
+            return f'chr(-ord({self._child(generated, node.operand, 0)}) % 256)', _ATOM
+        if is_vector(node.type):
+            return f"_vec('neg', {node.type[1]!r}, {self._child(generated, node.operand, 0)})", _ATOM
+        if node.type == 'int':
+            return _int_checked(f'-{self._child(generated, node.operand, _UNARY)}', node), _ATOM
+        return f'-{self._child(generated, node.operand, _UNARY)}', _UNARY
+
+    def _array_access(self, node, generated):
+        array = self._child(generated, node.array, _ATOM)
+        index, n = node.index, node.array.type[2]
+        if index.kind == CONST and 0 <= const_value(index.value) < n:
+            return f'{array}[{const_value(index.value)!r}]', _ATOM
+        if node.safe:
+            return f'{array}[{self._child(generated, index, 0)}]', _ATOM
+        check = f', {n}, {node.lineno}, {node.col})'
+        if index.kind == VAR:
+            i = generated[id(index)][0]
+            return f'{array}[{i} if 0 <= {i} < {n} else _oob({i}{check}]', _ATOM
+        i = self._child(generated, index, 0)
+        return f'{array}[_i if 0 <= (_i := {i}) < {n} else _oob(_i{check}]', _ATOM
+
+    def _field_access(self, node, generated):
+        return self._field(self._child(generated, node.obj, _ATOM), node), _ATOM
+
+    def _field(self, obj, node):
+        # Atributo del registro, o posición de la columna en un vector de registros
+        if is_vector(node.obj.type):
+            return f'{obj}[{node.offset}]'
+        return f'{obj}.{field_name(node.field)}'
+
+    def _func_call(self, node, generated):
+        function = self.functions.get(node.name)
+        if function is None and node.name in REDUCTIONS:
+            args = ', '.join(self._child(generated, arg, 0) for arg in node.args)
+            return f'_vec({node.name!r}, {node.type!r}, {args})', _ATOM
+        if function is None:
+            raise ExecutionError(f"La función '{node.name}' no está definida.", node.lineno, node.col)
+        args = [_coerce_text(self._child(generated, arg, 0), arg.type, ptype)
+                for arg, ptype in zip(node.args, function[1])]
+        return f'f_{node.name}({", ".join(args)})', _ATOM
+
+
+def transpile(program, filename='<viper>'):
+    return PythonTranspiler(filename).transpile(program)
+
+
+def _int_checked(text, node):
+    # Los int son de 64 bits, como en la máquina virtual: el resultado se comprueba en línea
+    return (f'(_n if {INT_MIN} <= (_n := {text}) <= {INT_MAX} '
+            f'else _ovf({node.lineno}, {node.col}))')
+
+
+def _coerce_text(text, source, target):
+    # Conversiones automáticas (char -> int/float, int -> float) sobre el texto ya generado
+    if source == target or source not in SCALAR_DEFAULTS or target not in SCALAR_DEFAULTS:
+        return text
+    if source == 'char':
+        text = f'ord({text})'
+    return f'float({text})' if target == 'float' else text
+
+
+def _expression_children(node):
+    kind = node.kind
+    if kind == BINOP:
+        return (node.left, node.right)
+    if kind == UNOP:
+        return (node.operand,)
+    if kind == ARRAY_ACCESS:
+        return (node.array, node.index)
+    if kind == FIELD_ACCESS:
+        return (node.obj,)
+    if kind == FUNC_CALL:
+        return node.args
+    return ()
+
+
+# ----------------------------- Tablas de despacho -----------------------------
+
+_STATEMENT_TRANSPILERS = {
+    DECL: PythonTranspiler._decl,
+    DECL_ASSIGN: PythonTranspiler._decl_assign,
+    ASSIGN: PythonTranspiler._assign,
+    FUNC_DEF: PythonTranspiler._func_def,
+    RETURN: PythonTranspiler._return,
+    IF: PythonTranspiler._if,
+    WHILE: PythonTranspiler._while,
+    INSTANCE: PythonTranspiler._instance,
+    TYPE_DEF: PythonTranspiler._type_def,
+    BINOP: PythonTranspiler._expression_statement,
+    UNOP: PythonTranspiler._expression_statement,
+    CONST: PythonTranspiler._expression_statement,
+    VAR: PythonTranspiler._expression_statement,
+    ARRAY_ACCESS: PythonTranspiler._expression_statement,
+    FIELD_ACCESS: PythonTranspiler._expression_statement,
+    FUNC_CALL: PythonTranspiler._expression_statement,
+}
+
+_EXPRESSION_TRANSPILERS = {
+    CONST: PythonTranspiler._const,
+    VAR: PythonTranspiler._var,
+    BINOP: PythonTranspiler._binop,
+    UNOP: PythonTranspiler._unop,
+    ARRAY_ACCESS: PythonTranspiler._array_access,
+    FIELD_ACCESS: PythonTranspiler._field_access,
+    FUNC_CALL: PythonTranspiler._func_call,
+}
+
+
+# Para ejecutar (o ver) un .vpyc ya generado:
+if __name__ == "__main__":
+    argp = argparse.ArgumentParser(description="Ejecuta un programa Viper traducido a Python")
+    argp.add_argument('program', help="fichero .vpyc generado con main.py --emit-python")
+    argp.add_argument('--source', action='store_true', help="muestra el código Python en lugar de ejecutar")
+    args = argp.parse_args()
+
+    program = PythonProgram.load(args.program)
+    if args.source:
+        print(program.source, end='')
+        sys.exit(0)
+    try:
+        program.run()
+    except ExecutionError as e:
+        print(e)
+        sys.exit(1)
+    print('\n'.join(program.format_variables()))
@@ -0,0 +1,288 @@
+from array import array
+
+from ast_nodes import Node, to_tuple
+from executor import ExecutionError, SCALAR_DEFAULTS, is_vector, const_value, coerce, int_div, format_value
+from vectors import (VectorError, REDUCTIONS, OVERFLOW_MESSAGE, INT_MIN, INT_MAX, new_vector, elementwise, negate,
+                     reduce)
+
+
+# Intérprete de referencia: recorre el AST en forma de tuplas en cada ejecución, busca las
+# variables por nombre en diccionarios y despacha por la etiqueta de cada nodo. Es lento a
+# propósito y sirve como semántica de referencia para comparar los backends compilados.
+
+class _Return(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class _Environment:
+    def __init__(self, parent=None):
+        self.values = {}
+        self.types = {}
+        self.parent = parent
+
+    def find(self, name):
+        env = self
+        while env is not None:
+            if name in env.values:
+                return env
+            env = env.parent
+        raise ExecutionError(f"La variable '{name}' no ha sido declarada.")
+
+
+class TreeWalker:
+    def __init__(self):
+        self.globals = _Environment()
+        self.functions = {}
+        self.records = {}    # tipo -> [(campo, tipo), ...]
+
+    def run(self, program):
+        if isinstance(program, Node):
+            program = to_tuple(program)
+        self.globals = _Environment()
+        try:
+            self.execute_block(program[1], self.globals)
+        except RecursionError:
+            raise ExecutionError("Se ha superado la profundidad máxima de llamadas.") from None
+        return dict(self.globals.values)
+
+    def format_variables(self):
+        layouts = {name: {field: (offset, ftype) for offset, (field, ftype) in enumerate(fields)}
+                   for name, fields in self.records.items()}
+        env = self.globals
+        return [f"{name} = {format_value(value, env.types[name], layouts)}" for name, value in env.values.items()]
+
+    # ----------------------------- Sentencias -----------------------------
+
+    def execute_block(self, statements, env):
+        for stmt in statements:
+            self.execute(stmt, env)
+
+    def execute(self, stmt, env):
+        method = getattr(self, 'exec_' + stmt[0], None)
+        if method is None:
+            return self.evaluate(stmt, env)
+        return method(stmt, env)
+
+    def exec_decl(self, stmt, env):
+        _, vtype, names = stmt
+        for name in names:
+            env.values[name] = self.new_value(vtype)
+            env.types[name] = vtype
+
+    def exec_decl_assign(self, stmt, env):
+        _, vtype, names, expr = stmt
+        for name in names:
+            env.values[name] = self.new_value(vtype)
+            env.types[name] = vtype
+        value = self.evaluate(expr, env)
+        for name in names:
+            env.values[name] = self.convert(value, vtype)
+
+    def exec_instance(self, stmt, env):
+        _, type_name, name = stmt
+        env.values[name] = self.new_value(type_name)
+        env.types[name] = type_name
+
+    def exec_type_def(self, stmt, env):
+        _, name, fields = stmt
+        self.records[name] = [(field, ftype) for ftype, field in fields]
+
+    def exec_assign(self, stmt, env):
+        _, target, expr = stmt
+        value = self.evaluate(expr, env)
+        if target[0] == 'var':
+            owner = env.find(target[1])
+            owner.values[target[1]] = self.convert(value, owner.types[target[1]])
+        elif target[0] == 'array_access':
+            array = self.evaluate(target[1], env)
+            index = self.evaluate(target[2], env)
+            self.check_index(array, index)
+            try:
+                array[index] = self.convert_element(value, array)
+            except OverflowError:
+                raise ExecutionError(OVERFLOW_MESSAGE) from None
+        else:
+            record, offset, ftype = self.field(target, env)
+            record[offset] = self.convert(value, ftype)
+
+    def exec_func_def(self, stmt, env):
+        _, ftype, name, params, body = stmt
+        self.functions[name] = (ftype, params, body)
+
+    def exec_return(self, stmt, env):
+        raise _Return(self.evaluate(stmt[1], env))
+
+    def exec_if(self, stmt, env):
+        _, cond, then, orelse = stmt
+        if self.evaluate(cond, env):
+            self.execute_block(then, env)
+        elif orelse:
+            self.execute_block(orelse, env)
+
+    def exec_while(self, stmt, env):
+        _, cond, body = stmt
+        while self.evaluate(cond, env):
+            self.execute_block(body, env)
+
+    # ----------------------------- Expresiones -----------------------------
+
+    def evaluate(self, expr, env):
+        return getattr(self, 'eval_' + expr[0])(expr, env)
+
+    def eval_const(self, expr, env):
+        return const_value(expr[1])
+
+    def eval_var(self, expr, env):
+        return env.find(expr[1]).values[expr[1]]
+
+    def eval_binop(self, expr, env):
+        _, op, left, right = expr
+        a = self.evaluate(left, env)
+        if op == 'and':
+            return a and self.evaluate(right, env)
+        if op == 'or':
+            return a or self.evaluate(right, env)
+        b = self.evaluate(right, env)
+        if op == '==':
+            return a == b
+        if op == '<':
+            return a < b
+        if op == '<=':
+            return a <= b
+        if op == '>':
+            return a > b
+        if op == '>=':
+            return a >= b
+        if isinstance(a, array) or isinstance(b, array):
+            vector = a if isinstance(a, array) else b
+            return _vector_call(elementwise, op, _base(vector), a, b)
+        char = isinstance(a, str)
+        if char:
+            a, b = ord(a), ord(b)
+        try:
+            if op == '+':
+                result = a + b
+            elif op == '-':
+                result = a - b
+            elif op == '*':
+                result = a * b
+            elif isinstance(a, int):
+                result = int_div(a, b)
+            else:
+                result = a / b
+        except ZeroDivisionError:
+            raise ExecutionError("División por cero.") from None
+        if char:
+            return chr(result % 256)
+        if isinstance(result, int) and not INT_MIN <= result <= INT_MAX:
+            raise ExecutionError(OVERFLOW_MESSAGE)
+        return result
+
+    def eval_unop(self, expr, env):
+        _, op, operand = expr
+        value = self.evaluate(operand, env)
+        if op == 'not':
+            return not value
+        if isinstance(value, str):
+            return chr(-ord(value) % 256)
+        if isinstance(value, array):
+            return _vector_call(negate, _base(value), value)
+        if isinstance(value, int) and -value > INT_MAX:
+            raise ExecutionError(OVERFLOW_MESSAGE)
+        return -value
+
+    def eval_array_access(self, expr, env):
+        array = self.evaluate(expr[1], env)
+        index = self.evaluate(expr[2], env)
+        self.check_index(array, index)
+        return array[index]
+
+    def eval_field_access(self, expr, env):
+        record, offset, _ = self.field(expr, env)
+        return record[offset]
+
+    def eval_func_call(self, expr, env):
+        _, name, args = expr
+        if name not in self.functions and name in REDUCTIONS:
+            values = [self.evaluate(arg, env) for arg in args]
+            return _vector_call(reduce, name, _base(values[0]), *values)
+        if name not in self.functions:
+            raise ExecutionError(f"La función '{name}' no está definida.")
+        ftype, params, body = self.functions[name]
+        values = [self.evaluate(arg, env) for arg in args]
+        local = _Environment(self.globals)
+        for (ptype, pname), value in zip(params, values):
+            local.values[pname] = self.convert(value, ptype)
+            local.types[pname] = ptype
+        try:
+            self.execute_block(body, local)
+        except _Return as result:
+            return self.convert(result.value, ftype)
+        raise ExecutionError(f"La función '{name}' terminó sin ejecutar 'return'.")
+
+    # ----------------------------- Valores -----------------------------
+
+    def new_value(self, vtype):
+        if vtype in SCALAR_DEFAULTS:
+            return SCALAR_DEFAULTS[vtype]
+        if is_vector(vtype):
+            base, n = vtype[1], vtype[2]
+            if base in ('int', 'float'):
+                return new_vector(base, n)
+            if base in SCALAR_DEFAULTS:
+                return [SCALAR_DEFAULTS[base]] * n
+            if base in self.records:    # Una columna por campo
+                return [self.new_value(('vector', ftype, n)) for _, ftype in self.records[base]]
+            return [self.new_value(base) for _ in range(n)]
+        if vtype not in self.records:
+            raise ExecutionError(f"El tipo '{vtype}' no está definido.")
+        return [self.new_value(ftype) for _, ftype in self.records[vtype]]
+
+    def field(self, expr, env):
+        # Los registros sólo se alcanzan a través de una variable: su tipo da la posición del campo.
+        # En un vector de registros, el campo es la columna en esa misma posición
+        _, obj, name = expr
+        record = self.evaluate(obj, env)
+        vtype = env.find(obj[1]).types[obj[1]]
+        type_name = vtype[1] if is_vector(vtype) else vtype
+        for offset, (field, ftype) in enumerate(self.records[type_name]):
+            if field == name:
+                return record, offset, ('vector', ftype, vtype[2]) if is_vector(vtype) else ftype
+        raise ExecutionError(f"El tipo '{type_name}' no tiene el campo '{name}'.")
+
+    def check_index(self, array, index):
+        if not 0 <= index < len(array):
+            raise ExecutionError(f"Índice {index} fuera de rango para un vector de tamaño {len(array)}.")
+
+    def convert(self, value, vtype):
+        if vtype in SCALAR_DEFAULTS:
+            return coerce(value, _value_type(value), vtype)
+        return value
+
+    def convert_element(self, value, array):
+        return coerce(value, _value_type(value), _value_type(array[0])) if array else value
+
+
+def _base(vector):
+    # Los vectores de int y float son array.array: su código de tipo da el tipo base
+    return 'int' if vector.typecode == 'q' else 'float'
+
+
+def _vector_call(fn, *args):
+    try:
+        return fn(*args)
+    except VectorError as e:
+        raise ExecutionError(e.message) from None
+
+
+def _value_type(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, str):
+        return 'char'
+    return None
@@ -0,0 +1,207 @@
+import operator
+from array import array
+from itertools import repeat
+
+try:
+    import numpy
+except ImportError:      # Sin NumPy las operaciones en bloque recorren los arrays desde Python
+    numpy = None
+
+
+# ----------------------------- Almacenamiento -----------------------------
+# Los vectores de int y float son array.array con el tipo de C de cada base ('q': enteros de
+# 64 bits, 'd': double), como los registros de la máquina virtual; los de bool y char siguen
+# siendo listas. Leer o escribir un elemento cuesta lo mismo que en una lista y devuelve un
+# escalar de Python, así que los motores no cambian. Las operaciones con vectores completos
+# (aritmética elemento a elemento y reducciones) trabajan de una vez sobre todo el array: con
+# NumPy, sobre una vista sin copia del mismo buffer; sin NumPy, con map sobre el array.
+# Los resultados son los mismos con y sin NumPy: enteros exactos (o error de desbordamiento)
+# y sumas de float en el mismo orden que un bucle.
+
+BACKEND = 'numpy' if numpy is not None else 'array'
+
+TYPECODES = {'int': 'q', 'float': 'd'}
+_ZEROS = {'int': 0, 'float': 0.0}
+# Los int de todos los motores son de 64 bits: un resultado fuera de este rango es un error
+INT_MIN, INT_MAX = -(1 << 63), (1 << 63) - 1
+_SAFE_MAGNITUDE = float(1 << 62)   # Por debajo, un cálculo en int64 no puede desbordarse
+
+# Funciones predefinidas: nombre -> número de vectores que reciben. Devuelven un escalar del
+# tipo base; una función del programa con el mismo nombre las oculta desde su definición.
+REDUCTIONS = {'sum': 1, 'min': 1, 'max': 1, 'dot': 2}
+
+OVERFLOW_MESSAGE = "Desbordamiento: el entero no cabe en 64 bits."
+
+
+class VectorError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def is_numeric_vector(vtype):
+    return isinstance(vtype, tuple) and vtype[0] == 'vector' and vtype[1] in TYPECODES
+
+
+def vector_maker(vtype):
+    # Función que crea un vector nuevo a cero (None si la base no es numérica: lista)
+    base, n = vtype[1], vtype[2]
+    if base not in TYPECODES:
+        return None
+    prototype = array(TYPECODES[base], [_ZEROS[base]])
+    return lambda: prototype * n
+
+
+def new_vector(base, n):
+    return array(TYPECODES[base], [_ZEROS[base]]) * n
+
+
+# ----------------------------- Operaciones elemento a elemento -----------------------------
+
+def elementwise(op, base, a, b):
+    # a op b con op en + - * /; uno de los dos puede ser un escalar del tipo base
+    vector = a if isinstance(a, array) else b
+    if base == 'int':
+        for value in (a, b):
+            if not isinstance(value, array) and not INT_MIN <= value <= INT_MAX:
+                raise VectorError(OVERFLOW_MESSAGE)
+    if op == '/' and _has_zero(b):
+        raise VectorError("División por cero.")
+    if numpy is not None:
+        with numpy.errstate(all='ignore'):     # inf y nan como en Python, sin avisos
+            result = _numpy_elementwise(op, base, _view(a, base), _view(b, base), len(vector))
+        if result is not None:
+            return result
+    fn = _int_div if op == '/' and base == 'int' else _OPERATORS[op]
+    left = a if isinstance(a, array) else repeat(a, len(vector))
+    right = b if isinstance(b, array) else repeat(b, len(vector))
+    try:
+        return array(TYPECODES[base], map(fn, left, right))
+    except OverflowError:
+        raise VectorError(OVERFLOW_MESSAGE) from None
+
+
+def negate(base, a):
+    if numpy is not None:
+        x = _view(a, base)
+        if base == 'int' and len(a) and x.min() == INT_MIN:
+            raise VectorError(OVERFLOW_MESSAGE)
+        out = array(TYPECODES[base], bytes(a.itemsize * len(a)))
+        numpy.negative(x, out=_view(out, base))
+        return out
+    try:
+        return array(TYPECODES[base], map(operator.neg, a))
+    except OverflowError:
+        raise VectorError(OVERFLOW_MESSAGE) from None
+
+
+def _numpy_elementwise(op, base, x, y, n):
+    # Resultado con NumPy, o None si en enteros podría desbordarse (se calcula sin NumPy)
+    out = array(TYPECODES[base], bytes(8 * n))
+    result = _view(out, base)
+    if base == 'float':
+        _NUMPY_OPERATORS[op](x, y, out=result)
+        return out
+    if op == '*':
+        if numpy.max(numpy.abs(numpy.multiply(x, y, dtype=numpy.float64)), initial=0.0) >= _SAFE_MAGNITUDE:
+            return None
+        numpy.multiply(x, y, out=result)
+    elif op == '/':
+        if numpy.any((x == INT_MIN) & (y == -1)):
+            raise VectorError(OVERFLOW_MESSAGE)
+        numpy.floor_divide(x, y, out=result)
+        # División entera truncando hacia cero, como executor.int_div
+        result += (result < 0) & (result * y != x)
+    else:
+        _NUMPY_OPERATORS[op](x, y, out=result)
+        # Hay desbordamiento si el signo del resultado no es el que dan los operandos
+        signs = (x ^ result) & (y ^ result) if op == '+' else (x ^ y) & (x ^ result)
+        if numpy.any(signs < 0):
+            raise VectorError(OVERFLOW_MESSAGE)
+    return out
+
+
+def _view(value, base):
+    # Vista NumPy sin copia de un array (los escalares se quedan como están)
+    if isinstance(value, array):
+        return numpy.frombuffer(value, dtype=numpy.int64 if base == 'int' else numpy.float64)
+    return value
+
+
+def _magnitude(x):
+    # Valores absolutos en float (en int64, abs del mínimo se desborda): cota de los resultados
+    return numpy.abs(x.astype(numpy.float64))
+
+
+def _has_zero(value):
+    if not isinstance(value, array):
+        return value == 0
+    if numpy is not None:
+        return bool(numpy.any(_view(value, 'int' if value.typecode == 'q' else 'float') == 0))
+    return 0 in value
+
+
+def _int_div(a, b):
+    # La de executor.int_div, que no se importa aquí: executor depende de este módulo
+    q = a // b
+    if q < 0 and q * b != a:
+        q += 1
+    return q
+
+
+# ----------------------------- Reducciones -----------------------------
+
+def reduce(name, base, a, b=None):
+    if name == 'dot':
+        return _dot(base, a, b)
+    if name == 'sum':
+        if base == 'int' and numpy is not None:
+            x = _view(a, base)
+            if _magnitude(x).sum() < _SAFE_MAGNITUDE:
+                return int(x.sum())
+        # Exacta en enteros y, en float, en el orden de un bucle
+        return _checked(sum(a, _ZEROS[base]), base)
+    if not len(a):
+        raise VectorError(f"'{name}' de un vector vacío.")
+    if numpy is not None:
+        # El primero de los iguales, como min/max de Python (importa con 0.0 y -0.0)
+        x = _view(a, base)
+        value = a[int(x.argmin() if name == 'min' else x.argmax())]
+        if value == value:  # Con NaN, el resultado de min/max de Python depende del orden
+            return value
+    return min(a) if name == 'min' else max(a)
+
+
+def _dot(base, a, b):
+    if numpy is not None:
+        x, y = _view(a, base), _view(b, base)
+        if base == 'float':
+            # Productos en bloque (cada uno redondeado como en Python) y suma en orden
+            with numpy.errstate(all='ignore'):
+                return sum(array('d', (x * y).tobytes()), 0.0)
+        if _magnitude(x) @ _magnitude(y) < _SAFE_MAGNITUDE:
+            return int(x @ y)
+    return _checked(sum(map(operator.mul, a, b), _ZEROS[base]), base)
+
+
+def _checked(value, base):
+    if base == 'int' and not INT_MIN <= value <= INT_MAX:
+        raise VectorError(OVERFLOW_MESSAGE)
+    return value
+
+
+def vector_op(name, base, *operands):
+    # Punto de entrada único para los motores que guardan la operación como dato (máquina
+    # virtual, IR): + - * / y 'neg' dan un vector, == un bool y las reducciones un escalar
+    if name in _OPERATORS:
+        return elementwise(name, base, *operands)
+    if name == 'neg':
+        return negate(base, *operands)
+    if name == '==':
+        return operands[0] == operands[1]
+    return reduce(name, base, *operands)
+
+
+_OPERATORS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+_NUMPY_OPERATORS = ({'+': numpy.add, '-': numpy.subtract, '*': numpy.multiply, '/': numpy.true_divide}
+                    if numpy is not None else {})
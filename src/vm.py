@@ -0,0 +1,326 @@
+import argparse
+import sys
+from array import array
+
+from bytecode import (BytecodeProgram, MOV_I, MOV_F, MOV_O, ADD_I, SUB_I, MUL_I, DIV_I, NEG_I, ADD_F, SUB_F,
+                      MUL_F, DIV_F, NEG_F, ADD_C, SUB_C, MUL_C, DIV_C, NEG_C, LT_I, LE_I, GT_I, GE_I, EQ_I,
+                      LT_F, LE_F, GT_F, GE_F, EQ_F, NOT, I2F, JMP, JF, JT, JLT_I, JLE_I, JGT_I, JGE_I,
+                      JEQ_I, JNE_I, GETG_I, GETG_F, GETG_O, SETG_I, SETG_F, SETG_O, NEWVEC_I, NEWVEC_F,
+                      VGET_I, VGET_F, VSET_I, VSET_F, NEWREC, FGET_I, FGET_F, FGET_O, FSET_I, FSET_F,
+                      FSET_O, CALL_I, CALL_F, CALL_O, RET_I, RET_F, RET_O, NORET, HALT, VEC, VGETU_I, VGETU_F,
+                      VSETU_I, VSETU_F, VGET_O, VSET_O, VGETU_O, VSETU_O, I, F)
+from executor import ExecutionError, SCALAR_DEFAULTS, is_vector
+from vectors import VectorError, OVERFLOW_MESSAGE, vector_op
+
+
+_NO_RETURN = object()    # Lo que devuelve NORET: la llamada da el error en su propia línea
+
+
+# Intérprete del bytecode de registros. Cada llamada crea su marco copiando las plantillas
+# de la función (arrays tipados con las constantes ya cargadas) y ejecuta un bucle de
+# despacho; el código se decodifica una vez a tuplas (op, a, b, c).
+class VirtualMachine:
+    def __init__(self, program):
+        self.program = program
+        self.functions = program.functions
+        self.sites = program.call_sites
+        self.vector_sites = program.vector_sites
+        self.code = [[tuple(f.code[pc:pc + 4]) for pc in range(0, len(f.code), 4)] for f in program.functions]
+        self.record_makers = [self._record_maker(name) for name in program.record_names]
+        self.globals = None
+
+    def _record_maker(self, type_name):
+        if is_vector(type_name):
+            return self._columns_maker(type_name)
+        fields = self.program.records[type_name]
+        template = [0.0 if ftype == 'float' else 0 if ftype in SCALAR_DEFAULTS else None for _, ftype in fields]
+        vectors = [(offset, _new_vector(ftype)) for offset, (_, ftype) in enumerate(fields) if is_vector(ftype)]
+        if not vectors:
+            return template.copy
+
+        def make():
+            record = template.copy()
+            for offset, new in vectors:
+                record[offset] = new()
+            return record
+        return make
+
+    def _columns_maker(self, vtype):
+        # Vector de registros: una columna por campo (las de campos vector, con n vectores)
+        n = vtype[2]
+        columns = []
+        for _, ftype in self.program.records[vtype[1]]:
+            if is_vector(ftype):
+                new = _new_vector(ftype)
+                columns.append(lambda new=new: [new() for _ in range(n)])
+            else:
+                columns.append(_new_vector(('vector', ftype, n)))
+        return lambda: [new() for new in columns]
+
+    def run(self):
+        main = self.functions[0]
+        ints, floats, objs = main.int_template[:], main.float_template[:], [None] * main.obj_count
+        self.globals = (ints, floats, objs)
+        try:
+            self._execute(0, ints, floats, objs)
+        except RecursionError:
+            raise ExecutionError("Se ha superado la profundidad máxima de llamadas.") from None
+        return self.program.variables(ints, floats, objs)
+
+    def variables(self):
+        return self.program.variables(*self.globals)
+
+    def format_variables(self):
+        return self.program.format_variables(*self.globals)
+
+    def _execute(self, index, R, Fl, Ob):
+        code = self.code[index]
+        GI, GF, GO = self.globals
+        functions, sites, makers = self.functions, self.sites, self.record_makers
+        vector_sites = self.vector_sites
+        pc = 0
+        try:
+            while True:
+                op, a, b, c = code[pc]
+                pc += 1
+                # Las instrucciones más frecuentes en bucles van primero
+                if op == JLT_I:
+                    if R[a] < R[b]:
+                        pc = c
+                elif op == JGE_I:
+                    if R[a] >= R[b]:
+                        pc = c
+                elif op == ADD_I:
+                    R[a] = R[b] + R[c]
+                elif op == MOV_I:
+                    R[a] = R[b]
+                elif op == SUB_I:
+                    R[a] = R[b] - R[c]
+                elif op == MUL_I:
+                    R[a] = R[b] * R[c]
+                elif op == VGETU_I:
+                    R[a] = Ob[b][R[c]]
+                elif op == VSETU_I:
+                    Ob[a][R[b]] = R[c]
+                elif op == VGET_I:
+                    vector, i = Ob[b], R[c]
+                    if not 0 <= i < len(vector):
+                        raise _index_error(i, len(vector), functions[index].lines[pc - 1])
+                    R[a] = vector[i]
+                elif op == VSET_I:
+                    vector, i = Ob[a], R[b]
+                    if not 0 <= i < len(vector):
+                        raise _index_error(i, len(vector), functions[index].lines[pc - 1])
+                    vector[i] = R[c]
+                elif op == JMP:
+                    pc = a
+                elif op == JF:
+                    if not R[a]:
+                        pc = b
+                elif op == JT:
+                    if R[a]:
+                        pc = b
+                elif op == JLE_I:
+                    if R[a] <= R[b]:
+                        pc = c
+                elif op == JGT_I:
+                    if R[a] > R[b]:
+                        pc = c
+                elif op == JEQ_I:
+                    if R[a] == R[b]:
+                        pc = c
+                elif op == JNE_I:
+                    if R[a] != R[b]:
+                        pc = c
+                elif op == LT_I:
+                    R[a] = R[b] < R[c]
+                elif op == LE_I:
+                    R[a] = R[b] <= R[c]
+                elif op == GT_I:
+                    R[a] = R[b] > R[c]
+                elif op == GE_I:
+                    R[a] = R[b] >= R[c]
+                elif op == EQ_I:
+                    R[a] = R[b] == R[c]
+                elif op == DIV_I:
+                    x, y = R[b], R[c]
+                    q = x // y
+                    if q < 0 and q * y != x:
+                        q += 1   # Truncamiento hacia cero
+                    R[a] = q
+                elif op == CALL_I or op == CALL_F or op == CALL_O:
+                    callee = functions[b]
+                    ints, floats, objs = callee.int_template[:], callee.float_template[:], [None] * callee.obj_count
+                    for bank, src, dst in sites[c]:
+                        if bank == I:
+                            ints[dst] = R[src]
+                        elif bank == F:
+                            floats[dst] = Fl[src]
+                        else:
+                            objs[dst] = Ob[src]
+                    result = self._execute(b, ints, floats, objs)
+                    if result is _NO_RETURN:
+                        # Como en los demás motores, el error se da en la línea de la llamada
+                        raise ExecutionError(f"La función '{callee.name}' terminó sin ejecutar 'return'.",
+                                             functions[index].lines[pc - 1])
+                    if op == CALL_I:
+                        R[a] = result
+                    elif op == CALL_F:
+                        Fl[a] = result
+                    else:
+                        Ob[a] = result
+                elif op == RET_I:
+                    return R[a]
+                elif op == RET_F:
+                    return Fl[a]
+                elif op == RET_O:
+                    return Ob[a]
+                elif op == GETG_I:
+                    R[a] = GI[b]
+                elif op == SETG_I:
+                    GI[a] = R[b]
+                elif op == NEG_I:
+                    R[a] = -R[b]
+                elif op == NOT:
+                    R[a] = not R[b]
+                elif op == MOV_F:
+                    Fl[a] = Fl[b]
+                elif op == ADD_F:
+                    Fl[a] = Fl[b] + Fl[c]
+                elif op == SUB_F:
+                    Fl[a] = Fl[b] - Fl[c]
+                elif op == MUL_F:
+                    Fl[a] = Fl[b] * Fl[c]
+                elif op == DIV_F:
+                    Fl[a] = Fl[b] / Fl[c]
+                elif op == NEG_F:
+                    Fl[a] = -Fl[b]
+                elif op == LT_F:
+                    R[a] = Fl[b] < Fl[c]
+                elif op == LE_F:
+                    R[a] = Fl[b] <= Fl[c]
+                elif op == GT_F:
+                    R[a] = Fl[b] > Fl[c]
+                elif op == GE_F:
+                    R[a] = Fl[b] >= Fl[c]
+                elif op == EQ_F:
+                    R[a] = Fl[b] == Fl[c]
+                elif op == I2F:
+                    Fl[a] = R[b]
+                elif op == VGETU_F:
+                    Fl[a] = Ob[b][R[c]]
+                elif op == VSETU_F:
+                    Ob[a][R[b]] = Fl[c]
+                elif op == VGET_F:
+                    vector, i = Ob[b], R[c]
+                    if not 0 <= i < len(vector):
+                        raise _index_error(i, len(vector), functions[index].lines[pc - 1])
+                    Fl[a] = vector[i]
+                elif op == VSET_F:
+                    vector, i = Ob[a], R[b]
+                    if not 0 <= i < len(vector):
+                        raise _index_error(i, len(vector), functions[index].lines[pc - 1])
+                    vector[i] = Fl[c]
+                elif op == FGET_I:
+                    R[a] = Ob[b][c]
+                elif op == FSET_I:
+                    Ob[a][b] = R[c]
+                elif op == FGET_F:
+                    Fl[a] = Ob[b][c]
+                elif op == FSET_F:
+                    Ob[a][b] = Fl[c]
+                elif op == FGET_O:
+                    Ob[a] = Ob[b][c]
+                elif op == FSET_O:
+                    Ob[a][b] = Ob[c]
+                elif op == VGETU_O:
+                    Ob[a] = Ob[b][R[c]]
+                elif op == VSETU_O:
+                    Ob[a][R[b]] = Ob[c]
+                elif op == VGET_O:
+                    vector, i = Ob[b], R[c]
+                    if not 0 <= i < len(vector):
+                        raise _index_error(i, len(vector), functions[index].lines[pc - 1])
+                    Ob[a] = vector[i]
+                elif op == VSET_O:
+                    vector, i = Ob[a], R[b]
+                    if not 0 <= i < len(vector):
+                        raise _index_error(i, len(vector), functions[index].lines[pc - 1])
+                    vector[i] = Ob[c]
+                elif op == MOV_O:
+                    Ob[a] = Ob[b]
+                elif op == GETG_F:
+                    Fl[a] = GF[b]
+                elif op == SETG_F:
+                    GF[a] = Fl[b]
+                elif op == GETG_O:
+                    Ob[a] = GO[b]
+                elif op == SETG_O:
+                    GO[a] = Ob[b]
+                elif op == ADD_C:
+                    R[a] = (R[b] + R[c]) % 256
+                elif op == SUB_C:
+                    R[a] = (R[b] - R[c]) % 256
+                elif op == MUL_C:
+                    R[a] = (R[b] * R[c]) % 256
+                elif op == DIV_C:
+                    R[a] = (R[b] // R[c]) % 256
+                elif op == NEG_C:
+                    R[a] = -R[b] % 256
+                elif op == NEWVEC_I:
+                    Ob[a] = array('q', [0]) * b
+                elif op == NEWVEC_F:
+                    Ob[a] = array('d', [0.0]) * b
+                elif op == NEWREC:
+                    Ob[a] = makers[b]()
+                elif op == VEC:
+                    name, base, operands, bank = vector_sites[b]
+                    banks = (R, Fl, Ob)
+                    banks[bank][a] = vector_op(name, base, *[banks[k][reg] for k, reg in operands])
+                elif op == HALT:
+                    return None
+                elif op == NORET:
+                    return _NO_RETURN
+                else:
+                    raise ExecutionError(f"Instrucción desconocida: {op}")
+        except ZeroDivisionError:
+            raise ExecutionError("División por cero.", functions[index].lines[pc - 1]) from None
+        except OverflowError:
+            raise ExecutionError(OVERFLOW_MESSAGE, functions[index].lines[pc - 1]) from None
+        except VectorError as e:
+            raise ExecutionError(e.message, functions[index].lines[pc - 1]) from None
+
+
+def _new_vector(vtype):
+    prototype = array('d', [0.0]) if vtype[1] == 'float' else array('q', [0])
+    n = vtype[2]
+    return lambda: prototype * n
+
+
+def _index_error(i, n, lineno):
+    return ExecutionError(f"Índice {i} fuera de rango para un vector de tamaño {n}.", lineno)
+
+
+def run_bytecode(program):
+    vm = VirtualMachine(program)
+    vm.run()
+    return vm
+
+
+# Para ejecutar un .vbc ya compilado:
+if __name__ == "__main__":
+    argp = argparse.ArgumentParser(description="Máquina virtual de Viper")
+    argp.add_argument('bytecode', help="fichero .vbc generado con main.py --emit-bytecode")
+    argp.add_argument('--disassemble', action='store_true', help="muestra las instrucciones en lugar de ejecutar")
+    args = argp.parse_args()
+
+    program = BytecodeProgram.load(args.bytecode)
+    if args.disassemble:
+        print('\n'.join(program.disassemble()))
+        sys.exit(0)
+    try:
+        vm = run_bytecode(program)
+    except ExecutionError as e:
+        print(e)
+        sys.exit(1)
+    print('\n'.join(vm.format_variables()))
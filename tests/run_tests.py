@@ -0,0 +1,84 @@
+# Comprueba la salida esperada de los programas de tests/ con todos los motores.
+#
+#   python tests/run_tests.py [directorio]
+#
+# Un programa declara lo que debe dar en comentarios '# => ' (las variables globales como las
+# muestra main.py --run, o el error que detiene la compilación o la ejecución, como en la salida
+# de texto). Cada programa se compila con los dos lexers y con y sin -O, y se ejecuta con
+# closures, la máquina virtual, el programa traducido a Python y la IR (sin optimizar y
+# optimizada); todas las salidas tienen que ser la esperada. Los programas sin '# => ' se
+# ignoran.
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from diagnostics import Diagnostic, render_text, ERROR
+from executor import ExecutionError
+from ir import lower_program
+from ir_interpreter import IRInterpreter
+from ir_optimizer import optimize_ir
+from main import ParserRunner
+
+EXPECTED = '# => '
+ENGINES = ('closures', 'vm', 'python', 'ir')
+
+
+def expected_output(source):
+    return [line[len(EXPECTED):].rstrip() for line in source.splitlines() if line.startswith(EXPECTED)]
+
+
+def errors(result):
+    return [render_text(d) for d in result.diagnostics if d.severity == ERROR]
+
+
+def run_ir(program):
+    interpreter = IRInterpreter(program)
+    try:
+        interpreter.run()
+    except ExecutionError as e:
+        return [render_text(Diagnostic('error', 'runtime.error', e.message, line=e.lineno or 0))]
+    return interpreter.format_variables()
+
+
+def outputs(source, filename, scanner, optimize):
+    # (configuración, salida) de cada motor
+    for engine in ENGINES:
+        runner = ParserRunner(production=True, output_format='json', execute=engine != 'ir',
+                              engine=engine, optimize=optimize, scanner=scanner)
+        result = runner.compile_source(source, filename)
+        name = f"{engine}{' -O' if optimize else ''} --scanner {scanner}"
+        if result.status != 'ok':
+            yield name, errors(result)
+        elif engine != 'ir':
+            yield name, result.output
+        else:
+            yield name, run_ir(lower_program(result.ast))
+            program, _ = optimize_ir(lower_program(result.ast))
+            yield name + ' (IR optimizada)', run_ir(program)
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    failed = checked = 0
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.vip'):
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            source = f.read()
+        expected = expected_output(source)
+        if not expected:
+            continue
+        checked += 1
+        wrong = [(name, got) for scanner in ('ply', 'fast') for optimize in (False, True)
+                 for name, got in outputs(source, filename, scanner, optimize) if got != expected]
+        print(f"{filename:45} {'OK' if not wrong else 'DISTINTO'}")
+        for name, got in wrong:
+            print(f"  {name}: {got}")
+        failed += bool(wrong)
+    print(f"{checked - failed} de {checked} programas con la salida esperada")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()